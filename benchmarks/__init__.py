@@ -0,0 +1,25 @@
+"""Offline benchmark suite for the runtime generator and renderer.
+
+Run the suite and store a machine-readable report::
+
+    python -m benchmarks run --output benchmarks/results/current.json
+
+Compare it against a stored baseline (exit status 1 on regression)::
+
+    python -m benchmarks compare benchmarks/results/baseline.json \\
+        benchmarks/results/current.json --threshold 0.15
+
+The suite uses only the standard library and never touches the network.
+"""
+
+from benchmarks.compare import compare_reports, format_comparison, load_report
+from benchmarks.suite import RESULTS_SCHEMA_VERSION, build_scenarios, run_suite
+
+__all__ = [
+    "RESULTS_SCHEMA_VERSION",
+    "build_scenarios",
+    "compare_reports",
+    "format_comparison",
+    "load_report",
+    "run_suite",
+]
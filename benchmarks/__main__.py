@@ -0,0 +1,143 @@
+"""
+Command-line interface for the benchmark suite.
+
+Usage
+-----
+Measure and write a report::
+
+    python -m benchmarks run --output current.json
+
+Quick smoke run limited to batch generation::
+
+    python -m benchmarks run --quick --only generate_batch
+
+Flag regressions against a stored baseline::
+
+    python -m benchmarks compare baseline.json current.json --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.compare import compare_reports, format_comparison, load_report
+from benchmarks.suite import run_suite
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and return the argument parser for the benchmark CLI.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser with ``run`` and ``compare`` subcommands.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark NameGenerator and render_names, and compare reports.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and emit a JSON report.")
+    run.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write the report here instead of stdout.",
+    )
+    run.add_argument(
+        "--quick",
+        action="store_true",
+        help="Skip the largest batch size (for smoke runs and CI).",
+    )
+    run.add_argument(
+        "--only",
+        type=str,
+        default=None,
+        help="Only run scenarios whose name contains this substring.",
+    )
+    run.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum timed seconds per scenario. Default: 0.2.",
+    )
+
+    compare = commands.add_parser("compare", help="Flag regressions against a baseline.")
+    compare.add_argument("baseline", type=Path, help="Stored baseline report.")
+    compare.add_argument("current", type=Path, help="Report to check.")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Allowed relative slowdown (0.15 = 15%%). Default: 0.15.",
+    )
+    compare.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=None,
+        help="Allowed relative peak-memory growth. Default: same as --threshold.",
+    )
+    compare.add_argument(
+        "--all",
+        action="store_true",
+        help="List every compared metric, not only regressions.",
+    )
+    return parser
+
+
+def main(args: list[str] | None = None) -> int:
+    """
+    Run the benchmark CLI.
+
+    Parameters
+    ----------
+    args : list[str] | None
+        Argument list (defaults to ``sys.argv[1:]``).
+
+    Returns
+    -------
+    int
+        ``0`` on success, ``1`` when ``compare`` finds a regression, ``2``
+        for unreadable reports.
+    """
+    parsed = create_argument_parser().parse_args(args)
+
+    if parsed.command == "run":
+        report = run_suite(
+            quick=parsed.quick,
+            only=parsed.only,
+            min_time=parsed.min_time,
+            progress=lambda name: print(f"running {name}", file=sys.stderr),
+        )
+        text = json.dumps(report, indent=2) + "\n"
+        if parsed.output is None:
+            sys.stdout.write(text)
+        else:
+            parsed.output.parent.mkdir(parents=True, exist_ok=True)
+            parsed.output.write_text(text, encoding="utf-8")
+            print(f"wrote {len(report['results'])} results to {parsed.output}", file=sys.stderr)
+        return 0
+
+    try:
+        baseline = load_report(parsed.baseline)
+        current = load_report(parsed.current)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    comparison = compare_reports(
+        baseline,
+        current,
+        threshold=parsed.threshold,
+        memory_threshold=parsed.memory_threshold,
+    )
+    print(format_comparison(comparison, show_all=parsed.all))
+    return 1 if comparison["regressions"] else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Compare two benchmark reports and flag regressions.
+
+Scenarios are matched by ``name``. A scenario regresses when its throughput
+drops, or its ``p50``/``p99`` latency or peak memory grows, by more than the
+threshold fraction relative to the baseline. Scenarios present in only one
+report are listed but never fail the comparison.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from benchmarks.suite import RESULTS_SCHEMA_VERSION
+
+# (label, path into the result, True when larger is better)
+METRICS: tuple[tuple[str, tuple[str, ...], bool], ...] = (
+    ("names_per_sec", ("names_per_sec",), True),
+    ("latency_p50", ("latency_ns", "p50"), False),
+    ("latency_p99", ("latency_ns", "p99"), False),
+    ("peak_bytes", ("peak_bytes",), False),
+)
+
+
+@dataclass(frozen=True)
+class MetricChange:
+    """Relative change of one metric for one scenario.
+
+    Attributes:
+        scenario: Scenario name.
+        metric: Metric label from :data:`METRICS`.
+        baseline: Baseline value.
+        current: Current value.
+        change: Signed fraction where positive always means *worse*.
+    """
+
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+def load_report(path: str | os.PathLike[str]) -> dict[str, Any]:
+    """Read a report written by ``python -m benchmarks run``.
+
+    Raises:
+        ValueError: If the file is not a report of a supported schema version
+    """
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(payload, dict) or not isinstance(payload.get("results"), list):
+        raise ValueError(f"{path} is not a benchmark report")
+    if payload.get("schema_version") != RESULTS_SCHEMA_VERSION:
+        raise ValueError(
+            f"{path} has schema_version {payload.get('schema_version')!r}; "
+            f"expected {RESULTS_SCHEMA_VERSION}"
+        )
+    return payload
+
+
+def _metric_value(result: dict[str, Any], path: tuple[str, ...]) -> float | None:
+    value: Any = result
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float = 0.15,
+    memory_threshold: float | None = None,
+) -> dict[str, Any]:
+    """Compare ``current`` against ``baseline``.
+
+    Args:
+        baseline: Stored reference report.
+        current: Freshly measured report.
+        threshold: Allowed relative slowdown for throughput and latency.
+        memory_threshold: Allowed relative growth of ``peak_bytes``
+            (defaults to ``threshold``).
+
+    Returns:
+        Mapping with ``changes`` (every :class:`MetricChange`),
+        ``regressions`` (the subset beyond its threshold), and the scenario
+        names ``missing`` from ``current`` or ``added`` to it.
+    """
+    memory_limit = threshold if memory_threshold is None else memory_threshold
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    current_results = {result["name"]: result for result in current["results"]}
+
+    changes: list[MetricChange] = []
+    regressions: list[MetricChange] = []
+    for name, before in baseline_results.items():
+        after = current_results.get(name)
+        if after is None:
+            continue
+        for label, path, higher_is_better in METRICS:
+            old = _metric_value(before, path)
+            new = _metric_value(after, path)
+            if old is None or new is None or old <= 0:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            entry = MetricChange(name, label, old, new, change)
+            changes.append(entry)
+            limit = memory_limit if label == "peak_bytes" else threshold
+            if change > limit:
+                regressions.append(entry)
+
+    return {
+        "changes": changes,
+        "regressions": regressions,
+        "missing": sorted(set(baseline_results) - set(current_results)),
+        "added": sorted(set(current_results) - set(baseline_results)),
+    }
+
+
+def format_comparison(comparison: dict[str, Any], *, show_all: bool = False) -> str:
+    """Render a comparison as plain text (regressions only unless ``show_all``).
+
+    Percentages are signed so that positive always means worse.
+    """
+    lines: list[str] = []
+    shown = comparison["changes"] if show_all else comparison["regressions"]
+    flagged = set(map(id, comparison["regressions"]))
+    for entry in shown:
+        marker = "REGRESSION" if id(entry) in flagged else "ok"
+        lines.append(
+            f"{marker:<10} {entry.scenario:<44} {entry.metric:<13} "
+            f"{entry.baseline:>14.1f} -> {entry.current:>14.1f} ({entry.change:+.1%})"
+        )
+    for name in comparison["missing"]:
+        lines.append(f"missing    {name}")
+    for name in comparison["added"]:
+        lines.append(f"added      {name}")
+    count = len(comparison["regressions"])
+    lines.append(f"{count} regression(s) across {len(comparison['changes'])} metric(s)")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "METRICS",
+    "MetricChange",
+    "compare_reports",
+    "format_comparison",
+    "load_report",
+]
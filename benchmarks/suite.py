@@ -0,0 +1,201 @@
+"""Benchmark scenarios for the runtime generator and renderer.
+
+Each scenario times one operation and reports:
+
+- ``names_per_sec``: throughput over all timed repetitions.
+- ``latency_ns``: per-call ``p50``/``p90``/``p99``/``max`` (per name for
+  ``generate``; per batch call otherwise).
+- ``peak_bytes``: peak traced allocation for one call, measured in a separate
+  ``tracemalloc`` run so tracing overhead never skews timings.
+
+Everything runs in-process with the standard library and no network access.
+"""
+
+from __future__ import annotations
+
+import gc
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator
+
+from pipeworks_name_generation import NameGenerator, render_names
+
+RESULTS_SCHEMA_VERSION = 1
+
+BATCH_SIZES = (100, 1_000, 10_000)
+QUICK_BATCH_SIZES = (100, 1_000)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One benchmark case.
+
+    Attributes:
+        name: Stable identifier used to match results against a baseline.
+        params: Parameters reported alongside the results.
+        names_per_call: Names produced by one call of ``run``.
+        run: Zero-argument callable; each call is one timed sample.
+    """
+
+    name: str
+    params: dict[str, Any]
+    names_per_call: int
+    run: Callable[[], Any] = field(compare=False, repr=False)
+
+
+def _percentile(sorted_samples: list[int], fraction: float) -> int:
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def _peak_bytes(run: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(scenario: Scenario, *, min_time: float = 0.2, min_repeats: int = 5) -> dict[str, Any]:
+    """Time ``scenario.run`` until both ``min_time`` and ``min_repeats`` are met."""
+    scenario.run()  # warm caches and lazy imports
+    samples: list[int] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter_ns()
+        deadline = started + int(min_time * 1e9)
+        while len(samples) < min_repeats or time.perf_counter_ns() < deadline:
+            call_started = time.perf_counter_ns()
+            scenario.run()
+            samples.append(time.perf_counter_ns() - call_started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    total_ns = sum(samples)
+    ordered = sorted(samples)
+    return {
+        "name": scenario.name,
+        "params": scenario.params,
+        "repeats": len(samples),
+        "names_per_sec": round(scenario.names_per_call * len(samples) / (total_ns / 1e9), 1),
+        "latency_ns": {
+            "p50": _percentile(ordered, 0.50),
+            "p90": _percentile(ordered, 0.90),
+            "p99": _percentile(ordered, 0.99),
+            "max": ordered[-1],
+        },
+        "peak_bytes": _peak_bytes(scenario.run),
+    }
+
+
+def build_scenarios(*, quick: bool = False) -> list[Scenario]:
+    """Return the benchmark scenarios (a smaller set when ``quick``)."""
+    batch_sizes = QUICK_BATCH_SIZES if quick else BATCH_SIZES
+    scenarios: list[Scenario] = []
+
+    for rng_mode in ("mersenne", "counter"):
+        generator = NameGenerator(pattern="simple", rng_mode=rng_mode)
+        seed_counter = iter(range(1 << 62))
+
+        def generate_one(
+            gen: NameGenerator = generator, seeds: Iterator[int] = seed_counter
+        ) -> str:
+            return gen.generate(seed=next(seeds))
+
+        scenarios.append(
+            Scenario(
+                name=f"generate/{rng_mode}",
+                params={"rng_mode": rng_mode},
+                names_per_call=1,
+                run=generate_one,
+            )
+        )
+
+    generator = NameGenerator(pattern="simple")
+    capacity = generator.unique_capacity()
+    for size in batch_sizes:
+        for strategy, unique in (("seeded", False), ("seeded", True), ("permutation", True)):
+            # The seeded strategy gives up near the combinatorial limit.
+            if strategy == "seeded" and unique and size > capacity // 4:
+                continue
+
+            def generate_batch(
+                size: int = size, strategy: str = strategy, unique: bool = unique
+            ) -> list[str]:
+                return generator.generate_batch(
+                    count=size, base_seed=1, unique=unique, strategy=strategy
+                )
+
+            scenarios.append(
+                Scenario(
+                    name=f"generate_batch/{strategy}/unique={unique}/{size}",
+                    params={"count": size, "strategy": strategy, "unique": unique},
+                    names_per_call=size,
+                    run=generate_batch,
+                )
+            )
+
+    names = generator.generate_batch(count=max(batch_sizes), base_seed=7, unique=False)
+    for size in batch_sizes:
+        for style in ("title", "upper"):
+
+            def render(batch: list[str] = names[:size], style: str = style) -> list[str]:
+                return render_names(batch, style)
+
+            scenarios.append(
+                Scenario(
+                    name=f"render_names/{style}/{size}",
+                    params={"count": size, "style": style},
+                    names_per_call=size,
+                    run=render,
+                )
+            )
+    return scenarios
+
+
+def run_suite(
+    *,
+    quick: bool = False,
+    only: str | None = None,
+    min_time: float = 0.2,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Run every scenario (optionally filtered by name substring) into a report."""
+    results = []
+    for scenario in build_scenarios(quick=quick):
+        if only and only not in scenario.name:
+            continue
+        if progress is not None:
+            progress(scenario.name)
+        results.append(measure(scenario, min_time=min_time))
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "settings": {"quick": quick, "only": only, "min_time": min_time},
+        "results": results,
+    }
+
+
+__all__ = [
+    "RESULTS_SCHEMA_VERSION",
+    "Scenario",
+    "build_scenarios",
+    "measure",
+    "run_suite",
+]
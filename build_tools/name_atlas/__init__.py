@@ -0,0 +1,33 @@
+"""
+Name Atlas - Precomputed seed-to-name lookup files
+
+Precomputes ``NameGenerator.generate(seed)`` for a contiguous seed range into
+a memory-mapped atlas file (header, offsets array, UTF-8 blob). Game clients
+open the atlas with :class:`pipeworks_name_generation.atlas.NameAtlas` and
+resolve names in O(1) without running the generator.
+This is a **build-time tool only** - the reader lives in the runtime package.
+
+Features:
+- Streams names to disk in batches (memory bounded by the offsets table)
+- Any generator pattern: ``simple``, annotated JSON, corpus.db, package zip
+- CRC32 checksum validated on open
+- Post-build consistency check against ``NameGenerator.generate``
+
+Usage:
+    >>> from build_tools.name_atlas import build_atlas
+    >>> summary = build_atlas(Path("names.atlas"), count=1_000_000, rng_mode="counter")
+
+CLI::
+
+    python -m build_tools.name_atlas \\
+        --output names.atlas \\
+        --start-seed 0 \\
+        --count 1000000 \\
+        --rng-mode counter
+"""
+
+from build_tools.name_atlas.cli import build_atlas
+
+__all__ = [
+    "build_atlas",
+]
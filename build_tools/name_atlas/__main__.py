@@ -0,0 +1,8 @@
+"""Entry point for python -m build_tools.name_atlas."""
+
+import sys
+
+from build_tools.name_atlas.cli import main
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
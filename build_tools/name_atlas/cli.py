@@ -0,0 +1,225 @@
+"""
+Command-line interface for building name atlas files.
+
+Usage
+-----
+Build an atlas for one million entity IDs::
+
+    python -m build_tools.name_atlas \\
+        --output names.atlas \\
+        --start-seed 0 \\
+        --count 1000000 \\
+        --rng-mode counter
+
+Build from a corpus instead of the built-in syllables::
+
+    python -m build_tools.name_atlas \\
+        --output names.atlas \\
+        --pattern _working/output/20260110_115453_pyphen/data/corpus.db \\
+        --count 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any
+
+from pipeworks_name_generation import RNG_MODES, NameGenerator
+from pipeworks_name_generation.atlas import AtlasError, NameAtlas, write_atlas
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create and return the argument parser for the atlas builder.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Configured ArgumentParser ready to parse command-line arguments.
+
+    Notes
+    -----
+    This function follows the project's CLI documentation standards,
+    enabling sphinx-argparse to auto-generate documentation.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Precompute NameGenerator names for a contiguous seed range into a "
+            "memory-mapped atlas file for O(1) client-side lookups."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples::
+
+    # One million names from the built-in syllables (counter RNG)
+    python -m build_tools.name_atlas --output names.atlas --count 1000000 --rng-mode counter
+
+    # Names from a corpus database, checking every seed afterwards
+    python -m build_tools.name_atlas --output names.atlas \\
+        --pattern _working/output/20260110_115453_pyphen/data/corpus.db \\
+        --count 50000 --verify-seeds 0
+
+Output:
+    Writes the atlas file and prints its size, checksum, and verification result.
+        """,
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        required=True,
+        help="Destination atlas file.",
+    )
+    parser.add_argument(
+        "--pattern",
+        type=str,
+        default="simple",
+        help=(
+            "Generator pattern: 'simple' or a path to an annotated JSON, corpus.db, "
+            "or package zip. Default: simple."
+        ),
+    )
+    parser.add_argument(
+        "--rng-mode",
+        choices=list(RNG_MODES),
+        default="mersenne",
+        help="NameGenerator rng_mode. Default: mersenne.",
+    )
+    parser.add_argument(
+        "--start-seed",
+        type=int,
+        default=0,
+        help="First seed (entity ID) in the atlas. Default: 0.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        required=True,
+        help="Number of consecutive seeds to precompute.",
+    )
+    parser.add_argument(
+        "--syllables",
+        type=int,
+        default=None,
+        help="Fixed syllable count per name. Default: the pattern's range.",
+    )
+    parser.add_argument(
+        "--verify-seeds",
+        type=int,
+        default=10000,
+        help=(
+            "Seeds (evenly spaced) to regenerate and compare after building. "
+            "0 checks every seed. Default: 10000."
+        ),
+    )
+    return parser
+
+
+def parse_arguments(args: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Parameters
+    ----------
+    args : list[str] | None, optional
+        Arguments to parse. If None, uses sys.argv.
+
+    Returns
+    -------
+    argparse.Namespace
+        Parsed arguments.
+    """
+    parser = create_argument_parser()
+    return parser.parse_args(args)
+
+
+def build_atlas(
+    output: Path,
+    *,
+    count: int,
+    start_seed: int = 0,
+    pattern: str = "simple",
+    rng_mode: str = "mersenne",
+    syllables: int | None = None,
+    verify_seeds: int = 10000,
+) -> dict[str, Any]:
+    """
+    Write an atlas, reopen it, and check it against the generator.
+
+    Parameters
+    ----------
+    output : Path
+        Destination atlas file.
+    count : int
+        Number of consecutive seeds.
+    start_seed : int, optional
+        First seed in the atlas.
+    pattern : str, optional
+        ``NameGenerator`` pattern (``"simple"`` or a pattern source path).
+    rng_mode : str, optional
+        ``NameGenerator`` RNG mode.
+    syllables : int | None, optional
+        Fixed syllable count per name.
+    verify_seeds : int, optional
+        Evenly spaced seeds to regenerate and compare; ``0`` checks all.
+
+    Returns
+    -------
+    dict[str, Any]
+        Summary from ``write_atlas`` plus ``verified_seeds``.
+
+    Raises
+    ------
+    AtlasError
+        If the written atlas fails checksum or consistency checks.
+    """
+    generator = NameGenerator(pattern, rng_mode=rng_mode)
+    summary = write_atlas(
+        output, generator, start_seed=start_seed, count=count, syllables=syllables
+    )
+    step = 1 if verify_seeds <= 0 else max(1, count // verify_seeds)
+    seeds = range(start_seed, start_seed + count, step)
+    with NameAtlas(output) as atlas:
+        atlas.verify_against(generator, seeds=seeds)
+    return {**summary, "verified_seeds": len(seeds)}
+
+
+def main(args: list[str] | None = None) -> int:
+    """
+    Main entry point for the atlas builder CLI.
+
+    Parameters
+    ----------
+    args : list[str] | None, optional
+        Command-line arguments. If None, uses sys.argv.
+
+    Returns
+    -------
+    int
+        Exit code (0 for success, non-zero for error).
+    """
+    parsed = parse_arguments(args)
+    if parsed.count < 1:
+        print("Error: --count must be >= 1", file=sys.stderr)
+        return 1
+
+    try:
+        summary = build_atlas(
+            parsed.output,
+            count=parsed.count,
+            start_seed=parsed.start_seed,
+            pattern=parsed.pattern,
+            rng_mode=parsed.rng_mode,
+            syllables=parsed.syllables,
+            verify_seeds=parsed.verify_seeds,
+        )
+    except (AtlasError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {summary['count']:,} names to {summary['path']}")
+    print(f"File size: {summary['file_size']:,} bytes (blob {summary['blob_size']:,} bytes)")
+    print(f"Checksum: {summary['checksum']:08x}")
+    print(f"Verified {summary['verified_seeds']:,} seeds against NameGenerator.generate")
+    return 0
@@ -3,7 +3,13 @@
 This is the proof of concept version with minimal functionality.
 """
 
-from pipeworks_name_generation.generator import NameGenerator
+from pipeworks_name_generation.generator import (
+    BATCH_STRATEGIES,
+    COUNTER_RNG_VERSION,
+    RNG_MODES,
+    NameGenerator,
+)
+from pipeworks_name_generation.patterns import PatternSet, load_pattern_set
 from pipeworks_name_generation.renderer import (
     RENDER_STYLES,
     normalize_render_style,
@@ -13,6 +19,11 @@ from pipeworks_name_generation.renderer import (
 
 __all__ = [
     "NameGenerator",
+    "RNG_MODES",
+    "COUNTER_RNG_VERSION",
+    "BATCH_STRATEGIES",
+    "PatternSet",
+    "load_pattern_set",
     "RENDER_STYLES",
     "normalize_render_style",
     "render_name",
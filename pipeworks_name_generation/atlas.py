@@ -0,0 +1,304 @@
+"""Precomputed name atlases: memory-mapped ``seed -> name`` lookup files.
+
+An atlas stores ``NameGenerator.generate(seed)`` for a contiguous seed range
+so clients resolve names without running the generator or holding Python
+lists. The file layout (version 1, all integers little-endian) is:
+
+- Header (64 bytes): magic ``b"PWATLAS\\0"``, format version (u16), reserved
+  (u16), CRC32 of everything after the header (u32), first seed (i64), name
+  count (u64), metadata size (u64), blob size (u64), then zero padding.
+- Metadata: UTF-8 JSON describing the generator (pattern, RNG mode, fixed
+  syllable count, and ``NameGenerator.fingerprint``).
+- Offsets: ``count + 1`` u64 byte offsets into the blob; name ``i`` is
+  ``blob[offsets[i]:offsets[i + 1]]``.
+- Blob: the concatenated UTF-8 names.
+
+:class:`NameAtlas` memory-maps the file, so lookups are O(1), pages are
+loaded lazily and shared between processes, and :meth:`NameAtlas.raw_name_for`
+returns a zero-copy ``memoryview``.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable
+
+from pipeworks_name_generation.generator import NameGenerator
+
+ATLAS_MAGIC = b"PWATLAS\0"
+ATLAS_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIqQQQ")
+_HEADER_SIZE = 64
+_OFFSET = struct.Struct("<Q")
+_OFFSET_PAIR = struct.Struct("<QQ")
+_WRITE_BATCH = 4096
+_CHECKSUM_CHUNK = 1 << 20
+
+
+class AtlasError(ValueError):
+    """Raised for malformed, corrupted, or inconsistent atlas files."""
+
+
+def _crc32_file(handle: BinaryIO, start: int, length: int) -> int:
+    handle.seek(start)
+    checksum = 0
+    remaining = length
+    while remaining > 0:
+        chunk = handle.read(min(_CHECKSUM_CHUNK, remaining))
+        if not chunk:
+            raise AtlasError("Atlas file is truncated")
+        checksum = zlib.crc32(chunk, checksum)
+        remaining -= len(chunk)
+    return checksum
+
+
+def write_atlas(
+    path: str | os.PathLike[str],
+    generator: NameGenerator,
+    *,
+    start_seed: int,
+    count: int,
+    syllables: int | None = None,
+) -> dict[str, Any]:
+    """Generate names for ``start_seed .. start_seed + count - 1`` into an atlas.
+
+    Names are streamed to disk in batches, so memory use stays bounded by
+    the offsets table (8 bytes per name) regardless of ``count``. The file is
+    written to a temporary path and renamed into place when complete.
+
+    Args:
+        path: Destination atlas file.
+        generator: Generator whose ``generate()`` output is recorded.
+        start_seed: First seed in the atlas.
+        count: Number of consecutive seeds.
+        syllables: Optional fixed syllable count passed to ``generate()``.
+
+    Returns:
+        Summary with ``path``, ``count``, ``blob_size``, ``checksum``, and
+        ``file_size``.
+
+    Raises:
+        ValueError: If ``count`` is not positive
+    """
+    if count < 1:
+        raise ValueError("count must be >= 1")
+
+    target = Path(path)
+    metadata = json.dumps(
+        {
+            "pattern": generator.pattern,
+            "rng_mode": generator.rng_mode,
+            "syllables": syllables,
+            "fingerprint": generator.fingerprint,
+        },
+        sort_keys=True,
+    ).encode("utf-8")
+    offsets_start = _HEADER_SIZE + len(metadata)
+    blob_start = offsets_start + (count + 1) * _OFFSET.size
+
+    temp_path = target.with_name(target.name + ".tmp")
+    with open(temp_path, "w+b") as handle:
+        handle.write(b"\0" * _HEADER_SIZE)
+        handle.write(metadata)
+
+        offsets = array("Q", [0])
+        handle.seek(blob_start)
+        position = 0
+        for batch_start in range(0, count, _WRITE_BATCH):
+            encoded = [
+                generator.generate(seed=start_seed + index, syllables=syllables).encode("utf-8")
+                for index in range(batch_start, min(batch_start + _WRITE_BATCH, count))
+            ]
+            for name in encoded:
+                position += len(name)
+                offsets.append(position)
+            handle.write(b"".join(encoded))
+        blob_size = position
+
+        handle.seek(offsets_start)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        handle.write(offsets.tobytes())
+        handle.flush()
+        checksum = _crc32_file(handle, _HEADER_SIZE, blob_start + blob_size - _HEADER_SIZE)
+
+        handle.seek(0)
+        header = _HEADER.pack(
+            ATLAS_MAGIC,
+            ATLAS_FORMAT_VERSION,
+            0,
+            checksum,
+            start_seed,
+            count,
+            len(metadata),
+            blob_size,
+        )
+        handle.write(header.ljust(_HEADER_SIZE, b"\0"))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temp_path, target)
+    return {
+        "path": str(target),
+        "count": count,
+        "blob_size": blob_size,
+        "checksum": checksum,
+        "file_size": blob_start + blob_size,
+    }
+
+
+class NameAtlas:
+    """Read-only, memory-mapped view of an atlas file.
+
+    Args:
+        path: Atlas file written by :func:`write_atlas`.
+        verify_checksum: When ``True`` (default), the CRC32 of the whole
+            file is checked on open (a sequential read of the mapping).
+
+    Raises:
+        AtlasError: If the file is malformed or the checksum does not match
+    """
+
+    # Header fields, set by ``_load_header``.
+    checksum: int
+    start_seed: int
+    count: int
+    blob_size: int
+
+    def __init__(self, path: str | os.PathLike[str], *, verify_checksum: bool = True) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < _HEADER_SIZE:
+                raise AtlasError(f"{self.path.name} is too small to be an atlas")
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load_header(size)
+            if verify_checksum:
+                self.verify_checksum()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _load_header(self, size: int) -> None:
+        (
+            magic,
+            version,
+            _reserved,
+            self.checksum,
+            self.start_seed,
+            self.count,
+            metadata_size,
+            blob_size,
+        ) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != ATLAS_MAGIC:
+            raise AtlasError(f"{self.path.name} is not a name atlas")
+        if version != ATLAS_FORMAT_VERSION:
+            raise AtlasError(f"Unsupported atlas format version: {version}")
+
+        self._offsets_start = _HEADER_SIZE + metadata_size
+        self._blob_start = self._offsets_start + (self.count + 1) * _OFFSET.size
+        if self._blob_start + blob_size != size:
+            raise AtlasError(f"{self.path.name} size does not match its header")
+        self.blob_size = blob_size
+        raw_metadata = self._mmap[_HEADER_SIZE : self._offsets_start]
+        self.metadata: dict[str, Any] = json.loads(raw_metadata.decode("utf-8"))
+
+    def verify_checksum(self) -> None:
+        """Recompute the file CRC32 and compare it with the header.
+
+        Raises:
+            AtlasError: If the stored checksum does not match
+        """
+        view = memoryview(self._mmap)
+        try:
+            checksum = 0
+            end = len(view)
+            for start in range(_HEADER_SIZE, end, _CHECKSUM_CHUNK):
+                checksum = zlib.crc32(view[start : min(start + _CHECKSUM_CHUNK, end)], checksum)
+        finally:
+            view.release()
+        if checksum != self.checksum:
+            raise AtlasError(f"{self.path.name} checksum mismatch (file is corrupted)")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, seed: object) -> bool:
+        return isinstance(seed, int) and 0 <= seed - self.start_seed < self.count
+
+    def _span(self, seed: int) -> tuple[int, int]:
+        index = seed - self.start_seed
+        if not 0 <= index < self.count:
+            raise KeyError(seed)
+        start, end = _OFFSET_PAIR.unpack_from(self._mmap, self._offsets_start + index * 8)
+        return self._blob_start + start, self._blob_start + end
+
+    def raw_name_for(self, seed: int) -> memoryview:
+        """Return the UTF-8 bytes of a seed's name as a zero-copy view.
+
+        Raises:
+            KeyError: If ``seed`` is outside the atlas range
+        """
+        start, end = self._span(seed)
+        return memoryview(self._mmap)[start:end]
+
+    def name_for(self, seed: int) -> str:
+        """Return the name for ``seed`` in O(1).
+
+        Raises:
+            KeyError: If ``seed`` is outside the atlas range
+        """
+        start, end = self._span(seed)
+        return str(self._mmap[start:end], "utf-8")
+
+    def verify_against(
+        self, generator: NameGenerator, *, seeds: Iterable[int] | None = None
+    ) -> None:
+        """Check that the atlas matches ``generator.generate`` output.
+
+        The generator fingerprint is compared first; then every seed in
+        ``seeds`` (default: the whole atlas) is regenerated and compared.
+
+        Raises:
+            AtlasError: On a fingerprint or name mismatch
+        """
+        if self.metadata.get("fingerprint") != generator.fingerprint:
+            raise AtlasError(
+                f"Atlas was built from a different generator ({self.metadata.get('pattern')!r}, "
+                f"rng_mode={self.metadata.get('rng_mode')!r})"
+            )
+        syllables = self.metadata.get("syllables")
+        checked = range(self.start_seed, self.start_seed + self.count) if seeds is None else seeds
+        for seed in checked:
+            expected = generator.generate(seed=seed, syllables=syllables)
+            if self.name_for(seed) != expected:
+                raise AtlasError(
+                    f"Atlas name for seed {seed} is {self.name_for(seed)!r}, "
+                    f"generator returns {expected!r}"
+                )
+
+    def close(self) -> None:
+        """Unmap the file. Views from :meth:`raw_name_for` must be released first."""
+        self._mmap.close()
+
+    def __enter__(self) -> NameAtlas:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "ATLAS_FORMAT_VERSION",
+    "AtlasError",
+    "NameAtlas",
+    "write_atlas",
+]
@@ -2,33 +2,116 @@
 
 This is the SIMPLEST possible implementation that passes tests.
 Features to add later:
-- Pattern loading from YAML files
 - Phonotactic constraints
-- Custom pattern sets
-- Performance optimization
 
-For now: Hardcoded syllables, basic logic.
+Syllables come from the hardcoded ``simple`` set or from a pattern set loaded
+from pipeline output (see :mod:`pipeworks_name_generation.patterns`).
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
 import random
+import struct
+from typing import Callable
+
+from pipeworks_name_generation.patterns import AliasSampler, PatternSet, load_pattern_set
+
+#: Supported ``rng_mode`` values for :class:`NameGenerator`.
+#: ``"mersenne"`` is the original mode; ``"counter"`` is the SplitMix64 fast path.
+RNG_MODES = ("mersenne", "counter")
+
+#: Supported ``strategy`` values for :meth:`NameGenerator.generate_batch`.
+BATCH_STRATEGIES = ("seeded", "permutation")
+
+#: Version of the ``rng_mode="counter"`` determinism contract. Bump it (and keep
+#: the old derivation available) if the seed -> name mapping ever changes.
+COUNTER_RNG_VERSION = 1
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_INV_2_53 = 1.0 / (1 << 53)
+_WEIGHTED_ATTEMPTS_PER_SYLLABLE = 32
+_SPLITMIX64_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _splitmix64(seed: int, counter: int) -> int:
+    """Return the ``counter``-th SplitMix64 output for ``seed``.
+
+    Stateless: output ``n`` is computed directly from ``(seed, n)`` with
+    64-bit integer arithmetic only, so it is identical on every platform and
+    Python version.
+    """
+    z = (seed + (counter + 1) * _SPLITMIX64_GAMMA) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _bounded(draw: int, bound: int) -> int:
+    """Map a 64-bit draw onto ``range(bound)`` by multiply-shift."""
+    return (draw * bound) >> 64
+
+
+def _permutation_count(size: int, length: int) -> int:
+    """Return the number of ordered picks of ``length`` from ``size`` items."""
+    total = 1
+    for offset in range(length):
+        total *= size - offset
+    return total
+
+
+class _FeistelPermutation:
+    """Keyed bijection on ``range(domain)`` (format-preserving Feistel).
+
+    A balanced four-round Feistel network permutes ``range(4**half_bits)``;
+    cycle walking (re-applying it until the value falls inside the domain)
+    restricts that to ``range(domain)``. Round keys come from SplitMix64, so
+    the permutation is identical on every platform.
+    """
+
+    _ROUNDS = 4
+
+    def __init__(self, domain: int, key: int) -> None:
+        self.domain = domain
+        self._half_bits = max(1, ((domain - 1).bit_length() + 1) // 2)
+        self._half_mask = (1 << self._half_bits) - 1
+        self._round_keys = [_splitmix64(key & _MASK64, round_) for round_ in range(self._ROUNDS)]
+
+    def _encrypt(self, value: int) -> int:
+        left = value >> self._half_bits
+        right = value & self._half_mask
+        for round_key in self._round_keys:
+            left, right = right, left ^ (_splitmix64(round_key, right) & self._half_mask)
+        return (left << self._half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        value = self._encrypt(index)
+        while value >= self.domain:
+            value = self._encrypt(value)
+        return value
 
 
 class NameGenerator:
     """Generate phonetically-plausible names deterministically.
 
-    This is a minimal proof-of-concept implementation with hardcoded
-    syllables. Pattern loading and advanced features will be added later.
+    Syllables come from the hardcoded ``simple`` set or from a
+    :class:`~pipeworks_name_generation.patterns.PatternSet` loaded from an
+    annotated JSON, a ``corpus.db``, or a webapp package zip. Weighted
+    pattern sets draw syllables by corpus frequency.
 
     The key requirement is DETERMINISM: same seed = same name, always.
     This is critical for games where entity IDs must map to consistent names.
 
     Args:
-        pattern: Pattern set name (currently only "simple" is supported)
+        pattern: ``"simple"``, a ``PatternSet``, or a path to a pattern source
+        rng_mode: ``"mersenne"`` (default) seeds a ``random.Random`` per call.
+            ``"counter"`` uses a stateless SplitMix64 counter generator that
+            is several times faster per call. The two modes produce different
+            names for the same seed; see ``COUNTER_RNG_VERSION``.
 
     Raises:
-        ValueError: If pattern is not recognized
+        ValueError: If pattern or rng_mode is not recognized
 
     Example:
         >>> gen = NameGenerator(pattern="simple")
@@ -38,7 +121,6 @@ class NameGenerator:
 
     # Hardcoded syllables for proof of concept
     # These are phonetically plausible combinations
-    # TODO: Load from pattern files in next phase
     _SIMPLE_SYLLABLES = [
         # Soft/flowing syllables
         "ka",
@@ -74,24 +156,49 @@ class NameGenerator:
         "zar",
     ]
 
-    def __init__(self, pattern: str) -> None:
+    def __init__(
+        self,
+        pattern: str | os.PathLike[str] | PatternSet,
+        rng_mode: str = "mersenne",
+    ) -> None:
         """Initialize generator with a pattern set.
 
         Args:
-            pattern: Pattern set name (only "simple" supported in POC)
+            pattern: ``"simple"``, a loaded ``PatternSet``, or a path to an
+                annotated JSON, ``corpus.db``, or package zip (loaded with
+                frequency weighting and cached per process)
+            rng_mode: Random source, one of ``RNG_MODES``
 
         Raises:
-            ValueError: If pattern is not recognized
+            ValueError: If pattern or rng_mode is not recognized
         """
-        # Validate pattern
-        if pattern != "simple":
+        if rng_mode not in RNG_MODES:
+            raise ValueError(
+                f"Unknown rng_mode: '{rng_mode}'. Expected one of: {', '.join(RNG_MODES)}."
+            )
+
+        pattern_set: PatternSet | None = None
+        if isinstance(pattern, PatternSet):
+            pattern_set = pattern
+        elif isinstance(pattern, os.PathLike) or (pattern != "simple" and os.path.isfile(pattern)):
+            pattern_set = load_pattern_set(pattern)
+        elif pattern != "simple":
             raise ValueError(
                 f"Unknown pattern: '{pattern}'. "
-                f"Only 'simple' is currently supported in proof of concept."
+                f"Use 'simple', a PatternSet, or a path to a pattern source file."
             )
 
-        self.pattern = pattern
-        self._syllables = self._SIMPLE_SYLLABLES.copy()
+        self.rng_mode = rng_mode
+        self._sampler: AliasSampler | None = None
+        self._syllable_range = (2, 3)
+        if pattern_set is None:
+            self.pattern = "simple"
+            self._syllables = self._SIMPLE_SYLLABLES.copy()
+        else:
+            self.pattern = pattern_set.name
+            self._syllables = list(pattern_set.syllables)
+            self._sampler = pattern_set.sampler
+            self._syllable_range = pattern_set.syllable_range
 
     def generate(self, seed: int, syllables: int | None = None) -> str:
         """Generate a single name deterministically.
@@ -120,6 +227,9 @@ class NameGenerator:
             >>> gen.generate(seed=2)  # Different seed
             'Soravyn'  # Different name
         """
+        if self.rng_mode == "counter":
+            return self._generate_counter(seed, syllables)
+
         # Create deterministic random generator
         # CRITICAL: Use Random(seed), not random.seed()
         # Random(seed) creates isolated RNG, avoiding global state
@@ -129,7 +239,7 @@ class NameGenerator:
 
         # Decide syllable count if not specified
         if syllables is None:
-            syllables = rng.randint(2, 3)
+            syllables = rng.randint(*self._syllable_range)
 
         # Validate syllable count
         if syllables < 1:
@@ -142,33 +252,211 @@ class NameGenerator:
 
         # Select syllables without replacement
         # This prevents "kakaka" type repetition
-        chosen = rng.sample(self._syllables, k=syllables)
+        if self._sampler is not None:
+            sampler = self._sampler
+            size = len(sampler)
+            chosen = self._pick_weighted(
+                syllables, lambda: sampler.pick(rng.randrange(size), rng.random())
+            )
+        else:
+            chosen = rng.sample(self._syllables, k=syllables)
 
         # Combine syllables and capitalize first letter only
         name = "".join(chosen).capitalize()
 
         return name
 
+    def _generate_counter(self, seed: int, syllables: int | None) -> str:
+        """Generate a name with the stateless counter RNG (contract v1).
+
+        Contract v1, with ``draw(n) = splitmix64(seed mod 2**64, n)``:
+
+        - Without ``syllables``, the count is ``2 + bounded(draw(0), 2)``.
+        - Syllables are picked by a partial Fisher-Yates shuffle of the
+          syllable indices: step ``i`` swaps ``i`` with
+          ``i + bounded(draw(i + 1), n - i)``.
+        - ``bounded(x, n)`` is ``(x * n) >> 64``.
+
+        Pattern sets with a syllable range other than 2-3 use
+        ``low + bounded(draw(0), high - low + 1)``. Weighted pattern sets
+        replace the shuffle with alias draws: attempt ``t`` uses column
+        ``bounded(draw(2t + 1), n)`` and coin ``(draw(2t + 2) >> 11) / 2**53``,
+        and repeats of an already chosen syllable are skipped.
+        """
+        seed &= _MASK64
+        if syllables is None:
+            low, high = self._syllable_range
+            syllables = low + _bounded(_splitmix64(seed, 0), high - low + 1)
+
+        pool = self._syllables
+        size = len(pool)
+        if syllables < 1:
+            raise ValueError("Syllable count must be at least 1")
+        if syllables > size:
+            raise ValueError(
+                f"Cannot generate {syllables} syllables with only " f"{size} available syllables"
+            )
+
+        if self._sampler is not None:
+            sampler = self._sampler
+            attempt = iter(range(1, 1 << 62, 2))
+
+            def next_pick() -> int:
+                counter = next(attempt)
+                column = _bounded(_splitmix64(seed, counter), size)
+                coin = (_splitmix64(seed, counter + 1) >> 11) * _INV_2_53
+                return sampler.pick(column, coin)
+
+            return "".join(self._pick_weighted(syllables, next_pick)).capitalize()
+
+        # Sparse Fisher-Yates: only swapped positions are stored.
+        swapped: dict[int, int] = {}
+        chosen: list[str] = []
+        for i in range(syllables):
+            j = i + _bounded(_splitmix64(seed, i + 1), size - i)
+            chosen.append(pool[swapped.get(j, j)])
+            swapped[j] = swapped.get(i, i)
+        return "".join(chosen).capitalize()
+
+    def _pick_weighted(self, count: int, next_pick: Callable[[], int]) -> list[str]:
+        """Draw ``count`` distinct syllables from weighted picks.
+
+        Repeated picks are rejected. If a very skewed distribution keeps
+        repeating, the remaining slots take the first unused syllables in
+        table order, so the result is still deterministic.
+        """
+        picked: list[int] = []
+        for _ in range(count * _WEIGHTED_ATTEMPTS_PER_SYLLABLE):
+            if len(picked) == count:
+                break
+            index = next_pick()
+            if index not in picked:
+                picked.append(index)
+        for index in range(len(self._syllables)):
+            if len(picked) == count:
+                break
+            if index not in picked:
+                picked.append(index)
+        return [self._syllables[index] for index in picked]
+
+    def unique_capacity(self, syllables: int | None = None) -> int:
+        """Return how many distinct syllable sequences can be generated.
+
+        This is the exact limit for ``generate_batch(strategy="permutation")``
+        when no two syllable sequences concatenate to the same string (true
+        for the built-in syllable set).
+
+        Args:
+            syllables: Fixed syllable count, or ``None`` for the pattern
+                set's default range (2-3 syllables for ``simple``).
+
+        Raises:
+            ValueError: If syllable count is invalid
+        """
+        return sum(
+            _permutation_count(len(self._syllables), length)
+            for length in self._batch_lengths(syllables)
+        )
+
+    def _batch_lengths(self, syllables: int | None) -> tuple[int, ...]:
+        if syllables is None:
+            low, high = self._syllable_range
+            return tuple(range(low, min(high, len(self._syllables)) + 1))
+        if syllables < 1:
+            raise ValueError("Syllable count must be at least 1")
+        if syllables > len(self._syllables):
+            raise ValueError(
+                f"Cannot generate {syllables} syllables with only "
+                f"{len(self._syllables)} available syllables"
+            )
+        return (syllables,)
+
+    def _name_at_index(self, index: int, lengths: tuple[int, ...]) -> str:
+        """Decode a mixed-radix sequence index into a name.
+
+        Indices enumerate every ordered syllable pick: first all sequences of
+        ``lengths[0]`` syllables, then ``lengths[1]``, and so on. Within one
+        length, digit ``i`` (radix ``n - i``) picks from the syllables not yet
+        used.
+        """
+        size = len(self._syllables)
+        for length in lengths:
+            block = _permutation_count(size, length)
+            if index < block:
+                break
+            index -= block
+        remaining = list(self._syllables)
+        chosen: list[str] = []
+        for position in range(length):
+            index, digit = divmod(index, size - position)
+            chosen.append(remaining.pop(digit))
+        return "".join(chosen).capitalize()
+
+    def _generate_batch_permutation(
+        self, count: int, base_seed: int, syllables: int | None
+    ) -> list[str]:
+        lengths = self._batch_lengths(syllables)
+        capacity = self.unique_capacity(syllables)
+        if count > capacity:
+            raise ValueError(
+                f"Cannot generate {count} unique names; capacity is {capacity} "
+                f"for this syllable set."
+            )
+
+        permutation = _FeistelPermutation(capacity, base_seed)
+        names: list[str] = []
+        seen: set[str] = set()
+        position = 0
+        while len(names) < count:
+            if position >= capacity:
+                raise ValueError(
+                    f"Could not generate {count} unique names. "
+                    f"Only {len(names)} distinct strings exist for this syllable set."
+                )
+            name = self._name_at_index(permutation[position], lengths)
+            position += 1
+            # Distinct sequences only collide when syllables concatenate
+            # ambiguously; skip those so the result is still unique.
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+        return names
+
     def generate_batch(
         self,
         count: int,
         base_seed: int,
         unique: bool = True,
+        strategy: str = "seeded",
+        syllables: int | None = None,
     ) -> list[str]:
         """Generate multiple names at once.
 
         This is useful for bulk generation (e.g., populating a town with NPCs).
 
+        ``strategy="seeded"`` calls :meth:`generate` with ``base_seed``,
+        ``base_seed + 1``, ... and skips repeats when ``unique`` is set; it
+        can give up near the combinatorial limit. ``strategy="permutation"``
+        walks a keyed bijective permutation of every syllable sequence, so
+        names are always distinct, cost O(count), and succeed for any
+        ``count`` up to :meth:`unique_capacity`. The two strategies produce
+        different names for the same ``base_seed``.
+
         Args:
             count: Number of names to generate
-            base_seed: Starting seed (incremented for each name)
-            unique: If True, ensure all names are different
+            base_seed: Starting seed (incremented for each name), or the
+                permutation key for ``strategy="permutation"``
+            unique: If True, ensure all names are different (the permutation
+                strategy is always unique)
+            strategy: One of ``BATCH_STRATEGIES``
+            syllables: Fixed syllable count per name (default random 2-3)
 
         Returns:
             List of generated names
 
         Raises:
-            ValueError: If unable to generate enough unique names
+            ValueError: If unable to generate enough unique names, or the
+                strategy or syllable count is invalid
 
         Example:
             >>> gen = NameGenerator(pattern="simple")
@@ -178,21 +466,31 @@ class NameGenerator:
             >>> names == gen.generate_batch(count=3, base_seed=100)
             True  # Deterministic!
         """
+        if strategy not in BATCH_STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy: '{strategy}'. "
+                f"Expected one of: {', '.join(BATCH_STRATEGIES)}."
+            )
+        if strategy == "permutation":
+            return self._generate_batch_permutation(count, base_seed, syllables)
+
         names: list[str] = []
+        seen: set[str] = set()
         seed = base_seed
         attempts = 0
         max_attempts = count * 100  # Prevent infinite loop
 
         while len(names) < count and attempts < max_attempts:
-            name = self.generate(seed=seed)
+            name = self.generate(seed=seed, syllables=syllables)
 
-            if unique and name in names:
+            if unique and name in seen:
                 # Name collision, try next seed
                 seed += 1
                 attempts += 1
                 continue
 
             names.append(name)
+            seen.add(name)
             seed += 1
             attempts += 1
 
@@ -204,6 +502,26 @@ class NameGenerator:
 
         return names
 
+    @property
+    def fingerprint(self) -> str:
+        """Hex digest of everything that determines ``generate()`` output.
+
+        Covers the RNG mode, syllable table, default syllable range, and
+        weighted sampler tables. Two generators with equal fingerprints map
+        every seed to the same name.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{self.rng_mode}|{self._syllable_range}|".encode())
+        digest.update("\x1f".join(self._syllables).encode("utf-8"))
+        if self._sampler is not None:
+            size = len(self._sampler)
+            # Pack explicitly so the digest is independent of platform layout.
+            digest.update(struct.pack(f"<{size}d", *self._sampler.probability))
+            digest.update(struct.pack(f"<{size}Q", *self._sampler.alias))
+        return digest.hexdigest()[:32]
+
     def __repr__(self) -> str:
         """String representation for debugging."""
+        if self.rng_mode != "mersenne":
+            return f"NameGenerator(pattern='{self.pattern}', rng_mode='{self.rng_mode}')"
         return f"NameGenerator(pattern='{self.pattern}')"
@@ -0,0 +1,234 @@
+"""Pattern sets: syllable tables and weighted samplers for ``NameGenerator``.
+
+A pattern set is the syllable inventory a generator draws from. Besides the
+built-in ``simple`` set, pattern sets can be loaded from pipeline output:
+
+- An annotated syllable JSON (``syllables_annotated.json``): a list of
+  ``{"syllable", "frequency", ...}`` records.
+- A corpus SQLite database (``corpus.db``) with a ``syllables`` table.
+- A webapp package zip: every non-blank line of every ``*.txt`` member is a
+  unit (these are whole selected names, so generators default to one unit).
+
+Loading builds everything generation needs once: a syllable tuple, a compact
+``array`` of frequencies, and an alias-method sampler for O(1)
+frequency-weighted draws. Loaded sets are cached per process (keyed by
+resolved path, size, and mtime), so constructing many generators, or
+generators in forked workers after the parent loaded the set, is cheap.
+
+Uses only the standard library, like the rest of the runtime package.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import zipfile
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+
+class AliasSampler:
+    """O(1) weighted index sampler (Vose's alias method).
+
+    Tables are built once in O(n) and stored as compact arrays. A draw needs
+    one uniform column index and one uniform float.
+
+    Args:
+        weights: Non-negative weights; at least one must be positive.
+
+    Raises:
+        ValueError: If weights are empty, negative, or all zero
+    """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        size = len(weights)
+        total = float(sum(weights))
+        if size == 0 or total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("Alias sampler needs non-negative weights with a positive sum")
+
+        scaled = [weight * size / total for weight in weights]
+        self.probability = array("d", [1.0] * size)
+        self.alias = array("L", range(size))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] = (scaled[high] + scaled[low]) - 1.0
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Leftovers are 1.0 up to rounding error; their defaults already apply.
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def pick(self, column: int, coin: float) -> int:
+        """Return the sampled index for a uniform ``column`` and ``coin`` in [0, 1)."""
+        return column if coin < self.probability[column] else self.alias[column]
+
+
+@dataclass(frozen=True)
+class PatternSet:
+    """Immutable syllable inventory shared by generators.
+
+    Attributes:
+        name: Display name (``"simple"`` or the source file name).
+        syllables: Syllable strings, in a stable order.
+        frequencies: Corpus frequency per syllable (``array('Q')``).
+        sampler: Alias sampler over ``frequencies``, or ``None`` for
+            uniform draws.
+        syllable_range: Default ``(min, max)`` syllables per name.
+    """
+
+    name: str
+    syllables: tuple[str, ...]
+    frequencies: array
+    sampler: AliasSampler | None
+    syllable_range: tuple[int, int] = (2, 3)
+
+    @property
+    def weighted(self) -> bool:
+        """Whether draws follow corpus frequencies."""
+        return self.sampler is not None
+
+
+def build_pattern_set(
+    name: str,
+    counts: Iterable[tuple[str, int]],
+    *,
+    weighted: bool = True,
+    syllable_range: tuple[int, int] = (2, 3),
+) -> PatternSet:
+    """Build a pattern set from ``(syllable, frequency)`` pairs.
+
+    Repeated syllables are merged and blank ones dropped. Syllables are sorted
+    so the set (and every name generated from it) does not depend on the
+    source's row order.
+
+    Raises:
+        ValueError: If no usable syllables remain
+    """
+    merged: Counter[str] = Counter()
+    for syllable, frequency in counts:
+        cleaned = str(syllable).strip()
+        if cleaned:
+            merged[cleaned] += max(int(frequency), 0)
+    if not merged:
+        raise ValueError(f"Pattern source {name!r} contains no syllables")
+
+    syllables = tuple(sorted(merged))
+    frequencies = array("Q", (merged[syllable] for syllable in syllables))
+    sampler = AliasSampler(frequencies) if weighted and sum(frequencies) > 0 else None
+    return PatternSet(
+        name=name,
+        syllables=syllables,
+        frequencies=frequencies,
+        sampler=sampler,
+        syllable_range=syllable_range,
+    )
+
+
+def _read_annotated_json(path: Path) -> list[tuple[str, int]]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, list):
+        raise ValueError(f"{path.name} is not an annotated syllable list")
+    counts: list[tuple[str, int]] = []
+    for record in payload:
+        if not isinstance(record, dict) or "syllable" not in record:
+            raise ValueError(f"{path.name} has a record without a 'syllable' key")
+        counts.append((str(record["syllable"]), int(record.get("frequency", 1))))
+    return counts
+
+
+def _read_corpus_db(path: Path) -> list[tuple[str, int]]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT syllable, frequency FROM syllables").fetchall()
+    except sqlite3.OperationalError as exc:
+        raise ValueError(f"{path.name} has no corpus 'syllables' table") from exc
+    finally:
+        conn.close()
+    return [(str(syllable), int(frequency)) for syllable, frequency in rows]
+
+
+def _read_package_zip(path: Path) -> list[tuple[str, int]]:
+    counts: Counter[str] = Counter()
+    with zipfile.ZipFile(path) as archive:
+        for member in archive.namelist():
+            if not member.lower().endswith(".txt"):
+                continue
+            text = archive.read(member).decode("utf-8")
+            counts.update(line.strip() for line in text.splitlines() if line.strip())
+    return list(counts.items())
+
+
+_SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_CACHE: dict[tuple[str, int, int, bool], PatternSet] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def load_pattern_set(source: str | os.PathLike[str], *, weighted: bool = True) -> PatternSet:
+    """Load (or return the cached) pattern set for a pipeline output file.
+
+    Args:
+        source: Annotated JSON, ``corpus.db``, or webapp package ``.zip``.
+        weighted: When ``True``, draws follow corpus frequencies; otherwise
+            every syllable is equally likely.
+
+    Raises:
+        ValueError: If the file type is unsupported or holds no syllables
+        OSError: If the file cannot be read
+    """
+    path = Path(source).expanduser().resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns, weighted)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    suffix = path.suffix.lower()
+    syllable_range = (2, 3)
+    if suffix == ".json":
+        counts = _read_annotated_json(path)
+    elif suffix in _SQLITE_SUFFIXES:
+        counts = _read_corpus_db(path)
+    elif suffix == ".zip":
+        counts = _read_package_zip(path)
+        syllable_range = (1, 1)
+    else:
+        raise ValueError(
+            f"Unsupported pattern source {path.name!r}; expected an annotated .json, "
+            "a corpus .db, or a package .zip"
+        )
+    pattern_set = build_pattern_set(
+        path.name, counts, weighted=weighted, syllable_range=syllable_range
+    )
+    with _CACHE_LOCK:
+        # Drop stale entries for the same file before caching the new one.
+        for stale in [cached_key for cached_key in _CACHE if cached_key[0] == key[0]]:
+            if stale[1:3] != key[1:3]:
+                del _CACHE[stale]
+        return _CACHE.setdefault(key, pattern_set)
+
+
+def clear_pattern_set_cache() -> None:
+    """Forget every cached pattern set (mainly for tests)."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+__all__ = [
+    "AliasSampler",
+    "PatternSet",
+    "build_pattern_set",
+    "load_pattern_set",
+    "clear_pattern_set_cache",
+]
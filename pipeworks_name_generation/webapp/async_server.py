@@ -0,0 +1,410 @@
+"""Asyncio HTTP/1.1 server for the webapp.
+
+:class:`AsyncHTTPServer` is a drop-in alternative to ``http.server.HTTPServer``
+(and :class:`~pipeworks_name_generation.webapp.runtime.BoundedThreadingHTTPServer`)
+for deployments with many concurrent or idle keep-alive clients:
+
+- Connections are coroutines on one event loop, so idle keep-alive clients
+  cost a few kilobytes each instead of a thread each.
+- Requests are parsed on asyncio streams (HTTP/1.1 keep-alive, ``Expect:
+  100-continue``, ``Content-Length`` bodies up to ``max_body_bytes``, read
+  within ``keepalive_timeout``) and dispatched to the same
+  ``BaseHTTPRequestHandler`` subclass the threaded server uses, so
+  ``route_registry`` maps and ``endpoint_adapters`` run unchanged.
+- Handlers, which do blocking SQLite work, run on a bounded
+  ``ThreadPoolExecutor``. At most ``max_workers + queue_depth`` requests may
+  be running or waiting; further requests receive ``503`` immediately.
+  Requests for ``inline_paths``/``inline_prefixes`` (cheap in-memory routes
+  such as static assets and health checks) skip the executor; other methods
+  on those paths receive ``405``.
+
+Handler output is buffered and written by the event loop. Large streamed
+responses flush to the socket as they grow, with backpressure applied to the
+worker thread, so memory stays bounded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.client
+import io
+import json
+import socket
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Collection
+
+# Request line plus headers must fit in this many bytes.
+MAX_REQUEST_HEAD_BYTES = 64 * 1024
+# Default limit for a request body announced by ``Content-Length``.
+MAX_REQUEST_BODY_BYTES = 16 * 1024 * 1024
+# Buffered handler output is handed to the event loop at this size.
+_FLUSH_THRESHOLD = 64 * 1024
+
+
+class _ResponseBuffer:
+    """File-like ``wfile`` that collects handler output for the event loop.
+
+    Writes are buffered. When a worker thread's buffer passes the flush
+    threshold it hands the bytes to the loop and waits for the transport to
+    drain, which is the backpressure for long streamed responses. Handlers
+    that run on the loop thread only buffer; :meth:`drain` sends the rest.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, writer: asyncio.StreamWriter) -> None:
+        self._loop = loop
+        self._writer = writer
+        self._loop_thread = threading.get_ident()
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        if len(self._buffer) >= _FLUSH_THRESHOLD:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if not self._buffer or threading.get_ident() == self._loop_thread:
+            return
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        asyncio.run_coroutine_threadsafe(self._send(data), self._loop).result()
+
+    async def _send(self, data: bytes) -> None:
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def drain(self) -> None:
+        """Write whatever is still buffered (called on the loop thread)."""
+        if self._buffer:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            await self._send(data)
+
+
+def _simple_response(
+    status: HTTPStatus,
+    message: str,
+    *,
+    retry_after: int | None = None,
+    allow: str | None = None,
+) -> bytes:
+    """Build a complete ``Connection: close`` JSON error response."""
+    body = json.dumps({"error": message}).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        + (f"Retry-After: {retry_after}\r\n" if retry_after is not None else "")
+        + (f"Allow: {allow}\r\n" if allow is not None else "")
+        + "Connection: close\r\n\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+class _BadRequestError(Exception):
+    """A request that is answered with a simple error response, then closed."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _wants_keep_alive(version: str, headers: http.client.HTTPMessage) -> bool:
+    tokens = {token.strip().lower() for token in headers.get("Connection", "").split(",")}
+    if version >= "HTTP/1.1":
+        return "close" not in tokens
+    return "keep-alive" in tokens
+
+
+class AsyncHTTPServer:
+    """Serve a ``BaseHTTPRequestHandler`` subclass from an asyncio event loop.
+
+    The constructor binds the listening socket (so port errors surface
+    immediately, as with ``HTTPServer``); :meth:`serve_forever` runs the loop
+    on the calling thread until :meth:`shutdown` is called from another
+    thread or ``KeyboardInterrupt`` is raised.
+
+    Args:
+        server_address: ``(host, port)`` bind address.
+        handler_class: Request handler class with ``do_<METHOD>`` methods.
+        max_workers: Executor threads for blocking handler work.
+        queue_depth: Requests allowed to wait for a free worker.
+        keepalive_timeout: Seconds an idle keep-alive connection is kept, and
+            the time a client has to send a request body.
+        max_body_bytes: Largest accepted ``Content-Length``; larger requests
+            receive ``413`` before any of the body is read.
+        inline_paths: Exact request paths served on the event loop without
+            the executor.
+        inline_prefixes: Path prefixes served on the event loop.
+        inline_methods: Methods the inline paths accept. Other methods on an
+            inline path receive ``405 Method Not Allowed``.
+    """
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        *,
+        max_workers: int,
+        queue_depth: int = 0,
+        keepalive_timeout: float = 15.0,
+        max_body_bytes: int = MAX_REQUEST_BODY_BYTES,
+        inline_paths: Collection[str] = (),
+        inline_prefixes: Collection[str] = (),
+        inline_methods: Collection[str] = ("GET",),
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if queue_depth < 0:
+            raise ValueError("queue_depth must be >= 0")
+        if keepalive_timeout <= 0:
+            raise ValueError("keepalive_timeout must be > 0")
+        if max_body_bytes < 0:
+            raise ValueError("max_body_bytes must be >= 0")
+        self.RequestHandlerClass = handler_class
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.keepalive_timeout = keepalive_timeout
+        self.max_body_bytes = max_body_bytes
+        self.rejected_requests = 0
+        self._inline_paths = frozenset(inline_paths)
+        self._inline_prefixes = tuple(inline_prefixes)
+        self._inline_methods = frozenset(inline_methods)
+        self.socket = socket.create_server(server_address, backlog=1024)
+        self.server_address: tuple[str, int] = self.socket.getsockname()[:2]
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pipeworks-aio",
+        )
+        self._in_flight = 0
+        self._connections: dict[asyncio.Task[None], bool] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._stopped = threading.Event()
+        self._running = False
+        self._shutdown_requested = False
+        self._closing = False
+
+    @property
+    def open_connections(self) -> int:
+        """Number of client connections currently open."""
+        return len(self._connections)
+
+    def serve_forever(self) -> None:
+        """Run the event loop and serve requests until :meth:`shutdown`."""
+        self._running = True
+        self._stopped.clear()
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self._running = False
+            self._shutdown_requested = False
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        """Stop :meth:`serve_forever` (from another thread) and wait for it."""
+        self._shutdown_requested = True
+        loop, stop = self._loop, self._stop
+        if loop is not None and stop is not None:
+            loop.call_soon_threadsafe(stop.set)
+        if self._running:
+            self._stopped.wait()
+
+    def server_close(self) -> None:
+        """Close the listening socket and wait for executor work to finish."""
+        self.socket.close()
+        self._executor.shutdown(wait=True)
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._closing = False
+        if self._shutdown_requested:
+            self._stop.set()
+        server = await asyncio.start_server(
+            self._handle_connection, sock=self.socket, limit=MAX_REQUEST_HEAD_BYTES
+        )
+        try:
+            await self._stop.wait()
+        finally:
+            self._closing = True
+            server.close()
+            # Idle keep-alive connections are dropped; busy ones finish first.
+            for task, busy in list(self._connections.items()):
+                if not busy:
+                    task.cancel()
+            if self._connections:
+                await asyncio.gather(*self._connections, return_exceptions=True)
+            self._loop = None
+            self._stop = None
+
+    def _is_inline(self, path: str) -> bool:
+        route = path.split("?", 1)[0]
+        return route in self._inline_paths or route.startswith(self._inline_prefixes)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[task] = False
+        peer = writer.get_extra_info("peername") or ("", 0)
+        try:
+            while not self._closing:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), timeout=self.keepalive_timeout
+                    )
+                except (asyncio.IncompleteReadError, TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(
+                        _simple_response(
+                            HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                            "Request headers are too large.",
+                        )
+                    )
+                    break
+
+                self._connections[task] = True
+                try:
+                    keep_alive = await self._handle_request(head, reader, writer, peer)
+                except _BadRequestError as exc:
+                    writer.write(_simple_response(exc.status, str(exc)))
+                    break
+                finally:
+                    self._connections[task] = False
+                if not keep_alive:
+                    break
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    async def _handle_request(
+        self,
+        head: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        peer: Any,
+    ) -> bool:
+        """Parse and dispatch one request; return whether to keep the connection."""
+        request_line, _, header_block = head.lstrip(b"\r\n").partition(b"\r\n")
+        requestline = request_line.decode("iso-8859-1")
+        parts = requestline.split()
+        if len(parts) != 3:
+            raise _BadRequestError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        method, target, version = parts
+        if not version.startswith("HTTP/1."):
+            raise _BadRequestError(
+                HTTPStatus.HTTP_VERSION_NOT_SUPPORTED, f"Unsupported HTTP version: {version}"
+            )
+        headers = http.client.parse_headers(io.BytesIO(header_block))
+
+        if headers.get("Transfer-Encoding"):
+            raise _BadRequestError(
+                HTTPStatus.NOT_IMPLEMENTED, "Chunked request bodies are not supported."
+            )
+        try:
+            content_length = int(headers.get("Content-Length", "0"))
+        except ValueError as exc:
+            raise _BadRequestError(
+                HTTPStatus.BAD_REQUEST, "Invalid Content-Length header."
+            ) from exc
+        if content_length < 0:
+            raise _BadRequestError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length header.")
+        if content_length > self.max_body_bytes:
+            raise _BadRequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Request body exceeds {self.max_body_bytes} bytes.",
+            )
+        if content_length and headers.get("Expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        body = b""
+        if content_length:
+            try:
+                body = await asyncio.wait_for(
+                    reader.readexactly(content_length), timeout=self.keepalive_timeout
+                )
+            except TimeoutError as exc:
+                raise _BadRequestError(
+                    HTTPStatus.REQUEST_TIMEOUT, "Request body was not received in time."
+                ) from exc
+            except asyncio.IncompleteReadError:
+                return False
+
+        loop = asyncio.get_running_loop()
+        wfile = _ResponseBuffer(loop, writer)
+        handler: Any = self.RequestHandlerClass.__new__(self.RequestHandlerClass)
+        handler.server = self
+        handler.request = None
+        handler.client_address = peer
+        handler.rfile = io.BytesIO(body)
+        handler.wfile = wfile
+        handler.raw_requestline = request_line + b"\r\n"
+        handler.requestline = requestline
+        handler.command = method
+        handler.path = target
+        handler.request_version = version
+        handler.headers = headers
+        handler.protocol_version = "HTTP/1.1" if version >= "HTTP/1.1" else "HTTP/1.0"
+        handler.close_connection = not _wants_keep_alive(version, headers)
+
+        inline = self._is_inline(target)
+        if inline and method not in self._inline_methods:
+            writer.write(
+                _simple_response(
+                    HTTPStatus.METHOD_NOT_ALLOWED,
+                    f"Method {method} is not allowed for this path.",
+                    allow=", ".join(sorted(self._inline_methods)),
+                )
+            )
+            return False
+
+        dispatch = getattr(handler, f"do_{method}", None)
+        if dispatch is None:
+            handler.send_error(HTTPStatus.NOT_IMPLEMENTED, f"Unsupported method ({method!r})")
+            await wfile.drain()
+            return False
+
+        try:
+            if inline:
+                dispatch()
+            else:
+                if self._in_flight >= self.max_workers + self.queue_depth:
+                    self.rejected_requests += 1
+                    writer.write(
+                        _simple_response(
+                            HTTPStatus.SERVICE_UNAVAILABLE,
+                            "Server is busy; retry shortly.",
+                            retry_after=1,
+                        )
+                    )
+                    return False
+                self._in_flight += 1
+                try:
+                    await loop.run_in_executor(self._executor, dispatch)
+                finally:
+                    self._in_flight -= 1
+        except ConnectionError:
+            return False
+        except Exception:  # nosec B110 - mirrors socketserver error reporting
+            print(f"Exception while handling request from {peer}", file=sys.stderr)
+            traceback.print_exc()
+            return False
+        await wfile.drain()
+        return not handler.close_connection and not self._closing
+
+
+__all__ = ["AsyncHTTPServer", "MAX_REQUEST_HEAD_BYTES"]
@@ -0,0 +1,233 @@
+"""In-process caching primitives shared by webapp service modules.
+
+The webapp keeps a few small, read-mostly payloads in memory (for example
+prepared generation candidate pools). This module provides one bounded LRU
+implementation so those caches share the same eviction, sizing, and
+hit/miss accounting behavior, plus :class:`ChangeStampedCache` for query
+results that must follow writes made by other processes.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for one :class:`ByteBoundedLRUCache`.
+
+    Attributes:
+        hits: Number of lookups served from the cache.
+        misses: Number of lookups that required a fresh computation.
+        evictions: Number of entries dropped to honor size limits.
+        entries: Current number of cached entries.
+        total_bytes: Current estimated payload size across entries.
+        max_entries: Configured entry-count limit.
+        max_bytes: Configured byte-size limit.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    total_bytes: int
+    max_entries: int
+    max_bytes: int
+
+
+class ByteBoundedLRUCache(Generic[KeyT, ValueT]):
+    """Thread-safe LRU cache bounded by entry count and estimated byte size.
+
+    Each entry is stored with a caller-provided size estimate. Inserting a new
+    entry evicts least-recently-used entries until both limits are satisfied.
+    Values larger than ``max_bytes`` are never cached.
+
+    Args:
+        max_entries: Maximum number of cached entries.
+        max_bytes: Maximum total estimated byte size across entries.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[KeyT, tuple[ValueT, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """Return a cached value and mark it most-recently used.
+
+        Lookups update hit/miss counters.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: KeyT, value: ValueT, *, nbytes: int) -> bool:
+        """Insert or replace one entry.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            nbytes: Estimated memory footprint of ``value``.
+
+        Returns:
+            ``True`` when the value was cached, ``False`` when it exceeds
+            ``max_bytes`` on its own.
+        """
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                return False
+            self._entries[key] = (value, nbytes)
+            self._total_bytes += nbytes
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+                self._evictions += 1
+            return True
+
+    def invalidate(self, predicate: Callable[[KeyT], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``.
+
+        Returns:
+            Number of removed entries.
+        """
+        with self._lock:
+            doomed = [key for key in self._entries if predicate(key)]
+            for key in doomed:
+                self._discard(key)
+            return len(doomed)
+
+    def clear(self) -> None:
+        """Drop all entries. Hit/miss counters are preserved."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of cache counters and sizes."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                total_bytes=self._total_bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+            )
+
+    def __len__(self) -> int:
+        """Return the current number of cached entries."""
+        return len(self._entries)
+
+    def _discard(self, key: KeyT) -> None:
+        """Remove one entry without touching counters (caller holds lock)."""
+        existing = self._entries.pop(key, None)
+        if existing is not None:
+            self._total_bytes -= existing[1]
+
+
+class ChangeStampedCache(Generic[KeyT, ValueT]):
+    """Query-result cache invalidated by per-database change stamps.
+
+    Entries are grouped by database key. Every lookup passes the stamp the
+    caller just read from that database (see
+    :func:`~pipeworks_name_generation.webapp.db.changes.get_database_change_stamp`);
+    when it differs from the stamp the cached entries were computed under,
+    all of that database's entries are dropped before the lookup. Writes from
+    any process therefore invalidate the cache on the next request.
+
+    Callers must read the stamp *before* running the query they cache. A
+    write that lands in between is then stored under the older stamp and
+    refreshed on the following request, rather than served stale.
+
+    Args:
+        max_entries: Maximum number of cached entries across databases.
+        max_bytes: Maximum total estimated byte size across entries.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self._entries = ByteBoundedLRUCache[tuple[str, KeyT], ValueT](
+            max_entries=max_entries, max_bytes=max_bytes
+        )
+        self._stamps: dict[str, Hashable] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db_key: str, key: KeyT, *, stamp: Hashable) -> ValueT | None:
+        """Return the entry cached for ``key`` under ``stamp``, if any."""
+        self._observe(db_key, stamp)
+        return self._entries.get((db_key, key))
+
+    def put(self, db_key: str, key: KeyT, value: ValueT, *, stamp: Hashable, nbytes: int) -> bool:
+        """Cache ``value`` for ``key`` when ``stamp`` is still current.
+
+        Args:
+            db_key: Resolved database path (or other database identity).
+            key: Cache key within the database.
+            value: Value to store.
+            stamp: Change stamp read before computing ``value``.
+            nbytes: Estimated memory footprint of ``value``.
+
+        Returns:
+            ``True`` when the value was cached. Values computed under a stamp
+            that another caller has already moved past are not cached.
+        """
+        with self._lock:
+            if self._stamps.get(db_key, stamp) != stamp:
+                return False
+            self._stamps[db_key] = stamp
+            return self._entries.put((db_key, key), value, nbytes=nbytes)
+
+    def invalidate(self, db_key: str | None = None) -> int:
+        """Drop entries for one database, or for all databases.
+
+        Returns:
+            Number of removed entries.
+        """
+        with self._lock:
+            if db_key is None:
+                self._stamps.clear()
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            self._stamps.pop(db_key, None)
+            return self._entries.invalidate(lambda key: key[0] == db_key)
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of cache counters and sizes."""
+        return self._entries.stats()
+
+    def __len__(self) -> int:
+        """Return the current number of cached entries."""
+        return len(self._entries)
+
+    def _observe(self, db_key: str, stamp: Hashable) -> None:
+        """Drop ``db_key`` entries computed under a different stamp."""
+        with self._lock:
+            known = self._stamps.get(db_key, stamp)
+            self._stamps[db_key] = stamp
+            if known != stamp:
+                self._entries.invalidate(lambda key: key[0] == db_key)
+
+
+__all__ = ["CacheStats", "ByteBoundedLRUCache", "ChangeStampedCache"]
@@ -43,6 +43,57 @@ def create_argument_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Serve API routes only (no UI or static assets).",
     )
+    parser.add_argument(
+        "--worker-threads",
+        type=int,
+        default=None,
+        help="Number of request worker threads (0 = single-threaded).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of server processes sharing the listening socket (default: 1).",
+    )
+    parser.add_argument(
+        "--request-queue-depth",
+        type=int,
+        default=None,
+        help="Connections allowed to wait for a worker before returning 503.",
+    )
+    parser.add_argument(
+        "--no-connection-pool",
+        action="store_true",
+        help="Open a fresh SQLite connection per request instead of pooling.",
+    )
+    parser.add_argument(
+        "--storage-layout",
+        choices=["table", "values"],
+        default=None,
+        help="Storage layout for newly imported txt rows.",
+    )
+    parser.add_argument(
+        "--generation-export-dir",
+        type=Path,
+        default=None,
+        help="Directory for generation export job files (default: <db dir>/exports).",
+    )
+    parser.add_argument(
+        "--no-compression",
+        action="store_true",
+        help="Send responses uncompressed even when clients accept gzip.",
+    )
+    parser.add_argument(
+        "--runtime",
+        choices=["threaded", "asyncio"],
+        default=None,
+        help="Server runtime: http.server threads or an asyncio event loop.",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record request and SQLite timings and serve them at /api/metrics.",
+    )
     return parser
 
 
@@ -68,6 +119,15 @@ def build_settings_from_args(args: argparse.Namespace) -> ServerSettings:
         db_backup_path=None,
         verbose=verbose_override,
         serve_ui=serve_ui_override,
+        worker_threads=getattr(args, "worker_threads", None),
+        request_queue_depth=getattr(args, "request_queue_depth", None),
+        connection_pool=False if getattr(args, "no_connection_pool", False) else None,
+        storage_layout=getattr(args, "storage_layout", None),
+        generation_export_dir=getattr(args, "generation_export_dir", None),
+        compression=False if getattr(args, "no_compression", False) else None,
+        runtime=getattr(args, "runtime", None),
+        metrics=True if getattr(args, "metrics", False) else None,
+        workers=getattr(args, "workers", None),
     )
 
 
@@ -8,14 +8,29 @@ is omitted the server auto-selects a free port in the 8000 range.
 from __future__ import annotations
 
 from configparser import ConfigParser
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
+from pipeworks_name_generation.webapp.async_server import MAX_REQUEST_BODY_BYTES
+from pipeworks_name_generation.webapp.db.table_store import STORAGE_LAYOUT_TABLE, STORAGE_LAYOUTS
+from pipeworks_name_generation.webapp.http.caching import (
+    CACHE_ROUTE_FAMILIES,
+    DEFAULT_CACHE_CONTROL,
+)
+
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_DB_PATH = Path("pipeworks_name_generation/data/name_packages.sqlite3")
 DEFAULT_FAVORITES_DB_PATH = Path("pipeworks_name_generation/data/user_favorites.sqlite3")
 DEFAULT_DB_EXPORT_PATH: Path | None = None
 DEFAULT_DB_BACKUP_PATH: Path | None = None
+DEFAULT_WORKER_THREADS = 0
+DEFAULT_REQUEST_QUEUE_DEPTH = 16
+RUNTIME_THREADED = "threaded"
+RUNTIME_ASYNCIO = "asyncio"
+SERVER_RUNTIMES: tuple[str, ...] = (RUNTIME_THREADED, RUNTIME_ASYNCIO)
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+DEFAULT_MAX_REQUEST_BODY_BYTES = MAX_REQUEST_BODY_BYTES
+DEFAULT_WORKERS = 1
 
 
 @dataclass(frozen=True)
@@ -29,6 +44,31 @@ class ServerSettings:
         favorites_db_path: SQLite database file path for user favorites
         verbose: Print startup/runtime messages when True
         serve_ui: When ``True``, serve UI/static routes in addition to the API.
+        worker_threads: Number of request worker threads. ``0`` keeps the
+            single-threaded server.
+        request_queue_depth: Accepted connections allowed to wait for a free
+            worker before new ones are rejected with ``503``.
+        connection_pool: When ``True``, routes reuse pooled SQLite
+            connections (read-only per worker thread plus one writer).
+        storage_layout: Layout for newly imported txt rows: ``table`` (one
+            physical table per txt) or ``values`` (shared ``package_values``).
+        generation_export_dir: Directory for generation export job files.
+            ``None`` uses an ``exports`` directory next to ``db_path``.
+        compression: When ``True``, gzip-encode compressible responses for
+            clients that send ``Accept-Encoding: gzip``.
+        cache_control: ``Cache-Control`` value per route family (``html``,
+            ``static``, ``fonts``, ``api``).
+        runtime: Server runtime: ``threaded`` (``http.server``, optionally
+            with ``worker_threads``) or ``asyncio`` (event-loop connections
+            with ``worker_threads`` executor threads for handler work).
+        keepalive_timeout: Seconds the ``asyncio`` runtime keeps an idle
+            keep-alive connection open (and waits for a request body).
+        max_request_body_bytes: Largest ``Content-Length`` the ``asyncio``
+            runtime accepts; larger requests receive ``413``.
+        metrics: When ``True``, record per-route request and SQLite timings
+            and serve them from ``GET /api/metrics``.
+        workers: Number of server processes. Values above ``1`` fork that
+            many workers that share one listening socket under a supervisor.
     """
 
     host: str = DEFAULT_HOST
@@ -39,6 +79,18 @@ class ServerSettings:
     db_backup_path: Path | None = DEFAULT_DB_BACKUP_PATH
     verbose: bool = True
     serve_ui: bool = True
+    worker_threads: int = DEFAULT_WORKER_THREADS
+    request_queue_depth: int = DEFAULT_REQUEST_QUEUE_DEPTH
+    connection_pool: bool = True
+    storage_layout: str = STORAGE_LAYOUT_TABLE
+    generation_export_dir: Path | None = None
+    compression: bool = True
+    cache_control: dict[str, str] = field(default_factory=lambda: dict(DEFAULT_CACHE_CONTROL))
+    runtime: str = RUNTIME_THREADED
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT
+    max_request_body_bytes: int = DEFAULT_MAX_REQUEST_BODY_BYTES
+    metrics: bool = False
+    workers: int = DEFAULT_WORKERS
 
 
 def _coerce_port(raw_port: str | None) -> int | None:
@@ -71,6 +123,91 @@ def _coerce_port(raw_port: str | None) -> int | None:
     return port
 
 
+def _coerce_non_negative_int(raw_value: str | None, *, field: str, default: int) -> int:
+    """Convert an optional non-negative integer config value.
+
+    Raises:
+        ValueError: If the value is not an integer or is negative
+    """
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        value = int(raw_value.strip())
+    except ValueError as exc:
+        raise ValueError(f"Invalid {field} value: {raw_value!r}") from exc
+    if value < 0:
+        raise ValueError(f"{field} must be >= 0")
+    return value
+
+
+def _coerce_positive_int(raw_value: str | None, *, field: str, default: int) -> int:
+    """Convert an optional positive integer config value.
+
+    Raises:
+        ValueError: If the value is not an integer or is not positive
+    """
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        value = int(raw_value.strip())
+    except ValueError as exc:
+        raise ValueError(f"Invalid {field} value: {raw_value!r}") from exc
+    if value < 1:
+        raise ValueError(f"{field} must be >= 1")
+    return value
+
+
+def _coerce_storage_layout(raw_layout: str | None, *, default: str) -> str:
+    """Validate an optional storage layout name.
+
+    Raises:
+        ValueError: If the layout is not supported
+    """
+    if raw_layout is None or not raw_layout.strip():
+        return default
+    layout = raw_layout.strip().lower()
+    if layout not in STORAGE_LAYOUTS:
+        raise ValueError(
+            f"Invalid storage_layout value: {raw_layout!r} (expected one of: "
+            f"{', '.join(STORAGE_LAYOUTS)})"
+        )
+    return layout
+
+
+def _coerce_runtime(raw_runtime: str | None, *, default: str) -> str:
+    """Validate an optional server runtime name.
+
+    Raises:
+        ValueError: If the runtime is not supported
+    """
+    if raw_runtime is None or not raw_runtime.strip():
+        return default
+    runtime = raw_runtime.strip().lower()
+    if runtime not in SERVER_RUNTIMES:
+        raise ValueError(
+            f"Invalid runtime value: {raw_runtime!r} (expected one of: "
+            f"{', '.join(SERVER_RUNTIMES)})"
+        )
+    return runtime
+
+
+def _coerce_positive_float(raw_value: str | None, *, field: str, default: float) -> float:
+    """Convert an optional positive float config value.
+
+    Raises:
+        ValueError: If the value is not a number or is not positive
+    """
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        value = float(raw_value.strip())
+    except ValueError as exc:
+        raise ValueError(f"Invalid {field} value: {raw_value!r}") from exc
+    if value <= 0:
+        raise ValueError(f"{field} must be > 0")
+    return value
+
+
 def _coerce_optional_path(raw_path: str | None) -> Path | None:
     """Normalize an optional filesystem path from config values."""
     if raw_path is None:
@@ -81,13 +218,36 @@ def _coerce_optional_path(raw_path: str | None) -> Path | None:
     return Path(cleaned).expanduser()
 
 
+def _read_cache_control(parser: ConfigParser, *, default: dict[str, str]) -> dict[str, str]:
+    """Read per-route-family ``Cache-Control`` values from a ``[cache]`` section.
+
+    Raises:
+        ValueError: If the section names an unknown route family
+    """
+    policies = dict(default)
+    if not parser.has_section("cache"):
+        return policies
+    for family, value in parser.items("cache"):
+        if family not in CACHE_ROUTE_FAMILIES:
+            allowed = ", ".join(CACHE_ROUTE_FAMILIES)
+            raise ValueError(f"Unknown cache route family: {family!r}. Allowed: {allowed}.")
+        if value.strip():
+            policies[family] = value.strip()
+    return policies
+
+
 def load_server_settings(config_path: Path | None) -> ServerSettings:
     """Load server settings from an INI file.
 
     The parser reads a ``[server]`` section with the following optional keys:
-    ``host``, ``port``, ``db_path``, ``favorites_db_path``, ``verbose``, and
-    ``serve_ui``. An optional ``api_only`` flag can be used to force API-only
-    mode and overrides ``serve_ui`` when set.
+    ``host``, ``port``, ``db_path``, ``favorites_db_path``, ``verbose``,
+    ``serve_ui``, ``worker_threads``, ``request_queue_depth``,
+    ``connection_pool``, ``storage_layout``, ``generation_export_dir``,
+    ``compression``, ``runtime``, ``keepalive_timeout``,
+    ``max_request_body_bytes``, ``metrics``, and ``workers``. An optional ``api_only`` flag can be used to force API-only
+    mode and overrides ``serve_ui`` when set. An optional ``[cache]`` section
+    sets ``Cache-Control`` per route family (``html``, ``static``, ``fonts``,
+    ``api``).
 
     Args:
         config_path: Path to INI file. If missing/None, defaults are used.
@@ -106,8 +266,9 @@ def load_server_settings(config_path: Path | None) -> ServerSettings:
     parser = ConfigParser()
     parser.read(config_path, encoding="utf-8")
 
+    cache_control = _read_cache_control(parser, default=settings.cache_control)
     if not parser.has_section("server"):
-        return settings
+        return replace(settings, cache_control=cache_control)
 
     host = parser.get("server", "host", fallback=settings.host).strip() or settings.host
     port = _coerce_port(parser.get("server", "port", fallback=None))
@@ -131,13 +292,56 @@ def load_server_settings(config_path: Path | None) -> ServerSettings:
         or settings.db_backup_path
     )
 
+    generation_export_dir = (
+        _coerce_optional_path(parser.get("server", "generation_export_dir", fallback=None))
+        or settings.generation_export_dir
+    )
+
     verbose = parser.getboolean("server", "verbose", fallback=settings.verbose)
     serve_ui = parser.getboolean("server", "serve_ui", fallback=settings.serve_ui)
     api_only = parser.getboolean("server", "api_only", fallback=False)
+    connection_pool = parser.getboolean(
+        "server", "connection_pool", fallback=settings.connection_pool
+    )
+    compression = parser.getboolean("server", "compression", fallback=settings.compression)
+    metrics = parser.getboolean("server", "metrics", fallback=settings.metrics)
+    runtime = _coerce_runtime(
+        parser.get("server", "runtime", fallback=None), default=settings.runtime
+    )
+    keepalive_timeout = _coerce_positive_float(
+        parser.get("server", "keepalive_timeout", fallback=None),
+        field="keepalive_timeout",
+        default=settings.keepalive_timeout,
+    )
+    max_request_body_bytes = _coerce_positive_int(
+        parser.get("server", "max_request_body_bytes", fallback=None),
+        field="max_request_body_bytes",
+        default=settings.max_request_body_bytes,
+    )
+    storage_layout = _coerce_storage_layout(
+        parser.get("server", "storage_layout", fallback=None),
+        default=settings.storage_layout,
+    )
 
     if api_only:
         serve_ui = False
 
+    worker_threads = _coerce_non_negative_int(
+        parser.get("server", "worker_threads", fallback=None),
+        field="worker_threads",
+        default=settings.worker_threads,
+    )
+    request_queue_depth = _coerce_non_negative_int(
+        parser.get("server", "request_queue_depth", fallback=None),
+        field="request_queue_depth",
+        default=settings.request_queue_depth,
+    )
+    workers = _coerce_positive_int(
+        parser.get("server", "workers", fallback=None),
+        field="workers",
+        default=settings.workers,
+    )
+
     return ServerSettings(
         host=host,
         port=port,
@@ -147,6 +351,18 @@ def load_server_settings(config_path: Path | None) -> ServerSettings:
         db_backup_path=db_backup_path,
         verbose=verbose,
         serve_ui=serve_ui,
+        worker_threads=worker_threads,
+        request_queue_depth=request_queue_depth,
+        connection_pool=connection_pool,
+        storage_layout=storage_layout,
+        generation_export_dir=generation_export_dir,
+        compression=compression,
+        cache_control=cache_control,
+        runtime=runtime,
+        keepalive_timeout=keepalive_timeout,
+        max_request_body_bytes=max_request_body_bytes,
+        metrics=metrics,
+        workers=workers,
     )
 
 
@@ -160,6 +376,15 @@ def apply_runtime_overrides(
     db_backup_path: Path | None,
     verbose: bool | None,
     serve_ui: bool | None,
+    worker_threads: int | None = None,
+    request_queue_depth: int | None = None,
+    connection_pool: bool | None = None,
+    storage_layout: str | None = None,
+    generation_export_dir: Path | None = None,
+    compression: bool | None = None,
+    runtime: str | None = None,
+    metrics: bool | None = None,
+    workers: int | None = None,
 ) -> ServerSettings:
     """Apply command-line overrides over loaded settings.
 
@@ -171,6 +396,15 @@ def apply_runtime_overrides(
         favorites_db_path: Optional favorites database path override
         verbose: Optional verbose override
         serve_ui: Optional UI routing override
+        worker_threads: Optional worker thread count override
+        request_queue_depth: Optional request queue depth override
+        connection_pool: Optional connection pool toggle override
+        storage_layout: Optional storage layout override for new imports
+        generation_export_dir: Optional export job directory override
+        compression: Optional response compression toggle override
+        runtime: Optional server runtime override
+        metrics: Optional metrics collection toggle override
+        workers: Optional server process count override
 
     Returns:
         Updated settings with overrides applied
@@ -193,5 +427,32 @@ def apply_runtime_overrides(
         result = replace(result, verbose=verbose)
     if serve_ui is not None:
         result = replace(result, serve_ui=serve_ui)
+    if worker_threads is not None:
+        if worker_threads < 0:
+            raise ValueError("worker_threads must be >= 0")
+        result = replace(result, worker_threads=worker_threads)
+    if request_queue_depth is not None:
+        if request_queue_depth < 0:
+            raise ValueError("request_queue_depth must be >= 0")
+        result = replace(result, request_queue_depth=request_queue_depth)
+    if connection_pool is not None:
+        result = replace(result, connection_pool=connection_pool)
+    if storage_layout is not None:
+        result = replace(
+            result,
+            storage_layout=_coerce_storage_layout(storage_layout, default=result.storage_layout),
+        )
+    if generation_export_dir is not None:
+        result = replace(result, generation_export_dir=generation_export_dir.expanduser())
+    if compression is not None:
+        result = replace(result, compression=compression)
+    if runtime is not None:
+        result = replace(result, runtime=_coerce_runtime(runtime, default=result.runtime))
+    if metrics is not None:
+        result = replace(result, metrics=metrics)
+    if workers is not None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        result = replace(result, workers=workers)
 
     return result
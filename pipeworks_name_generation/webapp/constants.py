@@ -44,6 +44,38 @@ GENERATION_SYLLABLE_LABELS: dict[str, str] = {
     "all": "All syllables",
 }
 
+# Output formats accepted by ``POST /api/generate``. ``ndjson`` always streams;
+# ``txt`` streams plain text when the request sets ``stream``.
+GENERATION_OUTPUT_FORMATS: tuple[str, ...] = ("json", "txt", "ndjson")
+
+# Names sampled/rendered/written per chunk for streamed generation output.
+GENERATION_STREAM_CHUNK_SIZE = 1000
+
+# Scopes with at least this many stored rows are sampled by indexed row lookups
+# instead of loading every candidate value into memory.
+GENERATION_INDEXED_SAMPLING_MIN_ROWS = 100_000
+
+# ``POST /api/generate/batch`` limits: scopes per request and output formats.
+GENERATION_BATCH_MAX_SCOPES = 16
+GENERATION_BATCH_OUTPUT_FORMATS: tuple[str, ...] = ("json", "ndjson")
+
+# Background generation export jobs (``POST /api/generate/export``).
+GENERATION_EXPORT_FORMATS: tuple[str, ...] = ("txt", "csv", "ndjson")
+GENERATION_EXPORT_MAX_COUNT = 50_000_000
+GENERATION_EXPORT_DEFAULT_CHUNK_SIZE = 10_000
+GENERATION_EXPORT_MAX_CONCURRENT_JOBS = 1
+
+# Favorites export/import file formats. ``ndjson`` streams one favorite per line.
+FAVORITES_EXPORT_FORMATS: tuple[str, ...] = ("json", "ndjson")
+
+# Background package import jobs (``POST /api/import/start``). Imports write
+# through one SQLite writer, so running them one at a time avoids lock waits.
+IMPORT_JOB_MAX_CONCURRENT_JOBS = 1
+IMPORT_JOB_HISTORY_LIMIT = 50
+# Seconds between checks of the job table for cancel requests made through
+# another worker process.
+IMPORT_JOB_CANCEL_POLL_SECONDS = 0.5
+
 __all__ = [
     "DEFAULT_PAGE_LIMIT",
     "MAX_PAGE_LIMIT",
@@ -51,4 +83,17 @@ __all__ = [
     "GENERATION_CLASS_PATTERNS",
     "GENERATION_CLASS_KEYS",
     "GENERATION_SYLLABLE_LABELS",
+    "GENERATION_OUTPUT_FORMATS",
+    "GENERATION_STREAM_CHUNK_SIZE",
+    "GENERATION_INDEXED_SAMPLING_MIN_ROWS",
+    "GENERATION_BATCH_MAX_SCOPES",
+    "GENERATION_BATCH_OUTPUT_FORMATS",
+    "GENERATION_EXPORT_FORMATS",
+    "GENERATION_EXPORT_MAX_COUNT",
+    "GENERATION_EXPORT_DEFAULT_CHUNK_SIZE",
+    "GENERATION_EXPORT_MAX_CONCURRENT_JOBS",
+    "FAVORITES_EXPORT_FORMATS",
+    "IMPORT_JOB_MAX_CONCURRENT_JOBS",
+    "IMPORT_JOB_HISTORY_LIMIT",
+    "IMPORT_JOB_CANCEL_POLL_SECONDS",
 ]
@@ -1,8 +1,29 @@
 """Database-layer modules for the webapp backend."""
 
 from .backup import BackupResult, RestoreResult, backup_database, export_database, restore_database
+from .changes import (
+    bump_database_change_stamp,
+    get_database_change_stamp,
+    install_change_tracking,
+)
 from .connection import connect_database
-from .importer import import_package_pair, load_metadata_json, read_txt_rows
+from .importer import (
+    ImportCancelledError,
+    ImportProgress,
+    import_package_pair,
+    iter_txt_rows,
+    load_metadata_json,
+    read_txt_rows,
+)
+from .migration import LayoutMigrationResult, drop_migrated_legacy_tables, migrate_to_values_layout
+from .pool import (
+    ConnectionPool,
+    ConnectionPoolStats,
+    close_connection_pools,
+    get_connection_pool,
+    get_connection_pool_stats,
+    reset_connection_pools,
+)
 from .repositories import (
     build_package_table_name,
     get_package_table,
@@ -10,19 +31,63 @@ from .repositories import (
     list_packages,
     slugify_identifier,
 )
-from .schema import initialize_schema
-from .table_store import create_text_table, fetch_text_rows, insert_text_rows, quote_identifier
+from .schema import (
+    backfill_package_table_scope_keys,
+    backfill_text_table_line_indexes,
+    initialize_schema,
+)
+from .stats import (
+    PackageStatsAccumulator,
+    decode_length_histogram,
+    encode_length_histogram,
+    get_scope_stats,
+    package_has_stats,
+    recompute_package_stats,
+)
+from .table_store import (
+    STORAGE_LAYOUT_TABLE,
+    STORAGE_LAYOUT_VALUES,
+    STORAGE_LAYOUTS,
+    create_text_table,
+    create_text_table_line_index,
+    decode_row_cursor,
+    encode_row_cursor,
+    fetch_package_table_rows,
+    fetch_package_table_rows_after,
+    fetch_package_values,
+    fetch_package_values_after,
+    fetch_text_rows,
+    fetch_text_rows_after,
+    insert_package_values,
+    insert_text_rows,
+    quote_identifier,
+    read_package_values,
+)
 
 __all__ = [
     "connect_database",
+    "ConnectionPool",
+    "ConnectionPoolStats",
+    "get_connection_pool",
+    "get_connection_pool_stats",
+    "reset_connection_pools",
+    "close_connection_pools",
     "BackupResult",
     "RestoreResult",
     "backup_database",
     "export_database",
     "restore_database",
     "initialize_schema",
+    "backfill_package_table_scope_keys",
+    "backfill_text_table_line_indexes",
+    "install_change_tracking",
+    "get_database_change_stamp",
+    "bump_database_change_stamp",
     "import_package_pair",
+    "ImportCancelledError",
+    "ImportProgress",
     "load_metadata_json",
+    "iter_txt_rows",
     "read_txt_rows",
     "build_package_table_name",
     "slugify_identifier",
@@ -31,6 +96,28 @@ __all__ = [
     "get_package_table",
     "quote_identifier",
     "create_text_table",
+    "create_text_table_line_index",
+    "encode_row_cursor",
+    "decode_row_cursor",
     "insert_text_rows",
     "fetch_text_rows",
+    "fetch_text_rows_after",
+    "STORAGE_LAYOUT_TABLE",
+    "STORAGE_LAYOUT_VALUES",
+    "STORAGE_LAYOUTS",
+    "insert_package_values",
+    "fetch_package_values",
+    "fetch_package_values_after",
+    "fetch_package_table_rows",
+    "fetch_package_table_rows_after",
+    "read_package_values",
+    "LayoutMigrationResult",
+    "migrate_to_values_layout",
+    "drop_migrated_legacy_tables",
+    "PackageStatsAccumulator",
+    "encode_length_histogram",
+    "decode_length_histogram",
+    "get_scope_stats",
+    "package_has_stats",
+    "recompute_package_stats",
 ]
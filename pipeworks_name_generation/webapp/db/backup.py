@@ -13,6 +13,11 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from pipeworks_name_generation.webapp.db.changes import (
+    bump_database_change_stamp,
+    get_database_change_stamp,
+    install_change_tracking,
+)
 from pipeworks_name_generation.webapp.db.connection import connect_database
 
 
@@ -101,6 +106,24 @@ def _run_backup(source_path: Path, destination_path: Path) -> None:
             dest_conn.commit()
 
 
+def _advance_restored_change_stamp(db_path: Path, *, previous_stamp: int | None) -> None:
+    """Move the restored DB's change stamp past the one it replaced.
+
+    A restored file carries its own stamp, which may equal a value other
+    processes already cached results for. Skips files that are not webapp
+    package databases.
+    """
+    with connect_database(db_path) as conn:
+        is_package_db = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'package_tables'"
+        ).fetchone()
+        if is_package_db is None:
+            return
+        install_change_tracking(conn)
+        bump_database_change_stamp(conn, at_least=previous_stamp)
+        conn.commit()
+
+
 def backup_database(
     db_path: Path,
     *,
@@ -189,7 +212,13 @@ def restore_database(
     if destination.parent and str(destination.parent) != ".":
         destination.parent.mkdir(parents=True, exist_ok=True)
 
+    previous_stamp: int | None = None
+    if destination.exists():
+        with connect_database(destination) as conn:
+            previous_stamp = get_database_change_stamp(conn)
+
     _run_backup(source, destination)
+    _advance_restored_change_stamp(destination, previous_stamp=previous_stamp)
     created_at = datetime.now(timezone.utc).isoformat()
     return RestoreResult(
         restored_path=destination,
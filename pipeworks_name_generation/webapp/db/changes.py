@@ -0,0 +1,112 @@
+"""Database change stamps used to invalidate cached query results.
+
+Every write to the package metadata tables bumps a single counter row through
+SQLite triggers, so the stamp changes no matter which process (or connection)
+performed the write. Caches keyed on the stamp read it with one indexed
+``SELECT`` per request and drop their entries when it moves.
+
+``PRAGMA data_version`` is not used because it is per-connection: it ignores
+the connection's own commits and its values are not comparable across the
+pooled connections that serve one process.
+
+Writers that change imported rows without touching the tracked tables must
+call :func:`bump_database_change_stamp` themselves.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+# Tables whose rows describe (or accompany every change to) imported data.
+# Package imports, migrations, and stats recomputes all write at least one.
+_CHANGE_TRACKED_TABLES = (
+    "imported_packages",
+    "package_tables",
+    "package_table_stats",
+    "generation_scope_stats",
+    "pending_imports",
+)
+_CHANGE_TRACKED_EVENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+def install_change_tracking(conn: sqlite3.Connection) -> None:
+    """Create the change counter row and the triggers that bump it.
+
+    Safe to call repeatedly. Tracked tables that do not exist yet are skipped;
+    their triggers are added by a later call once they do. The caller commits.
+
+    Args:
+        conn: Open SQLite connection.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS database_changes (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            change_counter INTEGER NOT NULL
+        )
+        """)
+    conn.execute("INSERT OR IGNORE INTO database_changes (id, change_counter) VALUES (1, 0)")
+    existing = {
+        str(row[0]) for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    for table_name in _CHANGE_TRACKED_TABLES:
+        if table_name not in existing:
+            continue
+        for event in _CHANGE_TRACKED_EVENTS:
+            query = f"""
+                CREATE TRIGGER IF NOT EXISTS {table_name}_{event.lower()}_change_stamp
+                AFTER {event} ON {table_name}
+                BEGIN
+                    UPDATE database_changes
+                    SET change_counter = change_counter + 1
+                    WHERE id = 1;
+                END
+                """  # nosec B608 - fixed table and event names only
+            conn.execute(query)
+
+
+def get_database_change_stamp(conn: sqlite3.Connection) -> int | None:
+    """Return the current change stamp, or ``None`` for untracked databases.
+
+    Databases that have not been initialized with
+    :func:`install_change_tracking` yet (for example a freshly restored older
+    file) report ``None``.
+    """
+    try:
+        row = conn.execute("SELECT change_counter FROM database_changes WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return None if row is None else int(row[0])
+
+
+def bump_database_change_stamp(conn: sqlite3.Connection, *, at_least: int | None = None) -> int:
+    """Advance the change stamp and return its new value. The caller commits.
+
+    Args:
+        conn: Open SQLite connection with change tracking installed.
+        at_least: Optional floor. The stamp becomes greater than both its
+            current value and ``at_least``, which keeps it moving forward when
+            an older database file replaces a newer one.
+
+    Returns:
+        The new change stamp.
+    """
+    floor = -1 if at_least is None else at_least
+    conn.execute(
+        """
+        UPDATE database_changes
+        SET change_counter = MAX(change_counter, ?) + 1
+        WHERE id = 1
+        """,
+        (floor,),
+    )
+    stamp = get_database_change_stamp(conn)
+    if stamp is None:
+        raise RuntimeError("Database change tracking is not installed.")
+    return stamp
+
+
+__all__ = [
+    "install_change_tracking",
+    "get_database_change_stamp",
+    "bump_database_change_stamp",
+]
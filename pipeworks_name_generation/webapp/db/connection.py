@@ -9,12 +9,22 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 
+from pipeworks_name_generation.webapp.metrics import sqlite_connection_factory
 
-def connect_database(db_path: Path) -> sqlite3.Connection:
+
+def connect_database(
+    db_path: Path,
+    *,
+    check_same_thread: bool = True,
+    cached_statements: int = 128,
+) -> sqlite3.Connection:
     """Open a SQLite connection configured for webapp usage.
 
     Args:
         db_path: Filesystem path to the SQLite database file.
+        check_same_thread: Forwarded to ``sqlite3.connect``. Pooled
+            connections shared across worker threads pass ``False``.
+        cached_statements: Prepared-statement cache size for the connection.
 
     Returns:
         Open ``sqlite3.Connection`` with ``sqlite3.Row`` row factory.
@@ -27,12 +37,20 @@ def connect_database(db_path: Path) -> sqlite3.Connection:
         - ``journal_mode = WAL`` to improve concurrent read behavior.
         - ``synchronous = NORMAL`` to balance durability and write latency.
         - ``busy_timeout = 5000`` to reduce transient lock failures.
+
+        While webapp metrics are enabled the connection times every statement
+        (see :mod:`pipeworks_name_generation.webapp.metrics`).
     """
     resolved = db_path.expanduser()
     if resolved.parent and str(resolved.parent) != ".":
         resolved.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(resolved)
+    conn = sqlite3.connect(
+        resolved,
+        check_same_thread=check_same_thread,
+        cached_statements=cached_statements,
+        factory=sqlite_connection_factory(),
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
@@ -1,16 +1,81 @@
-"""Importer workflow for metadata JSON + ZIP package pairs."""
+"""Importer workflow for metadata JSON + ZIP package pairs.
+
+Txt entries are streamed: each entry is decoded incrementally from the ZIP
+stream and inserted in fixed-size ``executemany`` chunks, so peak memory does
+not grow with entry size. ``table``-layout entries get their ``line_number``
+index once their rows are inserted. ``values``-layout entries keep the shared
+``package_values`` indexes in place: rows arrive in ``line_number`` order
+under a new, highest ``package_table_id``, so index maintenance only touches
+the new table's key range instead of the whole database.
+
+Background imports commit after every chunk instead, so other writers only
+wait for one chunk at a time. Their package is listed in ``pending_imports``
+with the importing process id until the final commit, which keeps the
+partial package out of listings. A cancelled or failed import deletes what it
+committed, and packages left by a process that died mid-import are removed
+by the next chunked import.
+"""
 
 from __future__ import annotations
 
+import codecs
+import contextlib
 import json
+import os
 import sqlite3
+import threading
 import zipfile
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 from pipeworks_name_generation.webapp.db.repositories import build_package_table_name
-from pipeworks_name_generation.webapp.db.table_store import create_text_table, insert_text_rows
+from pipeworks_name_generation.webapp.db.stats import PackageStatsAccumulator
+from pipeworks_name_generation.webapp.db.table_store import (
+    STORAGE_LAYOUT_TABLE,
+    STORAGE_LAYOUT_VALUES,
+    STORAGE_LAYOUTS,
+    create_text_table,
+    create_text_table_line_index,
+    insert_package_values,
+    insert_text_rows,
+    quote_identifier,
+)
+from pipeworks_name_generation.webapp.generation_mapping import _scope_keys_for_source_txt_name
+
+# Rows per ``executemany`` call while streaming one txt entry.
+IMPORT_CHUNK_ROWS = 10_000
+# Bytes read from the ZIP stream per incremental decode step.
+IMPORT_READ_BLOCK_BYTES = 64 * 1024
+# Page cache for the import connection (negative = KiB), restored afterwards.
+IMPORT_CACHE_SIZE_KIB = 32 * 1024
+
+# Line boundaries recognised by ``str.splitlines``.
+_LINE_BREAKS = ("\n", "\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+
+class ImportCancelledError(Exception):
+    """Raised when an import is cancelled; its rows are rolled back."""
+
+
+@dataclass(frozen=True)
+class ImportProgress:
+    """Progress snapshot reported after each imported txt entry.
+
+    Attributes:
+        entries_total: Number of txt entries selected for import.
+        entries_processed: Entries whose rows have been inserted.
+        rows_inserted: Rows inserted so far across entries.
+        bytes_total: Uncompressed size of the selected entries.
+        bytes_read: Uncompressed bytes read from processed entries.
+    """
+
+    entries_total: int
+    entries_processed: int
+    rows_inserted: int
+    bytes_total: int
+    bytes_read: int
 
 
 def load_metadata_json(metadata_path: Path) -> dict[str, Any]:
@@ -32,35 +97,182 @@ def load_metadata_json(metadata_path: Path) -> dict[str, Any]:
     return payload
 
 
+def iter_txt_rows(
+    archive: zipfile.ZipFile,
+    entry_name: str,
+    *,
+    block_size: int = IMPORT_READ_BLOCK_BYTES,
+) -> Iterator[tuple[int, str]]:
+    """Stream one txt entry as ``(line_number, value)`` tuples.
+
+    The entry is read in ``block_size`` chunks through an incremental UTF-8
+    decoder, so only one block and one partial line are held at a time. Line
+    numbering matches :meth:`str.splitlines` on the whole decoded entry, and
+    empty or whitespace-only lines are skipped.
+
+    Raises:
+        ValueError: If the entry is missing or not valid UTF-8. Invalid bytes
+            are reported when the stream reaches them, after earlier rows
+            have been yielded.
+    """
+    try:
+        stream = archive.open(entry_name)
+    except KeyError as exc:
+        raise ValueError(f"TXT entry missing from zip: {entry_name}") from exc
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    line_number = 0
+    pending = ""
+    with stream:
+        while True:
+            block = stream.read(block_size)
+            try:
+                text = decoder.decode(block, final=not block)
+            except UnicodeDecodeError as exc:
+                raise ValueError(f"TXT entry is not valid UTF-8: {entry_name}") from exc
+            lines = (pending + text).splitlines(keepends=True)
+            pending = ""
+            # Keep an unterminated tail (or a bare "\r" that may pair with a
+            # "\n" in the next block) until more input arrives.
+            if (
+                block
+                and lines
+                and (not lines[-1].endswith(_LINE_BREAKS) or lines[-1].endswith("\r"))
+            ):
+                pending = lines.pop()
+            for line in lines:
+                line_number += 1
+                text_value = line.strip()
+                if text_value:
+                    yield line_number, text_value
+            if not block:
+                return
+
+
 def read_txt_rows(archive: zipfile.ZipFile, entry_name: str) -> list[tuple[int, str]]:
     """Read one txt entry and return ``(line_number, value)`` tuples.
 
     Empty and whitespace-only lines are skipped during import so DB tables only
-    store meaningful values.
+    store meaningful values. Prefer :func:`iter_txt_rows` for large entries.
     """
+    return list(iter_txt_rows(archive, entry_name))
+
+
+def _chunked(rows: Iterator[tuple[int, str]], size: int) -> Iterator[list[tuple[int, str]]]:
+    chunk: list[tuple[int, str]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@contextlib.contextmanager
+def _bulk_load_pragmas(conn: sqlite3.Connection) -> Iterator[None]:
+    """Enlarge the page cache and keep temp b-trees on disk during an import.
+
+    A bigger cache keeps index pages hot across chunked inserts; file-backed
+    temp storage keeps index rebuild sorts out of process memory. The previous
+    settings are restored afterwards because pooled write connections outlive
+    the import.
+    """
+    cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+    temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+    conn.execute(f"PRAGMA cache_size = {-IMPORT_CACHE_SIZE_KIB:d}")
+    conn.execute("PRAGMA temp_store = FILE")
     try:
-        payload = archive.read(entry_name)
-    except KeyError as exc:
-        raise ValueError(f"TXT entry missing from zip: {entry_name}") from exc
+        yield
+    finally:
+        conn.execute(f"PRAGMA cache_size = {int(cache_size):d}")
+        conn.execute(f"PRAGMA temp_store = {int(temp_store):d}")
+
 
+def _process_start_time(pid: int) -> str | None:
+    """Return the start time of ``pid`` from ``/proc``, or ``None`` if unavailable.
+
+    Together with the pid it identifies one process, so a pid reused by a new
+    process can be told apart from the one that recorded it.
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text(encoding="ascii", errors="replace")
+    except OSError:
+        return None
+    # Field 22 (``starttime``); the command name in field 2 may contain spaces.
+    fields = stat.rsplit(")", 1)[-1].split()
+    return fields[19] if len(fields) > 19 else None
+
+
+def _process_alive(pid: int, started: str | None = None) -> bool:
+    """Return whether ``pid`` names a running process on this host.
+
+    When ``started`` (see :func:`_process_start_time`) is given and the
+    platform reports start times, a process with a different start time is
+    treated as a reuse of the pid, not as the original process.
+    """
+    if os.name == "nt":
+        # ``os.kill`` terminates the target on Windows; assume it is alive.
+        return True
     try:
-        decoded = payload.decode("utf-8")
-    except UnicodeDecodeError as exc:
-        raise ValueError(f"TXT entry is not valid UTF-8: {entry_name}") from exc
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    if started is None:
+        return True
+    current = _process_start_time(pid)
+    return current is None or current == started
+
+
+def _discard_partial_import(conn: sqlite3.Connection, package_id: int) -> None:
+    """Delete a package whose chunked import did not reach its final commit."""
+    tables = conn.execute(
+        "SELECT id, table_name, storage_layout FROM package_tables WHERE package_id = ?",
+        (package_id,),
+    ).fetchall()
+    for row in tables:
+        if str(row[2]) == STORAGE_LAYOUT_VALUES:
+            conn.execute("DELETE FROM package_values WHERE package_table_id = ?", (int(row[0]),))
+        else:
+            conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(str(row[1]))}")  # nosec B608
+    conn.execute("DELETE FROM imported_packages WHERE id = ?", (package_id,))
+    conn.commit()
+
+
+def _discard_stale_imports(conn: sqlite3.Connection) -> int:
+    """Delete partial packages left by importing processes that have exited.
+
+    Returns:
+        Number of packages discarded.
+    """
+    rows = conn.execute("SELECT package_id, import_pid FROM pending_imports").fetchall()
+    stale = [int(row[0]) for row in rows if not _process_alive(int(row[1]))]
+    for package_id in stale:
+        _discard_partial_import(conn, package_id)
+    return len(stale)
+
 
-    rows: list[tuple[int, str]] = []
-    for line_number, line in enumerate(decoded.splitlines(), start=1):
-        text = line.strip()
-        if not text:
-            continue
-        rows.append((line_number, text))
-    return rows
+def _abandon_import(conn: sqlite3.Connection, staged_package_id: int | None) -> None:
+    """Roll back the open transaction and delete any chunks already committed."""
+    conn.rollback()
+    if staged_package_id is not None:
+        _discard_partial_import(conn, staged_package_id)
 
 
 def import_package_pair(
-    conn: sqlite3.Connection, *, metadata_path: Path, zip_path: Path
+    conn: sqlite3.Connection,
+    *,
+    metadata_path: Path,
+    zip_path: Path,
+    storage_layout: str = STORAGE_LAYOUT_TABLE,
+    on_progress: Callable[[ImportProgress], None] | None = None,
+    cancel_event: threading.Event | None = None,
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+    commit_chunks: bool = False,
 ) -> dict[str, Any]:
-    """Import one metadata+zip pair and create one SQLite table per ``*.txt``.
+    """Import one metadata+zip pair and store rows for each ``*.txt``.
 
     The importer ignores JSON files inside the archive. It uses metadata
     ``files_included`` (when provided) to limit which ``*.txt`` entries are
@@ -70,6 +282,24 @@ def import_package_pair(
         conn: Open SQLite connection.
         metadata_path: Path to ``*_metadata.json`` file.
         zip_path: Path to package zip file.
+        storage_layout: ``table`` creates one physical SQLite table per txt
+            file; ``values`` stores rows in the shared ``package_values``
+            table. ``table_name`` is recorded in both cases.
+        on_progress: Optional callback receiving an :class:`ImportProgress`
+            before the first entry and after each imported entry.
+        cancel_event: Optional event checked before each inserted chunk and
+            before commit; when set the import rolls back and raises
+            :class:`ImportCancelledError`.
+        chunk_rows: Rows per ``executemany`` batch while streaming an entry.
+        commit_chunks: Commit after every chunk instead of once at the end,
+            so the database write lock is only held for one chunk at a time.
+            The package stays hidden until the final commit and is deleted
+            if the import fails or is cancelled.
+
+    Rows are streamed from the archive (see :func:`iter_txt_rows`), so memory
+    use does not depend on entry size. Selection statistics for every table
+    and generation scope are written in the final transaction; distinct
+    counts are computed by SQLite from the inserted rows.
 
     Returns:
         API-style summary payload describing imported package and created tables.
@@ -78,7 +308,11 @@ def import_package_pair(
         FileNotFoundError: If metadata or zip path does not exist.
         ValueError: For invalid metadata, duplicate imports, or zip format/data
             issues.
+        ImportCancelledError: If ``cancel_event`` was set before commit.
     """
+    if storage_layout not in STORAGE_LAYOUTS:
+        raise ValueError(f"Unsupported storage layout: {storage_layout!r}")
+
     metadata_resolved = metadata_path.resolve()
     zip_resolved = zip_path.resolve()
 
@@ -102,8 +336,9 @@ def import_package_pair(
         str(name).strip() for name in files_included if str(name).strip().lower().endswith(".txt")
     }
 
+    staged_package_id: int | None = None
     try:
-        with zipfile.ZipFile(zip_resolved, "r") as archive:
+        with zipfile.ZipFile(zip_resolved, "r") as archive, _bulk_load_pragmas(conn):
             entries = sorted(
                 name
                 for name in archive.namelist()
@@ -113,6 +348,31 @@ def import_package_pair(
             if allowed_txt_names:
                 entries = [entry for entry in entries if Path(entry).name in allowed_txt_names]
 
+            entry_sizes = [archive.getinfo(entry).file_size for entry in entries]
+            bytes_total = sum(entry_sizes)
+            bytes_read = 0
+            rows_inserted = 0
+
+            def report(processed: int) -> None:
+                if on_progress is not None:
+                    on_progress(
+                        ImportProgress(
+                            entries_total=len(entries),
+                            entries_processed=processed,
+                            rows_inserted=rows_inserted,
+                            bytes_total=bytes_total,
+                            bytes_read=bytes_read,
+                        )
+                    )
+
+            def check_cancelled() -> None:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ImportCancelledError("Import cancelled.")
+
+            report(0)
+
+            if commit_chunks:
+                _discard_stale_imports(conn)
             cursor = conn.execute(
                 """
                 INSERT INTO imported_packages (
@@ -132,31 +392,82 @@ def import_package_pair(
             if cursor.lastrowid is None:
                 raise RuntimeError("SQLite did not return a row id for imported package insert.")
             package_id = int(cursor.lastrowid)
+            if commit_chunks:
+                conn.execute(
+                    "INSERT INTO pending_imports (package_id, import_pid) VALUES (?, ?)",
+                    (package_id, os.getpid()),
+                )
+                conn.commit()
+                staged_package_id = package_id
 
             created_tables: list[dict[str, Any]] = []
+            stats = PackageStatsAccumulator(package_id, distinct_in_db=True)
             for index, entry_name in enumerate(entries, start=1):
-                txt_rows = read_txt_rows(archive, entry_name)
+                check_cancelled()
                 table_name = build_package_table_name(
                     package_name, Path(entry_name).stem, package_id, index
                 )
-                create_text_table(conn, table_name)
-                insert_text_rows(conn, table_name, txt_rows)
-
-                conn.execute(
+                source_txt_name = Path(entry_name).name
+                class_key, syllable_key = _scope_keys_for_source_txt_name(source_txt_name)
+                table_cursor = conn.execute(
                     """
-                    INSERT INTO package_tables (package_id, source_txt_name, table_name, row_count)
-                    VALUES (?, ?, ?, ?)
+                    INSERT INTO package_tables (
+                        package_id, source_txt_name, table_name, row_count, storage_layout,
+                        class_key, syllable_key
+                    )
+                    VALUES (?, ?, ?, 0, ?, ?, ?)
                     """,
-                    (package_id, Path(entry_name).name, table_name, len(txt_rows)),
+                    (
+                        package_id,
+                        source_txt_name,
+                        table_name,
+                        storage_layout,
+                        class_key,
+                        syllable_key,
+                    ),
+                )
+                if table_cursor.lastrowid is None:
+                    raise RuntimeError("SQLite did not return a row id for package table.")
+                package_table_id = int(table_cursor.lastrowid)
+                if storage_layout != STORAGE_LAYOUT_VALUES:
+                    create_text_table(conn, table_name, line_index=False)
+
+                table_stats = stats.start_table(package_table_id, source_txt_name)
+                for chunk in _chunked(iter_txt_rows(archive, entry_name), chunk_rows):
+                    check_cancelled()
+                    if storage_layout == STORAGE_LAYOUT_VALUES:
+                        insert_package_values(conn, package_table_id, chunk)
+                    else:
+                        insert_text_rows(conn, table_name, chunk)
+                    table_stats.update(value for _, value in chunk)
+                    if commit_chunks:
+                        conn.commit()
+
+                if storage_layout != STORAGE_LAYOUT_VALUES:
+                    create_text_table_line_index(conn, table_name)
+                conn.execute(
+                    "UPDATE package_tables SET row_count = ? WHERE id = ?",
+                    (table_stats.row_count, package_table_id),
                 )
+                if commit_chunks:
+                    conn.commit()
                 created_tables.append(
                     {
-                        "source_txt_name": Path(entry_name).name,
+                        "source_txt_name": source_txt_name,
                         "table_name": table_name,
-                        "row_count": len(txt_rows),
+                        "row_count": table_stats.row_count,
+                        "storage_layout": storage_layout,
                     }
                 )
+                rows_inserted += table_stats.row_count
+                bytes_read += entry_sizes[index - 1]
+                report(index)
 
+            check_cancelled()
+            stats.write(conn)
+            if commit_chunks:
+                conn.execute("DELETE FROM pending_imports WHERE package_id = ?", (package_id,))
+            check_cancelled()
             conn.commit()
             return {
                 "message": f"Imported package '{package_name}' with {len(created_tables)} txt table(s).",
@@ -165,14 +476,22 @@ def import_package_pair(
                 "tables": created_tables,
             }
     except sqlite3.IntegrityError as exc:
-        conn.rollback()
+        _abandon_import(conn, staged_package_id)
         raise ValueError("This metadata/zip pair has already been imported.") from exc
     except zipfile.BadZipFile as exc:
-        conn.rollback()
+        _abandon_import(conn, staged_package_id)
         raise ValueError(f"Invalid ZIP file: {zip_resolved}") from exc
     except Exception:
-        conn.rollback()
+        _abandon_import(conn, staged_package_id)
         raise
 
 
-__all__ = ["load_metadata_json", "read_txt_rows", "import_package_pair"]
+__all__ = [
+    "ImportCancelledError",
+    "ImportProgress",
+    "IMPORT_CHUNK_ROWS",
+    "load_metadata_json",
+    "iter_txt_rows",
+    "read_txt_rows",
+    "import_package_pair",
+]
@@ -0,0 +1,162 @@
+"""Storage-layout migration for imported package rows.
+
+Moves package tables from the legacy layout (one physical SQLite table per
+imported ``*.txt``) into the consolidated ``package_values`` table.
+
+The migration is safe to run against a live database: each package table is
+copied and flipped to ``storage_layout = 'values'`` in its own transaction, so
+concurrent readers always observe either the complete legacy table or the
+complete consolidated rows. Legacy tables are kept by default and can be
+dropped in the same run (``drop_legacy_tables=True``) or in a later pass once
+no reader can still hold the old layout. Values and their order are preserved,
+so cached generation results stay valid across the migration.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .table_store import STORAGE_LAYOUT_TABLE, STORAGE_LAYOUT_VALUES, quote_identifier
+
+
+@dataclass(frozen=True)
+class LayoutMigrationResult:
+    """Summary of one :func:`migrate_to_values_layout` run.
+
+    Attributes:
+        migrated_tables: Package tables moved into ``package_values``.
+        migrated_rows: Rows copied into ``package_values``.
+        dropped_tables: Legacy physical tables dropped.
+        skipped_tables: Legacy entries whose physical table no longer exists.
+    """
+
+    migrated_tables: int
+    migrated_rows: int
+    dropped_tables: int
+    skipped_tables: int
+
+
+def _physical_table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table_name,),
+    ).fetchone()
+    return row is not None
+
+
+def migrate_to_values_layout(
+    conn: sqlite3.Connection,
+    *,
+    package_id: int | None = None,
+    drop_legacy_tables: bool = False,
+    on_table_migrated: Callable[[dict[str, Any]], None] | None = None,
+) -> LayoutMigrationResult:
+    """Copy legacy per-txt tables into ``package_values``.
+
+    Args:
+        conn: Open SQLite connection with the current schema initialized.
+        package_id: Optional package id to limit the migration scope.
+        drop_legacy_tables: When ``True``, drop each legacy physical table once
+            its rows are copied, and drop leftovers from earlier runs.
+        on_table_migrated: Optional callback receiving ``id``,
+            ``table_name``, and ``rows`` after each committed table.
+
+    Returns:
+        Migration counters.
+    """
+    query = """
+        SELECT id, table_name
+        FROM package_tables
+        WHERE storage_layout = ?
+          AND package_id NOT IN (SELECT package_id FROM pending_imports)
+        """
+    params: list[Any] = [STORAGE_LAYOUT_TABLE]
+    if package_id is not None:
+        query += " AND package_id = ?"
+        params.append(package_id)
+    query += " ORDER BY id"
+    pending = conn.execute(query, params).fetchall()
+
+    migrated_tables = 0
+    migrated_rows = 0
+    dropped_tables = 0
+    skipped_tables = 0
+    for row in pending:
+        table_id = int(row["id"])
+        table_name = str(row["table_name"])
+        if not _physical_table_exists(conn, table_name):
+            skipped_tables += 1
+            continue
+
+        quoted = quote_identifier(table_name)
+        try:
+            # Clear partial rows from an interrupted earlier attempt.
+            conn.execute("DELETE FROM package_values WHERE package_table_id = ?", (table_id,))
+            cursor = conn.execute(
+                f"""
+                INSERT INTO package_values (package_table_id, line_number, value)
+                SELECT ?, line_number, value
+                FROM {quoted}
+                ORDER BY line_number, id
+                """,  # nosec B608
+                (table_id,),
+            )
+            conn.execute(
+                "UPDATE package_tables SET storage_layout = ? WHERE id = ?",
+                (STORAGE_LAYOUT_VALUES, table_id),
+            )
+            if drop_legacy_tables:
+                conn.execute(f"DROP TABLE {quoted}")  # nosec B608
+                dropped_tables += 1
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        copied = max(int(cursor.rowcount), 0)
+        migrated_tables += 1
+        migrated_rows += copied
+        if on_table_migrated is not None:
+            on_table_migrated({"id": table_id, "table_name": table_name, "rows": copied})
+
+    if drop_legacy_tables:
+        dropped_tables += drop_migrated_legacy_tables(conn, package_id=package_id)
+
+    return LayoutMigrationResult(
+        migrated_tables=migrated_tables,
+        migrated_rows=migrated_rows,
+        dropped_tables=dropped_tables,
+        skipped_tables=skipped_tables,
+    )
+
+
+def drop_migrated_legacy_tables(conn: sqlite3.Connection, *, package_id: int | None = None) -> int:
+    """Drop physical tables left behind by already-migrated package tables.
+
+    Returns:
+        Number of dropped tables.
+    """
+    query = "SELECT table_name FROM package_tables WHERE storage_layout = ?"
+    params: list[Any] = [STORAGE_LAYOUT_VALUES]
+    if package_id is not None:
+        query += " AND package_id = ?"
+        params.append(package_id)
+    table_names = [str(row["table_name"]) for row in conn.execute(query, params).fetchall()]
+
+    dropped = 0
+    for table_name in table_names:
+        if not _physical_table_exists(conn, table_name):
+            continue
+        conn.execute(f"DROP TABLE {quote_identifier(table_name)}")  # nosec B608
+        conn.commit()
+        dropped += 1
+    return dropped
+
+
+__all__ = [
+    "LayoutMigrationResult",
+    "migrate_to_values_layout",
+    "drop_migrated_legacy_tables",
+]
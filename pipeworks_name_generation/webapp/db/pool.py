@@ -0,0 +1,319 @@
+"""Persistent SQLite connection pool for webapp request handling.
+
+``connect_database`` opens a fresh connection (directory check, connect, four
+PRAGMA round-trips) for every request. The pool keeps connections open across
+requests instead:
+
+- one read connection per worker thread, opened read-only (``mode=ro``) so GET
+  routes can never write by accident and each thread keeps its own warm
+  statement cache;
+- one shared writer connection, serialized by a lock, for routes that mutate
+  the database.
+
+Leases returned by :meth:`ConnectionPool.read` and :meth:`ConnectionPool.write`
+are context managers with the same commit/rollback semantics as
+``with sqlite3.connect(...) as conn``, so route modules can use them wherever
+they accept a ``connect_database`` callable. Connections are never closed on
+lease exit. After the database file is replaced, call
+:func:`reset_connection_pools`: it bumps the pool generation and each thread
+closes its own stale reader on its next lease, so connections another thread
+is still using are never closed underneath it. Call
+:func:`close_connection_pools` on shutdown.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from pipeworks_name_generation.webapp.metrics import sqlite_connection_factory
+
+from .connection import connect_database
+
+DEFAULT_CACHED_STATEMENTS = 256
+
+
+@dataclass(frozen=True)
+class ConnectionPoolStats:
+    """Point-in-time counters for one :class:`ConnectionPool`.
+
+    Attributes:
+        db_path: Resolved database path served by the pool.
+        reader_connections: Open per-thread read connections.
+        reader_opens: Read connections opened since the pool was created.
+        reader_leases: Read leases handed out.
+        read_only: Whether the most recently opened read connection uses
+            ``mode=ro`` (``False`` means the ``PRAGMA query_only`` fallback
+            was needed for it).
+        writer_open: Whether the shared writer connection is open.
+        writer_leases: Writer leases handed out.
+        writer_wait_seconds: Total time spent waiting for the writer lock.
+        active_leases: Leases currently held.
+    """
+
+    db_path: str
+    reader_connections: int
+    reader_opens: int
+    reader_leases: int
+    read_only: bool
+    writer_open: bool
+    writer_leases: int
+    writer_wait_seconds: float
+    active_leases: int
+
+
+class _Lease:
+    """Context manager wrapping one pooled connection checkout."""
+
+    def __init__(self, pool: ConnectionPool, conn: sqlite3.Connection, *, writer: bool) -> None:
+        self._pool = pool
+        self._conn = conn
+        self._writer = writer
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self._conn
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self._pool._release(writer=self._writer)
+
+
+class ConnectionPool:
+    """Reuse SQLite connections for one database path across requests.
+
+    Args:
+        db_path: SQLite database file path.
+        cached_statements: Prepared-statement cache size per connection.
+    """
+
+    def __init__(self, db_path: Path, *, cached_statements: int = DEFAULT_CACHED_STATEMENTS):
+        self.db_path = db_path.expanduser().resolve()
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writer_lock = threading.Lock()
+        self._writer: sqlite3.Connection | None = None
+        self._readers: list[sqlite3.Connection] = []
+        self._read_only = True
+        self._reader_opens = 0
+        self._reader_leases = 0
+        self._writer_leases = 0
+        self._writer_wait_seconds = 0.0
+        self._active_leases = 0
+        self._generation = 0
+
+    def read(self, _db_path: Path | None = None) -> _Lease:
+        """Lease this thread's read-only connection.
+
+        The optional path argument lets the bound method stand in for
+        ``connect_database(db_path)`` in route dependency injection.
+        """
+        conn = self._thread_reader()
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        with self._lock:
+            self._reader_leases += 1
+            self._active_leases += 1
+        return _Lease(self, conn, writer=False)
+
+    def write(self, _db_path: Path | None = None) -> _Lease:
+        """Lease the shared writer connection, blocking until it is free."""
+        started = time.perf_counter()
+        self._writer_lock.acquire()
+        waited = time.perf_counter() - started
+        try:
+            if self._writer is None:
+                self._writer = self._open_writer()
+        except BaseException:
+            self._writer_lock.release()
+            raise
+        with self._lock:
+            self._writer_leases += 1
+            self._writer_wait_seconds += waited
+            self._active_leases += 1
+        return _Lease(self, self._writer, writer=True)
+
+    def stats(self) -> ConnectionPoolStats:
+        """Return a snapshot of pool counters."""
+        with self._lock:
+            return ConnectionPoolStats(
+                db_path=str(self.db_path),
+                reader_connections=len(self._readers),
+                reader_opens=self._reader_opens,
+                reader_leases=self._reader_leases,
+                read_only=self._read_only,
+                writer_open=self._writer is not None,
+                writer_leases=self._writer_leases,
+                writer_wait_seconds=round(self._writer_wait_seconds, 6),
+                active_leases=self._active_leases,
+            )
+
+    def reset(self) -> None:
+        """Make every thread reopen its connections on its next lease.
+
+        Use after the database file was replaced (for example by a restore).
+        The writer is closed once no lease holds it; read connections stay
+        open until their owning thread leases again and closes its stale
+        reader itself, so queries already running on other threads finish on
+        the connection they started with.
+        """
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            with self._lock:
+                self._generation += 1
+
+    def close(self) -> None:
+        """Close every pooled connection on shutdown.
+
+        Only call this once no other thread holds a lease; use :meth:`reset`
+        while requests are still being served. Threads that lease again
+        afterwards transparently reopen connections.
+        """
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._lock:
+            readers, self._readers = self._readers, []
+            self._generation += 1
+        for conn in readers:
+            conn.close()
+
+    def _release(self, *, writer: bool) -> None:
+        with self._lock:
+            self._active_leases -= 1
+        if writer:
+            self._writer_lock.release()
+        else:
+            self._local.depth -= 1
+
+    def _thread_reader(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            if getattr(self._local, "generation", -1) == self._generation:
+                return conn
+            if getattr(self._local, "depth", 0) > 0:
+                # An outer lease on this thread still uses the stale reader.
+                return conn
+            with self._lock:
+                if conn in self._readers:
+                    self._readers.remove(conn)
+            conn.close()
+        conn = self._open_reader()
+        self._local.conn = conn
+        self._local.generation = self._generation
+        with self._lock:
+            self._readers.append(conn)
+            self._reader_opens += 1
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        # ``mode=ro`` is retried for every new reader: a failure can be
+        # transient (the file briefly missing during a restore, for example).
+        try:
+            conn = sqlite3.connect(
+                f"{self.db_path.as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+                factory=sqlite_connection_factory(),
+            )
+            conn.execute("PRAGMA schema_version").fetchone()
+            self._read_only = True
+        except sqlite3.OperationalError:
+            # Some filesystems reject read-only URI connections; fall back to a
+            # plain connection that SQLite itself refuses to write through.
+            self._read_only = False
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+                factory=sqlite_connection_factory(),
+            )
+            conn.execute("PRAGMA query_only = ON")
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _open_writer(self) -> sqlite3.Connection:
+        return connect_database(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+
+
+_POOLS: dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_connection_pool(db_path: Path) -> ConnectionPool:
+    """Return the process-wide pool for ``db_path``, creating it on first use."""
+    key = str(db_path.expanduser().resolve())
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _POOLS[key] = pool
+        return pool
+
+
+def get_connection_pool_stats() -> list[dict[str, Any]]:
+    """Return stats for every pool created in this process."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    return [asdict(pool.stats()) for pool in pools]
+
+
+def reset_connection_pools(db_path: Path) -> None:
+    """Reset the pool for ``db_path`` after its database file was replaced.
+
+    Safe while other threads hold leases; see :meth:`ConnectionPool.reset`.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(str(db_path.expanduser().resolve()))
+    if pool is not None:
+        pool.reset()
+
+
+def close_connection_pools(db_path: Path | None = None) -> None:
+    """Close pooled connections for one database path or for every pool.
+
+    Intended for shutdown; use :func:`reset_connection_pools` while serving.
+    """
+    with _POOLS_LOCK:
+        if db_path is None:
+            pools = list(_POOLS.values())
+            _POOLS.clear()
+        else:
+            pool = _POOLS.pop(str(db_path.expanduser().resolve()), None)
+            pools = [pool] if pool is not None else []
+    for pool in pools:
+        pool.close()
+
+
+__all__ = [
+    "ConnectionPool",
+    "ConnectionPoolStats",
+    "get_connection_pool",
+    "get_connection_pool_stats",
+    "reset_connection_pools",
+    "close_connection_pools",
+]
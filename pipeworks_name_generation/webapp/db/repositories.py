@@ -34,6 +34,7 @@ def list_packages(conn: sqlite3.Connection) -> list[dict[str, Any]]:
     rows = conn.execute("""
         SELECT id, package_name, imported_at
         FROM imported_packages
+        WHERE id NOT IN (SELECT package_id FROM pending_imports)
         ORDER BY id DESC
         """).fetchall()
     return [
@@ -50,7 +51,7 @@ def list_package_tables(conn: sqlite3.Connection, package_id: int) -> list[dict[
     """Return txt tables for one package id."""
     rows = conn.execute(
         """
-        SELECT id, source_txt_name, table_name, row_count
+        SELECT id, source_txt_name, table_name, row_count, storage_layout
         FROM package_tables
         WHERE package_id = ?
         ORDER BY source_txt_name
@@ -63,6 +64,7 @@ def list_package_tables(conn: sqlite3.Connection, package_id: int) -> list[dict[
             "source_txt_name": str(row["source_txt_name"]),
             "table_name": str(row["table_name"]),
             "row_count": int(row["row_count"]),
+            "storage_layout": str(row["storage_layout"]),
         }
         for row in rows
     ]
@@ -72,7 +74,7 @@ def get_package_table(conn: sqlite3.Connection, table_id: int) -> dict[str, Any]
     """Return one package table metadata row by id."""
     row = conn.execute(
         """
-        SELECT id, package_id, source_txt_name, table_name, row_count
+        SELECT id, package_id, source_txt_name, table_name, row_count, storage_layout
         FROM package_tables
         WHERE id = ?
         """,
@@ -87,6 +89,7 @@ def get_package_table(conn: sqlite3.Connection, table_id: int) -> dict[str, Any]
         "source_txt_name": str(row["source_txt_name"]),
         "table_name": str(row["table_name"]),
         "row_count": int(row["row_count"]),
+        "storage_layout": str(row["storage_layout"]),
     }
 
 
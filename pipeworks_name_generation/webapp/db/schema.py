@@ -4,10 +4,29 @@ from __future__ import annotations
 
 import sqlite3
 
+from pipeworks_name_generation.webapp.generation_mapping import _scope_keys_for_source_txt_name
+
+from .changes import install_change_tracking
+from .table_store import STORAGE_LAYOUT_TABLE, create_text_table_line_index
+
 
 def initialize_schema(conn: sqlite3.Connection) -> None:
     """Create metadata tables used by import and database browsing.
 
+    ``package_values`` holds imported rows for tables stored with the
+    consolidated ``values`` layout; ``package_tables.storage_layout`` records
+    which layout each imported txt uses. Older databases gain the column on
+    first initialization, and unmapped rows get their persisted generation
+    ``class_key``/``syllable_key`` backfilled. ``package_table_stats`` and
+    ``generation_scope_stats`` hold selection statistics materialized at import
+    time. ``pending_imports`` lists packages a chunked import is still
+    committing; they stay hidden until the import finishes. ``import_jobs``
+    holds background import job state so every server process can report
+    and cancel a job. Physical txt tables imported before keyset pagination gain their
+    ``line_number`` index here. Triggers on the metadata tables bump the
+    database change stamp that cross-process caches key on (see
+    :mod:`~pipeworks_name_generation.webapp.db.changes`).
+
     Args:
         conn: Open SQLite connection.
     """
@@ -39,8 +58,145 @@ def initialize_schema(conn: sqlite3.Connection) -> None:
 
         CREATE INDEX IF NOT EXISTS idx_imported_packages_imported_at
         ON imported_packages(imported_at);
+
+        CREATE TABLE IF NOT EXISTS package_values (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            package_table_id INTEGER NOT NULL,
+            line_number INTEGER NOT NULL,
+            value TEXT NOT NULL,
+            FOREIGN KEY(package_table_id) REFERENCES package_tables(id) ON DELETE CASCADE
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_package_values_table_line
+        ON package_values(package_table_id, line_number, value);
+
+        CREATE INDEX IF NOT EXISTS idx_package_values_table_value
+        ON package_values(package_table_id, value);
+
+        CREATE TABLE IF NOT EXISTS package_table_stats (
+            package_table_id INTEGER PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            distinct_count INTEGER NOT NULL,
+            length_histogram TEXT NOT NULL,
+            computed_at TEXT NOT NULL,
+            FOREIGN KEY(package_table_id) REFERENCES package_tables(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS generation_scope_stats (
+            package_id INTEGER NOT NULL,
+            class_key TEXT NOT NULL,
+            syllable_key TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            distinct_count INTEGER NOT NULL,
+            length_histogram TEXT NOT NULL,
+            computed_at TEXT NOT NULL,
+            PRIMARY KEY(package_id, class_key, syllable_key),
+            FOREIGN KEY(package_id) REFERENCES imported_packages(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS pending_imports (
+            package_id INTEGER PRIMARY KEY,
+            import_pid INTEGER NOT NULL,
+            FOREIGN KEY(package_id) REFERENCES imported_packages(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS import_jobs (
+            job_id TEXT PRIMARY KEY,
+            owner_pid INTEGER NOT NULL,
+            owner_started TEXT,
+            status TEXT NOT NULL,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            payload TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        """)
+    # Keep schema migrations lightweight by adding missing columns when upgrading
+    # older package databases in place.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(package_tables)").fetchall()}
+    if "storage_layout" not in columns:
+        conn.execute(
+            "ALTER TABLE package_tables ADD COLUMN storage_layout TEXT NOT NULL DEFAULT 'table'"
+        )
+    if "class_key" not in columns:
+        conn.execute("ALTER TABLE package_tables ADD COLUMN class_key TEXT")
+    if "syllable_key" not in columns:
+        conn.execute("ALTER TABLE package_tables ADD COLUMN syllable_key TEXT")
+    job_columns = {row[1] for row in conn.execute("PRAGMA table_info(import_jobs)").fetchall()}
+    if "owner_started" not in job_columns:
+        conn.execute("ALTER TABLE import_jobs ADD COLUMN owner_started TEXT")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_package_tables_scope
+        ON package_tables(package_id, class_key, syllable_key)
         """)
+    backfill_package_table_scope_keys(conn)
+    backfill_text_table_line_indexes(conn)
+    install_change_tracking(conn)
     conn.commit()
 
 
-__all__ = ["initialize_schema"]
+def backfill_package_table_scope_keys(
+    conn: sqlite3.Connection, *, package_id: int | None = None
+) -> int:
+    """Populate ``class_key``/``syllable_key`` for rows that were never mapped.
+
+    Rows imported before the columns existed (or inserted without them) keep
+    ``NULL`` keys until this runs. The caller commits.
+
+    Args:
+        conn: Open SQLite connection.
+        package_id: Optional package id to limit the backfill scope.
+
+    Returns:
+        Number of updated ``package_tables`` rows.
+    """
+    query = "SELECT id, source_txt_name FROM package_tables WHERE class_key IS NULL"
+    params: list[int] = []
+    if package_id is not None:
+        query += " AND package_id = ?"
+        params.append(package_id)
+    updates = [
+        (*_scope_keys_for_source_txt_name(str(row[1])), int(row[0]))
+        for row in conn.execute(query, params).fetchall()
+    ]
+    conn.executemany(
+        "UPDATE package_tables SET class_key = ?, syllable_key = ? WHERE id = ?",
+        updates,
+    )
+    return len(updates)
+
+
+def backfill_text_table_line_indexes(conn: sqlite3.Connection) -> int:
+    """Create missing ``line_number`` indexes on ``table``-layout txt tables.
+
+    Tables imported before keyset pagination have no index to seek on. Tables
+    listed in ``package_tables`` but already dropped (for example after a
+    layout migration) are skipped. The caller commits.
+
+    Returns:
+        Number of indexes created.
+    """
+    existing = {
+        (str(row[0]), str(row[1]))
+        for row in conn.execute("SELECT type, name FROM sqlite_master").fetchall()
+    }
+    rows = conn.execute(
+        "SELECT table_name FROM package_tables WHERE storage_layout = ?",
+        (STORAGE_LAYOUT_TABLE,),
+    ).fetchall()
+    created = 0
+    for row in rows:
+        table_name = str(row[0])
+        if ("table", table_name) not in existing:
+            continue
+        if ("index", f"{table_name}_line_idx") in existing:
+            continue
+        create_text_table_line_index(conn, table_name)
+        created += 1
+    return created
+
+
+__all__ = [
+    "initialize_schema",
+    "backfill_package_table_scope_keys",
+    "backfill_text_table_line_indexes",
+]
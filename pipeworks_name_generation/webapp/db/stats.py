@@ -0,0 +1,349 @@
+"""Materialized value statistics for imported package tables.
+
+Selection statistics (row count, distinct count, and value-length histogram)
+are computed once when a package is imported and stored in two metadata
+tables:
+
+- ``package_table_stats``: one row per imported txt table.
+- ``generation_scope_stats``: one row per ``(package_id, class_key,
+  syllable_key)`` generation scope, aggregated across every table in the scope.
+
+Read paths can then answer selection-stats requests with a primary-key lookup
+instead of scanning value tables. Databases imported before stats existed can
+be backfilled with :func:`recompute_package_stats`.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from pipeworks_name_generation.webapp.generation_mapping import (
+    _extract_syllable_option_from_source_txt_name,
+    _map_source_txt_name_to_generation_class,
+)
+
+from .table_store import STORAGE_LAYOUT_VALUES, quote_identifier, read_package_values
+
+
+def _scope_key(source_txt_name: str) -> tuple[str, str] | None:
+    """Return the ``(class_key, syllable_key)`` scope of a txt name, if mapped."""
+    class_key = _map_source_txt_name_to_generation_class(source_txt_name)
+    syllable_key = _extract_syllable_option_from_source_txt_name(source_txt_name)
+    if class_key is None or syllable_key is None:
+        return None
+    return class_key, syllable_key
+
+
+def encode_length_histogram(histogram: Counter[int]) -> str:
+    """Serialize a value-length histogram as compact JSON with sorted keys."""
+    return json.dumps({str(length): histogram[length] for length in sorted(histogram)})
+
+
+def decode_length_histogram(raw: str | None) -> dict[str, int]:
+    """Parse a stored histogram; missing or invalid payloads decode to ``{}``."""
+    if not raw:
+        return {}
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    return {str(key): int(value) for key, value in payload.items()}
+
+
+@dataclass
+class TableStatsAccumulator:
+    """Running statistics for one imported txt table.
+
+    Feed values with :meth:`update` as often as needed; the histogram and row
+    count are incremental. ``distinct_values`` is ``None`` when the owning
+    :class:`PackageStatsAccumulator` counts distinct values in SQLite instead.
+    """
+
+    package_table_id: int
+    source_txt_name: str
+    row_count: int = 0
+    histogram: Counter[int] = field(default_factory=Counter)
+    distinct_values: set[str] | None = field(default_factory=set)
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add one batch of values to the table statistics."""
+        for value in values:
+            self.row_count += 1
+            self.histogram[len(value)] += 1
+            if self.distinct_values is not None:
+                self.distinct_values.add(value)
+
+
+def _value_source_query(
+    package_table_id: int, table_name: str, storage_layout: str
+) -> tuple[str, tuple[int, ...]]:
+    """Return ``SELECT value`` SQL (and parameters) for one stored table."""
+    if storage_layout == STORAGE_LAYOUT_VALUES:
+        return "SELECT value FROM package_values WHERE package_table_id = ?", (package_table_id,)
+    return f"SELECT value FROM {quote_identifier(table_name)}", ()  # nosec B608
+
+
+class PackageStatsAccumulator:
+    """Collect per-table and per-scope statistics for one package.
+
+    Tables are fed one at a time so callers never need every value of a
+    package in memory at once. By default the distinct values of each table
+    are retained until :meth:`write` runs; with ``distinct_in_db=True`` only
+    row counts and histograms are kept and distinct counts are computed by
+    SQLite from the rows already inserted in the same transaction, so memory
+    stays constant however large a table is.
+
+    Args:
+        package_id: Imported package id the statistics belong to.
+        distinct_in_db: Count distinct values with SQL in :meth:`write`.
+    """
+
+    def __init__(self, package_id: int, *, distinct_in_db: bool = False) -> None:
+        self.package_id = package_id
+        self.distinct_in_db = distinct_in_db
+        self._tables: list[TableStatsAccumulator] = []
+
+    def start_table(self, package_table_id: int, source_txt_name: str) -> TableStatsAccumulator:
+        """Register one imported txt table and return its running statistics."""
+        table = TableStatsAccumulator(
+            package_table_id,
+            source_txt_name,
+            distinct_values=None if self.distinct_in_db else set(),
+        )
+        self._tables.append(table)
+        return table
+
+    def add_table(self, package_table_id: int, source_txt_name: str, values: Iterable[str]) -> None:
+        """Record statistics for one imported txt table."""
+        self.start_table(package_table_id, source_txt_name).update(values)
+
+    def _table_sources(self, conn: sqlite3.Connection) -> dict[int, tuple[str, tuple[int, ...]]]:
+        rows = conn.execute(
+            "SELECT id, table_name, storage_layout FROM package_tables WHERE package_id = ?",
+            (self.package_id,),
+        ).fetchall()
+        return {
+            int(row[0]): _value_source_query(int(row[0]), str(row[1]), str(row[2])) for row in rows
+        }
+
+    def _distinct_counts(
+        self, conn: sqlite3.Connection
+    ) -> tuple[dict[int, int], dict[tuple[str, str], int]]:
+        """Return distinct counts per table id and per generation scope."""
+        scopes: dict[tuple[str, str], list[TableStatsAccumulator]] = {}
+        for table in self._tables:
+            scope_key = _scope_key(table.source_txt_name)
+            if scope_key is not None:
+                scopes.setdefault(scope_key, []).append(table)
+
+        if not self.distinct_in_db:
+            per_table = {
+                table.package_table_id: len(table.distinct_values or ()) for table in self._tables
+            }
+            per_scope = {
+                key: len(set().union(*(table.distinct_values or () for table in tables)))
+                for key, tables in scopes.items()
+            }
+            return per_table, per_scope
+
+        sources = self._table_sources(conn)
+
+        def count_distinct(table_ids: list[int]) -> int:
+            parts = [sources[table_id] for table_id in table_ids]
+            union = " UNION ALL ".join(query for query, _ in parts)
+            params = tuple(param for _, table_params in parts for param in table_params)
+            query = f"SELECT COUNT(DISTINCT value) FROM ({union})"  # nosec B608 - quoted names
+            return int(conn.execute(query, params).fetchone()[0])
+
+        per_table = {
+            table.package_table_id: count_distinct([table.package_table_id])
+            for table in self._tables
+        }
+        per_scope = {
+            key: count_distinct([table.package_table_id for table in tables])
+            for key, tables in scopes.items()
+        }
+        return per_table, per_scope
+
+    def write(self, conn: sqlite3.Connection) -> int:
+        """Replace stored statistics for the package (caller commits).
+
+        Returns:
+            Number of generation scopes written.
+        """
+        computed_at = datetime.now(timezone.utc).isoformat()
+        distinct_per_table, distinct_per_scope = self._distinct_counts(conn)
+
+        scope_rows: dict[tuple[str, str], int] = {}
+        scope_histograms: dict[tuple[str, str], Counter[int]] = {}
+        for table in self._tables:
+            scope_key = _scope_key(table.source_txt_name)
+            if scope_key is None:
+                continue
+            scope_rows[scope_key] = scope_rows.get(scope_key, 0) + table.row_count
+            scope_histograms.setdefault(scope_key, Counter()).update(table.histogram)
+
+        conn.execute(
+            """
+            DELETE FROM package_table_stats
+            WHERE package_table_id IN (SELECT id FROM package_tables WHERE package_id = ?)
+            """,
+            (self.package_id,),
+        )
+        conn.execute(
+            "DELETE FROM generation_scope_stats WHERE package_id = ?",
+            (self.package_id,),
+        )
+        conn.executemany(
+            """
+            INSERT INTO package_table_stats (
+                package_table_id, row_count, distinct_count, length_histogram, computed_at
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    table.package_table_id,
+                    table.row_count,
+                    distinct_per_table[table.package_table_id],
+                    encode_length_histogram(table.histogram),
+                    computed_at,
+                )
+                for table in self._tables
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO generation_scope_stats (
+                package_id, class_key, syllable_key, row_count, distinct_count,
+                length_histogram, computed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    self.package_id,
+                    class_key,
+                    syllable_key,
+                    scope_rows[(class_key, syllable_key)],
+                    distinct_per_scope[(class_key, syllable_key)],
+                    encode_length_histogram(scope_histograms[(class_key, syllable_key)]),
+                    computed_at,
+                )
+                for class_key, syllable_key in sorted(scope_rows)
+            ],
+        )
+        return len(scope_rows)
+
+
+def get_scope_stats(
+    conn: sqlite3.Connection, *, package_id: int, class_key: str, syllable_key: str
+) -> dict[str, Any] | None:
+    """Return materialized statistics for one generation scope, if stored.
+
+    Returns:
+        ``{"row_count", "distinct_count", "length_histogram"}`` or ``None``
+        when the package has no materialized statistics for the scope.
+    """
+    row = conn.execute(
+        """
+        SELECT row_count, distinct_count, length_histogram
+        FROM generation_scope_stats
+        WHERE package_id = ? AND class_key = ? AND syllable_key = ?
+        """,
+        (package_id, class_key, syllable_key),
+    ).fetchone()
+    if row is None:
+        return None
+    return {
+        "row_count": int(row[0]),
+        "distinct_count": int(row[1]),
+        "length_histogram": decode_length_histogram(row[2]),
+    }
+
+
+def package_has_stats(conn: sqlite3.Connection, package_id: int) -> bool:
+    """Return ``True`` when statistics were materialized for ``package_id``."""
+    row = conn.execute(
+        """
+        SELECT 1
+        FROM package_table_stats AS s
+        INNER JOIN package_tables AS t ON t.id = s.package_table_id
+        WHERE t.package_id = ?
+        LIMIT 1
+        """,
+        (package_id,),
+    ).fetchone()
+    return row is not None
+
+
+def recompute_package_stats(
+    conn: sqlite3.Connection, *, package_id: int | None = None
+) -> dict[str, int]:
+    """Rebuild materialized statistics from stored values.
+
+    Each package is recomputed and committed in its own transaction.
+
+    Args:
+        conn: Open SQLite connection.
+        package_id: Optional package id; when omitted every package is rebuilt.
+
+    Returns:
+        Counters with ``packages``, ``tables``, and ``scopes`` processed.
+    """
+    if package_id is None:
+        package_ids = [
+            int(row[0])
+            for row in conn.execute(
+                "SELECT id FROM imported_packages WHERE id NOT IN "
+                "(SELECT package_id FROM pending_imports)"
+            )
+        ]
+    else:
+        package_ids = [package_id]
+
+    totals = {"packages": 0, "tables": 0, "scopes": 0}
+    for current_id in package_ids:
+        tables = conn.execute(
+            """
+            SELECT id, source_txt_name, table_name, storage_layout
+            FROM package_tables
+            WHERE package_id = ?
+            ORDER BY id
+            """,
+            (current_id,),
+        ).fetchall()
+        accumulator = PackageStatsAccumulator(current_id)
+        for table in tables:
+            table_id = int(table[0])
+            if table[3] == STORAGE_LAYOUT_VALUES:
+                values = read_package_values(conn, [table_id])[table_id]
+            else:
+                query = f"SELECT value FROM {quote_identifier(str(table[2]))}"  # nosec B608
+                values = [str(row[0]) for row in conn.execute(query)]
+            accumulator.add_table(table_id, str(table[1]), values)
+        try:
+            totals["scopes"] += accumulator.write(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        totals["packages"] += 1
+        totals["tables"] += len(tables)
+    return totals
+
+
+__all__ = [
+    "PackageStatsAccumulator",
+    "TableStatsAccumulator",
+    "encode_length_histogram",
+    "decode_length_histogram",
+    "get_scope_stats",
+    "package_has_stats",
+    "recompute_package_stats",
+]
@@ -1,14 +1,33 @@
-"""Low-level helpers for dynamic imported text tables.
+"""Low-level helpers for imported text rows.
 
-Each imported ``*.txt`` file gets mapped to one physical SQLite table.
-This module owns identifier safety and row-level table operations.
+Imported ``*.txt`` files use one of two storage layouts, recorded per row in
+``package_tables.storage_layout``:
+
+- ``table`` (legacy): one physical SQLite table per txt file.
+- ``values``: rows live in the shared ``package_values`` table keyed by
+  ``package_table_id``.
+
+This module owns identifier safety and row-level operations for both layouts.
+
+Rows can be paged two ways: ``offset``/``limit`` (simple, but deep pages scan
+and discard ``offset`` rows) or keyset pagination with an opaque cursor that
+encodes the last row's ``(line_number, id)``. Keyset pages seek directly via
+an index on ``line_number`` (physical tables) or the
+``(package_table_id, line_number, value)`` index (``package_values``), so
+every page costs the same.
 """
 
 from __future__ import annotations
 
+import base64
+import binascii
 import re
 import sqlite3
-from typing import Any
+from typing import Any, Iterable, Sequence
+
+STORAGE_LAYOUT_TABLE = "table"
+STORAGE_LAYOUT_VALUES = "values"
+STORAGE_LAYOUTS: tuple[str, ...] = (STORAGE_LAYOUT_TABLE, STORAGE_LAYOUT_VALUES)
 
 
 def quote_identifier(identifier: str) -> str:
@@ -28,7 +47,9 @@ def quote_identifier(identifier: str) -> str:
     return f'"{identifier}"'
 
 
-def create_text_table(conn: sqlite3.Connection, table_name: str) -> None:
+def create_text_table(
+    conn: sqlite3.Connection, table_name: str, *, line_index: bool = True
+) -> None:
     """Create one physical text table for imported txt rows.
 
     The table schema is intentionally minimal:
@@ -36,6 +57,11 @@ def create_text_table(conn: sqlite3.Connection, table_name: str) -> None:
     - ``id``: surrogate primary key
     - ``line_number``: source txt line number
     - ``value``: trimmed non-empty line value
+
+    The ``line_number`` index (which implicitly ends with ``id``) serves
+    keyset pagination in ``(line_number, id)`` order. Bulk loaders pass
+    ``line_index=False`` and call :func:`create_text_table_line_index` once
+    the rows are in, so the index is built in one pass instead of per row.
     """
     quoted = quote_identifier(table_name)
     query = f"""
@@ -46,6 +72,58 @@ def create_text_table(conn: sqlite3.Connection, table_name: str) -> None:
         )
         """
     conn.execute(query)
+    if line_index:
+        create_text_table_line_index(conn, table_name)
+
+
+def create_text_table_line_index(conn: sqlite3.Connection, table_name: str) -> None:
+    """Create the ``line_number`` index for one physical text table if missing."""
+    quoted = quote_identifier(table_name)
+    index_name = quote_identifier(f"{table_name}_line_idx")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {quoted}(line_number)")  # nosec B608
+
+
+def encode_row_cursor(line_number: int, row_id: int) -> str:
+    """Encode a row position as an opaque URL-safe keyset cursor."""
+    raw = f"{int(line_number)}:{int(row_id)}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_row_cursor(cursor: str) -> tuple[int, int]:
+    """Decode a cursor from :func:`encode_row_cursor`.
+
+    Returns:
+        ``(line_number, id)`` of the last row on the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+        line_text, id_text = raw.split(":")
+        return int(line_text), int(id_text)
+    except (UnicodeError, binascii.Error, ValueError) as exc:
+        raise ValueError(f"Invalid row cursor: {cursor!r}") from exc
+
+
+def _keyset_page(rows: list[sqlite3.Row], limit: int) -> tuple[list[dict[str, Any]], str | None]:
+    """Split a ``limit + 1`` row fetch into the page and its next cursor."""
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_row_cursor(int(last["line_number"]), int(last["id"]))
+    return (
+        [
+            {
+                "line_number": int(row["line_number"]),
+                "value": str(row["value"]),
+            }
+            for row in page
+        ],
+        next_cursor,
+    )
 
 
 def insert_text_rows(
@@ -98,9 +176,188 @@ def fetch_text_rows(
     ]
 
 
+def fetch_text_rows_after(
+    conn: sqlite3.Connection,
+    table_name: str,
+    *,
+    after: tuple[int, int] | None,
+    limit: int,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Fetch one keyset page from a physical txt table.
+
+    Args:
+        conn: Open SQLite connection.
+        table_name: Validated physical table name.
+        after: ``(line_number, id)`` of the previous page's last row, or
+            ``None`` for the first page.
+        limit: Maximum rows to return.
+
+    Returns:
+        ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the last page.
+    """
+    quoted = quote_identifier(table_name)
+    where = "WHERE (line_number, id) > (?, ?)" if after is not None else ""
+    query = f"""
+        SELECT id, line_number, value
+        FROM {quoted}
+        {where}
+        ORDER BY line_number, id
+        LIMIT ?
+        """  # nosec B608
+    params = (*after, limit + 1) if after is not None else (limit + 1,)
+    return _keyset_page(conn.execute(query, params).fetchall(), limit)
+
+
+def insert_package_values(
+    conn: sqlite3.Connection, package_table_id: int, rows: Iterable[tuple[int, str]]
+) -> None:
+    """Insert parsed txt rows into ``package_values`` for one package table.
+
+    Callers pass rows in ``line_number`` order so both ``package_values``
+    indexes are appended to at the end of the table's key range.
+    """
+    conn.executemany(
+        """
+        INSERT INTO package_values (package_table_id, line_number, value)
+        VALUES (?, ?, ?)
+        """,
+        ((package_table_id, line_number, value) for line_number, value in rows),
+    )
+
+
+def fetch_package_values(
+    conn: sqlite3.Connection,
+    package_table_id: int,
+    *,
+    offset: int,
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Fetch paginated rows for one ``values``-layout package table.
+
+    Returns:
+        List of ``{"line_number": int, "value": str}`` mappings.
+    """
+    rows = conn.execute(
+        """
+        SELECT line_number, value
+        FROM package_values
+        WHERE package_table_id = ?
+        ORDER BY line_number, id
+        LIMIT ? OFFSET ?
+        """,
+        (package_table_id, limit, offset),
+    ).fetchall()
+    return [
+        {
+            "line_number": int(row["line_number"]),
+            "value": str(row["value"]),
+        }
+        for row in rows
+    ]
+
+
+def fetch_package_values_after(
+    conn: sqlite3.Connection,
+    package_table_id: int,
+    *,
+    after: tuple[int, int] | None,
+    limit: int,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Fetch one keyset page for a ``values``-layout package table.
+
+    Returns:
+        ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the last page.
+    """
+    after_clause = "AND (line_number, id) > (?, ?)" if after is not None else ""
+    query = f"""
+        SELECT id, line_number, value
+        FROM package_values
+        WHERE package_table_id = ? {after_clause}
+        ORDER BY line_number, id
+        LIMIT ?
+        """  # nosec B608 - fixed clause text only
+    params = (package_table_id, *(after or ()), limit + 1)
+    return _keyset_page(conn.execute(query, params).fetchall(), limit)
+
+
+def fetch_package_table_rows(
+    conn: sqlite3.Connection,
+    table_meta: dict[str, Any],
+    *,
+    offset: int,
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Fetch paginated rows for one package table in either storage layout.
+
+    Args:
+        conn: Open SQLite connection.
+        table_meta: ``package_tables`` metadata (``id``, ``table_name`` and
+            optional ``storage_layout``).
+        offset: Zero-based row offset.
+        limit: Maximum rows to return.
+    """
+    if table_meta.get("storage_layout", STORAGE_LAYOUT_TABLE) == STORAGE_LAYOUT_VALUES:
+        return fetch_package_values(conn, int(table_meta["id"]), offset=offset, limit=limit)
+    return fetch_text_rows(conn, str(table_meta["table_name"]), offset=offset, limit=limit)
+
+
+def fetch_package_table_rows_after(
+    conn: sqlite3.Connection,
+    table_meta: dict[str, Any],
+    *,
+    after: tuple[int, int] | None,
+    limit: int,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Fetch one keyset page for a package table in either storage layout."""
+    if table_meta.get("storage_layout", STORAGE_LAYOUT_TABLE) == STORAGE_LAYOUT_VALUES:
+        return fetch_package_values_after(conn, int(table_meta["id"]), after=after, limit=limit)
+    return fetch_text_rows_after(conn, str(table_meta["table_name"]), after=after, limit=limit)
+
+
+def read_package_values(
+    conn: sqlite3.Connection, package_table_ids: Sequence[int]
+) -> dict[int, list[str]]:
+    """Read every value for several ``values``-layout tables in one query.
+
+    The lookup is served by the ``(package_table_id, line_number, value)``
+    covering index, so SQLite never touches the base table.
+
+    Returns:
+        Mapping of ``package_table_id`` to values in source line order. Every
+        requested id is present, even when it has no rows.
+    """
+    grouped: dict[int, list[str]] = {int(table_id): [] for table_id in package_table_ids}
+    if not grouped:
+        return grouped
+
+    placeholders = ", ".join("?" for _ in grouped)
+    query = f"""
+        SELECT package_table_id, value
+        FROM package_values
+        WHERE package_table_id IN ({placeholders})
+        ORDER BY package_table_id, line_number
+        """  # nosec B608 - placeholders only
+    for row in conn.execute(query, tuple(grouped)):
+        grouped[int(row[0])].append(str(row[1]))
+    return grouped
+
+
 __all__ = [
+    "STORAGE_LAYOUT_TABLE",
+    "STORAGE_LAYOUT_VALUES",
+    "STORAGE_LAYOUTS",
     "quote_identifier",
     "create_text_table",
+    "create_text_table_line_index",
+    "encode_row_cursor",
+    "decode_row_cursor",
     "insert_text_rows",
     "fetch_text_rows",
+    "fetch_text_rows_after",
+    "insert_package_values",
+    "fetch_package_values",
+    "fetch_package_values_after",
+    "fetch_package_table_rows",
+    "fetch_package_table_rows_after",
+    "read_package_values",
 ]
@@ -6,22 +6,42 @@ These adapters bridge route dispatch to route-domain modules while keeping
 
 from __future__ import annotations
 
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
 
 from pipeworks_name_generation.renderer import render_names
-from pipeworks_name_generation.webapp.constants import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from pipeworks_name_generation.webapp.constants import (
+    DEFAULT_PAGE_LIMIT,
+    GENERATION_STREAM_CHUNK_SIZE,
+    MAX_PAGE_LIMIT,
+)
 from pipeworks_name_generation.webapp.db import (
     backup_database as _backup_database,
 )
 from pipeworks_name_generation.webapp.db import (
     connect_database as _connect_database,
 )
+from pipeworks_name_generation.webapp.db import (
+    decode_row_cursor as _decode_row_cursor,
+)
 from pipeworks_name_generation.webapp.db import (
     export_database as _export_database,
 )
+from pipeworks_name_generation.webapp.db import (
+    fetch_package_table_rows as _fetch_package_table_rows,
+)
+from pipeworks_name_generation.webapp.db import (
+    fetch_package_table_rows_after as _fetch_package_table_rows_after,
+)
 from pipeworks_name_generation.webapp.db import (
     fetch_text_rows as _fetch_text_rows,
 )
+from pipeworks_name_generation.webapp.db import (
+    get_connection_pool as _get_connection_pool,
+)
+from pipeworks_name_generation.webapp.db import (
+    get_connection_pool_stats as _get_connection_pool_stats,
+)
 from pipeworks_name_generation.webapp.db import (
     get_package_table as _get_package_table,
 )
@@ -34,9 +54,20 @@ from pipeworks_name_generation.webapp.db import (
 from pipeworks_name_generation.webapp.db import (
     list_packages as _list_packages,
 )
+from pipeworks_name_generation.webapp.db import (
+    recompute_package_stats as _recompute_package_stats,
+)
+from pipeworks_name_generation.webapp.db import (
+    reset_connection_pools as _reset_connection_pools,
+)
 from pipeworks_name_generation.webapp.db import (
     restore_database as _restore_database,
 )
+from pipeworks_name_generation.webapp.export_jobs import (
+    EXPORT_CONTENT_TYPES,
+    _parse_export_job_request,
+    get_export_job_manager,
+)
 from pipeworks_name_generation.webapp.favorites import (
     delete_favorite as _delete_favorite,
 )
@@ -46,6 +77,12 @@ from pipeworks_name_generation.webapp.favorites import (
 from pipeworks_name_generation.webapp.favorites import (
     insert_favorites as _insert_favorites,
 )
+from pipeworks_name_generation.webapp.favorites import (
+    insert_favorites_bulk as _insert_favorites_bulk,
+)
+from pipeworks_name_generation.webapp.favorites import (
+    iter_favorites as _iter_favorites,
+)
 from pipeworks_name_generation.webapp.favorites import (
     list_favorites as _list_favorites,
 )
@@ -57,8 +94,10 @@ from pipeworks_name_generation.webapp.favorites import (
 )
 from pipeworks_name_generation.webapp.frontend import (
     get_index_html,
+    get_static_asset_cache_stats,
     get_static_binary_asset,
     get_static_text_asset,
+    prepare_asset,
 )
 from pipeworks_name_generation.webapp.generation import (
     _coerce_bool,
@@ -68,32 +107,70 @@ from pipeworks_name_generation.webapp.generation import (
     _coerce_render_style,
     _collect_generation_source_values,
     _get_generation_selection_stats,
+    _iter_generation_values,
     _list_generation_syllable_options,
     _sample_generation_values,
-    clear_generation_package_options_cache,
     get_cached_generation_package_options,
+    get_generation_candidate_cache_stats,
+    get_generation_candidate_source,
+    invalidate_generation_caches,
+)
+from pipeworks_name_generation.webapp.generation_batch import (
+    _parse_generation_batch_request,
+    _render_batch_template,
+    _sample_generation_batch,
 )
 from pipeworks_name_generation.webapp.help_content import get_help_entries
 from pipeworks_name_generation.webapp.http import _parse_optional_int, _parse_required_int
+from pipeworks_name_generation.webapp.import_jobs import (
+    _parse_import_job_request,
+    get_import_job_manager,
+)
+from pipeworks_name_generation.webapp.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    get_metrics_registry,
+)
 from pipeworks_name_generation.webapp.routes import database as database_routes
 from pipeworks_name_generation.webapp.routes import database_admin as database_admin_routes
 from pipeworks_name_generation.webapp.routes import favorites as favorites_routes
 from pipeworks_name_generation.webapp.routes import generation as generation_routes
+from pipeworks_name_generation.webapp.routes import generation_export as generation_export_routes
 from pipeworks_name_generation.webapp.routes import help as help_routes
 from pipeworks_name_generation.webapp.routes import imports as import_routes
+from pipeworks_name_generation.webapp.routes import metrics as metrics_routes
 from pipeworks_name_generation.webapp.routes import static as static_routes
 
 
+def _read_connector(handler: Any) -> Callable[[Path], Any]:
+    """Return the connection factory for read-only routes.
+
+    Pooled handlers lease the calling thread's read-only connection; otherwise
+    each request opens a fresh connection through ``_connect_database``.
+    """
+    if getattr(handler, "connection_pool_enabled", False):
+        return lambda db_path: _get_connection_pool(db_path).read()
+    return _connect_database
+
+
+def _write_connector(handler: Any) -> Callable[[Path], Any]:
+    """Return the connection factory for routes that mutate the database."""
+    if getattr(handler, "connection_pool_enabled", False):
+        return lambda db_path: _get_connection_pool(db_path).write()
+    return _connect_database
+
+
 def get_root(handler: Any, _query: dict[str, list[str]]) -> None:
     """Serve the single-page web UI shell."""
-    static_routes.get_root(handler, get_index_html())
+    static_routes.get_root(handler, prepare_asset(get_index_html(), "text/html"))
 
 
 def get_static_app_css(handler: Any, _query: dict[str, list[str]]) -> None:
     """Serve main webapp stylesheet."""
     try:
         content, content_type = get_static_text_asset("app.css")
-        static_routes.get_text_asset(handler, content=content, content_type=content_type)
+        static_routes.get_text_asset(
+            handler, body=prepare_asset(content, content_type), content_type=content_type
+        )
     except FileNotFoundError:
         handler.send_error(404, "Not Found")
 
@@ -102,7 +179,9 @@ def get_static_app_js(handler: Any, _query: dict[str, list[str]]) -> None:
     """Serve main webapp client-side script bundle."""
     try:
         content, content_type = get_static_text_asset("app.js")
-        static_routes.get_text_asset(handler, content=content, content_type=content_type)
+        static_routes.get_text_asset(
+            handler, body=prepare_asset(content, content_type), content_type=content_type
+        )
     except FileNotFoundError:
         handler.send_error(404, "Not Found")
 
@@ -111,7 +190,9 @@ def get_static_api_builder_preview_js(handler: Any, _query: dict[str, list[str]]
     """Serve the API builder preview support script."""
     try:
         content, content_type = get_static_text_asset("api_builder_preview.js")
-        static_routes.get_text_asset(handler, content=content, content_type=content_type)
+        static_routes.get_text_asset(
+            handler, body=prepare_asset(content, content_type), content_type=content_type
+        )
     except FileNotFoundError:
         handler.send_error(404, "Not Found")
 
@@ -120,7 +201,9 @@ def get_static_favorites_js(handler: Any, _query: dict[str, list[str]]) -> None:
     """Serve the favorites tab support script."""
     try:
         content, content_type = get_static_text_asset("favorites.js")
-        static_routes.get_text_asset(handler, content=content, content_type=content_type)
+        static_routes.get_text_asset(
+            handler, body=prepare_asset(content, content_type), content_type=content_type
+        )
     except FileNotFoundError:
         handler.send_error(404, "Not Found")
 
@@ -130,7 +213,9 @@ def get_static_font(handler: Any, path: str) -> None:
     try:
         relative_path = path.removeprefix("/static/").lstrip("/")
         payload, content_type = get_static_binary_asset(relative_path)
-        static_routes.get_binary_asset(handler, payload=payload, content_type=content_type)
+        static_routes.get_binary_asset(
+            handler, body=prepare_asset(payload, content_type), content_type=content_type
+        )
     except FileNotFoundError:
         handler.send_error(404, "Not Found")
 
@@ -151,7 +236,7 @@ def get_favorites(handler: Any, query: dict[str, list[str]]) -> None:
         handler,
         query,
         parse_optional_int=_parse_optional_int,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         list_favorites=_list_favorites,
     )
@@ -161,19 +246,21 @@ def get_favorite_tags(handler: Any, _query: dict[str, list[str]]) -> None:
     """Return known favorites tags."""
     favorites_routes.get_favorite_tags(
         handler,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         list_tags=_list_favorite_tags,
     )
 
 
-def get_favorites_export(handler: Any, _query: dict[str, list[str]]) -> None:
-    """Return export JSON for favorites."""
+def get_favorites_export(handler: Any, query: dict[str, list[str]]) -> None:
+    """Return export JSON for favorites, or stream NDJSON with ``format=ndjson``."""
     favorites_routes.get_favorites_export(
         handler,
-        connect_database=_connect_database,
+        query,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         export_favorites=_export_favorites,
+        iter_favorites=_iter_favorites,
     )
 
 
@@ -181,7 +268,7 @@ def post_favorites(handler: Any) -> None:
     """Persist favorites entries."""
     favorites_routes.post_favorites(
         handler,
-        connect_database=_connect_database,
+        connect_database=_write_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         insert_favorites=_insert_favorites,
     )
@@ -191,7 +278,7 @@ def post_favorites_update(handler: Any) -> None:
     """Update favorites note or tags."""
     favorites_routes.post_favorites_update(
         handler,
-        connect_database=_connect_database,
+        connect_database=_write_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         update_favorite=_update_favorite,
     )
@@ -201,7 +288,7 @@ def post_favorites_delete(handler: Any) -> None:
     """Delete a favorite."""
     favorites_routes.post_favorites_delete(
         handler,
-        connect_database=_connect_database,
+        connect_database=_write_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         delete_favorite=_delete_favorite,
     )
@@ -211,19 +298,21 @@ def post_favorites_export(handler: Any) -> None:
     """Write favorites export to a file path."""
     favorites_routes.post_favorites_export(
         handler,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         export_favorites=_export_favorites,
+        iter_favorites=_iter_favorites,
     )
 
 
 def post_favorites_import(handler: Any) -> None:
-    """Import favorites from a file path."""
+    """Import favorites from a JSON or NDJSON file path."""
     favorites_routes.post_favorites_import(
         handler,
-        connect_database=_connect_database,
+        connect_database=_write_connector(handler),
         initialize_schema=handler._ensure_favorites_schema,
         insert_favorites=_insert_favorites,
+        insert_favorites_bulk=_insert_favorites_bulk,
     )
 
 
@@ -235,7 +324,7 @@ def get_generation_package_options(handler: Any, _query: dict[str, list[str]]) -
 
     generation_routes.get_package_options(
         handler,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_schema,
         list_generation_package_options=_list_generation_package_options_cached,
     )
@@ -247,7 +336,7 @@ def get_generation_package_syllables(handler: Any, query: dict[str, list[str]])
         handler,
         query,
         parse_required_int=_parse_required_int,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_schema,
         list_generation_syllable_options=_list_generation_syllable_options,
     )
@@ -259,9 +348,10 @@ def get_generation_selection_stats(handler: Any, query: dict[str, list[str]]) ->
         handler,
         query,
         parse_required_int=_parse_required_int,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_schema,
         get_generation_selection_stats=_get_generation_selection_stats,
+        parse_optional_int=_parse_optional_int,
     )
 
 
@@ -269,7 +359,7 @@ def get_database_packages(handler: Any, _query: dict[str, list[str]]) -> None:
     """Return imported package metadata used by the Database View tab."""
     database_routes.get_packages(
         handler,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_schema,
         list_packages=_list_packages,
     )
@@ -281,7 +371,7 @@ def get_database_package_tables(handler: Any, query: dict[str, list[str]]) -> No
         handler,
         query,
         parse_required_int=_parse_required_int,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_schema,
         list_package_tables=_list_package_tables,
     )
@@ -296,10 +386,43 @@ def get_database_table_rows(handler: Any, query: dict[str, list[str]]) -> None:
         max_page_limit=MAX_PAGE_LIMIT,
         parse_required_int=_parse_required_int,
         parse_optional_int=_parse_optional_int,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_schema,
         get_package_table=_get_package_table,
         fetch_text_rows=_fetch_text_rows,
+        fetch_table_rows=_fetch_package_table_rows,
+        fetch_table_rows_after=_fetch_package_table_rows_after,
+        decode_row_cursor=_decode_row_cursor,
+    )
+
+
+def get_database_pool_stats(handler: Any, _query: dict[str, list[str]]) -> None:
+    """Return connection pool metrics for this server process."""
+    database_routes.get_pool_stats(
+        handler,
+        pool_enabled=bool(getattr(handler, "connection_pool_enabled", False)),
+        get_pool_stats=_get_connection_pool_stats,
+    )
+
+
+def get_metrics(handler: Any, _query: dict[str, list[str]]) -> None:
+    """Return request, SQLite, cache, and pool metrics in Prometheus format."""
+
+    def _render() -> str | None:
+        registry = get_metrics_registry()
+        if registry is None:
+            return None
+        pool_enabled = bool(getattr(handler, "connection_pool_enabled", False))
+        return registry.render_prometheus(
+            caches={
+                "generation_candidates": get_generation_candidate_cache_stats(),
+                "static_assets": get_static_asset_cache_stats(),
+            },
+            pools=_get_connection_pool_stats() if pool_enabled else [],
+        )
+
+    metrics_routes.get_metrics(
+        handler, render_metrics=_render, content_type=PROMETHEUS_CONTENT_TYPE
     )
 
 
@@ -310,17 +433,76 @@ def get_favicon(handler: Any, _query: dict[str, list[str]]) -> None:
 
 def post_import(handler: Any) -> None:
     """Import one metadata+zip pair and create tables for included txt data."""
+
+    def _import_package_pair_with_layout(conn: Any, **paths: Any) -> dict[str, Any]:
+        return _import_package_pair(
+            conn,
+            storage_layout=getattr(handler, "storage_layout", "table"),
+            **paths,
+        )
+
     import_routes.post_import(
         handler,
-        connect_database=_connect_database,
+        connect_database=_write_connector(handler),
+        initialize_schema=handler._ensure_schema,
+        import_package_pair=_import_package_pair_with_layout,
+        on_import_success=lambda: invalidate_generation_caches(handler.db_path),
+    )
+
+
+def _import_job_manager(handler: Any) -> Callable[[], Any]:
+    """Return a lazy getter for the handler database's import job manager."""
+
+    def _get() -> Any:
+        return get_import_job_manager(
+            handler.db_path,
+            on_success=lambda: invalidate_generation_caches(handler.db_path),
+        )
+
+    return _get
+
+
+def post_import_start(handler: Any) -> None:
+    """Queue a background import of one metadata+zip pair."""
+    import_routes.post_import_start(
+        handler,
+        parse_import_job_request=lambda payload: _parse_import_job_request(
+            payload, storage_layout=getattr(handler, "storage_layout", "table")
+        ),
+        connect_database=_write_connector(handler),
         initialize_schema=handler._ensure_schema,
-        import_package_pair=_import_package_pair,
-        on_import_success=lambda: clear_generation_package_options_cache(handler.db_path),
+        get_import_job_manager=_import_job_manager(handler),
+    )
+
+
+def get_import_status(handler: Any, query: dict[str, list[str]]) -> None:
+    """Return progress for one background import job."""
+    import_routes.get_import_status(
+        handler,
+        query,
+        get_import_job_manager=_import_job_manager(handler),
+    )
+
+
+def post_import_cancel(handler: Any) -> None:
+    """Cancel one queued or running background import job."""
+    import_routes.post_import_cancel(
+        handler,
+        get_import_job_manager=_import_job_manager(handler),
     )
 
 
 def post_generate(handler: Any) -> None:
     """Generate names from SQLite tables for one selected class scope."""
+
+    def _generation_candidate_source(conn: Any, **scope: Any) -> Any:
+        return get_generation_candidate_source(
+            conn,
+            db_path=handler.db_path,
+            collect_values=_collect_generation_source_values,
+            **scope,
+        )
+
     generation_routes.post_generate(
         handler,
         coerce_generation_count=_coerce_generation_count,
@@ -328,11 +510,91 @@ def post_generate(handler: Any) -> None:
         coerce_bool=_coerce_bool,
         coerce_output_format=_coerce_output_format,
         coerce_render_style=_coerce_render_style,
-        connect_database=_connect_database,
+        connect_database=_read_connector(handler),
         initialize_schema=handler._ensure_schema,
-        collect_generation_source_values=_collect_generation_source_values,
+        collect_generation_source_values=_generation_candidate_source,
         sample_generation_values=_sample_generation_values,
         render_values=render_names,
+        iter_generation_values=_iter_generation_values,
+    )
+
+
+def post_generate_batch(handler: Any) -> None:
+    """Generate aligned names for several scopes over one connection."""
+
+    def _generation_candidate_source(conn: Any, **scope: Any) -> Any:
+        return get_generation_candidate_source(
+            conn,
+            db_path=handler.db_path,
+            collect_values=_collect_generation_source_values,
+            **scope,
+        )
+
+    def _sample_batch(batch: Any, pools: Any) -> list[list[str]]:
+        return _sample_generation_batch(
+            batch, pools, sample_generation_values=_sample_generation_values
+        )
+
+    generation_routes.post_generate_batch(
+        handler,
+        parse_generation_batch_request=_parse_generation_batch_request,
+        connect_database=_read_connector(handler),
+        initialize_schema=handler._ensure_schema,
+        collect_generation_source_values=_generation_candidate_source,
+        sample_generation_batch=_sample_batch,
+        render_values=render_names,
+        render_batch_template=_render_batch_template,
+        stream_chunk_rows=GENERATION_STREAM_CHUNK_SIZE,
+    )
+
+
+def _export_job_manager(handler: Any) -> Callable[[], Any]:
+    """Return a lazy accessor for the handler's export job manager."""
+
+    def _manager() -> Any:
+        export_dir = getattr(handler, "generation_export_dir", None)
+        if export_dir is None:
+            export_dir = Path(handler.db_path).parent / "exports"
+        return get_export_job_manager(Path(export_dir), db_path=handler.db_path)
+
+    return _manager
+
+
+def post_generate_export(handler: Any) -> None:
+    """Start a background job that writes generated names to a file."""
+    generation_export_routes.post_generate_export(
+        handler,
+        parse_export_job_request=_parse_export_job_request,
+        connect_database=_write_connector(handler),
+        initialize_schema=handler._ensure_schema,
+        get_export_job_manager=_export_job_manager(handler),
+    )
+
+
+def get_generate_export_status(handler: Any, query: dict[str, list[str]]) -> None:
+    """Return progress for one generation export job."""
+    generation_export_routes.get_generate_export_status(
+        handler,
+        query,
+        get_export_job_manager=_export_job_manager(handler),
+    )
+
+
+def get_generate_export_download(handler: Any, query: dict[str, list[str]]) -> None:
+    """Stream the file written by a completed generation export job."""
+    generation_export_routes.get_generate_export_download(
+        handler,
+        query,
+        get_export_job_manager=_export_job_manager(handler),
+        content_types=EXPORT_CONTENT_TYPES,
+    )
+
+
+def post_generate_export_resume(handler: Any) -> None:
+    """Resume a failed or interrupted generation export job."""
+    generation_export_routes.post_generate_export_resume(
+        handler,
+        get_export_job_manager=_export_job_manager(handler),
     )
 
 
@@ -357,9 +619,27 @@ def post_database_import(handler: Any) -> None:
     database_admin_routes.post_database_import(
         handler,
         restore_database=_restore_database,
+        on_restore_success=lambda: _on_database_restored(handler.db_path),
+    )
+
+
+def post_database_recompute_stats(handler: Any) -> None:
+    """Rebuild materialized selection statistics for one or all packages."""
+    database_admin_routes.post_database_recompute_stats(
+        handler,
+        connect_database=_write_connector(handler),
+        initialize_schema=handler._ensure_schema,
+        recompute_package_stats=_recompute_package_stats,
+        on_recompute_success=lambda: invalidate_generation_caches(handler.db_path),
     )
 
 
+def _on_database_restored(db_path: Path) -> None:
+    """Drop caches and pooled connections that may describe the old database."""
+    invalidate_generation_caches(db_path)
+    _reset_connection_pools(db_path)
+
+
 __all__ = [
     "get_root",
     "get_static_app_css",
@@ -378,8 +658,15 @@ __all__ = [
     "get_database_packages",
     "get_database_package_tables",
     "get_database_table_rows",
+    "get_database_pool_stats",
+    "get_metrics",
+    "get_import_status",
+    "get_generate_export_status",
+    "get_generate_export_download",
     "get_favicon",
     "post_import",
+    "post_import_start",
+    "post_import_cancel",
     "post_favorites",
     "post_favorites_update",
     "post_favorites_delete",
@@ -388,5 +675,9 @@ __all__ = [
     "post_database_backup",
     "post_database_export",
     "post_database_import",
+    "post_database_recompute_stats",
     "post_generate",
+    "post_generate_batch",
+    "post_generate_export",
+    "post_generate_export_resume",
 ]
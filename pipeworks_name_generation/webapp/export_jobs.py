@@ -0,0 +1,656 @@
+"""Background export jobs that write large generated name sets to disk.
+
+``POST /api/generate`` is capped at 100,000 names because sampling and
+rendering happen inside the request. Export jobs lift that limit by running on
+a background thread and streaming names to a file in fixed-size chunks.
+
+Each job writes two files in the export directory:
+
+- ``<job_id>.<ext>``: the generated names (``txt``, ``csv``, or ``ndjson``).
+- ``<job_id>.json``: a manifest with the job spec and progress, rewritten
+  atomically after every completed chunk.
+- ``<job_id>.lock``: locked (``flock``) by the process that owns the job
+  while it is queued or running.
+
+The manifest records the byte offset and the RNG state after the last
+completed chunk, so an interrupted or failed job resumes from exactly that
+point and the finished file is byte-identical to an uninterrupted run.
+Requests without a seed get a random one recorded in the manifest, so every
+export is reproducible.
+
+Managers in other processes (pre-fork workers) answer status and download
+requests from the manifest. A queued or running job is only reported as
+``interrupted`` once no process holds its lock, and resuming takes the lock
+first, so a job never has two writers.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence
+
+from pipeworks_name_generation.renderer import render_names
+from pipeworks_name_generation.webapp.constants import (
+    GENERATION_CLASS_KEYS,
+    GENERATION_EXPORT_DEFAULT_CHUNK_SIZE,
+    GENERATION_EXPORT_FORMATS,
+    GENERATION_EXPORT_MAX_CONCURRENT_JOBS,
+    GENERATION_EXPORT_MAX_COUNT,
+)
+from pipeworks_name_generation.webapp.db import connect_database
+from pipeworks_name_generation.webapp.generation import (
+    _coerce_bool,
+    _coerce_optional_seed,
+    _coerce_render_style,
+    _collect_generation_source_values,
+    _draw_generation_chunk,
+    _list_generation_matching_tables,
+    _sample_generation_values,
+    get_generation_candidate_source,
+)
+from pipeworks_name_generation.webapp.generation_mapping import (
+    _validate_generation_syllable_key,
+)
+
+if sys.platform != "win32":
+    import fcntl
+
+EXPORT_STATUS_QUEUED = "queued"
+EXPORT_STATUS_RUNNING = "running"
+EXPORT_STATUS_COMPLETED = "completed"
+EXPORT_STATUS_FAILED = "failed"
+EXPORT_STATUS_INTERRUPTED = "interrupted"
+EXPORT_ACTIVE_STATUSES = (EXPORT_STATUS_QUEUED, EXPORT_STATUS_RUNNING)
+EXPORT_RESUMABLE_STATUSES = (EXPORT_STATUS_FAILED, EXPORT_STATUS_INTERRUPTED)
+
+EXPORT_CONTENT_TYPES: dict[str, str] = {
+    "txt": "text/plain; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass(frozen=True)
+class ExportJobSpec:
+    """Immutable parameters of one export job.
+
+    ``seed`` is always set: requests without a seed get a random one so the
+    job can be reproduced and resumed.
+    """
+
+    class_key: str
+    package_id: int
+    syllable_key: str
+    generation_count: int
+    seed: int
+    unique_only: bool
+    render_style: str
+    output_format: str
+    chunk_size: int
+
+
+@dataclass
+class ExportJob:
+    """Mutable state of one export job (guarded by the manager lock)."""
+
+    job_id: str
+    spec: ExportJobSpec
+    output_path: Path
+    status: str = EXPORT_STATUS_QUEUED
+    names_written: int = 0
+    chunks_completed: int = 0
+    bytes_written: int = 0
+    total_names: int | None = None
+    rng_state: list[Any] | None = None
+    error: str | None = None
+    created_at: str = field(default_factory=_utc_now)
+    updated_at: str = field(default_factory=_utc_now)
+
+    @property
+    def manifest_path(self) -> Path:
+        """Return the manifest path stored next to the output file."""
+        return self.output_path.with_name(f"{self.job_id}.json")
+
+    def to_payload(self) -> dict[str, Any]:
+        """Return the public API representation of the job."""
+        target = self.total_names if self.total_names is not None else self.spec.generation_count
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            **asdict(self.spec),
+            "names_written": self.names_written,
+            "chunks_completed": self.chunks_completed,
+            "progress": round(self.names_written / target, 6) if target else 1.0,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "output_path": str(self.output_path),
+            "download_url": f"/api/generate/export/download?job_id={self.job_id}",
+        }
+
+    def to_manifest(self) -> dict[str, Any]:
+        """Return the on-disk manifest (public payload plus resume state)."""
+        return {
+            **self.to_payload(),
+            "bytes_written": self.bytes_written,
+            "total_names": self.total_names,
+            "rng_state": self.rng_state,
+        }
+
+    @classmethod
+    def from_manifest(cls, payload: Mapping[str, Any], *, output_path: Path) -> ExportJob:
+        """Rebuild a job from a manifest written by :meth:`to_manifest`."""
+        spec = ExportJobSpec(**{name: payload[name] for name in ExportJobSpec.__dataclass_fields__})
+        return cls(
+            job_id=str(payload["job_id"]),
+            spec=spec,
+            output_path=output_path,
+            status=str(payload["status"]),
+            names_written=int(payload["names_written"]),
+            chunks_completed=int(payload["chunks_completed"]),
+            bytes_written=int(payload["bytes_written"]),
+            total_names=payload.get("total_names"),
+            rng_state=payload.get("rng_state"),
+            error=payload.get("error"),
+            created_at=str(payload["created_at"]),
+            updated_at=str(payload["updated_at"]),
+        )
+
+
+def _coerce_export_count(raw_count: Any) -> int:
+    """Parse and bound the requested export size."""
+    try:
+        count = int(raw_count)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Field 'generation_count' must be an integer.") from exc
+    if count < 1:
+        raise ValueError("Field 'generation_count' must be >= 1.")
+    if count > GENERATION_EXPORT_MAX_COUNT:
+        raise ValueError(f"Field 'generation_count' must be <= {GENERATION_EXPORT_MAX_COUNT}.")
+    return count
+
+
+def _parse_export_job_request(payload: Mapping[str, Any]) -> ExportJobSpec:
+    """Validate an export request payload.
+
+    Raises:
+        ValueError: For any invalid field, with an API-ready message.
+    """
+    class_key = str(payload.get("class_key", "")).strip()
+    if not class_key:
+        raise ValueError("Field 'class_key' is required.")
+    if class_key not in GENERATION_CLASS_KEYS:
+        raise ValueError(f"Unsupported generation class_key: {class_key!r}")
+
+    package_id_raw = payload.get("package_id")
+    if package_id_raw is None or (isinstance(package_id_raw, str) and not package_id_raw.strip()):
+        raise ValueError("Field 'package_id' is required.")
+    try:
+        package_id = int(package_id_raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Field 'package_id' must be an integer.") from exc
+    if package_id < 1:
+        raise ValueError("Field 'package_id' must be >= 1.")
+
+    syllable_raw = str(payload.get("syllable_key", "")).strip()
+    if not syllable_raw:
+        raise ValueError("Field 'syllable_key' is required.")
+    syllable_key = _validate_generation_syllable_key(syllable_raw)
+
+    output_format = str(payload.get("output_format") or "txt").strip().lower()
+    if output_format not in GENERATION_EXPORT_FORMATS:
+        raise ValueError(
+            "Field 'output_format' must be one of: " + ", ".join(GENERATION_EXPORT_FORMATS) + "."
+        )
+
+    chunk_raw = payload.get("chunk_size", GENERATION_EXPORT_DEFAULT_CHUNK_SIZE)
+    try:
+        chunk_size = int(chunk_raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Field 'chunk_size' must be an integer.") from exc
+    if chunk_size < 1 or chunk_size > 1_000_000:
+        raise ValueError("Field 'chunk_size' must be between 1 and 1000000.")
+
+    seed = _coerce_optional_seed(payload.get("seed"))
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+
+    return ExportJobSpec(
+        class_key=class_key,
+        package_id=package_id,
+        syllable_key=syllable_key,
+        generation_count=_coerce_export_count(payload.get("generation_count")),
+        seed=seed,
+        unique_only=_coerce_bool(payload.get("unique_only", False)),
+        render_style=_coerce_render_style(payload.get("render_style")),
+        output_format=output_format,
+        chunk_size=chunk_size,
+    )
+
+
+def _encode_export_chunk(
+    raw_names: Sequence[str], rendered: Sequence[str], *, spec: ExportJobSpec
+) -> bytes:
+    """Encode one chunk of names in the job's output format."""
+    include_raw = spec.render_style != "raw"
+    if spec.output_format == "ndjson":
+        if include_raw:
+            lines = [
+                json.dumps({"name": name, "raw_name": raw})
+                for name, raw in zip(rendered, raw_names)
+            ]
+        else:
+            lines = [json.dumps({"name": name}) for name in rendered]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+    if spec.output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if include_raw:
+            writer.writerows(zip(rendered, raw_names))
+        else:
+            writer.writerows([name] for name in rendered)
+        return buffer.getvalue().encode("utf-8")
+    return ("\n".join(rendered) + "\n").encode("utf-8")
+
+
+def _export_header(spec: ExportJobSpec) -> bytes:
+    """Return the file header for the job's output format (CSV only)."""
+    if spec.output_format != "csv":
+        return b""
+    return b"name,raw_name\n" if spec.render_style != "raw" else b"name\n"
+
+
+def _rng_state_to_json(state: tuple[Any, ...]) -> list[Any]:
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _rng_state_from_json(payload: Sequence[Any]) -> tuple[Any, ...]:
+    version, internal, gauss_next = payload
+    return (version, tuple(internal), gauss_next)
+
+
+def _acquire_job_lock(path: Path) -> int | None:
+    """Lock a job's lock file exclusively without waiting.
+
+    Returns:
+        The locked file descriptor (closing it releases the lock), or ``None``
+        when another process holds the lock. Windows has no ``flock`` and
+        serves jobs from one process, so the lock always succeeds there.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if sys.platform != "win32":
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+    return fd
+
+
+def _job_lock_held(path: Path) -> bool:
+    """Return whether some process holds a job's lock file."""
+    if sys.platform == "win32" or not path.exists():
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+class ExportJobManager:
+    """Run and track export jobs for one database and export directory.
+
+    Args:
+        export_dir: Directory that receives output files and manifests.
+        db_path: SQLite database the jobs sample from.
+        max_concurrent_jobs: Jobs allowed to run at once; others stay queued.
+        open_connection: Connection factory (each job opens its own).
+        render_values: Renderer applied to each sampled chunk.
+    """
+
+    def __init__(
+        self,
+        export_dir: Path,
+        *,
+        db_path: Path,
+        max_concurrent_jobs: int = GENERATION_EXPORT_MAX_CONCURRENT_JOBS,
+        open_connection: Callable[[Path], Any] = connect_database,
+        render_values: Callable[[Sequence[str], str], list[str]] = render_names,
+    ) -> None:
+        self.export_dir = export_dir.expanduser()
+        self.db_path = db_path
+        self._open_connection = open_connection
+        self._render_values = render_values
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent_jobs))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # Jobs this manager owns (queued or running here), with their locks.
+        self._jobs: dict[str, ExportJob] = {}
+        self._job_locks: dict[str, int] = {}
+        self._threads: dict[str, threading.Thread] = {}
+
+    def submit(self, spec: ExportJobSpec) -> dict[str, Any]:
+        """Validate the scope, persist a queued job, and start it.
+
+        Raises:
+            ValueError: If the scope has no imported tables.
+        """
+        conn = self._open_connection(self.db_path)
+        try:
+            matching = _list_generation_matching_tables(
+                conn,
+                class_key=spec.class_key,
+                package_id=spec.package_id,
+                syllable_key=spec.syllable_key,
+            )
+        finally:
+            conn.close()
+        if not matching:
+            raise ValueError("No imported tables match class/package/syllable selection.")
+
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        job = ExportJob(
+            job_id=job_id,
+            spec=spec,
+            output_path=self.export_dir / f"{job_id}.{spec.output_format}",
+        )
+        with self._lock:
+            if not self._claim(job):
+                raise RuntimeError(f"Export job lock is already held: {job_id}")
+            self._write_manifest(job)
+            payload = job.to_payload()
+        self._start(job)
+        return payload
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Return a job payload, loading it from its manifest if needed."""
+        job = self._lookup(job_id)
+        if job is None:
+            return None
+        with self._lock:
+            return job.to_payload()
+
+    def resume(self, job_id: str) -> dict[str, Any] | None:
+        """Restart a failed or interrupted job from its last completed chunk.
+
+        Returns:
+            The queued job payload, or ``None`` when the job is not failed or
+            interrupted (including when another process is running it).
+
+        Raises:
+            LookupError: If the job does not exist.
+        """
+        job = self._lookup(job_id)
+        if job is None:
+            raise LookupError(f"Export job not found: {job_id}")
+        with self._lock:
+            if job.status not in EXPORT_RESUMABLE_STATUSES or job_id in self._jobs:
+                return None
+            if not self._claim(job):
+                return None
+            # Re-read the manifest now that no other process can write it.
+            current = self._load_manifest(job_id, claimed=True)
+            if current is None or current.status not in EXPORT_RESUMABLE_STATUSES:
+                self._release(job_id)
+                return None
+            job = current
+            self._jobs[job_id] = job
+            job.status = EXPORT_STATUS_QUEUED
+            job.error = None
+            job.updated_at = _utc_now()
+            self._write_manifest(job)
+            payload = job.to_payload()
+        self._start(job)
+        return payload
+
+    def download_path(self, job_id: str) -> tuple[Path, str] | None:
+        """Return ``(path, output_format)`` for a completed job, else ``None``.
+
+        Raises:
+            LookupError: If the job does not exist.
+        """
+        job = self._lookup(job_id)
+        if job is None:
+            raise LookupError(f"Export job not found: {job_id}")
+        with self._lock:
+            if job.status != EXPORT_STATUS_COMPLETED:
+                return None
+            return job.output_path, job.spec.output_format
+
+    def wait(self, job_id: str, timeout: float | None = None) -> None:
+        """Block until a job's worker thread exits (used by tests and scripts)."""
+        with self._lock:
+            thread = self._threads.get(job_id)
+        if thread is not None:
+            thread.join(timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Stop running jobs at their next chunk boundary.
+
+        Stopped jobs are recorded as ``interrupted`` and can be resumed later.
+        """
+        self._stop.set()
+        with self._lock:
+            threads = list(self._threads.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def _lookup(self, job_id: str) -> ExportJob | None:
+        if not _JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job
+            return self._load_manifest(job_id)
+
+    def _lock_path(self, job_id: str) -> Path:
+        return self.export_dir / f"{job_id}.lock"
+
+    def _load_manifest(self, job_id: str, *, claimed: bool = False) -> ExportJob | None:
+        """Read a job this manager does not own from its manifest (lock held).
+
+        A queued or running job is reported as interrupted once no process
+        holds its lock (or this manager has just claimed it).
+        """
+        manifest_path = self.export_dir / f"{job_id}.json"
+        if not manifest_path.is_file():
+            return None
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+        job = ExportJob.from_manifest(
+            payload,
+            output_path=self.export_dir / f"{job_id}.{payload['output_format']}",
+        )
+        if job.status in EXPORT_ACTIVE_STATUSES and (
+            claimed or not _job_lock_held(self._lock_path(job_id))
+        ):
+            job.status = EXPORT_STATUS_INTERRUPTED
+        return job
+
+    def _claim(self, job: ExportJob) -> bool:
+        """Take ownership of a job through its lock file (lock held)."""
+        fd = _acquire_job_lock(self._lock_path(job.job_id))
+        if fd is None:
+            return False
+        self._job_locks[job.job_id] = fd
+        self._jobs[job.job_id] = job
+        return True
+
+    def _release(self, job_id: str) -> None:
+        """Give up ownership once the job's final state is on disk (lock held)."""
+        self._jobs.pop(job_id, None)
+        fd = self._job_locks.pop(job_id, None)
+        if fd is not None:
+            os.close(fd)
+
+    def _start(self, job: ExportJob) -> None:
+        thread = threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"generation-export-{job.job_id[:8]}",
+            daemon=True,
+        )
+        with self._lock:
+            self._threads[job.job_id] = thread
+        thread.start()
+
+    def _write_manifest(self, job: ExportJob) -> None:
+        """Atomically rewrite the job manifest (caller holds the lock)."""
+        temp_path = job.manifest_path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(job.to_manifest()), encoding="utf-8")
+        os.replace(temp_path, job.manifest_path)
+
+    def _update(self, job: ExportJob, **changes: Any) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.updated_at = _utc_now()
+            self._write_manifest(job)
+
+    def _run(self, job: ExportJob) -> None:
+        try:
+            with self._slots:
+                if self._stop.is_set():
+                    self._update(job, status=EXPORT_STATUS_INTERRUPTED)
+                    return
+                self._update(job, status=EXPORT_STATUS_RUNNING)
+                try:
+                    stopped = self._write_names(job)
+                except Exception as exc:  # nosec B110 - recorded on the job for the status API
+                    self._update(job, status=EXPORT_STATUS_FAILED, error=str(exc))
+                    return
+                self._update(
+                    job,
+                    status=EXPORT_STATUS_INTERRUPTED if stopped else EXPORT_STATUS_COMPLETED,
+                )
+        finally:
+            with self._lock:
+                self._release(job.job_id)
+
+    def _write_names(self, job: ExportJob) -> bool:
+        """Write remaining chunks; return ``True`` if stopped before finishing."""
+        spec = job.spec
+        conn = self._open_connection(self.db_path)
+        try:
+            source = get_generation_candidate_source(
+                conn,
+                db_path=self.db_path,
+                class_key=spec.class_key,
+                package_id=spec.package_id,
+                syllable_key=spec.syllable_key,
+                collect_values=_collect_generation_source_values,
+            )
+            # Unique-only output is bounded by the distinct candidates, so it is
+            # sampled once (deterministically) and sliced from the resume point.
+            sampled: list[str] | None = None
+            if spec.unique_only:
+                sampled = _sample_generation_values(
+                    source, count=spec.generation_count, seed=spec.seed, unique_only=True
+                )
+                total = len(sampled)
+            else:
+                total = spec.generation_count if len(source) else 0
+
+            resuming = job.bytes_written > 0 and job.output_path.exists()
+            if resuming and job.output_path.stat().st_size < job.bytes_written:
+                # The file lost bytes the manifest counted; start over.
+                resuming = False
+            if not resuming:
+                self._update(
+                    job, names_written=0, chunks_completed=0, bytes_written=0, rng_state=None
+                )
+
+            rng = random.Random(spec.seed)  # nosec B311 - reproducible sampling
+            if job.rng_state is not None:
+                rng.setstate(_rng_state_from_json(job.rng_state))
+
+            with open(job.output_path, "r+b" if resuming else "wb") as handle:
+                handle.truncate(job.bytes_written)
+                handle.seek(job.bytes_written)
+                if not resuming:
+                    handle.write(_export_header(spec))
+                self._update(job, total_names=total)
+
+                names_written = job.names_written
+                while names_written < total:
+                    if self._stop.is_set():
+                        return True
+                    size = min(spec.chunk_size, total - names_written)
+                    if sampled is not None:
+                        raw = sampled[names_written : names_written + size]
+                    else:
+                        raw = _draw_generation_chunk(source, rng, size)
+                    rendered = self._render_values(raw, spec.render_style)
+                    handle.write(_encode_export_chunk(raw, rendered, spec=spec))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    names_written += size
+                    rng_state = None if sampled is not None else _rng_state_to_json(rng.getstate())
+                    self._update(
+                        job,
+                        names_written=names_written,
+                        chunks_completed=job.chunks_completed + 1,
+                        bytes_written=handle.tell(),
+                        rng_state=rng_state,
+                    )
+            return False
+        finally:
+            conn.close()
+
+
+_MANAGERS: dict[tuple[str, str], ExportJobManager] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def get_export_job_manager(export_dir: Path, *, db_path: Path) -> ExportJobManager:
+    """Return the process-wide manager for one export directory and database."""
+    key = (str(export_dir.expanduser().resolve()), str(db_path.expanduser().resolve()))
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = ExportJobManager(export_dir, db_path=db_path)
+            _MANAGERS[key] = manager
+        return manager
+
+
+def close_export_job_managers() -> None:
+    """Stop every manager's running jobs (they become resumable)."""
+    with _MANAGERS_LOCK:
+        managers = list(_MANAGERS.values())
+        _MANAGERS.clear()
+    for manager in managers:
+        manager.close()
+
+
+__all__ = [
+    "EXPORT_CONTENT_TYPES",
+    "ExportJob",
+    "ExportJobSpec",
+    "ExportJobManager",
+    "_parse_export_job_request",
+    "get_export_job_manager",
+    "close_export_job_managers",
+]
@@ -1,9 +1,12 @@
 """Favorites database access helpers."""
 
 from .repositories import (
+    FAVORITES_BULK_BATCH_SIZE,
     delete_favorite,
     export_favorites,
     insert_favorites,
+    insert_favorites_bulk,
+    iter_favorites,
     list_favorites,
     list_tags,
     list_tags_for_favorite,
@@ -14,6 +17,9 @@ from .schema import initialize_favorites_schema
 __all__ = [
     "initialize_favorites_schema",
     "insert_favorites",
+    "insert_favorites_bulk",
+    "iter_favorites",
+    "FAVORITES_BULK_BATCH_SIZE",
     "list_favorites",
     "list_tags",
     "list_tags_for_favorite",
@@ -3,8 +3,16 @@
 from __future__ import annotations
 
 import json
+import re
 from datetime import datetime, timezone
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
+
+from .schema import FAVORITES_FTS_TABLE
+
+# Rows per ``executemany`` batch for bulk favorites import and export reads.
+FAVORITES_BULK_BATCH_SIZE = 500
+# Bound for ``IN (...)`` lists, below SQLite's historic 999-variable limit.
+_SQL_VARIABLE_BATCH = 500
 
 
 def _normalize_tags(raw_tags: Iterable[str]) -> list[str]:
@@ -23,21 +31,33 @@ def _normalize_tags(raw_tags: Iterable[str]) -> list[str]:
     return normalized
 
 
-def _ensure_tags(conn: Any, tags: Iterable[str]) -> list[int]:
-    """Insert tags when missing and return their ids."""
+def _resolve_tag_ids(conn: Any, tags: Iterable[str]) -> dict[str, int]:
+    """Insert missing tags and return ids keyed by casefolded tag name.
+
+    Tags are inserted with one ``executemany`` and resolved with one
+    ``SELECT`` per :data:`_SQL_VARIABLE_BATCH` names.
+    """
     normalized = _normalize_tags(tags)
     if not normalized:
-        return []
+        return {}
 
-    for tag in normalized:
-        conn.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag,))
+    conn.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(tag,) for tag in normalized])
+    id_by_name: dict[str, int] = {}
+    for start in range(0, len(normalized), _SQL_VARIABLE_BATCH):
+        names = normalized[start : start + _SQL_VARIABLE_BATCH]
+        placeholders = ",".join(["?"] * len(names))
+        rows = conn.execute(
+            f"SELECT id, name FROM tags WHERE name IN ({placeholders})",  # nosec B608
+            names,
+        ).fetchall()
+        id_by_name.update({row["name"].casefold(): int(row["id"]) for row in rows})
+    return id_by_name
 
-    placeholders = ",".join(["?"] * len(normalized))
-    rows = conn.execute(
-        f"SELECT id, name FROM tags WHERE name IN ({placeholders})",  # nosec B608
-        normalized,
-    ).fetchall()
-    id_by_name = {row["name"].casefold(): int(row["id"]) for row in rows}
+
+def _ensure_tags(conn: Any, tags: Iterable[str]) -> list[int]:
+    """Insert tags when missing and return their ids."""
+    normalized = _normalize_tags(tags)
+    id_by_name = _resolve_tag_ids(conn, normalized)
     return [id_by_name[tag.casefold()] for tag in normalized if tag.casefold() in id_by_name]
 
 
@@ -55,6 +75,114 @@ def _deserialize_metadata(payload: str) -> dict[str, Any]:
     return parsed if isinstance(parsed, dict) else {}
 
 
+def _prepare_favorite(entry: dict[str, Any]) -> dict[str, Any]:
+    """Validate one favorite entry and normalize its tags and metadata."""
+    name = str(entry.get("name", "")).strip()
+    source = str(entry.get("source", "")).strip()
+    if not name:
+        raise ValueError("Favorite name is required.")
+    if not source:
+        raise ValueError("Favorite source is required.")
+
+    metadata = entry.get("metadata")
+    if not isinstance(metadata, dict):
+        metadata = {}
+
+    return {
+        "name": name,
+        "name_class": entry.get("name_class"),
+        "package_id": entry.get("package_id"),
+        "package_name": entry.get("package_name"),
+        "syllable_key": entry.get("syllable_key"),
+        "render_style": entry.get("render_style"),
+        "output_format": entry.get("output_format"),
+        "seed": entry.get("seed"),
+        "gender": entry.get("gender"),
+        "source": source,
+        "note_md": entry.get("note_md"),
+        "metadata": metadata,
+        "tags": _normalize_tags(entry.get("tags", [])),
+    }
+
+
+def _insert_favorite_batch(
+    conn: Any, favorites: list[dict[str, Any]], created_at: str
+) -> list[int]:
+    """Insert prepared favorites and their tag links; return the new ids.
+
+    Must run inside a write transaction: ids are assigned explicitly after
+    the current ``AUTOINCREMENT`` high-water mark, which no other writer can
+    move while the transaction owns SQLite's write lock.
+    """
+    if not favorites:
+        return []
+
+    id_by_tag = _resolve_tag_ids(conn, (tag for item in favorites for tag in item["tags"]))
+    sequence_row = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'favorites'"
+    ).fetchone()
+    max_row = conn.execute("SELECT MAX(id) FROM favorites").fetchone()
+    first_id = max(int(sequence_row[0]) if sequence_row else 0, int(max_row[0] or 0)) + 1
+
+    conn.executemany(
+        """
+        INSERT INTO favorites (
+            id,
+            name,
+            name_class,
+            package_id,
+            package_name,
+            syllable_key,
+            render_style,
+            output_format,
+            seed,
+            gender,
+            source,
+            note_md,
+            metadata_json,
+            created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                first_id + offset,
+                item["name"],
+                item["name_class"],
+                item["package_id"],
+                item["package_name"],
+                item["syllable_key"],
+                item["render_style"],
+                item["output_format"],
+                item["seed"],
+                item["gender"],
+                item["source"],
+                item["note_md"],
+                _serialize_metadata(item["metadata"]),
+                created_at,
+            )
+            for offset, item in enumerate(favorites)
+        ],
+    )
+    favorite_ids = list(range(first_id, first_id + len(favorites)))
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO favorite_tags (favorite_id, tag_id) VALUES (?, ?)",
+        [
+            (favorite_id, id_by_tag[tag.casefold()])
+            for favorite_id, item in zip(favorite_ids, favorites)
+            for tag in item["tags"]
+            if tag.casefold() in id_by_tag
+        ],
+    )
+    return favorite_ids
+
+
+def _begin_write(conn: Any) -> None:
+    """Open an immediate write transaction unless one is already active."""
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
 def insert_favorites(conn: Any, entries: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
     """Insert favorites and return the inserted records.
 
@@ -62,89 +190,97 @@ def insert_favorites(conn: Any, entries: Iterable[dict[str, Any]]) -> list[dict[
     Optional fields are stored when present.
     """
     created_at = datetime.now(timezone.utc).isoformat()
-    inserted: list[dict[str, Any]] = []
-
-    for entry in entries:
-        name = str(entry.get("name", "")).strip()
-        source = str(entry.get("source", "")).strip()
-        if not name:
-            raise ValueError("Favorite name is required.")
-        if not source:
-            raise ValueError("Favorite source is required.")
-
-        metadata = entry.get("metadata")
-        if not isinstance(metadata, dict):
-            metadata = {}
-
-        tags = _normalize_tags(entry.get("tags", []))
-        tag_ids = _ensure_tags(conn, tags)
-
-        cursor = conn.execute(
-            """
-            INSERT INTO favorites (
-                name,
-                name_class,
-                package_id,
-                package_name,
-                syllable_key,
-                render_style,
-                output_format,
-                seed,
-                gender,
-                source,
-                note_md,
-                metadata_json,
-                created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                name,
-                entry.get("name_class"),
-                entry.get("package_id"),
-                entry.get("package_name"),
-                entry.get("syllable_key"),
-                entry.get("render_style"),
-                entry.get("output_format"),
-                entry.get("seed"),
-                entry.get("gender"),
-                source,
-                entry.get("note_md"),
-                _serialize_metadata(metadata),
-                created_at,
-            ),
-        )
-        favorite_id = int(cursor.lastrowid)
+    prepared = [_prepare_favorite(entry) for entry in entries]
 
-        for tag_id in tag_ids:
-            conn.execute(
-                "INSERT OR IGNORE INTO favorite_tags (favorite_id, tag_id) VALUES (?, ?)",
-                (favorite_id, tag_id),
-            )
+    _begin_write(conn)
+    try:
+        favorite_ids = _insert_favorite_batch(conn, prepared, created_at)
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
+    return [
+        {"id": favorite_id, **item, "created_at": created_at}
+        for favorite_id, item in zip(favorite_ids, prepared)
+    ]
 
-        inserted.append(
-            {
-                "id": favorite_id,
-                "name": name,
-                "name_class": entry.get("name_class"),
-                "package_id": entry.get("package_id"),
-                "package_name": entry.get("package_name"),
-                "syllable_key": entry.get("syllable_key"),
-                "render_style": entry.get("render_style"),
-                "output_format": entry.get("output_format"),
-                "seed": entry.get("seed"),
-                "gender": entry.get("gender"),
-                "source": source,
-                "note_md": entry.get("note_md"),
-                "metadata": metadata,
-                "created_at": created_at,
-                "tags": tags,
-            }
-        )
 
+def insert_favorites_bulk(
+    conn: Any,
+    entries: Iterable[dict[str, Any]],
+    *,
+    batch_size: int = FAVORITES_BULK_BATCH_SIZE,
+) -> int:
+    """Insert a large stream of favorites in one transaction.
+
+    ``entries`` is consumed lazily, ``batch_size`` entries at a time: each
+    batch resolves its tags in one pass and inserts favorites and tag links
+    with ``executemany``. Any error (including one raised while iterating
+    ``entries``) rolls back the whole import.
+
+    Returns:
+        Number of favorites inserted.
+    """
+    created_at = datetime.now(timezone.utc).isoformat()
+    size = max(1, batch_size)
+    inserted = 0
+
+    _begin_write(conn)
+    try:
+        batch: list[dict[str, Any]] = []
+        for entry in entries:
+            batch.append(_prepare_favorite(entry))
+            if len(batch) >= size:
+                inserted += len(_insert_favorite_batch(conn, batch, created_at))
+                batch = []
+        inserted += len(_insert_favorite_batch(conn, batch, created_at))
+    except Exception:
+        conn.rollback()
+        raise
     conn.commit()
     return inserted
 
 
+def _fts_match_expression(name_query: str) -> str | None:
+    """Translate free-text search into an FTS5 prefix query.
+
+    Every word becomes a quoted prefix term (``"bry"*``) and terms are ANDed,
+    so the search box matches as the user types. Returns ``None`` when the
+    query has no word characters to search for.
+    """
+    terms = re.findall(r"\w+", name_query)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _has_favorites_fts(conn: Any) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (FAVORITES_FTS_TABLE,),
+    ).fetchone()
+    return row is not None
+
+
+def _tags_by_favorite(conn: Any, favorite_ids: list[int]) -> dict[int, list[str]]:
+    """Return tag names for several favorites, one query per :data:`_SQL_VARIABLE_BATCH` ids."""
+    tags: dict[int, list[str]] = {favorite_id: [] for favorite_id in favorite_ids}
+    for start in range(0, len(favorite_ids), _SQL_VARIABLE_BATCH):
+        batch = favorite_ids[start : start + _SQL_VARIABLE_BATCH]
+        placeholders = ",".join(["?"] * len(batch))
+        rows = conn.execute(
+            "SELECT ft.favorite_id, t.name "  # nosec B608 - placeholders only
+            "FROM favorite_tags ft "
+            "JOIN tags t ON t.id = ft.tag_id "
+            f"WHERE ft.favorite_id IN ({placeholders}) "
+            "ORDER BY ft.favorite_id, ft.rowid",
+            batch,
+        ).fetchall()
+        for row in rows:
+            tags[int(row[0])].append(str(row[1]))
+    return tags
+
+
 def list_favorites(
     conn: Any,
     *,
@@ -155,14 +291,31 @@ def list_favorites(
     name_class: str | None = None,
     package_id: int | None = None,
 ) -> tuple[list[dict[str, Any]], int]:
-    """Return favorites and total count for the given filters."""
+    """Return favorites and total count for the given filters.
+
+    ``name_query`` searches names and notes through the ``favorites_fts``
+    index with prefix matching, and results are ordered by relevance (bm25)
+    before recency. Without the index (SQLite built without FTS5) it falls
+    back to substring ``LIKE`` matching. The total comes from a
+    ``COUNT(*) OVER ()`` window in the page query, so only an out-of-range
+    page needs a separate count.
+    """
+    joins = ""
     filters: list[str] = []
     params: list[Any] = []
+    order_by = "f.created_at DESC, f.id DESC"
 
     if name_query:
-        filters.append("(f.name LIKE ? OR f.note_md LIKE ?)")
-        like = f"%{name_query}%"
-        params.extend([like, like])
+        match = _fts_match_expression(name_query) if _has_favorites_fts(conn) else None
+        if match is not None:
+            joins = f"JOIN {FAVORITES_FTS_TABLE} ON {FAVORITES_FTS_TABLE}.rowid = f.id "
+            filters.append(f"{FAVORITES_FTS_TABLE} MATCH ?")
+            params.append(match)
+            order_by = f"{FAVORITES_FTS_TABLE}.rank, {order_by}"
+        else:
+            filters.append("(f.name LIKE ? OR f.note_md LIKE ?)")
+            like = f"%{name_query}%"
+            params.extend([like, like])
 
     if name_class:
         filters.append("f.name_class = ?")
@@ -182,28 +335,28 @@ def list_favorites(
 
     where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
 
-    count_row = conn.execute(
-        f"SELECT COUNT(*) AS total FROM favorites f {where_clause}",  # nosec B608
-        params,
-    ).fetchone()
-    total = int(count_row["total"]) if count_row else 0
-
     query = (
-        "SELECT f.*, GROUP_CONCAT(t.name, '|') AS tags "
+        "SELECT f.*, COUNT(*) OVER () AS total_count "
         "FROM favorites f "
-        "LEFT JOIN favorite_tags ft ON ft.favorite_id = f.id "
-        "LEFT JOIN tags t ON t.id = ft.tag_id "
-        f"{where_clause} "  # nosec B608
-        "GROUP BY f.id "
-        "ORDER BY f.created_at DESC, f.id DESC "
+        f"{joins}"  # nosec B608
+        f"{where_clause} "
+        f"ORDER BY {order_by} "
         "LIMIT ? OFFSET ?"
     )
     rows = conn.execute(query, params + [limit, offset]).fetchall()
 
+    if rows:
+        total = int(rows[0]["total_count"])
+    else:
+        count_row = conn.execute(
+            f"SELECT COUNT(*) AS total FROM favorites f {joins}{where_clause}",  # nosec B608
+            params,
+        ).fetchone()
+        total = int(count_row["total"]) if count_row else 0
+
+    tags_by_id = _tags_by_favorite(conn, [int(row["id"]) for row in rows])
     favorites: list[dict[str, Any]] = []
     for row in rows:
-        tags_raw = row["tags"] or ""
-        tags = [tag for tag in tags_raw.split("|") if tag]
         favorites.append(
             {
                 "id": int(row["id"]),
@@ -220,7 +373,7 @@ def list_favorites(
                 "note_md": row["note_md"],
                 "metadata": _deserialize_metadata(row["metadata_json"]),
                 "created_at": row["created_at"],
-                "tags": tags,
+                "tags": tags_by_id[int(row["id"])],
             }
         )
 
@@ -303,23 +456,27 @@ def delete_favorite(conn: Any, favorite_id: int) -> bool:
     return bool(cursor.rowcount)
 
 
-def export_favorites(conn: Any) -> dict[str, Any]:
-    """Serialize all favorites for export."""
-    rows = conn.execute("""
-        SELECT f.*, GROUP_CONCAT(t.name, '|') AS tags
-        FROM favorites f
-        LEFT JOIN favorite_tags ft ON ft.favorite_id = f.id
-        LEFT JOIN tags t ON t.id = ft.tag_id
-        GROUP BY f.id
-        ORDER BY f.created_at DESC, f.id DESC
-        """).fetchall()
+def iter_favorites(
+    conn: Any, *, batch_size: int = FAVORITES_BULK_BATCH_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Yield every favorite in id order without loading the whole library.
 
-    favorites: list[dict[str, Any]] = []
-    for row in rows:
-        tags_raw = row["tags"] or ""
-        tags = [tag for tag in tags_raw.split("|") if tag]
-        favorites.append(
-            {
+    Rows are read in keyset batches of ``batch_size`` (``WHERE id > ?``) and
+    each batch resolves its tags with one query, so memory is bounded by the
+    batch size.
+    """
+    size = max(1, batch_size)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT * FROM favorites WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, size),
+        ).fetchall()
+        if not rows:
+            return
+        tags_by_id = _tags_by_favorite(conn, [int(row["id"]) for row in rows])
+        for row in rows:
+            yield {
                 "id": int(row["id"]),
                 "name": row["name"],
                 "name_class": row["name_class"],
@@ -334,10 +491,22 @@ def export_favorites(conn: Any) -> dict[str, Any]:
                 "note_md": row["note_md"],
                 "metadata": _deserialize_metadata(row["metadata_json"]),
                 "created_at": row["created_at"],
-                "tags": tags,
+                "tags": tags_by_id[int(row["id"])],
             }
-        )
+        last_id = int(rows[-1]["id"])
+
 
+def export_favorites(conn: Any) -> dict[str, Any]:
+    """Serialize all favorites for export.
+
+    This builds the whole library in memory; use :func:`iter_favorites` (the
+    NDJSON export) for large libraries.
+    """
+    favorites = sorted(
+        iter_favorites(conn),
+        key=lambda entry: (entry["created_at"], entry["id"]),
+        reverse=True,
+    )
     return {
         "schema_version": 1,
         "exported_at": datetime.now(timezone.utc).isoformat(),
@@ -346,7 +515,10 @@ def export_favorites(conn: Any) -> dict[str, Any]:
 
 
 __all__ = [
+    "FAVORITES_BULK_BATCH_SIZE",
     "insert_favorites",
+    "insert_favorites_bulk",
+    "iter_favorites",
     "list_favorites",
     "list_tags",
     "list_tags_for_favorite",
@@ -4,10 +4,15 @@ from __future__ import annotations
 
 import sqlite3
 
+FAVORITES_FTS_TABLE = "favorites_fts"
+
 
 def initialize_favorites_schema(conn: sqlite3.Connection) -> None:
     """Create tables used by the favorites user database.
 
+    ``favorites_fts`` is an external-content FTS5 index over ``name`` and
+    ``note_md`` kept in sync by triggers (see :func:`ensure_favorites_fts`).
+
     Args:
         conn: Open SQLite connection.
     """
@@ -62,7 +67,71 @@ def initialize_favorites_schema(conn: sqlite3.Connection) -> None:
     columns = {row[1] for row in conn.execute("PRAGMA table_info(favorites)").fetchall()}
     if "gender" not in columns:
         conn.execute("ALTER TABLE favorites ADD COLUMN gender TEXT")
+    ensure_favorites_fts(conn)
     conn.commit()
 
 
-__all__ = ["initialize_favorites_schema"]
+def ensure_favorites_fts(conn: sqlite3.Connection) -> bool:
+    """Create the favorites FTS5 index and its sync triggers when missing.
+
+    The table, triggers, and any rebuild run in one transaction that the
+    caller commits. The index is rebuilt whenever its document count differs
+    from the ``favorites`` row count, so older databases become searchable on
+    upgrade and an index left incomplete by an interrupted setup is repaired
+    on the next start.
+
+    Returns:
+        ``True`` when the index is available, ``False`` when this SQLite build
+        lacks FTS5 (searches then fall back to ``LIKE`` scans).
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (FAVORITES_FTS_TABLE,),
+    ).fetchone()
+    if exists is None:
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE favorites_fts USING fts5(
+                    name,
+                    note_md,
+                    content = 'favorites',
+                    content_rowid = 'id',
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+                """)
+        except sqlite3.OperationalError as exc:
+            if "fts5" in str(exc).lower():
+                return False
+            raise
+    # Individual statements: ``executescript`` would commit the open transaction.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS favorites_fts_insert AFTER INSERT ON favorites BEGIN
+            INSERT INTO favorites_fts(rowid, name, note_md)
+            VALUES (new.id, new.name, new.note_md);
+        END
+        """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS favorites_fts_delete AFTER DELETE ON favorites BEGIN
+            INSERT INTO favorites_fts(favorites_fts, rowid, name, note_md)
+            VALUES ('delete', old.id, old.name, old.note_md);
+        END
+        """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS favorites_fts_update
+        AFTER UPDATE OF name, note_md ON favorites BEGIN
+            INSERT INTO favorites_fts(favorites_fts, rowid, name, note_md)
+            VALUES ('delete', old.id, old.name, old.note_md);
+            INSERT INTO favorites_fts(rowid, name, note_md)
+            VALUES (new.id, new.name, new.note_md);
+        END
+        """)
+    indexed = conn.execute("SELECT COUNT(*) FROM favorites_fts_docsize").fetchone()[0]
+    stored = conn.execute("SELECT COUNT(*) FROM favorites").fetchone()[0]
+    if indexed != stored:
+        conn.execute("INSERT INTO favorites_fts(favorites_fts) VALUES ('rebuild')")
+    return True
+
+
+__all__ = ["FAVORITES_FTS_TABLE", "initialize_favorites_schema", "ensure_favorites_fts"]
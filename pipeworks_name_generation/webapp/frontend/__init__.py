@@ -1,5 +1,19 @@
 """Frontend asset access helpers used by the webapp handler."""
 
-from .assets import get_index_html, get_static_binary_asset, get_static_text_asset
+from .assets import (
+    get_index_html,
+    get_static_asset_cache_stats,
+    get_static_binary_asset,
+    get_static_text_asset,
+    preload_static_assets,
+    prepare_asset,
+)
 
-__all__ = ["get_index_html", "get_static_text_asset", "get_static_binary_asset"]
+__all__ = [
+    "get_index_html",
+    "get_static_text_asset",
+    "get_static_binary_asset",
+    "prepare_asset",
+    "preload_static_assets",
+    "get_static_asset_cache_stats",
+]
@@ -1,7 +1,9 @@
 """Frontend asset loading for the webapp shell.
 
 The webapp serves one HTML page plus small static CSS/JS assets from package
-files. Content is cached in-process so repeated requests avoid disk IO.
+files. Content is cached in-process so repeated requests avoid disk IO, and
+:func:`preload_static_assets` prepares every asset's gzip variant and ETag once
+at startup so requests only pick a representation.
 """
 
 from __future__ import annotations
@@ -9,6 +11,9 @@ from __future__ import annotations
 from functools import lru_cache
 from pathlib import Path
 
+from pipeworks_name_generation.webapp.cache import ByteBoundedLRUCache, CacheStats
+from pipeworks_name_generation.webapp.http.caching import PreparedBody, prepare_body
+
 _FRONTEND_ROOT = Path(__file__).resolve().parent
 _TEMPLATES_DIR = _FRONTEND_ROOT / "templates"
 _STATIC_DIR = _FRONTEND_ROOT / "static"
@@ -25,6 +30,15 @@ _STATIC_BINARY_CONTENT_TYPES: dict[str, str] = {
     ".ttf": "font/ttf",
 }
 
+# Prepared bodies (identity + gzip variant) keyed by ``(content, content_type)``.
+PREPARED_ASSET_CACHE_MAX_ENTRIES = 64
+PREPARED_ASSET_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+_PREPARED_ASSET_CACHE = ByteBoundedLRUCache[tuple[str | bytes, str], PreparedBody](
+    max_entries=PREPARED_ASSET_CACHE_MAX_ENTRIES,
+    max_bytes=PREPARED_ASSET_CACHE_MAX_BYTES,
+)
+
 
 @lru_cache(maxsize=1)
 def get_index_html() -> str:
@@ -51,6 +65,12 @@ def get_static_text_asset(filename: str) -> tuple[str, str]:
     return _read_static_text(filename), content_type
 
 
+@lru_cache(maxsize=64)
+def _read_static_binary(resolved: Path) -> bytes:
+    """Read and cache one binary static asset by resolved path."""
+    return resolved.read_bytes()
+
+
 def get_static_binary_asset(relative_path: str) -> tuple[bytes, str]:
     """Return ``(payload, content_type)`` for binary assets under ``static/``.
 
@@ -68,7 +88,49 @@ def get_static_binary_asset(relative_path: str) -> tuple[bytes, str]:
     content_type = _STATIC_BINARY_CONTENT_TYPES.get(resolved.suffix.lower())
     if content_type is None:
         raise FileNotFoundError("Static asset type not supported.")
-    return resolved.read_bytes(), content_type
+    return _read_static_binary(resolved), content_type
+
 
+def prepare_asset(content: str | bytes, content_type: str) -> PreparedBody:
+    """Return the cached gzip variant and strong ETag for one asset body.
 
-__all__ = ["get_index_html", "get_static_text_asset", "get_static_binary_asset"]
+    Keyed by the cached content objects above, whose hashes Python memoizes,
+    so lookups on the request path are O(1) after the first call.
+    """
+    key = (content, content_type)
+    prepared = _PREPARED_ASSET_CACHE.get(key)
+    if prepared is None:
+        payload = content.encode("utf-8") if isinstance(content, str) else content
+        prepared = prepare_body(payload, content_type)
+        nbytes = len(prepared.identity) + len(prepared.gzipped or b"")
+        _PREPARED_ASSET_CACHE.put(key, prepared, nbytes=nbytes)
+    return prepared
+
+
+def preload_static_assets() -> int:
+    """Read and prepare every served asset once; return how many were prepared."""
+    prepare_asset(get_index_html(), "text/html")
+    prepared = 1
+    for filename in _STATIC_CONTENT_TYPES:
+        prepare_asset(*get_static_text_asset(filename))
+        prepared += 1
+    for path in sorted(_STATIC_DIR.rglob("*")):
+        if path.suffix.lower() in _STATIC_BINARY_CONTENT_TYPES and path.is_file():
+            prepare_asset(*get_static_binary_asset(str(path.relative_to(_STATIC_DIR))))
+            prepared += 1
+    return prepared
+
+
+def get_static_asset_cache_stats() -> CacheStats:
+    """Return hit/miss, eviction, and size counters for the prepared asset cache."""
+    return _PREPARED_ASSET_CACHE.stats()
+
+
+__all__ = [
+    "get_index_html",
+    "get_static_text_asset",
+    "get_static_binary_asset",
+    "prepare_asset",
+    "preload_static_assets",
+    "get_static_asset_cache_stats",
+]
@@ -22,7 +22,17 @@
       limit: 20,
       total: 0,
       packageId: null,
+      cursor: '',
+      cursorStack: [],
+      nextCursor: null,
     };
+
+    function resetDbPaging() {
+      dbState.offset = 0;
+      dbState.cursor = '';
+      dbState.cursorStack = [];
+      dbState.nextCursor = null;
+    }
     const generationCardKeys = [
       'first_name',
       'last_name',
@@ -111,6 +121,12 @@
       setGenerationCardsCollapsed(!generationCardsCollapsed);
     }
 
+    function formatImportProgress(job) {
+      const percent = Math.round((job.progress || 0) * 100);
+      return `Importing... ${job.entries_processed}/${job.entries_total} file(s), `
+        + `${job.rows_inserted} row(s), ${percent}%`;
+    }
+
     async function importPair() {
       const status = document.getElementById('import-status');
       status.className = 'muted';
@@ -121,19 +137,41 @@
         package_zip_path: document.getElementById('zip-path').value.trim(),
       };
 
-      const response = await fetch('/api/import', {
+      const response = await fetch('/api/import/start', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(payload),
       });
       const data = await response.json();
-      status.className = response.ok ? 'ok' : 'err';
-      status.textContent = data.message || data.error || 'Import failed.';
+      if (!response.ok) {
+        status.className = 'err';
+        status.textContent = data.error || 'Import failed.';
+        return;
+      }
+
+      let job = data.job;
+      while (job.status === 'queued' || job.status === 'running') {
+        status.textContent = formatImportProgress(job);
+        await new Promise((resolve) => setTimeout(resolve, 500));
+        const poll = await fetch(`/api/import/status?job_id=${encodeURIComponent(job.job_id)}`);
+        const pollData = await poll.json();
+        if (!poll.ok) {
+          status.className = 'err';
+          status.textContent = pollData.error || 'Import failed.';
+          return;
+        }
+        job = pollData.job;
+      }
 
-      if (response.ok) {
-        await loadPackages();
-        await loadGenerationPackageOptions();
+      if (job.status !== 'completed') {
+        status.className = 'err';
+        status.textContent = job.error || `Import ${job.status}.`;
+        return;
       }
+      status.className = 'ok';
+      status.textContent = job.result.message;
+      await loadPackages();
+      await loadGenerationPackageOptions();
     }
 
     function setGenerationCardState(classKey, isEnabled, noteText, options) {
@@ -1112,7 +1150,7 @@
 
       dbState.packageId = packageId;
       dbState.tableId = null;
-      dbState.offset = 0;
+      resetDbPaging();
       dbState.total = 0;
 
       const response = await fetch(`/api/database/package-tables?package_id=${encodeURIComponent(packageId)}`);
@@ -1169,9 +1207,11 @@
         return;
       }
 
-      const response = await fetch(
-        `/api/database/table-rows?table_id=${encodeURIComponent(dbState.tableId)}&offset=${encodeURIComponent(dbState.offset)}&limit=${encodeURIComponent(dbState.limit)}`
-      );
+      const params = new URLSearchParams({ table_id: String(dbState.tableId), limit: String(dbState.limit) });
+      if (dbState.cursor) {
+        params.set('after', dbState.cursor);
+      }
+      const response = await fetch(`/api/database/table-rows?${params.toString()}`);
       const data = await response.json();
       body.innerHTML = '';
 
@@ -1187,7 +1227,7 @@
 
       const rows = data.rows || [];
       dbState.total = Number(data.total_rows || 0);
-      dbState.offset = Number(data.offset || 0);
+      dbState.nextCursor = data.next_cursor || null;
       dbState.limit = Number(data.limit || dbState.limit);
 
       for (const row of rows) {
@@ -1205,16 +1245,25 @@
       const start = dbState.total ? dbState.offset + 1 : 0;
       const end = dbState.offset + rows.length;
       pageStatus.textContent = `Rows ${start}-${end} of ${dbState.total}`;
-      prevBtn.disabled = dbState.offset <= 0;
-      nextBtn.disabled = (dbState.offset + dbState.limit) >= dbState.total;
+      prevBtn.disabled = dbState.cursorStack.length === 0;
+      nextBtn.disabled = !dbState.nextCursor;
     }
 
     function pagePrev() {
+      if (!dbState.cursorStack.length) {
+        return;
+      }
+      dbState.cursor = dbState.cursorStack.pop();
       dbState.offset = Math.max(0, dbState.offset - dbState.limit);
       loadTableRows();
     }
 
     function pageNext() {
+      if (!dbState.nextCursor) {
+        return;
+      }
+      dbState.cursorStack.push(dbState.cursor);
+      dbState.cursor = dbState.nextCursor;
       dbState.offset = dbState.offset + dbState.limit;
       loadTableRows();
     }
@@ -1243,7 +1292,7 @@
       const tableSelect = document.getElementById('db-table-select');
       dbState.tableId = Number(tableSelect.value || '0');
       dbState.total = Number(tableSelect.selectedOptions[0]?.dataset.rowCount || '0');
-      dbState.offset = 0;
+      resetDbPaging();
       loadTableRows();
     });
     document.getElementById('db-prev-btn').addEventListener('click', pagePrev);
@@ -1,26 +1,52 @@
 """Generation-domain helpers for the webapp API.
 
-This module owns class/syllable mapping rules, package option discovery,
-selection statistics, and deterministic sampling behavior used by
-``/api/generate`` and related generation endpoints.
+This module owns package option discovery, selection statistics, and
+deterministic sampling behavior used by ``/api/generate`` and related
+generation endpoints. Class/syllable mapping rules live in
+:mod:`pipeworks_name_generation.webapp.generation_mapping` and are re-exported
+here.
 """
 
 from __future__ import annotations
 
+import bisect
+import json
 import random
-import re
 import sqlite3
+import sys
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 
 from pipeworks_name_generation.renderer import normalize_render_style
+from pipeworks_name_generation.webapp.cache import CacheStats, ChangeStampedCache
 from pipeworks_name_generation.webapp.constants import (
     GENERATION_CLASS_KEYS,
-    GENERATION_CLASS_PATTERNS,
+    GENERATION_INDEXED_SAMPLING_MIN_ROWS,
     GENERATION_NAME_CLASSES,
+    GENERATION_OUTPUT_FORMATS,
+    GENERATION_STREAM_CHUNK_SIZE,
     GENERATION_SYLLABLE_LABELS,
 )
 from pipeworks_name_generation.webapp.db import quote_identifier as _quote_identifier
+from pipeworks_name_generation.webapp.db.changes import get_database_change_stamp
+from pipeworks_name_generation.webapp.db.stats import get_scope_stats as _get_scope_stats
+from pipeworks_name_generation.webapp.db.stats import package_has_stats as _package_has_stats
+from pipeworks_name_generation.webapp.db.table_store import (
+    STORAGE_LAYOUT_TABLE,
+    STORAGE_LAYOUT_VALUES,
+)
+from pipeworks_name_generation.webapp.db.table_store import (
+    read_package_values as _read_package_values,
+)
+from pipeworks_name_generation.webapp.generation_mapping import (
+    UNMAPPED_SCOPE_KEY,
+    _extract_syllable_option_from_source_txt_name,
+    _map_source_txt_name_to_generation_class,
+    _syllable_option_sort_key,
+    _validate_generation_syllable_key,
+)
 
 
 def _coerce_generation_count(raw_count: Any) -> int:
@@ -48,7 +74,7 @@ def _coerce_optional_seed(raw_seed: Any) -> int | None:
         raise ValueError("Field 'seed' must be an integer when provided.") from exc
 
 
-def _coerce_bool(raw_value: Any) -> bool:
+def _coerce_bool(raw_value: Any, *, field: str = "unique_only") -> bool:
     """Parse loose bool payload values used by UI and API clients."""
     if isinstance(raw_value, bool):
         return raw_value
@@ -60,14 +86,14 @@ def _coerce_bool(raw_value: Any) -> bool:
             return True
         if normalized in {"0", "false", "no", "n", "off", ""}:
             return False
-    raise ValueError("Field 'unique_only' must be a boolean-compatible value.")
+    raise ValueError(f"Field '{field}' must be a boolean-compatible value.")
 
 
 def _coerce_output_format(raw_format: Any) -> str:
     """Validate output format enum currently supported by the generate route."""
     normalized = str(raw_format).strip().lower() if raw_format is not None else "json"
-    if normalized not in {"json", "txt"}:
-        raise ValueError("Field 'output_format' must be one of: json, txt.")
+    if normalized not in GENERATION_OUTPUT_FORMATS:
+        raise ValueError("Field 'output_format' must be one of: json, txt, ndjson.")
     return normalized
 
 
@@ -111,10 +137,24 @@ def _collect_generation_source_values(
     if not matching_tables:
         raise ValueError("No imported tables match class/package/syllable selection.")
 
+    # Consolidated-layout tables are served by one indexed query for the whole
+    # scope; legacy physical tables are read one by one. Values are then
+    # concatenated in ``matching_tables`` order so output stays deterministic
+    # regardless of layout.
+    consolidated = _read_package_values(
+        conn,
+        [
+            int(item["id"])
+            for item in matching_tables
+            if item["storage_layout"] == STORAGE_LAYOUT_VALUES
+        ],
+    )
     values: list[str] = []
     for item in matching_tables:
-        table_name = str(item["table_name"])
-        values.extend(_read_all_values_from_table(conn, table_name))
+        if item["storage_layout"] == STORAGE_LAYOUT_VALUES:
+            values.extend(consolidated[int(item["id"])])
+        else:
+            values.extend(_read_all_values_from_table(conn, str(item["table_name"])))
 
     # Keep non-empty strings only; importer already trims values but this keeps
     # generation resilient to unexpected DB contents.
@@ -124,87 +164,376 @@ def _collect_generation_source_values(
     return normalized_values
 
 
+@dataclass(frozen=True)
+class GenerationCandidatePool:
+    """Prepared candidate values for one generation scope.
+
+    Pools are immutable so they can be shared between concurrent requests.
+    ``unique_values`` and ``counts`` reference the same string objects as
+    ``values``, so the deduplicated views only cost a few pointers per
+    distinct value.
+
+    Attributes:
+        values: Stripped, non-empty candidates in table/row order.
+        unique_values: First-seen-order distinct view of ``values``.
+        counts: Occurrences of each distinct value in ``values``.
+        nbytes: Estimated memory footprint used for cache accounting.
+    """
+
+    values: tuple[str, ...]
+    unique_values: tuple[str, ...]
+    counts: Mapping[str, int]
+    nbytes: int
+
+    @classmethod
+    def from_values(cls, values: Sequence[str]) -> "GenerationCandidatePool":
+        """Build a pool from already-normalized candidate values."""
+        packed = tuple(values)
+        counts = Counter(packed)
+        unique_values = tuple(counts)
+        # Tuple slots for both views, the count map, and each distinct string once.
+        nbytes = sys.getsizeof(packed) + sys.getsizeof(unique_values) + sys.getsizeof(counts)
+        nbytes += sum(sys.getsizeof(value) for value in unique_values)
+        return cls(values=packed, unique_values=unique_values, counts=counts, nbytes=nbytes)
+
+    def __len__(self) -> int:
+        """Return the number of candidate values (including duplicates)."""
+        return len(self.values)
+
+    @property
+    def distinct_count(self) -> int:
+        """Return the number of distinct candidate values."""
+        return len(self.unique_values)
+
+    def values_at(self, positions: Sequence[int]) -> list[str | None]:
+        """Return the value at each position (see :meth:`IndexedCandidateSource.values_at`)."""
+        return [self.values[position] for position in positions]
+
+    def multiplicities(self, values: Iterable[str]) -> dict[str, int]:
+        """Return how often each of ``values`` occurs in the pool."""
+        return {value: self.counts.get(value, 0) for value in values}
+
+
+# SQLite's default host-parameter limit is 999 on older builds.
+_INDEXED_FETCH_BATCH = 500
+# Redraw rounds that find only blank rows before falling back to the pool.
+_INDEXED_MAX_EMPTY_ROUNDS = 8
+# Unique-only draws of at most this share of a scope's distinct values use
+# rejection sampling; the expected number of row draws, about
+# ``rows * ln(distinct / (distinct - count))``, then stays below ``rows / 16``.
+# Larger draws shuffle the deduplicated pool instead.
+_UNIQUE_REJECTION_MAX_SHARE = 0.06
+
+
+@dataclass(frozen=True)
+class _IndexedSpan:
+    """Contiguous rowid range backing one matching table of a scope."""
+
+    start: int
+    first_id: int
+    row_count: int
+    table_name: str | None  # ``None`` means rows live in ``package_values``
+    package_table_id: int
+
+
+@dataclass(frozen=True)
+class IndexedCandidateSource:
+    """Candidate values of one scope addressed by position, never fully loaded.
+
+    Position ``k`` of the scope maps to one row id inside the matching tables,
+    in the same order :func:`_collect_generation_source_values` would return
+    them, so sampling is identical to sampling the in-memory list. Sampling
+    needs the connection to stay open, so callers sample inside the block
+    that leased it.
+
+    Attributes:
+        conn: Open SQLite connection used for row lookups.
+        spans: Rowid ranges of the matching tables, in scope order.
+        total: Number of candidate positions.
+        load_pool: Loads the full candidate pool for requests indexed
+            sampling cannot serve.
+        distinct_count: Distinct values in the scope from materialized
+            statistics, or ``None`` when they are missing or a matching
+            table has no index on ``value``; unique-only draws then use the
+            pool.
+    """
+
+    conn: sqlite3.Connection
+    spans: tuple[_IndexedSpan, ...]
+    total: int
+    load_pool: Callable[[], GenerationCandidatePool]
+    distinct_count: int | None = None
+
+    def __len__(self) -> int:
+        """Return the number of candidate positions."""
+        return self.total
+
+    def fetch(self, positions: Sequence[int]) -> list[str]:
+        """Return values for ``positions`` in the given order.
+
+        Values are stripped and blank ones dropped, as in
+        :func:`_collect_generation_source_values`, so the result can be
+        shorter than ``positions``.
+        """
+        return [value for value in self.values_at(positions) if value]
+
+    def values_at(self, positions: Sequence[int]) -> list[str | None]:
+        """Return the stripped value at each position, ``None`` for blank rows."""
+        starts = [span.start for span in self.spans]
+        wanted: dict[int, list[int]] = {}
+        for position in positions:
+            span_index = bisect.bisect_right(starts, position) - 1
+            span = self.spans[span_index]
+            wanted.setdefault(span_index, []).append(span.first_id + position - span.start)
+
+        by_row: dict[tuple[int, int], str] = {}
+        for span_index, row_ids in wanted.items():
+            span = self.spans[span_index]
+            source = (
+                "package_values" if span.table_name is None else _quote_identifier(span.table_name)
+            )
+            unique_ids = list(dict.fromkeys(row_ids))
+            for offset in range(0, len(unique_ids), _INDEXED_FETCH_BATCH):
+                batch = unique_ids[offset : offset + _INDEXED_FETCH_BATCH]
+                placeholders = ", ".join("?" for _ in batch)
+                query = f"SELECT id, value FROM {source} WHERE id IN ({placeholders})"  # nosec B608
+                for row in self.conn.execute(query, batch):
+                    by_row[(span_index, int(row[0]))] = str(row[1]).strip()
+
+        values: list[str | None] = []
+        for position in positions:
+            span_index = bisect.bisect_right(starts, position) - 1
+            span = self.spans[span_index]
+            values.append(by_row.get((span_index, span.first_id + position - span.start)) or None)
+        return values
+
+    def multiplicities(self, values: Iterable[str]) -> dict[str, int]:
+        """Count each value's rows across the scope through the ``value`` indexes."""
+        wanted = list(dict.fromkeys(values))
+        counts = dict.fromkeys(wanted, 0)
+        for span in self.spans:
+            if span.table_name is None:
+                source, filters = "package_values", "package_table_id = ? AND "
+            else:
+                source, filters = _quote_identifier(span.table_name), ""
+            for offset in range(0, len(wanted), _INDEXED_FETCH_BATCH):
+                batch = wanted[offset : offset + _INDEXED_FETCH_BATCH]
+                placeholders = ", ".join("?" for _ in batch)
+                query = (
+                    f"SELECT value, COUNT(*) FROM {source} "  # nosec B608
+                    f"WHERE {filters}value IN ({placeholders}) GROUP BY value"
+                )
+                params = ([span.package_table_id] if span.table_name is None else []) + batch
+                for row in self.conn.execute(query, params):
+                    counts[str(row[0])] += int(row[1])
+        return counts
+
+    def draw(self, rng: random.Random, size: int) -> list[str]:
+        """Draw ``size`` names with replacement, advancing ``rng``.
+
+        Positions holding blank values are redrawn. The importer never stores
+        blank values, so for imported data the RNG calls match ``rng.choice``
+        on the in-memory candidate list.
+        """
+        values = self.fetch([rng.randrange(self.total) for _ in range(size)])
+        empty_rounds = 0
+        while len(values) < size:
+            extra = self.fetch([rng.randrange(self.total) for _ in range(size - len(values))])
+            empty_rounds = 0 if extra else empty_rounds + 1
+            if empty_rounds >= _INDEXED_MAX_EMPTY_ROUNDS:
+                # Mostly blank rows: sample the normalized pool instead, which
+                # raises when the scope has no usable values at all.
+                pool_values = self.load_pool().values
+                values.extend(rng.choice(pool_values) for _ in range(size - len(values)))
+                break
+            values.extend(extra)
+        return values
+
+
+def _draw_unique_by_rejection(
+    source: GenerationCandidatePool | IndexedCandidateSource,
+    rng: random.Random,
+    count: int,
+) -> list[str] | None:
+    """Draw ``count`` distinct values uniformly without loading every candidate.
+
+    Each step draws a row position and accepts its value with probability
+    ``1 / multiplicity``, so every distinct value is equally likely however
+    often it repeats; values already drawn are rejected. Steps always consume
+    one ``randrange`` and one ``random`` call and run in fixed batches, so a
+    pool and an indexed source over the same rows return the same names.
+
+    Returns:
+        The drawn values, or ``None`` if the draw budget ran out (statistics
+        that overstate the distinct count).
+    """
+    total = len(source)
+    accepted: list[str] = []
+    seen: set[str] = set()
+    known: dict[str, int] = {}
+    draws = 0
+    while len(accepted) < count:
+        if draws >= total:
+            return None
+        batch = min(_INDEXED_FETCH_BATCH, 2 * (count - len(accepted)))
+        steps = [(rng.randrange(total), rng.random()) for _ in range(batch)]
+        draws += batch
+        values = source.values_at([position for position, _ in steps])
+        known.update(
+            source.multiplicities(
+                {value for value in values if value is not None and value not in known}
+            )
+        )
+        for value, (_, threshold) in zip(values, steps):
+            if value is None or value in seen:
+                continue
+            # Stored and stripped values can differ in legacy tables; never
+            # divide by a zero count.
+            if threshold * max(1, known[value]) < 1:
+                seen.add(value)
+                accepted.append(value)
+                if len(accepted) == count:
+                    break
+    return accepted
+
+
+def _sample_unique_values(
+    source: GenerationCandidatePool | IndexedCandidateSource,
+    rng: random.Random,
+    count: int,
+) -> list[str]:
+    """Sample up to ``count`` distinct values uniformly over distinct values.
+
+    Small draws (relative to the distinct count) use
+    :func:`_draw_unique_by_rejection`, whose cost grows with ``count`` rather
+    than with the scope. The choice depends only on the data, never on the
+    source type, so cached pools and indexed sources agree for a seed.
+    """
+    if isinstance(source, IndexedCandidateSource) and source.distinct_count is None:
+        source = source.load_pool()
+    distinct_count = source.distinct_count
+    if distinct_count is None or distinct_count < 1:
+        return []
+    if count <= distinct_count * _UNIQUE_REJECTION_MAX_SHARE:
+        drawn = _draw_unique_by_rejection(source, rng, count)
+        if drawn is not None:
+            return drawn
+    pool = source if isinstance(source, GenerationCandidatePool) else source.load_pool()
+    unique_values = list(pool.unique_values)
+    if not unique_values:
+        return []
+    if count >= len(unique_values):
+        rng.shuffle(unique_values)
+        return unique_values
+    return rng.sample(unique_values, k=count)
+
+
 def _sample_generation_values(
-    values: Sequence[str], *, count: int, seed: int | None, unique_only: bool
+    values: Sequence[str] | GenerationCandidatePool | IndexedCandidateSource,
+    *,
+    count: int,
+    seed: int | None,
+    unique_only: bool,
 ) -> list[str]:
     """Sample output names from candidate values using a local RNG instance.
 
     The RNG is per-request so seed usage never mutates global random state.
+    Passing a :class:`GenerationCandidatePool` reuses its pre-deduplicated
+    view; results are identical to sampling from the equivalent plain list.
+    An :class:`IndexedCandidateSource` is sampled by row lookups (see
+    :func:`_sample_unique_values` for unique-only draws).
     """
     # Non-cryptographic sampling is intentional for deterministic API behavior.
     rng = random.Random(seed) if seed is not None else random.Random()  # nosec B311
     if unique_only:
-        unique_values = list(dict.fromkeys(str(value) for value in values))
-        if not unique_values:
-            return []
-        if count >= len(unique_values):
-            shuffled = unique_values[:]
-            rng.shuffle(shuffled)
-            return shuffled
-        return rng.sample(unique_values, k=count)
-
+        if not isinstance(values, (GenerationCandidatePool, IndexedCandidateSource)):
+            values = GenerationCandidatePool.from_values([str(value) for value in values])
+        return _sample_unique_values(values, rng, count)
+
+    if isinstance(values, IndexedCandidateSource):
+        return values.draw(rng, count)
+    if isinstance(values, GenerationCandidatePool):
+        values = values.values
     if not values:
         return []
     return [str(rng.choice(values)) for _ in range(count)]
 
 
-def _map_source_txt_name_to_generation_class(source_txt_name: str) -> str | None:
-    """Map one imported txt filename to a canonical generation class key.
+def _iter_generation_values(
+    values: Sequence[str] | GenerationCandidatePool | IndexedCandidateSource,
+    *,
+    count: int,
+    seed: int | None,
+    unique_only: bool,
+    chunk_size: int = GENERATION_STREAM_CHUNK_SIZE,
+) -> Iterator[list[str]]:
+    """Yield sampled names in chunks for streaming responses.
 
-    The source filename stem is normalized to lowercase ``snake_case`` before
-    matching against known pattern hints for each Generation tab class.
+    The concatenated chunks are identical to
+    :func:`_sample_generation_values` for the same arguments. With-replacement
+    sampling is performed lazily, so memory stays bounded by ``chunk_size``
+    regardless of ``count``. Unique-only output is bounded by the distinct
+    candidate count and is sampled up front, then sliced into chunks.
 
     Args:
-        source_txt_name: Imported ``*.txt`` source filename.
-
-    Returns:
-        Canonical generation class key, or ``None`` when no mapping is known.
+        values: Candidate values or a prepared candidate pool.
+        count: Number of names requested.
+        seed: Optional deterministic seed.
+        unique_only: When ``True``, names are drawn without replacement.
+        chunk_size: Maximum names per yielded chunk.
     """
-    normalized = re.sub(r"[^a-z0-9]+", "_", Path(source_txt_name).stem.lower()).strip("_")
-    for class_key, patterns in GENERATION_CLASS_PATTERNS.items():
-        if any(pattern in normalized for pattern in patterns):
-            return class_key
-    return None
-
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
 
-def _extract_syllable_option_from_source_txt_name(source_txt_name: str) -> str | None:
-    """Extract normalized syllable option key from one source txt filename.
+    if unique_only:
+        sampled = _sample_generation_values(values, count=count, seed=seed, unique_only=True)
+        for start in range(0, len(sampled), chunk_size):
+            yield sampled[start : start + chunk_size]
+        return
 
-    Supported values are keys like ``2syl``, ``3syl``, ``4syl``, and ``all``
-    derived from common source filename conventions (for example
-    ``nltk_first_name_2syl.txt`` or ``nltk_first_name_all.txt``).
+    if not len(values):
+        return
 
-    Args:
-        source_txt_name: Imported ``*.txt`` source filename.
+    # Mirror ``_sample_generation_values`` exactly: same RNG, same draw order.
+    rng = random.Random(seed) if seed is not None else random.Random()  # nosec B311
+    remaining = count
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield _draw_generation_chunk(values, rng, size)
+        remaining -= size
 
-    Returns:
-        Normalized syllable option key, or ``None`` when no known mode exists.
-    """
-    normalized = re.sub(r"[^a-z0-9]+", "_", Path(source_txt_name).stem.lower()).strip("_")
-    if "_all" in normalized or normalized.endswith("all"):
-        return "all"
 
-    match = re.search(r"_(\d+)syl(?:_|$)", normalized)
-    if match:
-        return f"{match.group(1)}syl"
+def _draw_generation_chunk(
+    values: Sequence[str] | GenerationCandidatePool | IndexedCandidateSource,
+    rng: random.Random,
+    size: int,
+) -> list[str]:
+    """Draw ``size`` names with replacement, advancing ``rng``.
 
-    return None
+    Successive calls with one RNG produce the same sequence as a single
+    :func:`_sample_generation_values` call, which lets long-running exports
+    checkpoint ``rng.getstate()`` between chunks.
+    """
+    if isinstance(values, IndexedCandidateSource):
+        return values.draw(rng, size)
+    if isinstance(values, GenerationCandidatePool):
+        values = values.values
+    return [str(rng.choice(values)) for _ in range(size)]
 
 
-def _syllable_option_sort_key(option_key: str) -> tuple[int, int, str]:
-    """Return deterministic sort key for syllable option keys.
+def _row_scope_keys(row: sqlite3.Row) -> tuple[str | None, str | None]:
+    """Return ``(class_key, syllable_key)`` for one ``package_tables`` row.
 
-    Numeric options (for example ``2syl``) are sorted by number first, followed
-    by non-numeric options such as ``all``.
+    Persisted columns are used when present; rows that were never mapped
+    (``class_key IS NULL``) fall back to filename parsing.
     """
-    if option_key == "all":
-        return (1, 9999, option_key)
-
-    match = re.fullmatch(r"(\d+)syl", option_key)
-    if match:
-        return (0, int(match.group(1)), option_key)
-
-    return (2, 9999, option_key)
+    if row["class_key"] is None:
+        source_txt_name = str(row["source_txt_name"])
+        return (
+            _map_source_txt_name_to_generation_class(source_txt_name),
+            _extract_syllable_option_from_source_txt_name(source_txt_name),
+        )
+    return (row["class_key"] or None, row["syllable_key"] or None)
 
 
 def _list_generation_syllable_options(
@@ -227,64 +556,42 @@ def _list_generation_syllable_options(
     if class_key not in GENERATION_CLASS_KEYS:
         raise ValueError(f"Unsupported generation class_key: {class_key!r}")
 
-    rows = conn.execute(
+    option_keys = {
+        str(row["syllable_key"])
+        for row in conn.execute(
+            """
+            SELECT DISTINCT syllable_key
+            FROM package_tables
+            WHERE package_id = ? AND class_key = ? AND syllable_key != ?
+            """,
+            (package_id, class_key, UNMAPPED_SCOPE_KEY),
+        )
+    }
+    unmapped_rows = conn.execute(
         """
-        SELECT source_txt_name
+        SELECT source_txt_name, class_key, syllable_key
         FROM package_tables
-        WHERE package_id = ?
-        ORDER BY source_txt_name COLLATE NOCASE
+        WHERE package_id = ? AND class_key IS NULL
         """,
         (package_id,),
     ).fetchall()
-
-    option_keys: set[str] = set()
-    for row in rows:
-        source_txt_name = str(row["source_txt_name"])
-        mapped_class = _map_source_txt_name_to_generation_class(source_txt_name)
-        if mapped_class != class_key:
-            continue
-
-        option_key = _extract_syllable_option_from_source_txt_name(source_txt_name)
-        if option_key is None:
-            continue
-        option_keys.add(option_key)
+    for row in unmapped_rows:
+        mapped_class, option_key = _row_scope_keys(row)
+        if mapped_class == class_key and option_key is not None:
+            option_keys.add(option_key)
 
     sorted_keys = sorted(option_keys, key=_syllable_option_sort_key)
     return [{"key": key, "label": GENERATION_SYLLABLE_LABELS.get(key, key)} for key in sorted_keys]
 
 
-def _validate_generation_syllable_key(syllable_key: str) -> str:
-    """Validate and normalize one generation syllable mode key.
-
-    Accepted values are ``all`` or a numeric ``Nsyl`` shape (for example
-    ``2syl``). Invalid values fail fast so API callers receive a clear,
-    deterministic validation error.
-
-    Args:
-        syllable_key: Raw syllable key string from API query.
-
-    Returns:
-        Lower-cased, validated syllable key.
-
-    Raises:
-        ValueError: If the key does not match supported syllable modes.
-    """
-    normalized = syllable_key.strip().lower()
-    if normalized == "all":
-        return normalized
-    if re.fullmatch(r"\d+syl", normalized):
-        return normalized
-    raise ValueError(f"Unsupported generation syllable_key: {syllable_key!r}")
-
-
 def _list_generation_matching_tables(
     conn: sqlite3.Connection, *, class_key: str, package_id: int, syllable_key: str
 ) -> list[dict[str, Any]]:
     """List imported txt tables matching one generation class+syllable filter.
 
-    The filter is based on each ``package_tables.source_txt_name`` value:
-    filename patterns are mapped to canonical class keys and syllable keys, and
-    only exact matches are returned.
+    The filter uses the ``class_key``/``syllable_key`` columns persisted at
+    import time (derived from each ``source_txt_name``); only exact matches are
+    returned.
 
     Args:
         conn: Open SQLite connection.
@@ -293,8 +600,8 @@ def _list_generation_matching_tables(
         syllable_key: Validated syllable option key (for example ``2syl``).
 
     Returns:
-        Matching table metadata dictionaries with ``table_name`` and
-        ``row_count`` values.
+        Matching table metadata dictionaries with ``id``, ``table_name``,
+        ``row_count``, and ``storage_layout`` values.
 
     Raises:
         ValueError: If ``class_key`` or ``syllable_key`` is unsupported.
@@ -303,32 +610,37 @@ def _list_generation_matching_tables(
         raise ValueError(f"Unsupported generation class_key: {class_key!r}")
     normalized_syllable_key = _validate_generation_syllable_key(syllable_key)
 
+    # Both branches are seeks on idx_package_tables_scope; the second only
+    # returns rows imported before scope keys were persisted.
     rows = conn.execute(
         """
-        SELECT source_txt_name, table_name, row_count
+        SELECT id, source_txt_name, table_name, row_count, storage_layout,
+            class_key, syllable_key
+        FROM package_tables
+        WHERE package_id = ? AND class_key = ? AND syllable_key = ?
+        UNION ALL
+        SELECT id, source_txt_name, table_name, row_count, storage_layout,
+            class_key, syllable_key
         FROM package_tables
-        WHERE package_id = ?
+        WHERE package_id = ? AND class_key IS NULL
         ORDER BY source_txt_name COLLATE NOCASE
         """,
-        (package_id,),
+        (package_id, class_key, normalized_syllable_key, package_id),
     ).fetchall()
 
     matches: list[dict[str, Any]] = []
     for row in rows:
         source_txt_name = str(row["source_txt_name"])
-        mapped_class = _map_source_txt_name_to_generation_class(source_txt_name)
-        if mapped_class != class_key:
-            continue
-
-        mapped_syllable = _extract_syllable_option_from_source_txt_name(source_txt_name)
-        if mapped_syllable != normalized_syllable_key:
+        if _row_scope_keys(row) != (class_key, normalized_syllable_key):
             continue
 
         matches.append(
             {
+                "id": int(row["id"]),
                 "source_txt_name": source_txt_name,
                 "table_name": str(row["table_name"]),
                 "row_count": int(row["row_count"]),
+                "storage_layout": str(row["storage_layout"] or STORAGE_LAYOUT_TABLE),
             }
         )
 
@@ -366,38 +678,138 @@ def _count_distinct_values_across_tables(
     return int(row["count"]) if row is not None else 0
 
 
-def _get_generation_selection_stats(
-    conn: sqlite3.Connection, *, class_key: str, package_id: int, syllable_key: str
+def _union_values_query(matching_tables: Sequence[dict[str, Any]]) -> tuple[str, list[int]]:
+    """Build one ``SELECT value`` union over tables in either storage layout.
+
+    Returns:
+        ``(query, params)`` selecting every stored value of ``matching_tables``.
+    """
+    select_fragments = [
+        f"SELECT value FROM {_quote_identifier(str(item['table_name']))}"  # nosec B608
+        for item in matching_tables
+        if item["storage_layout"] != STORAGE_LAYOUT_VALUES
+    ]
+    value_ids = [
+        int(item["id"])
+        for item in matching_tables
+        if item["storage_layout"] == STORAGE_LAYOUT_VALUES
+    ]
+    if value_ids:
+        placeholders = ", ".join("?" for _ in value_ids)
+        select_fragments.append(
+            f"SELECT value FROM package_values WHERE package_table_id IN ({placeholders})"
+        )
+    return " UNION ALL ".join(select_fragments), value_ids
+
+
+def _count_distinct_values_for_tables(
+    conn: sqlite3.Connection, matching_tables: Sequence[dict[str, Any]]
+) -> int:
+    """Count distinct values across matching tables in either storage layout.
+
+    Args:
+        conn: Open SQLite connection.
+        matching_tables: Entries from :func:`_list_generation_matching_tables`.
+
+    Returns:
+        Count of unique ``value`` strings across all listed tables.
+    """
+    if not any(item["storage_layout"] == STORAGE_LAYOUT_VALUES for item in matching_tables):
+        return _count_distinct_values_across_tables(
+            conn, [str(item["table_name"]) for item in matching_tables]
+        )
+
+    union_query, params = _union_values_query(matching_tables)
+    query = f"SELECT COUNT(DISTINCT value) AS count FROM ({union_query})"  # nosec B608
+    row = conn.execute(query, params).fetchone()
+    return int(row["count"]) if row is not None else 0
+
+
+def _length_histogram_for_tables(
+    conn: sqlite3.Connection, matching_tables: Sequence[dict[str, Any]]
 ) -> dict[str, int]:
+    """Count values per character length across matching tables.
+
+    Returns:
+        Mapping of ``str(length)`` to row count, sorted by length.
+    """
+    if not matching_tables:
+        return {}
+    union_query, params = _union_values_query(matching_tables)
+    query = f"""
+        SELECT LENGTH(value) AS length, COUNT(*) AS count
+        FROM ({union_query})
+        GROUP BY length
+        ORDER BY length
+        """  # nosec B608
+    return {str(row["length"]): int(row["count"]) for row in conn.execute(query, params)}
+
+
+def _get_generation_selection_stats(
+    conn: sqlite3.Connection,
+    *,
+    class_key: str,
+    package_id: int,
+    syllable_key: str,
+    include_histogram: bool = False,
+) -> dict[str, Any]:
     """Compute size/uniqueness limits for one Generation card selection.
 
+    Packages imported with materialized statistics are answered from
+    ``generation_scope_stats`` with a single primary-key lookup. Packages
+    imported before statistics existed fall back to scanning the matching
+    tables until ``POST /api/database/recompute-stats`` backfills them.
+
     Args:
         conn: Open SQLite connection.
         class_key: Canonical generation class key.
         package_id: Imported package id.
         syllable_key: Syllable mode key selected by the user.
+        include_histogram: Also return ``length_histogram``.
 
     Returns:
         Dictionary with:
         - ``max_items``: Total available rows across matching table(s).
         - ``max_unique_combinations``: Distinct values across matching table(s).
+        - ``length_histogram``: Only when ``include_histogram`` is true; maps
+          value length (as a string) to row count.
+
+    Raises:
+        ValueError: If ``class_key`` or ``syllable_key`` is unsupported.
     """
+    if class_key not in GENERATION_CLASS_KEYS:
+        raise ValueError(f"Unsupported generation class_key: {class_key!r}")
+    normalized_syllable_key = _validate_generation_syllable_key(syllable_key)
+
+    stored = _get_scope_stats(
+        conn, package_id=package_id, class_key=class_key, syllable_key=normalized_syllable_key
+    )
+    if stored is None and _package_has_stats(conn, package_id):
+        stored = {"row_count": 0, "distinct_count": 0, "length_histogram": {}}
+    if stored is not None:
+        stats: dict[str, Any] = {
+            "max_items": stored["row_count"],
+            "max_unique_combinations": stored["distinct_count"],
+        }
+        if include_histogram:
+            stats["length_histogram"] = stored["length_histogram"]
+        return stats
+
     matching_tables = _list_generation_matching_tables(
         conn,
         class_key=class_key,
         package_id=package_id,
-        syllable_key=syllable_key,
+        syllable_key=normalized_syllable_key,
     )
-    if not matching_tables:
-        return {"max_items": 0, "max_unique_combinations": 0}
-
-    max_items = sum(int(item["row_count"]) for item in matching_tables)
-    table_names = [str(item["table_name"]) for item in matching_tables]
-    max_unique_combinations = _count_distinct_values_across_tables(conn, table_names)
-    return {
-        "max_items": max_items,
-        "max_unique_combinations": max_unique_combinations,
+    stats = {
+        "max_items": sum(int(item["row_count"]) for item in matching_tables),
+        "max_unique_combinations": (
+            _count_distinct_values_for_tables(conn, matching_tables) if matching_tables else 0
+        ),
     }
+    if include_histogram:
+        stats["length_histogram"] = _length_histogram_for_tables(conn, matching_tables)
+    return stats
 
 
 def _list_generation_package_options(conn: sqlite3.Connection) -> list[dict[str, Any]]:
@@ -417,9 +829,12 @@ def _list_generation_package_options(conn: sqlite3.Connection) -> list[dict[str,
         SELECT
             p.id AS package_id,
             p.package_name,
-            t.source_txt_name
+            t.source_txt_name,
+            t.class_key,
+            t.syllable_key
         FROM imported_packages AS p
         INNER JOIN package_tables AS t ON t.package_id = p.id
+        WHERE p.id NOT IN (SELECT package_id FROM pending_imports) AND (t.class_key IS NULL OR t.class_key != '')
         ORDER BY p.package_name COLLATE NOCASE, p.id, t.source_txt_name COLLATE NOCASE
         """).fetchall()
 
@@ -427,7 +842,7 @@ def _list_generation_package_options(conn: sqlite3.Connection) -> list[dict[str,
         class_key: {} for class_key, _ in GENERATION_NAME_CLASSES
     }
     for row in rows:
-        class_key = _map_source_txt_name_to_generation_class(str(row["source_txt_name"]))
+        class_key, _ = _row_scope_keys(row)
         if class_key is None:
             continue
 
@@ -458,7 +873,16 @@ def _list_generation_package_options(conn: sqlite3.Connection) -> list[dict[str,
     return result
 
 
-_PACKAGE_OPTIONS_CACHE: dict[str, list[dict[str, Any]]] = {}
+# Package options are keyed by resolved DB path and revalidated against the
+# database change stamp, so imports from other processes show up on the next
+# request.
+PACKAGE_OPTIONS_CACHE_MAX_ENTRIES = 64
+PACKAGE_OPTIONS_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+_PACKAGE_OPTIONS_CACHE = ChangeStampedCache[str, list[dict[str, Any]]](
+    max_entries=PACKAGE_OPTIONS_CACHE_MAX_ENTRIES,
+    max_bytes=PACKAGE_OPTIONS_CACHE_MAX_BYTES,
+)
 
 
 def get_cached_generation_package_options(
@@ -473,13 +897,16 @@ def get_cached_generation_package_options(
     Returns:
         Cached or freshly computed package option payload.
     """
-    cache_key = str(db_path.expanduser().resolve())
-    cached = _PACKAGE_OPTIONS_CACHE.get(cache_key)
+    db_key = str(db_path.expanduser().resolve())
+    stamp = get_database_change_stamp(conn)
+    cached = _PACKAGE_OPTIONS_CACHE.get(db_key, "options", stamp=stamp)
     if cached is not None:
         return cached
 
     payload = _list_generation_package_options(conn)
-    _PACKAGE_OPTIONS_CACHE[cache_key] = payload
+    _PACKAGE_OPTIONS_CACHE.put(
+        db_key, "options", payload, stamp=stamp, nbytes=len(json.dumps(payload))
+    )
     return payload
 
 
@@ -490,11 +917,284 @@ def clear_generation_package_options_cache(db_path: Path | None = None) -> None:
         db_path: Optional database path. When omitted, clears all cache entries.
     """
     if db_path is None:
-        _PACKAGE_OPTIONS_CACHE.clear()
+        _PACKAGE_OPTIONS_CACHE.invalidate()
         return
 
-    cache_key = str(db_path.expanduser().resolve())
-    _PACKAGE_OPTIONS_CACHE.pop(cache_key, None)
+    _PACKAGE_OPTIONS_CACHE.invalidate(str(db_path.expanduser().resolve()))
+
+
+# Candidate pools are keyed by ``(resolved_db_path, package_id, class_key,
+# syllable_key)`` and revalidated against the database change stamp. Limits
+# keep a handful of large scopes from pinning memory.
+CANDIDATE_CACHE_MAX_ENTRIES = 256
+CANDIDATE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+_CANDIDATE_POOL_CACHE = ChangeStampedCache[tuple[int, str, str], GenerationCandidatePool](
+    max_entries=CANDIDATE_CACHE_MAX_ENTRIES,
+    max_bytes=CANDIDATE_CACHE_MAX_BYTES,
+)
+
+
+def get_cached_generation_candidate_pool(
+    conn: sqlite3.Connection,
+    *,
+    db_path: Path,
+    class_key: str,
+    package_id: int,
+    syllable_key: str,
+    collect_values: Callable[..., Sequence[str]] = _collect_generation_source_values,
+) -> GenerationCandidatePool:
+    """Return the prepared candidate pool for one generation scope.
+
+    Pools are cached per database path and scope until the database change
+    stamp moves. Validation failures (for example unknown scopes) are raised
+    by ``collect_values`` and never cached.
+
+    Args:
+        conn: Open SQLite connection to the target database.
+        db_path: Filesystem path of the SQLite database.
+        class_key: Canonical generation class key.
+        package_id: Imported package id.
+        syllable_key: Syllable option key.
+        collect_values: Loader used on cache misses.
+
+    Returns:
+        Cached or freshly built candidate pool.
+    """
+    db_key = str(db_path.expanduser().resolve())
+    cache_key = _candidate_cache_key(
+        class_key=class_key, package_id=package_id, syllable_key=syllable_key
+    )
+    stamp = get_database_change_stamp(conn)
+    cached = _CANDIDATE_POOL_CACHE.get(db_key, cache_key, stamp=stamp)
+    if cached is not None:
+        return cached
+    return _build_candidate_pool(
+        conn,
+        db_key=db_key,
+        stamp=stamp,
+        class_key=class_key,
+        package_id=package_id,
+        syllable_key=syllable_key,
+        collect_values=collect_values,
+    )
+
+
+def _candidate_cache_key(
+    *, class_key: str, package_id: int, syllable_key: str
+) -> tuple[int, str, str]:
+    return (package_id, class_key, syllable_key.strip().lower())
+
+
+def _build_candidate_pool(
+    conn: sqlite3.Connection,
+    *,
+    db_key: str,
+    stamp: int | None,
+    class_key: str,
+    package_id: int,
+    syllable_key: str,
+    collect_values: Callable[..., Sequence[str]],
+) -> GenerationCandidatePool:
+    """Load one scope's candidate pool and cache it under ``stamp``."""
+    values = collect_values(
+        conn,
+        class_key=class_key,
+        package_id=package_id,
+        syllable_key=syllable_key,
+    )
+    pool = GenerationCandidatePool.from_values(values)
+    cache_key = _candidate_cache_key(
+        class_key=class_key, package_id=package_id, syllable_key=syllable_key
+    )
+    _CANDIDATE_POOL_CACHE.put(db_key, cache_key, pool, stamp=stamp, nbytes=pool.nbytes)
+    return pool
+
+
+def _indexed_span_for_table(
+    conn: sqlite3.Connection, table: dict[str, Any], *, start: int
+) -> _IndexedSpan | None:
+    """Return the rowid span of one matching table, or ``None`` if not contiguous."""
+    row_count = int(table["row_count"])
+    if row_count < 1:
+        return None
+    if table["storage_layout"] == STORAGE_LAYOUT_VALUES:
+        bounds = conn.execute(
+            """
+            SELECT
+                (SELECT id FROM package_values WHERE package_table_id = ?
+                 ORDER BY line_number LIMIT 1),
+                (SELECT id FROM package_values WHERE package_table_id = ?
+                 ORDER BY line_number DESC LIMIT 1)
+            """,
+            (int(table["id"]), int(table["id"])),
+        ).fetchone()
+        table_name = None
+    else:
+        quoted = _quote_identifier(str(table["table_name"]))
+        bounds = conn.execute(f"SELECT MIN(id), MAX(id) FROM {quoted}").fetchone()  # nosec B608
+        table_name = str(table["table_name"])
+    if bounds is None or bounds[0] is None or bounds[1] is None:
+        return None
+    first_id, last_id = int(bounds[0]), int(bounds[1])
+    if last_id - first_id + 1 != row_count:
+        return None
+    return _IndexedSpan(
+        start=start,
+        first_id=first_id,
+        row_count=row_count,
+        table_name=table_name,
+        package_table_id=int(table["id"]),
+    )
+
+
+def _has_value_index(conn: sqlite3.Connection, table_name: str) -> bool:
+    """Return ``True`` when some index of ``table_name`` leads with ``value``."""
+    quoted = _quote_identifier(table_name)
+    for index in conn.execute(f"PRAGMA index_list({quoted})").fetchall():
+        columns = conn.execute(f"PRAGMA index_info({_quote_identifier(str(index[1]))})").fetchall()
+        if columns and columns[0][2] == "value":
+            return True
+    return False
+
+
+def _indexed_distinct_count(
+    conn: sqlite3.Connection,
+    spans: Sequence[_IndexedSpan],
+    *,
+    class_key: str,
+    package_id: int,
+    syllable_key: str,
+) -> int | None:
+    """Return the scope's distinct count if unique draws can use row lookups."""
+    stats = _get_scope_stats(
+        conn,
+        package_id=package_id,
+        class_key=class_key,
+        syllable_key=_validate_generation_syllable_key(syllable_key),
+    )
+    if stats is None:
+        return None
+    for span in spans:
+        if span.table_name is not None and not _has_value_index(conn, span.table_name):
+            return None
+    return int(stats["distinct_count"])
+
+
+def get_generation_candidate_source(
+    conn: sqlite3.Connection,
+    *,
+    db_path: Path,
+    class_key: str,
+    package_id: int,
+    syllable_key: str,
+    collect_values: Callable[..., Sequence[str]] = _collect_generation_source_values,
+    min_indexed_rows: int = GENERATION_INDEXED_SAMPLING_MIN_ROWS,
+) -> GenerationCandidatePool | IndexedCandidateSource:
+    """Return the cheapest sampling source for one generation scope.
+
+    A candidate pool already cached for the scope is returned without
+    touching the matching tables. Otherwise scopes with at least
+    ``min_indexed_rows`` stored rows whose tables have contiguous row ids are
+    served by :class:`IndexedCandidateSource`, so requests cost time
+    proportional to ``generation_count`` instead of table size. Smaller scopes
+    (and anything not addressable by row id) load and cache a
+    :class:`GenerationCandidatePool`. For imported data both sources draw
+    identical names for a seed, so the choice never changes results.
+    """
+    db_key = str(db_path.expanduser().resolve())
+    stamp = get_database_change_stamp(conn)
+    cached = _CANDIDATE_POOL_CACHE.get(
+        db_key,
+        _candidate_cache_key(class_key=class_key, package_id=package_id, syllable_key=syllable_key),
+        stamp=stamp,
+    )
+    if cached is not None:
+        return cached
+
+    def load_pool() -> GenerationCandidatePool:
+        return get_cached_generation_candidate_pool(
+            conn,
+            db_path=db_path,
+            class_key=class_key,
+            package_id=package_id,
+            syllable_key=syllable_key,
+            collect_values=collect_values,
+        )
+
+    def build_pool() -> GenerationCandidatePool:
+        return _build_candidate_pool(
+            conn,
+            db_key=db_key,
+            stamp=stamp,
+            class_key=class_key,
+            package_id=package_id,
+            syllable_key=syllable_key,
+            collect_values=collect_values,
+        )
+
+    matching_tables = _list_generation_matching_tables(
+        conn,
+        class_key=class_key,
+        package_id=package_id,
+        syllable_key=syllable_key,
+    )
+    total = sum(int(item["row_count"]) for item in matching_tables)
+    if not matching_tables or total < min_indexed_rows:
+        return build_pool()
+
+    spans: list[_IndexedSpan] = []
+    start = 0
+    for table in matching_tables:
+        span = _indexed_span_for_table(conn, table, start=start)
+        if span is None:
+            return build_pool()
+        spans.append(span)
+        start += span.row_count
+
+    return IndexedCandidateSource(
+        conn=conn,
+        spans=tuple(spans),
+        total=total,
+        load_pool=load_pool,
+        distinct_count=_indexed_distinct_count(
+            conn,
+            spans,
+            class_key=class_key,
+            package_id=package_id,
+            syllable_key=syllable_key,
+        ),
+    )
+
+
+def clear_generation_candidate_cache(db_path: Path | None = None) -> None:
+    """Clear cached candidate pools for one DB or all DBs.
+
+    Args:
+        db_path: Optional database path. When omitted, clears all cache entries.
+    """
+    if db_path is None:
+        _CANDIDATE_POOL_CACHE.invalidate()
+        return
+
+    _CANDIDATE_POOL_CACHE.invalidate(str(db_path.expanduser().resolve()))
+
+
+def get_generation_candidate_cache_stats() -> CacheStats:
+    """Return hit/miss/size counters for the candidate pool cache."""
+    return _CANDIDATE_POOL_CACHE.stats()
+
+
+def invalidate_generation_caches(db_path: Path | None = None) -> None:
+    """Drop every generation cache derived from one database (or all).
+
+    Writes that go through the package metadata tables already move the
+    database change stamp, which invalidates these caches in every process.
+    Calling this after in-process writes (imports, restores, migrations)
+    additionally frees the memory of superseded entries right away.
+    """
+    clear_generation_package_options_cache(db_path)
+    clear_generation_candidate_cache(db_path)
 
 
 __all__ = [
@@ -506,6 +1206,8 @@ __all__ = [
     "_read_all_values_from_table",
     "_collect_generation_source_values",
     "_sample_generation_values",
+    "_iter_generation_values",
+    "_draw_generation_chunk",
     "_map_source_txt_name_to_generation_class",
     "_extract_syllable_option_from_source_txt_name",
     "_syllable_option_sort_key",
@@ -513,8 +1215,21 @@ __all__ = [
     "_validate_generation_syllable_key",
     "_list_generation_matching_tables",
     "_count_distinct_values_across_tables",
+    "_count_distinct_values_for_tables",
+    "_length_histogram_for_tables",
     "_get_generation_selection_stats",
     "_list_generation_package_options",
+    "PACKAGE_OPTIONS_CACHE_MAX_ENTRIES",
+    "PACKAGE_OPTIONS_CACHE_MAX_BYTES",
     "get_cached_generation_package_options",
     "clear_generation_package_options_cache",
+    "GenerationCandidatePool",
+    "CANDIDATE_CACHE_MAX_ENTRIES",
+    "CANDIDATE_CACHE_MAX_BYTES",
+    "get_cached_generation_candidate_pool",
+    "IndexedCandidateSource",
+    "get_generation_candidate_source",
+    "clear_generation_candidate_cache",
+    "get_generation_candidate_cache_stats",
+    "invalidate_generation_caches",
 ]
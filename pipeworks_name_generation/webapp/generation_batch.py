@@ -0,0 +1,283 @@
+"""Multi-scope batch generation helpers for ``POST /api/generate/batch``.
+
+A batch samples ``generation_count`` names from each of several scopes
+(class + package + syllable option) and returns them index-aligned, so row
+``i`` of every scope belongs to the same generated entity. An optional
+composite template such as ``"{first_name} {last_name}"`` joins each row into
+one string.
+
+Each scope gets its own RNG seed derived from the request seed and the scope
+position, so scopes never share draw sequences and the whole batch is
+reproducible for a given seed.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import string
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+from pipeworks_name_generation.webapp.constants import (
+    GENERATION_BATCH_MAX_SCOPES,
+    GENERATION_BATCH_OUTPUT_FORMATS,
+    GENERATION_CLASS_KEYS,
+)
+from pipeworks_name_generation.webapp.generation import (
+    _coerce_bool,
+    _coerce_generation_count,
+    _coerce_optional_seed,
+    _coerce_render_style,
+)
+from pipeworks_name_generation.webapp.generation_mapping import (
+    _validate_generation_syllable_key,
+)
+
+_SCOPE_KEY_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+@dataclass(frozen=True)
+class GenerationBatchScope:
+    """One normalized scope of a batch request.
+
+    Attributes:
+        key: Name used for template placeholders and response columns.
+        class_key: Canonical generation class key.
+        package_id: Imported package id.
+        syllable_key: Normalized syllable option key.
+        seed: Effective RNG seed for this scope (``None`` for random output).
+        unique_only: Whether this scope samples without replacement.
+    """
+
+    key: str
+    class_key: str
+    package_id: int
+    syllable_key: str
+    seed: int | None
+    unique_only: bool
+
+
+@dataclass(frozen=True)
+class GenerationBatchRequest:
+    """Validated ``POST /api/generate/batch`` payload."""
+
+    scopes: tuple[GenerationBatchScope, ...]
+    generation_count: int
+    seed: int | None
+    render_style: str
+    output_format: str
+    template: str | None
+
+
+def _derive_scope_seed(seed: int | None, index: int) -> int | None:
+    """Derive a stable per-scope seed from the batch seed and scope position."""
+    if seed is None:
+        return None
+    # String seeds are hashed with SHA-512 by ``random.Random`` (version 2),
+    # which is stable across processes and Python releases.
+    return random.Random(f"{seed}:{index}").getrandbits(63)  # nosec B311
+
+
+def _coerce_batch_package_id(raw_value: Any, *, field: str) -> int:
+    """Parse one required positive package id field."""
+    if raw_value is None or (isinstance(raw_value, str) and not raw_value.strip()):
+        raise ValueError(f"Field '{field}' is required.")
+    if isinstance(raw_value, bool):
+        raise ValueError(f"Field '{field}' must be an integer.")
+    try:
+        package_id = int(raw_value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Field '{field}' must be an integer.") from exc
+    if package_id < 1:
+        raise ValueError(f"Field '{field}' must be >= 1.")
+    return package_id
+
+
+def _template_fields(template: str) -> list[str]:
+    """Return placeholder names used by a composite template.
+
+    Raises:
+        ValueError: For malformed templates, positional placeholders, or
+            format specs/conversions (only plain ``{key}`` is supported).
+    """
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as exc:
+        raise ValueError(f"Field 'template' is invalid: {exc}") from exc
+
+    fields: list[str] = []
+    for _, field_name, format_spec, conversion in parsed:
+        if field_name is None:
+            continue
+        if not _SCOPE_KEY_PATTERN.fullmatch(field_name) or format_spec or conversion:
+            raise ValueError(
+                "Field 'template' placeholders must look like '{scope_key}' "
+                f"(got '{{{field_name}}}')."
+            )
+        if field_name not in fields:
+            fields.append(field_name)
+    if not fields:
+        raise ValueError("Field 'template' must contain at least one placeholder.")
+    return fields
+
+
+def _parse_generation_batch_request(payload: Mapping[str, Any]) -> GenerationBatchRequest:
+    """Validate and normalize a batch generation payload.
+
+    ``scopes`` is a list of objects with ``class_key`` and optional ``key``,
+    ``package_id``, ``syllable_key``, ``seed``, and ``unique_only``. Missing
+    ``package_id``/``syllable_key``/``unique_only`` values inherit the
+    top-level fields. When ``scopes`` is omitted, ``template`` placeholders
+    must be class keys and each becomes one scope.
+
+    Raises:
+        ValueError: For any invalid field, with an API-ready message.
+    """
+    generation_count = _coerce_generation_count(payload.get("generation_count", 20))
+    seed = _coerce_optional_seed(payload.get("seed"))
+    render_style = _coerce_render_style(payload.get("render_style"))
+    default_unique_only = _coerce_bool(payload.get("unique_only", False))
+    output_format = str(payload.get("output_format") or "json").strip().lower()
+    if output_format not in GENERATION_BATCH_OUTPUT_FORMATS:
+        raise ValueError(
+            "Field 'output_format' must be one of: "
+            + ", ".join(GENERATION_BATCH_OUTPUT_FORMATS)
+            + "."
+        )
+
+    raw_template = payload.get("template")
+    template: str | None = None
+    template_fields: list[str] = []
+    if raw_template is not None and str(raw_template) != "":
+        if not isinstance(raw_template, str):
+            raise ValueError("Field 'template' must be a string.")
+        template = raw_template
+        template_fields = _template_fields(template)
+
+    raw_scopes = payload.get("scopes")
+    if raw_scopes is None:
+        if template is None:
+            raise ValueError("Field 'scopes' or 'template' is required.")
+        raw_scopes = [{"class_key": field} for field in template_fields]
+    if not isinstance(raw_scopes, list) or not raw_scopes:
+        raise ValueError("Field 'scopes' must be a non-empty list.")
+    if len(raw_scopes) > GENERATION_BATCH_MAX_SCOPES:
+        raise ValueError(f"Field 'scopes' must contain <= {GENERATION_BATCH_MAX_SCOPES} entries.")
+
+    scopes: list[GenerationBatchScope] = []
+    seen_keys: set[str] = set()
+    for index, raw_scope in enumerate(raw_scopes):
+        prefix = f"scopes[{index}]"
+        if not isinstance(raw_scope, dict):
+            raise ValueError(f"Field '{prefix}' must be an object.")
+
+        class_key = str(raw_scope.get("class_key", "")).strip()
+        if not class_key:
+            raise ValueError(f"Field '{prefix}.class_key' is required.")
+        if class_key not in GENERATION_CLASS_KEYS:
+            raise ValueError(f"Unsupported generation class_key: {class_key!r}")
+
+        key = str(raw_scope.get("key") or class_key).strip()
+        if not _SCOPE_KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"Field '{prefix}.key' must be an identifier.")
+        if key in seen_keys:
+            raise ValueError(f"Duplicate scope key: {key!r}")
+        seen_keys.add(key)
+
+        package_id = _coerce_batch_package_id(
+            raw_scope.get("package_id", payload.get("package_id")),
+            field=f"{prefix}.package_id",
+        )
+        syllable_raw = str(raw_scope.get("syllable_key", payload.get("syllable_key")) or "")
+        if not syllable_raw.strip():
+            raise ValueError(f"Field '{prefix}.syllable_key' is required.")
+        syllable_key = _validate_generation_syllable_key(syllable_raw)
+
+        if "seed" in raw_scope:
+            scope_seed = _coerce_optional_seed(raw_scope.get("seed"))
+        else:
+            scope_seed = _derive_scope_seed(seed, index)
+        unique_only = default_unique_only
+        if "unique_only" in raw_scope:
+            unique_only = _coerce_bool(raw_scope["unique_only"], field=f"{prefix}.unique_only")
+
+        scopes.append(
+            GenerationBatchScope(
+                key=key,
+                class_key=class_key,
+                package_id=package_id,
+                syllable_key=syllable_key,
+                seed=scope_seed,
+                unique_only=unique_only,
+            )
+        )
+
+    missing = [field for field in template_fields if field not in seen_keys]
+    if missing:
+        raise ValueError(f"Field 'template' references unknown scope key(s): {', '.join(missing)}")
+
+    return GenerationBatchRequest(
+        scopes=tuple(scopes),
+        generation_count=generation_count,
+        seed=seed,
+        render_style=render_style,
+        output_format=output_format,
+        template=template,
+    )
+
+
+def _sample_generation_batch(
+    request: GenerationBatchRequest,
+    pools: Mapping[GenerationBatchScope, Any],
+    *,
+    sample_generation_values: Callable[..., list[str]],
+) -> list[list[str]]:
+    """Sample one aligned column of raw names per scope.
+
+    Args:
+        request: Parsed batch request.
+        pools: Candidate values (list or prepared pool) for each scope.
+        sample_generation_values: Single-scope sampler.
+
+    Returns:
+        Columns in scope order, each exactly ``generation_count`` long.
+
+    Raises:
+        ValueError: If a ``unique_only`` scope has fewer distinct values than
+            ``generation_count`` (rows could not stay aligned).
+    """
+    columns: list[list[str]] = []
+    for scope in request.scopes:
+        names = sample_generation_values(
+            pools[scope],
+            count=request.generation_count,
+            seed=scope.seed,
+            unique_only=scope.unique_only,
+        )
+        if len(names) < request.generation_count:
+            raise ValueError(
+                f"Scope '{scope.key}' has only {len(names)} unique value(s); "
+                f"cannot build {request.generation_count} aligned row(s)."
+            )
+        columns.append(names)
+    return columns
+
+
+def _render_batch_template(
+    template: str, keys: Sequence[str], columns: Sequence[Sequence[str]]
+) -> Iterator[str]:
+    """Yield one template-rendered string per aligned row."""
+    for row in zip(*columns):
+        yield template.format_map(dict(zip(keys, row)))
+
+
+__all__ = [
+    "GenerationBatchScope",
+    "GenerationBatchRequest",
+    "_derive_scope_seed",
+    "_template_fields",
+    "_parse_generation_batch_request",
+    "_sample_generation_batch",
+    "_render_batch_template",
+]
@@ -0,0 +1,124 @@
+"""Filename-to-scope mapping rules for generation selections.
+
+Imported ``*.txt`` filenames encode the generation class (for example
+``first_name``) and syllable option (for example ``2syl`` or ``all``). These
+rules are shared by the generation service, the importer, and import-time
+statistics, so they live in a module without database dependencies.
+
+Mapped keys are persisted on ``package_tables.class_key`` and
+``package_tables.syllable_key``. ``UNMAPPED_SCOPE_KEY`` marks a filename that
+was mapped but matched no class or syllable option; ``NULL`` means the row
+has not been mapped yet.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from pipeworks_name_generation.webapp.constants import GENERATION_CLASS_PATTERNS
+
+UNMAPPED_SCOPE_KEY = ""
+
+
+def _map_source_txt_name_to_generation_class(source_txt_name: str) -> str | None:
+    """Map one imported txt filename to a canonical generation class key.
+
+    The source filename stem is normalized to lowercase ``snake_case`` before
+    matching against known pattern hints for each Generation tab class.
+
+    Args:
+        source_txt_name: Imported ``*.txt`` source filename.
+
+    Returns:
+        Canonical generation class key, or ``None`` when no mapping is known.
+    """
+    normalized = re.sub(r"[^a-z0-9]+", "_", Path(source_txt_name).stem.lower()).strip("_")
+    for class_key, patterns in GENERATION_CLASS_PATTERNS.items():
+        if any(pattern in normalized for pattern in patterns):
+            return class_key
+    return None
+
+
+def _extract_syllable_option_from_source_txt_name(source_txt_name: str) -> str | None:
+    """Extract normalized syllable option key from one source txt filename.
+
+    Supported values are keys like ``2syl``, ``3syl``, ``4syl``, and ``all``
+    derived from common source filename conventions (for example
+    ``nltk_first_name_2syl.txt`` or ``nltk_first_name_all.txt``).
+
+    Args:
+        source_txt_name: Imported ``*.txt`` source filename.
+
+    Returns:
+        Normalized syllable option key, or ``None`` when no known mode exists.
+    """
+    normalized = re.sub(r"[^a-z0-9]+", "_", Path(source_txt_name).stem.lower()).strip("_")
+    if "_all" in normalized or normalized.endswith("all"):
+        return "all"
+
+    match = re.search(r"_(\d+)syl(?:_|$)", normalized)
+    if match:
+        return f"{match.group(1)}syl"
+
+    return None
+
+
+def _syllable_option_sort_key(option_key: str) -> tuple[int, int, str]:
+    """Return deterministic sort key for syllable option keys.
+
+    Numeric options (for example ``2syl``) are sorted by number first, followed
+    by non-numeric options such as ``all``.
+    """
+    if option_key == "all":
+        return (1, 9999, option_key)
+
+    match = re.fullmatch(r"(\d+)syl", option_key)
+    if match:
+        return (0, int(match.group(1)), option_key)
+
+    return (2, 9999, option_key)
+
+
+def _validate_generation_syllable_key(syllable_key: str) -> str:
+    """Validate and normalize one generation syllable mode key.
+
+    Accepted values are ``all`` or a numeric ``Nsyl`` shape (for example
+    ``2syl``). Invalid values fail fast so API callers receive a clear,
+    deterministic validation error.
+
+    Args:
+        syllable_key: Raw syllable key string from API query.
+
+    Returns:
+        Lower-cased, validated syllable key.
+
+    Raises:
+        ValueError: If the key does not match supported syllable modes.
+    """
+    normalized = syllable_key.strip().lower()
+    if normalized == "all":
+        return normalized
+    if re.fullmatch(r"\d+syl", normalized):
+        return normalized
+    raise ValueError(f"Unsupported generation syllable_key: {syllable_key!r}")
+
+
+def _scope_keys_for_source_txt_name(source_txt_name: str) -> tuple[str, str]:
+    """Return persisted ``(class_key, syllable_key)`` column values for a filename.
+
+    Unknown class or syllable options are stored as ``UNMAPPED_SCOPE_KEY``.
+    """
+    class_key = _map_source_txt_name_to_generation_class(source_txt_name)
+    syllable_key = _extract_syllable_option_from_source_txt_name(source_txt_name)
+    return (class_key or UNMAPPED_SCOPE_KEY, syllable_key or UNMAPPED_SCOPE_KEY)
+
+
+__all__ = [
+    "UNMAPPED_SCOPE_KEY",
+    "_scope_keys_for_source_txt_name",
+    "_map_source_txt_name_to_generation_class",
+    "_extract_syllable_option_from_source_txt_name",
+    "_syllable_option_sort_key",
+    "_validate_generation_syllable_key",
+]
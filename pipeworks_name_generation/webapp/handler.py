@@ -6,6 +6,7 @@ The handler intentionally focuses on transport concerns:
 - JSON/text response helpers
 - one-time schema bootstrap guard
 - GET/POST dispatch through route registries
+- optional per-route metrics around dispatch
 
 Route-specific behavior lives in ``endpoint_adapters.py`` and ``routes/*``.
 """
@@ -14,7 +15,7 @@ from __future__ import annotations
 
 from http.server import BaseHTTPRequestHandler
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Mapping
 from urllib.parse import parse_qs, urlsplit
 
 from pipeworks_name_generation.webapp import endpoint_adapters
@@ -22,7 +23,21 @@ from pipeworks_name_generation.webapp.db import initialize_schema as _initialize
 from pipeworks_name_generation.webapp.favorites import (
     initialize_favorites_schema as _initialize_favorites_schema,
 )
-from pipeworks_name_generation.webapp.http import read_json_body, send_bytes, send_json, send_text
+from pipeworks_name_generation.webapp.http import (
+    DEFAULT_CACHE_CONTROL,
+    PreparedBody,
+    read_json_body,
+    send_bytes,
+    send_chunked,
+    send_json,
+    send_prepared,
+    send_text,
+)
+from pipeworks_name_generation.webapp.metrics import (
+    get_metrics_registry,
+    route_label,
+    track_request,
+)
 from pipeworks_name_generation.webapp.route_registry import GET_ROUTE_METHODS, POST_ROUTE_METHODS
 
 
@@ -42,6 +57,16 @@ class WebAppHandler(BaseHTTPRequestHandler):
     schema_initialized_paths: set[str] = set()
     favorites_schema_ready: bool = False
     favorites_schema_initialized_paths: set[str] = set()
+    # When ``True``, routes lease pooled connections instead of opening new ones.
+    connection_pool_enabled: bool = False
+    # Storage layout for new imports (``table`` or ``values``).
+    storage_layout: str = "table"
+    # Directory for generation export job files; ``None`` uses ``<db dir>/exports``.
+    generation_export_dir: Path | None = None
+    # gzip-encode compressible responses for clients that accept it.
+    compression_enabled: bool = True
+    # ``Cache-Control`` value per route family (``html``/``static``/``fonts``/``api``).
+    cache_control: dict[str, str] = DEFAULT_CACHE_CONTROL
     # Route maps are class attributes so API-only mode can swap them at startup.
     get_routes: dict[str, str] = GET_ROUTE_METHODS
     post_routes: dict[str, str] = POST_ROUTE_METHODS
@@ -91,6 +116,25 @@ class WebAppHandler(BaseHTTPRequestHandler):
         """Send a binary response."""
         send_bytes(self, payload, status=status, content_type=content_type)
 
+    def _send_prepared(
+        self,
+        body: PreparedBody,
+        status: int = 200,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """Send a precomputed body, answering conditional GETs with ``304``."""
+        send_prepared(self, body, status=status, content_type=content_type)
+
+    def _send_stream(
+        self,
+        chunks: Iterable[bytes],
+        status: int = 200,
+        content_type: str = "application/octet-stream",
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """Send a streamed response from an iterable of byte chunks."""
+        send_chunked(self, chunks, status=status, content_type=content_type, headers=headers)
+
     def _send_json(self, payload: dict[str, Any], status: int = 200) -> None:
         """Send a JSON response."""
         send_json(self, payload, status=status)
@@ -101,6 +145,26 @@ class WebAppHandler(BaseHTTPRequestHandler):
 
     def do_GET(self) -> None:  # noqa: N802
         """Handle all supported ``GET`` routes."""
+        registry = get_metrics_registry()
+        if registry is None:
+            self._dispatch_get()
+            return
+        routes = type(self).get_routes
+        with track_request(self, registry, route_label(urlsplit(self.path).path, routes), "GET"):
+            self._dispatch_get()
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Handle all supported ``POST`` routes."""
+        registry = get_metrics_registry()
+        if registry is None:
+            self._dispatch_post()
+            return
+        routes = type(self).post_routes
+        with track_request(self, registry, route_label(urlsplit(self.path).path, routes), "POST"):
+            self._dispatch_post()
+
+    def _dispatch_get(self) -> None:
+        """Resolve and run the ``GET`` route adapter for ``self.path``."""
         parsed = urlsplit(self.path)
         route = parsed.path
         query = parse_qs(parsed.query)
@@ -116,8 +180,8 @@ class WebAppHandler(BaseHTTPRequestHandler):
         route_handler = getattr(endpoint_adapters, method_name)
         route_handler(self, query)
 
-    def do_POST(self) -> None:  # noqa: N802
-        """Handle all supported ``POST`` routes."""
+    def _dispatch_post(self) -> None:
+        """Resolve and run the ``POST`` route adapter for ``self.path``."""
         route = urlsplit(self.path).path
         method_name = type(self).post_routes.get(route)
         if method_name is None:
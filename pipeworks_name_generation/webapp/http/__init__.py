@@ -1,13 +1,26 @@
 """HTTP helper modules for the webapp server."""
 
+from .caching import DEFAULT_CACHE_CONTROL, PreparedBody, prepare_body
 from .query import _coerce_int, _parse_optional_int, _parse_required_int
-from .transport import read_json_body, send_bytes, send_json, send_text
+from .transport import (
+    read_json_body,
+    send_bytes,
+    send_chunked,
+    send_json,
+    send_prepared,
+    send_text,
+)
 
 __all__ = [
     "send_text",
     "send_bytes",
+    "send_prepared",
+    "send_chunked",
     "send_json",
     "read_json_body",
+    "DEFAULT_CACHE_CONTROL",
+    "PreparedBody",
+    "prepare_body",
     "_parse_required_int",
     "_parse_optional_int",
     "_coerce_int",
@@ -0,0 +1,198 @@
+"""HTTP content negotiation and cache validation helpers.
+
+These helpers keep response bodies small and revalidation cheap:
+
+- gzip negotiation from ``Accept-Encoding`` for compressible content types
+- strong ``ETag`` values derived from the exact bytes of each representation
+- ``If-None-Match`` / ``If-Modified-Since`` checks for ``304 Not Modified``
+- ``Cache-Control`` values chosen per route family (``html``, ``static``,
+  ``fonts``, ``api``) so deployments can tune caching without code changes
+
+Static assets are prepared once (see :class:`PreparedBody`); dynamic JSON
+bodies are hashed and compressed per response.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Mapping
+
+# Bodies smaller than this are sent as-is; gzip framing would outweigh savings.
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+CACHE_ROUTE_FAMILIES: tuple[str, ...] = ("html", "static", "fonts", "api")
+
+# Static asset URLs are not content-hashed, so text assets revalidate on every
+# use (cheap with ETags); fonts change only on upgrades.
+DEFAULT_CACHE_CONTROL: dict[str, str] = {
+    "html": "no-cache",
+    "static": "no-cache",
+    "fonts": "public, max-age=86400",
+    "api": "no-cache",
+}
+
+_COMPRESSIBLE_PREFIXES = ("text/",)
+_COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/javascript",
+        "application/x-ndjson",
+        "image/svg+xml",
+    }
+)
+
+
+@dataclass(frozen=True)
+class PreparedBody:
+    """A response body with its precomputed gzip variant and validators.
+
+    Attributes:
+        identity: Uncompressed body bytes.
+        gzipped: gzip-encoded body, or ``None`` when compression does not apply.
+        etag: Strong ETag of ``identity``.
+        last_modified: Optional HTTP-date of the underlying resource.
+    """
+
+    identity: bytes
+    gzipped: bytes | None
+    etag: str
+    last_modified: str | None = None
+
+    @property
+    def gzip_etag(self) -> str:
+        """Strong ETag of the gzip representation (distinct from ``etag``)."""
+        return self.etag[:-1] + '-gz"'
+
+
+def is_compressible(content_type: str) -> bool:
+    """Return whether a content type benefits from gzip (fonts/images do not)."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(_COMPRESSIBLE_PREFIXES) or media_type in _COMPRESSIBLE_TYPES
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return whether an ``Accept-Encoding`` header allows gzip.
+
+    Explicit ``gzip`` entries win over ``*``; a quality of ``0`` refuses.
+    """
+    if not accept_encoding:
+        return False
+    wildcard: bool | None = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return bool(wildcard)
+
+
+def strong_etag(payload: bytes) -> str:
+    """Return a strong ETag for exact body bytes."""
+    return '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+
+
+def gzip_bytes(payload: bytes) -> bytes:
+    """gzip ``payload`` deterministically (``mtime=0``) so output is stable."""
+    return gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def prepare_body(
+    payload: bytes,
+    content_type: str,
+    *,
+    last_modified: float | None = None,
+    compress: bool = True,
+) -> PreparedBody:
+    """Build a :class:`PreparedBody`, compressing only when it pays off.
+
+    Args:
+        payload: Uncompressed body.
+        content_type: Response ``Content-Type``.
+        last_modified: Optional POSIX timestamp for ``Last-Modified``.
+        compress: Set ``False`` to skip building the gzip variant (for
+            one-off bodies whose client does not accept gzip).
+    """
+    gzipped = None
+    if compress and len(payload) >= GZIP_MIN_SIZE and is_compressible(content_type):
+        candidate = gzip_bytes(payload)
+        if len(candidate) < len(payload):
+            gzipped = candidate
+    return PreparedBody(
+        identity=payload,
+        gzipped=gzipped,
+        etag=strong_etag(payload),
+        last_modified=None if last_modified is None else formatdate(last_modified, usegmt=True),
+    )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return whether ``If-None-Match`` matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_since(if_modified_since: str | None, last_modified: str | None) -> bool:
+    """Return whether a resource is unchanged since ``If-Modified-Since``."""
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def route_family(path: str) -> str:
+    """Map a request path to its cache route family."""
+    if path.startswith("/api/"):
+        return "api"
+    if path.startswith("/static/fonts/"):
+        return "fonts"
+    if path.startswith("/static/"):
+        return "static"
+    return "html"
+
+
+def cache_control_for(path: str, policies: Mapping[str, str] | None = None) -> str:
+    """Return the ``Cache-Control`` value for a request path."""
+    family = route_family(path)
+    if policies is not None and family in policies:
+        return policies[family]
+    return DEFAULT_CACHE_CONTROL[family]
+
+
+__all__ = [
+    "CACHE_ROUTE_FAMILIES",
+    "DEFAULT_CACHE_CONTROL",
+    "GZIP_LEVEL",
+    "GZIP_MIN_SIZE",
+    "PreparedBody",
+    "accepts_gzip",
+    "cache_control_for",
+    "etag_matches",
+    "gzip_bytes",
+    "is_compressible",
+    "not_modified_since",
+    "prepare_body",
+    "route_family",
+    "strong_etag",
+]
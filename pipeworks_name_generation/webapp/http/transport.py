@@ -7,23 +7,95 @@ request handler can focus on route dispatch and endpoint behavior.
 from __future__ import annotations
 
 import json
-from typing import Any
-
-
-def send_text(
+import zlib
+from typing import Any, Iterable, Iterator, Mapping
+
+from .caching import (
+    GZIP_LEVEL,
+    GZIP_MIN_SIZE,
+    PreparedBody,
+    accepts_gzip,
+    cache_control_for,
+    etag_matches,
+    gzip_bytes,
+    is_compressible,
+    not_modified_since,
+    prepare_body,
+)
+
+
+def _request_header(handler: Any, name: str) -> str | None:
+    headers = getattr(handler, "headers", None)
+    return None if headers is None else headers.get(name)
+
+
+def _client_accepts_gzip(handler: Any, content_type: str) -> bool:
+    """Return whether this response may be gzip-encoded for this client."""
+    return (
+        bool(getattr(handler, "compression_enabled", True))
+        and is_compressible(content_type)
+        and accepts_gzip(_request_header(handler, "Accept-Encoding"))
+    )
+
+
+def _cache_headers(handler: Any, content_type: str) -> dict[str, str]:
+    """Return ``Cache-Control``/``Vary`` headers for the handler's route family."""
+    headers = {
+        "Cache-Control": cache_control_for(
+            str(getattr(handler, "path", "") or ""), getattr(handler, "cache_control", None)
+        )
+    }
+    if getattr(handler, "compression_enabled", True) and is_compressible(content_type):
+        headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
+def send_prepared(
     handler: Any,
-    content: str,
+    body: PreparedBody,
     *,
     status: int = 200,
-    content_type: str = "text/plain",
+    content_type: str = "application/octet-stream",
+    headers: Mapping[str, str] | None = None,
 ) -> None:
-    """Write a UTF-8 text response through a ``BaseHTTPRequestHandler``-like object."""
-    encoded = content.encode("utf-8")
+    """Write a :class:`PreparedBody`, answering conditional GETs with ``304``.
+
+    The gzip representation is chosen when the client accepts it, and each
+    representation carries its own strong ``ETag``. ``If-None-Match`` takes
+    precedence over ``If-Modified-Since`` as required by RFC 9110.
+    """
+    use_gzip = body.gzipped is not None and _client_accepts_gzip(handler, content_type)
+    etag = body.gzip_etag if use_gzip else body.etag
+    response_headers = _cache_headers(handler, content_type)
+    response_headers["ETag"] = etag
+    if body.last_modified is not None:
+        response_headers["Last-Modified"] = body.last_modified
+    response_headers.update(headers or {})
+
+    if status == 200 and getattr(handler, "command", "GET") == "GET":
+        if_none_match = _request_header(handler, "If-None-Match")
+        if etag_matches(if_none_match, etag) or (
+            if_none_match is None
+            and not_modified_since(
+                _request_header(handler, "If-Modified-Since"), body.last_modified
+            )
+        ):
+            handler.send_response(304)
+            for name, value in response_headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            return
+
+    payload = body.gzipped if use_gzip and body.gzipped is not None else body.identity
     handler.send_response(status)
     handler.send_header("Content-Type", content_type)
-    handler.send_header("Content-Length", str(len(encoded)))
+    if use_gzip:
+        handler.send_header("Content-Encoding", "gzip")
+    for name, value in response_headers.items():
+        handler.send_header(name, value)
+    handler.send_header("Content-Length", str(len(payload)))
     handler.end_headers()
-    handler.wfile.write(encoded)
+    handler.wfile.write(payload)
 
 
 def send_bytes(
@@ -33,14 +105,109 @@ def send_bytes(
     status: int = 200,
     content_type: str = "application/octet-stream",
 ) -> None:
-    """Write raw binary data through a ``BaseHTTPRequestHandler``-like object."""
+    """Write raw binary data through a ``BaseHTTPRequestHandler``-like object.
+
+    Successful ``GET`` responses get a strong ``ETag`` (and ``304`` handling);
+    large compressible bodies are gzip-encoded when the client accepts it.
+    """
+    compress = len(payload) >= GZIP_MIN_SIZE and _client_accepts_gzip(handler, content_type)
+    if status == 200 and getattr(handler, "command", None) == "GET":
+        send_prepared(
+            handler,
+            prepare_body(payload, content_type, compress=compress),
+            status=status,
+            content_type=content_type,
+        )
+        return
+
+    headers = _cache_headers(handler, content_type)
+    if compress:
+        payload = gzip_bytes(payload)
+        headers["Content-Encoding"] = "gzip"
     handler.send_response(status)
     handler.send_header("Content-Type", content_type)
+    for name, value in headers.items():
+        handler.send_header(name, value)
     handler.send_header("Content-Length", str(len(payload)))
     handler.end_headers()
     handler.wfile.write(payload)
 
 
+def send_text(
+    handler: Any,
+    content: str,
+    *,
+    status: int = 200,
+    content_type: str = "text/plain",
+) -> None:
+    """Write a UTF-8 text response through a ``BaseHTTPRequestHandler``-like object."""
+    send_bytes(handler, content.encode("utf-8"), status=status, content_type=content_type)
+
+
+def _gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """gzip a chunk stream, flushing after each chunk so output stays incremental."""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if chunk:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def send_chunked(
+    handler: Any,
+    chunks: Iterable[bytes],
+    *,
+    status: int = 200,
+    content_type: str = "application/octet-stream",
+    headers: Mapping[str, str] | None = None,
+) -> None:
+    """Stream an iterable of byte chunks without buffering the full body.
+
+    HTTP/1.1 clients receive ``Transfer-Encoding: chunked`` framing. HTTP/1.0
+    clients, which do not understand chunked framing, receive the raw bytes
+    and the end of the body is signalled by closing the connection. In both
+    cases the connection is closed after the response so a single-threaded
+    server is never held open by an idle keep-alive client.
+
+    Headers are sent before the first chunk is produced, so callers must
+    validate inputs before handing over the iterable. ``headers`` adds extra
+    response headers (for example ``Content-Disposition``). Compressible
+    streams are gzip-encoded on the fly when the client accepts it.
+    """
+    request_version = str(getattr(handler, "request_version", "HTTP/1.1") or "HTTP/1.0")
+    use_chunked = request_version >= "HTTP/1.1"
+    if use_chunked:
+        # ``BaseHTTPRequestHandler`` defaults to HTTP/1.0 status lines, which
+        # must not carry chunked bodies; upgrade only this response.
+        handler.protocol_version = "HTTP/1.1"
+
+    response_headers = _cache_headers(handler, content_type)
+    if _client_accepts_gzip(handler, content_type):
+        response_headers["Content-Encoding"] = "gzip"
+        chunks = _gzip_stream(chunks)
+    response_headers.update(headers or {})
+
+    handler.send_response(status)
+    handler.send_header("Content-Type", content_type)
+    for name, value in response_headers.items():
+        handler.send_header(name, value)
+    if use_chunked:
+        handler.send_header("Transfer-Encoding", "chunked")
+    handler.send_header("Connection", "close")
+    handler.end_headers()
+    handler.close_connection = True
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if use_chunked:
+            handler.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+        else:
+            handler.wfile.write(chunk)
+    if use_chunked:
+        handler.wfile.write(b"0\r\n\r\n")
+
+
 def send_json(handler: Any, payload: dict[str, Any], *, status: int = 200) -> None:
     """Serialize and write a JSON object response."""
     send_text(handler, json.dumps(payload), status=status, content_type="application/json")
@@ -67,4 +234,11 @@ def read_json_body(handler: Any) -> dict[str, Any]:
     return payload
 
 
-__all__ = ["send_text", "send_bytes", "send_json", "read_json_body"]
+__all__ = [
+    "send_text",
+    "send_bytes",
+    "send_prepared",
+    "send_chunked",
+    "send_json",
+    "read_json_body",
+]
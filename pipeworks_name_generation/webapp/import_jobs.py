@@ -0,0 +1,532 @@
+"""Background import jobs for metadata JSON + ZIP package pairs.
+
+``POST /api/import`` runs :func:`import_package_pair` inside the request, so a
+large archive keeps that request (and, on the single-threaded server, every
+other client) waiting until the import commits. Import jobs run the same
+importer on a background thread instead:
+
+- ``POST /api/import/start`` validates the paths, queues a job, and returns
+  its id immediately (``202``).
+- ``GET /api/import/status`` reports entries processed, rows inserted, and
+  bytes read while the job runs, and the import summary once it completes.
+- ``POST /api/import/cancel`` asks a queued or running job to stop; the
+  importer stops at its next chunk and deletes the rows it committed.
+
+Jobs write through their own SQLite connection in WAL mode and commit after
+every chunk (``commit_chunks``), so other writers wait for one chunk rather
+than the whole import, and generation and browse requests keep reading the
+last committed state. The package stays hidden until the final commit.
+
+The worker thread runs in the process that accepted the job, but its state is
+also written to the ``import_jobs`` table after every change, so any server
+process (see :mod:`~pipeworks_name_generation.webapp.prefork`) can report it.
+Each job thread keeps one connection for these writes and for polling cancel
+requests stored on the job row by other processes. The owning process is
+recorded by pid and start time; jobs whose owner has exited (or whose pid now
+belongs to a different process) are reported as failed, and their partial
+import is discarded rather than resumed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from pipeworks_name_generation.webapp.constants import (
+    IMPORT_JOB_CANCEL_POLL_SECONDS,
+    IMPORT_JOB_HISTORY_LIMIT,
+    IMPORT_JOB_MAX_CONCURRENT_JOBS,
+)
+from pipeworks_name_generation.webapp.db import (
+    ImportCancelledError,
+    ImportProgress,
+    connect_database,
+    import_package_pair,
+)
+from pipeworks_name_generation.webapp.db.importer import _process_alive, _process_start_time
+
+IMPORT_STATUS_QUEUED = "queued"
+IMPORT_STATUS_RUNNING = "running"
+IMPORT_STATUS_COMPLETED = "completed"
+IMPORT_STATUS_FAILED = "failed"
+IMPORT_STATUS_CANCELLED = "cancelled"
+IMPORT_ACTIVE_STATUSES = (IMPORT_STATUS_QUEUED, IMPORT_STATUS_RUNNING)
+
+_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _SharedCancelEvent(threading.Event):
+    """Cancel event that also picks up cancel requests stored by other processes.
+
+    ``is_set`` calls ``poll`` at most once per ``poll_interval`` seconds, so the
+    importer's per-chunk checks stay cheap.
+    """
+
+    def __init__(self, poll: Callable[[], bool], *, poll_interval: float) -> None:
+        super().__init__()
+        self._poll = poll
+        self._poll_interval = poll_interval
+        self._next_poll = 0.0
+
+    def is_set(self) -> bool:
+        if not super().is_set():
+            now = time.monotonic()
+            if now >= self._next_poll:
+                self._next_poll = now + self._poll_interval
+                if self._poll():
+                    self.set()
+        return super().is_set()
+
+
+@dataclass(frozen=True)
+class ImportJobSpec:
+    """Immutable parameters of one import job."""
+
+    metadata_json_path: str
+    package_zip_path: str
+    storage_layout: str
+
+
+@dataclass
+class ImportJob:
+    """Mutable state of one import job (guarded by the manager lock)."""
+
+    job_id: str
+    spec: ImportJobSpec
+    status: str = IMPORT_STATUS_QUEUED
+    entries_total: int = 0
+    entries_processed: int = 0
+    rows_inserted: int = 0
+    bytes_total: int = 0
+    bytes_read: int = 0
+    cancel_requested: bool = False
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: str = field(default_factory=_utc_now)
+    updated_at: str = field(default_factory=_utc_now)
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_payload(self) -> dict[str, Any]:
+        """Return the public API representation of the job."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            **asdict(self.spec),
+            "entries_total": self.entries_total,
+            "entries_processed": self.entries_processed,
+            "rows_inserted": self.rows_inserted,
+            "bytes_total": self.bytes_total,
+            "bytes_read": self.bytes_read,
+            "progress": (
+                round(self.bytes_read / self.bytes_total, 6)
+                if self.bytes_total
+                else (1.0 if self.status == IMPORT_STATUS_COMPLETED else 0.0)
+            ),
+            "cancel_requested": self.cancel_requested,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def _parse_import_job_request(payload: dict[str, Any], *, storage_layout: str) -> ImportJobSpec:
+    """Validate an import job request payload.
+
+    Raises:
+        ValueError: If either path is missing.
+        FileNotFoundError: If either file does not exist.
+    """
+    metadata_raw = str(payload.get("metadata_json_path", "")).strip()
+    zip_raw = str(payload.get("package_zip_path", "")).strip()
+    if not metadata_raw or not zip_raw:
+        raise ValueError("Both 'metadata_json_path' and 'package_zip_path' are required.")
+
+    metadata_path = Path(metadata_raw).expanduser().resolve()
+    zip_path = Path(zip_raw).expanduser().resolve()
+    if not metadata_path.is_file():
+        raise FileNotFoundError(f"Metadata JSON does not exist: {metadata_path}")
+    if not zip_path.is_file():
+        raise FileNotFoundError(f"Package ZIP does not exist: {zip_path}")
+    return ImportJobSpec(
+        metadata_json_path=str(metadata_path),
+        package_zip_path=str(zip_path),
+        storage_layout=storage_layout,
+    )
+
+
+class ImportJobManager:
+    """Run and track import jobs for one database.
+
+    Jobs started by this manager are served from memory; other jobs (started
+    by another server process) are read from the ``import_jobs`` table, which
+    :func:`~pipeworks_name_generation.webapp.db.initialize_schema` creates.
+
+    Args:
+        db_path: SQLite database the jobs import into.
+        max_concurrent_jobs: Jobs allowed to run at once; others stay queued.
+        history_limit: Finished jobs kept for status lookups; older ones are
+            forgotten first.
+        open_connection: Connection factory. Each job thread opens one
+            connection for the import and one for its job-table writes and
+            cancel polls.
+        import_pair: Importer called with the job's connection and paths.
+        on_success: Optional callback run after each committed import (for
+            example to invalidate generation caches).
+        cancel_poll_interval: Seconds between checks for cancel requests
+            stored by other processes while a job runs.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        max_concurrent_jobs: int = IMPORT_JOB_MAX_CONCURRENT_JOBS,
+        history_limit: int = IMPORT_JOB_HISTORY_LIMIT,
+        open_connection: Callable[[Path], Any] = connect_database,
+        import_pair: Callable[..., dict[str, Any]] = import_package_pair,
+        on_success: Callable[[], None] | None = None,
+        cancel_poll_interval: float = IMPORT_JOB_CANCEL_POLL_SECONDS,
+    ) -> None:
+        self.db_path = db_path
+        self.history_limit = max(1, history_limit)
+        self.on_success = on_success
+        self._open_connection = open_connection
+        self._import_pair = import_pair
+        self._cancel_poll_interval = cancel_poll_interval
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent_jobs))
+        self._lock = threading.Lock()
+        self._jobs: dict[str, ImportJob] = {}
+        self._threads: dict[str, threading.Thread] = {}
+        self._local = threading.local()
+
+    def submit(self, spec: ImportJobSpec) -> dict[str, Any]:
+        """Queue an import job, record it in the job table, and start it."""
+        job_id = uuid.uuid4().hex
+        job = ImportJob(
+            job_id=job_id,
+            spec=spec,
+            cancel_event=_SharedCancelEvent(
+                lambda: self._poll_cancel(job_id), poll_interval=self._cancel_poll_interval
+            ),
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+            payload = job.to_payload()
+        self._store(payload, prune=True)
+        thread = threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"package-import-{job.job_id[:8]}",
+            daemon=True,
+        )
+        with self._lock:
+            self._threads[job.job_id] = thread
+        thread.start()
+        return payload
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Return a job payload, or ``None`` for unknown ids."""
+        if not _JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job.to_payload()
+        return self._load(job_id)
+
+    def cancel(self, job_id: str) -> dict[str, Any] | None:
+        """Ask a queued or running job to stop.
+
+        Returns:
+            The job payload with ``cancel_requested`` set, or ``None`` when the
+            job has already finished.
+
+        Jobs owned by another process are cancelled through the job table;
+        that process stops the import at its next poll.
+
+        Raises:
+            LookupError: If the job does not exist.
+        """
+        if not _JOB_ID_PATTERN.fullmatch(job_id):
+            raise LookupError(f"Import job not found: {job_id}")
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                if job.status not in IMPORT_ACTIVE_STATUSES:
+                    return None
+                job.cancel_requested = True
+                job.cancel_event.set()
+                job.updated_at = _utc_now()
+                payload = job.to_payload()
+        if job is not None:
+            self._store(payload)
+            return payload
+
+        stored = self._load(job_id)
+        if stored is None:
+            raise LookupError(f"Import job not found: {job_id}")
+        if stored["status"] not in IMPORT_ACTIVE_STATUSES:
+            return None
+        updated_at = _utc_now()
+        self._execute(
+            (
+                "UPDATE import_jobs SET cancel_requested = 1, updated_at = ? WHERE job_id = ?",
+                (updated_at, job_id),
+            )
+        )
+        return {**stored, "cancel_requested": True, "updated_at": updated_at}
+
+    def wait(self, job_id: str, timeout: float | None = None) -> None:
+        """Block until a job's worker thread exits (used by tests and scripts)."""
+        with self._lock:
+            thread = self._threads.get(job_id)
+        if thread is not None:
+            thread.join(timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Cancel every active job and wait for the workers to clean up."""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status in IMPORT_ACTIVE_STATUSES:
+                    job.cancel_requested = True
+                    job.cancel_event.set()
+            threads = list(self._threads.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        """Yield the job thread's state connection, or a short-lived one elsewhere."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        conn = self._open_connection(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _load(self, job_id: str) -> dict[str, Any] | None:
+        """Read a job payload from the job table (jobs owned by other processes)."""
+        with self._connection() as conn:
+            row = conn.execute(
+                """
+                SELECT owner_pid, owner_started, status, cancel_requested, payload
+                FROM import_jobs
+                WHERE job_id = ?
+                """,
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        payload: dict[str, Any] = json.loads(str(row[4]))
+        payload["status"] = str(row[2])
+        payload["cancel_requested"] = bool(row[3]) or bool(payload["cancel_requested"])
+        owner_started = None if row[1] is None else str(row[1])
+        if payload["status"] in IMPORT_ACTIVE_STATUSES and not _process_alive(
+            int(row[0]), owner_started
+        ):
+            payload["status"] = IMPORT_STATUS_FAILED
+            payload["error"] = "The server process running this import exited."
+        return payload
+
+    def _execute(self, *statements: tuple[str, tuple[Any, ...]]) -> None:
+        """Run ``(query, params)`` statements in one transaction and commit."""
+        with self._connection() as conn:
+            try:
+                for query, params in statements:
+                    conn.execute(query, params)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+
+    def _store(self, payload: dict[str, Any], *, prune: bool = False) -> None:
+        """Write an owned job's payload to the job table.
+
+        Failures are ignored: the job keeps running and this process still
+        reports it from memory.
+        """
+        statements: list[tuple[str, tuple[Any, ...]]] = [
+            (
+                """
+                INSERT INTO import_jobs (
+                    job_id, owner_pid, owner_started, status, cancel_requested, payload,
+                    updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    status = excluded.status,
+                    cancel_requested = MAX(cancel_requested, excluded.cancel_requested),
+                    payload = excluded.payload,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    payload["job_id"],
+                    os.getpid(),
+                    _process_start_time(os.getpid()),
+                    payload["status"],
+                    int(payload["cancel_requested"]),
+                    json.dumps(payload),
+                    payload["updated_at"],
+                ),
+            )
+        ]
+        if prune:
+            statements.append(
+                (
+                    """
+                    DELETE FROM import_jobs
+                    WHERE status NOT IN (?, ?) AND job_id NOT IN (
+                        SELECT job_id FROM import_jobs
+                        WHERE status NOT IN (?, ?)
+                        ORDER BY updated_at DESC
+                        LIMIT ?
+                    )
+                    """,
+                    (*IMPORT_ACTIVE_STATUSES, *IMPORT_ACTIVE_STATUSES, self.history_limit),
+                )
+            )
+        try:
+            self._execute(*statements)
+        except sqlite3.Error:  # nosec B110 - job state stays available from memory
+            pass
+
+    def _poll_cancel(self, job_id: str) -> bool:
+        """Return whether another process stored a cancel request for a job."""
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT cancel_requested FROM import_jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+        except sqlite3.Error:  # nosec B110 - retried at the next poll
+            return False
+        if row is None or not row[0]:
+            return False
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.cancel_requested = True
+        return True
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond ``history_limit`` (lock held)."""
+        finished = [
+            job_id for job_id, job in self._jobs.items() if job.status not in IMPORT_ACTIVE_STATUSES
+        ]
+        for job_id in finished[: max(0, len(finished) - self.history_limit)]:
+            del self._jobs[job_id]
+            self._threads.pop(job_id, None)
+
+    def _update(self, job: ImportJob, **changes: Any) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.updated_at = _utc_now()
+            payload = job.to_payload()
+        self._store(payload)
+
+    def _record_progress(self, job: ImportJob, progress: ImportProgress) -> None:
+        self._update(job, **asdict(progress))
+
+    def _run(self, job: ImportJob) -> None:
+        self._local.conn = self._open_connection(self.db_path)
+        try:
+            self._run_job(job)
+        finally:
+            conn, self._local.conn = self._local.conn, None
+            conn.close()
+
+    def _run_job(self, job: ImportJob) -> None:
+        with self._slots:
+            if job.cancel_event.is_set():
+                self._update(job, status=IMPORT_STATUS_CANCELLED)
+                return
+            self._update(job, status=IMPORT_STATUS_RUNNING)
+            try:
+                result = self._import(job)
+            except ImportCancelledError:
+                self._update(job, status=IMPORT_STATUS_CANCELLED)
+                return
+            except Exception as exc:  # nosec B110 - recorded on the job for the status API
+                self._update(job, status=IMPORT_STATUS_FAILED, error=str(exc))
+                return
+            if self.on_success is not None:
+                self.on_success()
+            self._update(job, status=IMPORT_STATUS_COMPLETED, result=result)
+
+    def _import(self, job: ImportJob) -> dict[str, Any]:
+        spec = job.spec
+        conn = self._open_connection(self.db_path)
+        try:
+            return self._import_pair(
+                conn,
+                metadata_path=Path(spec.metadata_json_path),
+                zip_path=Path(spec.package_zip_path),
+                storage_layout=spec.storage_layout,
+                on_progress=lambda progress: self._record_progress(job, progress),
+                cancel_event=job.cancel_event,
+                commit_chunks=True,
+            )
+        finally:
+            conn.close()
+
+
+_MANAGERS: dict[str, ImportJobManager] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def get_import_job_manager(
+    db_path: Path, *, on_success: Callable[[], None] | None = None
+) -> ImportJobManager:
+    """Return the process-wide manager for one database.
+
+    ``on_success`` is only used when the manager is created.
+    """
+    key = str(db_path.expanduser().resolve())
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = ImportJobManager(db_path, on_success=on_success)
+            _MANAGERS[key] = manager
+        return manager
+
+
+def close_import_job_managers() -> None:
+    """Cancel every manager's active jobs (their partial imports are deleted)."""
+    with _MANAGERS_LOCK:
+        managers = list(_MANAGERS.values())
+        _MANAGERS.clear()
+    for manager in managers:
+        manager.close()
+
+
+__all__ = [
+    "IMPORT_STATUS_QUEUED",
+    "IMPORT_STATUS_RUNNING",
+    "IMPORT_STATUS_COMPLETED",
+    "IMPORT_STATUS_FAILED",
+    "IMPORT_STATUS_CANCELLED",
+    "ImportJob",
+    "ImportJobSpec",
+    "ImportJobManager",
+    "_parse_import_job_request",
+    "get_import_job_manager",
+    "close_import_job_managers",
+]
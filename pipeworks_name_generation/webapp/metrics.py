@@ -0,0 +1,476 @@
+"""Opt-in request and SQLite instrumentation for the webapp server.
+
+Metrics are disabled by default. While disabled, :func:`get_metrics_registry`
+returns ``None``: the handler dispatches requests exactly as before and new
+SQLite connections use the stock ``sqlite3.Connection`` class, so the only
+cost is one global lookup per request or connection open.
+
+When enabled (``metrics = true`` in the INI or ``--metrics`` on the CLI) the
+process-wide :class:`MetricsRegistry` records:
+
+- per-route request counts by method and status, latency histograms, and
+  response size histograms (bytes written, headers included)
+- SQLite statement counts and execution-time histograms by SQL verb, for
+  connections opened through ``connect_database`` or the connection pool
+  after metrics were enabled
+
+``GET /api/metrics`` renders the registry in the Prometheus text exposition
+format together with cache and connection-pool gauges supplied by the caller.
+Every series carries a ``worker_pid`` label: with ``--workers N`` each worker
+keeps its own registry, so scrapes answered by different workers stay
+distinguishable.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping, cast
+
+from pipeworks_name_generation.webapp.cache import CacheStats
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram upper bounds (``le`` labels); ``+Inf`` is implied.
+REQUEST_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+RESPONSE_SIZE_BUCKETS: tuple[float, ...] = (
+    256,
+    1024,
+    4096,
+    16384,
+    65536,
+    262144,
+    1048576,
+    4194304,
+    16777216,
+)
+QUERY_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+
+# Route labels for requests that did not match a registered route.
+UNMATCHED_ROUTE = "<unmatched>"
+FONT_ROUTE = "/static/fonts/*"
+
+# SQL verbs reported as-is; anything else is grouped under ``OTHER`` so label
+# cardinality stays bounded.
+_SQL_VERBS = frozenset(
+    {
+        "SELECT",
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "REPLACE",
+        "WITH",
+        "CREATE",
+        "DROP",
+        "ALTER",
+        "PRAGMA",
+        "BEGIN",
+        "COMMIT",
+        "ROLLBACK",
+        "SAVEPOINT",
+        "RELEASE",
+        "ANALYZE",
+        "VACUUM",
+        "ATTACH",
+        "DETACH",
+    }
+)
+
+
+class _Histogram:
+    """Cumulative-on-render histogram with fixed bucket bounds."""
+
+    __slots__ = ("bounds", "counts", "count", "total")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def render(self, name: str, labels: str) -> list[str]:
+        prefix = f"{labels}," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {_format_value(self.total)}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Thread-safe store for request and SQLite query measurements."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: dict[tuple[str, str, int], int] = {}
+        self._request_latency: dict[tuple[str, str], _Histogram] = {}
+        self._response_size: dict[tuple[str, str], _Histogram] = {}
+        self._query_latency: dict[str, _Histogram] = {}
+        self._query_errors: dict[str, int] = {}
+        self._started = time.time()
+
+    def observe_request(
+        self, route: str, method: str, status: int, seconds: float, nbytes: int
+    ) -> None:
+        """Record one dispatched request."""
+        key = (route, method)
+        with self._lock:
+            counter_key = (route, method, status)
+            self._requests[counter_key] = self._requests.get(counter_key, 0) + 1
+            latency = self._request_latency.get(key)
+            if latency is None:
+                latency = self._request_latency[key] = _Histogram(REQUEST_LATENCY_BUCKETS)
+                self._response_size[key] = _Histogram(RESPONSE_SIZE_BUCKETS)
+            latency.observe(seconds)
+            self._response_size[key].observe(nbytes)
+
+    def observe_query(self, verb: str, seconds: float, *, failed: bool = False) -> None:
+        """Record one SQLite statement execution."""
+        with self._lock:
+            histogram = self._query_latency.get(verb)
+            if histogram is None:
+                histogram = self._query_latency[verb] = _Histogram(QUERY_LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            if failed:
+                self._query_errors[verb] = self._query_errors.get(verb, 0) + 1
+
+    def render_prometheus(
+        self,
+        *,
+        caches: Mapping[str, CacheStats] | None = None,
+        pools: list[dict[str, Any]] | None = None,
+    ) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Args:
+            caches: Cache counters keyed by cache name.
+            pools: ``ConnectionPool.stats()`` payloads for open pools.
+        """
+        lines: list[str] = []
+        with self._lock:
+            lines += _header("pipeworks_uptime_seconds", "gauge", "Seconds since metrics start.")
+            uptime = _format_value(time.time() - self._started)
+            lines.append(f"pipeworks_uptime_seconds{{{_labels()}}} {uptime}")
+
+            lines += _header("pipeworks_http_requests_total", "counter", "Requests by route.")
+            for (route, method, status), count in sorted(self._requests.items()):
+                labels = _labels(route=route, method=method, status=str(status))
+                lines.append(f"pipeworks_http_requests_total{{{labels}}} {count}")
+
+            name = "pipeworks_http_request_duration_seconds"
+            lines += _header(name, "histogram", "Request handling time by route.")
+            for (route, method), histogram in sorted(self._request_latency.items()):
+                lines += histogram.render(name, _labels(route=route, method=method))
+
+            name = "pipeworks_http_response_size_bytes"
+            lines += _header(name, "histogram", "Response bytes written by route.")
+            for (route, method), histogram in sorted(self._response_size.items()):
+                lines += histogram.render(name, _labels(route=route, method=method))
+
+            name = "pipeworks_db_query_duration_seconds"
+            lines += _header(name, "histogram", "SQLite statement execution time by verb.")
+            for verb, histogram in sorted(self._query_latency.items()):
+                lines += histogram.render(name, _labels(verb=verb))
+
+            name = "pipeworks_db_query_errors_total"
+            lines += _header(name, "counter", "SQLite statements that raised, by verb.")
+            for verb, count in sorted(self._query_errors.items()):
+                lines.append(f"{name}{{{_labels(verb=verb)}}} {count}")
+
+        lines += _render_caches(caches or {})
+        lines += _render_pools(pools or [])
+        return "\n".join(lines) + "\n"
+
+
+def _render_caches(caches: Mapping[str, CacheStats]) -> list[str]:
+    lines: list[str] = []
+    for name, kind, help_text, attr in (
+        ("pipeworks_cache_hits_total", "counter", "Cache lookups served from memory.", "hits"),
+        ("pipeworks_cache_misses_total", "counter", "Cache lookups that missed.", "misses"),
+        ("pipeworks_cache_evictions_total", "counter", "Cache entries evicted.", "evictions"),
+        ("pipeworks_cache_entries", "gauge", "Entries currently cached.", "entries"),
+        ("pipeworks_cache_bytes", "gauge", "Estimated bytes currently cached.", "total_bytes"),
+    ):
+        lines += _header(name, kind, help_text)
+        for cache, stats in sorted(caches.items()):
+            lines.append(f"{name}{{{_labels(cache=cache)}}} {getattr(stats, attr)}")
+    name = "pipeworks_cache_hit_ratio"
+    lines += _header(name, "gauge", "Hits divided by lookups since start.")
+    for cache, stats in sorted(caches.items()):
+        lookups = stats.hits + stats.misses
+        ratio = stats.hits / lookups if lookups else 0.0
+        lines.append(f"{name}{{{_labels(cache=cache)}}} {_format_value(ratio)}")
+    return lines
+
+
+def _render_pools(pools: list[dict[str, Any]]) -> list[str]:
+    lines: list[str] = []
+    for name, kind, help_text, key in (
+        ("pipeworks_db_pool_reader_leases_total", "counter", "Reader leases.", "reader_leases"),
+        ("pipeworks_db_pool_writer_leases_total", "counter", "Writer leases.", "writer_leases"),
+        (
+            "pipeworks_db_pool_writer_wait_seconds_total",
+            "counter",
+            "Time spent waiting for the writer connection.",
+            "writer_wait_seconds",
+        ),
+        ("pipeworks_db_pool_active_leases", "gauge", "Leases currently held.", "active_leases"),
+    ):
+        lines += _header(name, kind, help_text)
+        for pool in pools:
+            labels = _labels(db=str(pool["db_path"]))
+            lines.append(f"{name}{{{labels}}} {_format_value(pool[key])}")
+    return lines
+
+
+def _header(name: str, kind: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _labels(**labels: str) -> str:
+    # Read at render time so forked workers report their own pid.
+    labels = {"worker_pid": str(os.getpid()), **labels}
+    return ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(round(float(value), 9))
+
+
+_REGISTRY: MetricsRegistry | None = None
+
+
+def enable_metrics() -> MetricsRegistry:
+    """Start collecting metrics, returning the process-wide registry."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = MetricsRegistry()
+    return _REGISTRY
+
+
+def disable_metrics() -> None:
+    """Stop collecting metrics and drop everything recorded so far."""
+    global _REGISTRY
+    _REGISTRY = None
+
+
+def get_metrics_registry() -> MetricsRegistry | None:
+    """Return the active registry, or ``None`` while metrics are disabled."""
+    return _REGISTRY
+
+
+def route_label(route: str, routes: Mapping[str, str]) -> str:
+    """Map a request path onto a bounded route label."""
+    if route in routes:
+        return route
+    if route.startswith("/static/fonts/"):
+        return FONT_ROUTE
+    return UNMATCHED_ROUTE
+
+
+class _CountingWriter:
+    """``wfile`` proxy that counts bytes written through it."""
+
+    def __init__(self, wrapped: Any) -> None:
+        self._wrapped = wrapped
+        self.nbytes = 0
+
+    def write(self, data: bytes) -> int:
+        self.nbytes += len(data)
+        return cast(int, self._wrapped.write(data))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+
+
+@contextmanager
+def track_request(
+    handler: Any, registry: MetricsRegistry, route: str, method: str
+) -> Iterator[None]:
+    """Measure one request dispatch and record it in ``registry``.
+
+    The handler's ``wfile`` and ``send_response`` are shadowed on the instance
+    for the duration of the dispatch so the response size and status can be
+    observed without touching the transport helpers. Exceptions are recorded
+    as status ``500`` and re-raised.
+    """
+    writer = _CountingWriter(handler.wfile)
+    statuses: list[int] = []
+    send_response = handler.send_response
+    shadowed = "send_response" in vars(handler)
+
+    def recording_send_response(code: int, message: str | None = None) -> None:
+        statuses.append(int(code))
+        if message is None:
+            send_response(code)
+        else:
+            send_response(code, message)
+
+    handler.wfile = writer
+    handler.send_response = recording_send_response
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        handler.wfile = writer._wrapped
+        if shadowed:
+            handler.send_response = send_response
+        else:
+            del handler.send_response
+        status = 500 if failed or not statuses else statuses[0]
+        registry.observe_request(route, method, status, elapsed, writer.nbytes)
+
+
+def _sql_verb(sql: str) -> str:
+    head = sql[:32].split(None, 1)
+    verb = head[0].upper() if head else ""
+    return verb if verb in _SQL_VERBS else "OTHER"
+
+
+def _timed(registry: MetricsRegistry, sql: str, call: Any, *args: Any) -> Any:
+    started = time.perf_counter()
+    try:
+        result = call(*args)
+    except BaseException:
+        registry.observe_query(_sql_verb(sql), time.perf_counter() - started, failed=True)
+        raise
+    registry.observe_query(_sql_verb(sql), time.perf_counter() - started)
+    return result
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports statement execution time to the active registry.
+
+    The ``execute`` methods of ``sqlite3.Cursor`` return the cursor itself, so
+    these overrides return ``self``.
+    """
+
+    def execute(self, sql: str, parameters: Any = (), /) -> TimedCursor:
+        registry = _REGISTRY
+        if registry is None:
+            super().execute(sql, parameters)
+        else:
+            _timed(registry, sql, super().execute, sql, parameters)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> TimedCursor:
+        registry = _REGISTRY
+        if registry is None:
+            super().executemany(sql, seq_of_parameters)
+        else:
+            _timed(registry, sql, super().executemany, sql, seq_of_parameters)
+        return self
+
+    def executescript(self, sql_script: str, /) -> TimedCursor:
+        registry = _REGISTRY
+        if registry is None:
+            super().executescript(sql_script)
+        else:
+            _timed(registry, sql_script, super().executescript, sql_script)
+        return self
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose statements report execution time to the active registry.
+
+    ``Connection.execute`` and friends run their statement in C without
+    calling back into the cursor's Python methods, so both the connection
+    shortcuts and :meth:`cursor` are instrumented.
+    """
+
+    def cursor(self, factory: Any = TimedCursor) -> Any:  # type: ignore[override]
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> Any:
+        registry = _REGISTRY
+        if registry is None:
+            return super().execute(sql, parameters)
+        return _timed(registry, sql, super().execute, sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> Any:
+        registry = _REGISTRY
+        if registry is None:
+            return super().executemany(sql, seq_of_parameters)
+        return _timed(registry, sql, super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str, /) -> Any:
+        registry = _REGISTRY
+        if registry is None:
+            return super().executescript(sql_script)
+        return _timed(registry, sql_script, super().executescript, sql_script)
+
+
+def sqlite_connection_factory() -> type[sqlite3.Connection]:
+    """Return the connection class new SQLite connections should use."""
+    return sqlite3.Connection if _REGISTRY is None else TimedConnection
+
+
+__all__ = [
+    "PROMETHEUS_CONTENT_TYPE",
+    "REQUEST_LATENCY_BUCKETS",
+    "RESPONSE_SIZE_BUCKETS",
+    "QUERY_LATENCY_BUCKETS",
+    "UNMATCHED_ROUTE",
+    "FONT_ROUTE",
+    "MetricsRegistry",
+    "TimedConnection",
+    "TimedCursor",
+    "enable_metrics",
+    "disable_metrics",
+    "get_metrics_registry",
+    "route_label",
+    "sqlite_connection_factory",
+    "track_request",
+]
@@ -0,0 +1,202 @@
+"""Pre-fork multi-process serving for the webapp.
+
+Threads share one GIL, so sampling, rendering, and JSON encoding of large
+responses never use more than one core however many ``worker_threads`` run.
+:class:`PreforkSupervisor` runs ``workers`` copies of an already-bound server
+in forked child processes instead:
+
+- The parent initializes storage and binds the listening socket once, before
+  forking. Children inherit both, so schema setup never races and every
+  worker accepts from the same socket (the kernel hands each connection to
+  one of them).
+- The parent only supervises. A worker that exits unexpectedly is replaced;
+  workers that die within ``min_uptime`` seconds of starting are restarted
+  after ``restart_delay`` so a crash loop cannot spin the CPU.
+- ``SIGTERM`` or ``SIGINT`` in the parent is forwarded to the workers as
+  ``SIGTERM``. Each worker stops accepting, drains in-flight requests through
+  its server's ``server_close``, runs ``worker_cleanup``, and exits.
+
+Each worker has its own in-memory state: generation caches, connection pools,
+metrics, and the background jobs it runs. Caches stay consistent through the
+database change stamp, export jobs through their manifests and lock files in
+the export directory, and import jobs through the ``import_jobs`` table, so
+any worker answers job status requests. ``/api/metrics`` describes only the
+worker that answers the request.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable
+
+DEFAULT_WORKER_MIN_UPTIME = 5.0
+DEFAULT_WORKER_RESTART_DELAY = 1.0
+# Workers check for shutdown at least this often while waiting for clients.
+WORKER_ACCEPT_TIMEOUT = 0.5
+
+_STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+class PreforkSupervisor:
+    """Fork and supervise worker processes that share one bound server.
+
+    Args:
+        server: Bound server with ``serve_forever``, ``shutdown``,
+            ``server_close``, and a listening ``socket`` (``HTTPServer``,
+            :class:`~pipeworks_name_generation.webapp.runtime.BoundedThreadingHTTPServer`,
+            or :class:`~pipeworks_name_generation.webapp.async_server.AsyncHTTPServer`).
+        workers: Number of worker processes to keep running.
+        worker_cleanup: Optional hook each worker runs before exiting (for
+            example to close pools and cancel background jobs).
+        printer: Output callable for supervisor messages.
+        min_uptime: Workers exiting sooner than this after starting count as
+            crash-looping.
+        restart_delay: Seconds to wait before replacing a crash-looping worker.
+
+    Raises:
+        ValueError: If ``workers`` is less than 1.
+        OSError: If the platform cannot fork.
+    """
+
+    def __init__(
+        self,
+        server: Any,
+        *,
+        workers: int,
+        worker_cleanup: Callable[[], None] | None = None,
+        printer: Callable[[str], None] = print,
+        min_uptime: float = DEFAULT_WORKER_MIN_UPTIME,
+        restart_delay: float = DEFAULT_WORKER_RESTART_DELAY,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if not hasattr(os, "fork"):
+            raise OSError("Multiple worker processes require os.fork().")
+        self.server = server
+        self.workers = workers
+        self.worker_cleanup = worker_cleanup
+        self.printer = printer
+        self.min_uptime = min_uptime
+        self.restart_delay = restart_delay
+        self.restarts = 0
+        self._children: dict[int, tuple[int, float]] = {}
+        self._stopping = False
+
+    @property
+    def worker_pids(self) -> list[int]:
+        """Process ids of the currently running workers."""
+        return list(self._children)
+
+    def run(self) -> int:
+        """Start the workers and supervise them until a stop signal arrives.
+
+        Must be called from the main thread. The listening socket is left
+        open; the caller closes the server afterwards.
+
+        Returns:
+            ``0`` once every worker has exited after a stop signal.
+        """
+        # Worker sockets inherit this timeout, so blocking accepts that lose
+        # the race for a connection return to the serve loop.
+        self.server.socket.settimeout(WORKER_ACCEPT_TIMEOUT)
+        previous = {signum: signal.signal(signum, self._request_stop) for signum in _STOP_SIGNALS}
+        try:
+            for slot in range(self.workers):
+                self._spawn(slot)
+            while self._children:
+                try:
+                    pid, status = os.waitpid(-1, 0)
+                except ChildProcessError:
+                    break
+                child = self._children.pop(pid, None)
+                if child is None or self._stopping:
+                    continue
+                self._replace(pid, status, slot=child[0], started_at=child[1])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        return 0
+
+    def _spawn(self, slot: int) -> None:
+        """Fork one worker for ``slot`` (stop signals are blocked around fork)."""
+        sys.stdout.flush()
+        sys.stderr.flush()
+        signal.pthread_sigmask(signal.SIG_BLOCK, _STOP_SIGNALS)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                self._run_worker()
+            self._children[pid] = (slot, time.monotonic())
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+        if self._stopping:
+            self._signal_worker(pid)
+
+    def _replace(self, pid: int, status: int, *, slot: int, started_at: float) -> None:
+        """Report an unexpected worker exit and start a replacement."""
+        self.restarts += 1
+        self.printer(
+            f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting."
+        )
+        if time.monotonic() - started_at < self.min_uptime:
+            time.sleep(self.restart_delay)
+        if not self._stopping:
+            self._spawn(slot)
+
+    def _request_stop(self, _signum: int, _frame: Any) -> None:
+        """Signal handler: stop restarting workers and ask each one to exit."""
+        self._stopping = True
+        for pid in list(self._children):
+            self._signal_worker(pid)
+
+    @staticmethod
+    def _signal_worker(pid: int) -> None:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _run_worker(self) -> None:
+        """Serve requests in a forked child until ``SIGTERM``; never returns."""
+        exit_code = 0
+        try:
+            self._children.clear()
+            # The terminal delivers Ctrl-C to the whole process group; only the
+            # supervisor reacts to it and forwards SIGTERM.
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, self._stop_worker)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+            try:
+                self.server.serve_forever()
+            finally:
+                self.server.server_close()
+                if self.worker_cleanup is not None:
+                    self.worker_cleanup()
+        except BaseException:  # nosec B110 - a worker must never return into the parent's stack
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    def _stop_worker(self, _signum: int, _frame: Any) -> None:
+        """Worker signal handler: stop ``serve_forever`` from a helper thread.
+
+        ``shutdown`` waits for the serve loop, which is running on this
+        (main) thread, so it cannot be called from the handler directly.
+        """
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+__all__ = [
+    "DEFAULT_WORKER_MIN_UPTIME",
+    "DEFAULT_WORKER_RESTART_DELAY",
+    "WORKER_ACCEPT_TIMEOUT",
+    "PreforkSupervisor",
+]
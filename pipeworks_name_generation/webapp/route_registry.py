@@ -20,6 +20,11 @@ GET_ROUTE_METHODS: dict[str, str] = {
     "/api/database/packages": "get_database_packages",
     "/api/database/package-tables": "get_database_package_tables",
     "/api/database/table-rows": "get_database_table_rows",
+    "/api/database/pool-stats": "get_database_pool_stats",
+    "/api/metrics": "get_metrics",
+    "/api/import/status": "get_import_status",
+    "/api/generate/export/status": "get_generate_export_status",
+    "/api/generate/export/download": "get_generate_export_download",
     "/api/favorites": "get_favorites",
     "/api/favorites/tags": "get_favorite_tags",
     "/api/favorites/export": "get_favorites_export",
@@ -35,18 +40,40 @@ API_GET_ROUTE_METHODS: dict[str, str] = {
 # Map HTTP POST path -> endpoint adapter function name.
 POST_ROUTE_METHODS: dict[str, str] = {
     "/api/import": "post_import",
+    "/api/import/start": "post_import_start",
+    "/api/import/cancel": "post_import_cancel",
     "/api/database/backup": "post_database_backup",
     "/api/database/export": "post_database_export",
     "/api/database/import": "post_database_import",
+    "/api/database/recompute-stats": "post_database_recompute_stats",
     "/api/favorites": "post_favorites",
     "/api/favorites/update": "post_favorites_update",
     "/api/favorites/delete": "post_favorites_delete",
     "/api/favorites/export": "post_favorites_export",
     "/api/favorites/import": "post_favorites_import",
     "/api/generate": "post_generate",
+    "/api/generate/batch": "post_generate_batch",
+    "/api/generate/export": "post_generate_export",
+    "/api/generate/export/resume": "post_generate_export_resume",
 }
 
 
+# Routes answered from in-memory data without SQLite work. The asyncio runtime
+# serves these on its event loop instead of the blocking-handler executor.
+INLINE_GET_ROUTES: frozenset[str] = frozenset(
+    {
+        "/",
+        "/static/app.css",
+        "/static/app.js",
+        "/static/api_builder_preview.js",
+        "/static/favorites.js",
+        "/api/health",
+        "/favicon.ico",
+    }
+)
+INLINE_GET_ROUTE_PREFIXES: tuple[str, ...] = ("/static/fonts/",)
+
+
 def select_route_maps(serve_ui: bool) -> tuple[dict[str, str], dict[str, str]]:
     """Return the GET/POST route maps for the chosen server mode."""
     if serve_ui:
@@ -58,5 +85,7 @@ __all__ = [
     "GET_ROUTE_METHODS",
     "API_GET_ROUTE_METHODS",
     "POST_ROUTE_METHODS",
+    "INLINE_GET_ROUTES",
+    "INLINE_GET_ROUTE_PREFIXES",
     "select_route_maps",
 ]
@@ -1,13 +1,25 @@
 """Route handler modules for the webapp HTTP server."""
 
-from . import database, database_admin, favorites, generation, help, imports, static
+from . import (
+    database,
+    database_admin,
+    favorites,
+    generation,
+    generation_export,
+    help,
+    imports,
+    metrics,
+    static,
+)
 
 __all__ = [
     "static",
     "generation",
+    "generation_export",
     "database",
     "database_admin",
     "imports",
     "favorites",
     "help",
+    "metrics",
 ]
@@ -68,11 +68,29 @@ def get_table_rows(
     initialize_schema: Callable[..., None],
     get_package_table: Callable[..., dict[str, Any] | None],
     fetch_text_rows: Callable[..., list[dict[str, Any]]],
+    fetch_table_rows: Callable[..., list[dict[str, Any]]] | None = None,
+    fetch_table_rows_after: Callable[..., tuple[list[dict[str, Any]], str | None]] | None = None,
+    decode_row_cursor: Callable[[str], tuple[int, int]] | None = None,
 ) -> None:
-    """Return paginated rows from one imported physical txt-backed table."""
+    """Return paginated rows from one imported txt-backed table.
+
+    ``fetch_table_rows`` receives the full table metadata so it can serve
+    either storage layout; without it rows are read from the physical table.
+
+    When keyset callables are supplied and the query has no ``offset``, rows
+    are paged by cursor: the page starts after the opaque ``after`` cursor (or
+    at the first row without one) and the response includes ``next_cursor``
+    (``null`` on the last page) instead of ``offset``.
+    """
+    keyset = fetch_table_rows_after is not None and ("after" in query or "offset" not in query)
+    after: tuple[int, int] | None = None
     try:
         table_id = parse_required_int(query, "table_id", minimum=1)
-        offset = parse_optional_int(query, "offset", default=0, minimum=0)
+        offset = 0 if keyset else parse_optional_int(query, "offset", default=0, minimum=0)
+        if keyset:
+            cursor = (query.get("after") or [""])[0].strip()
+            if cursor and decode_row_cursor is not None:
+                after = decode_row_cursor(cursor)
         limit = parse_optional_int(
             query,
             "limit",
@@ -92,7 +110,24 @@ def get_table_rows(
                 handler._send_json({"error": "Table id not found."}, status=404)
                 return
 
-            rows = fetch_text_rows(conn, table_meta["table_name"], offset=offset, limit=limit)
+            if keyset and fetch_table_rows_after is not None:
+                rows, next_cursor = fetch_table_rows_after(
+                    conn, table_meta, after=after, limit=limit
+                )
+                handler._send_json(
+                    {
+                        "table": table_meta,
+                        "rows": rows,
+                        "next_cursor": next_cursor,
+                        "limit": limit,
+                        "total_rows": table_meta["row_count"],
+                    }
+                )
+                return
+            if fetch_table_rows is not None:
+                rows = fetch_table_rows(conn, table_meta, offset=offset, limit=limit)
+            else:
+                rows = fetch_text_rows(conn, table_meta["table_name"], offset=offset, limit=limit)
             handler._send_json(
                 {
                     "table": table_meta,
@@ -106,4 +141,18 @@ def get_table_rows(
         handler._send_json({"error": f"Failed to load table rows: {exc}"}, status=500)
 
 
-__all__ = ["get_packages", "get_package_tables", "get_table_rows"]
+def get_pool_stats(
+    handler: _DatabaseHandler,
+    *,
+    pool_enabled: bool,
+    get_pool_stats: Callable[[], list[dict[str, Any]]],
+) -> None:
+    """Return SQLite connection pool metrics."""
+    try:
+        pools = get_pool_stats() if pool_enabled else []
+        handler._send_json({"enabled": pool_enabled, "pools": pools})
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to read pool stats: {exc}"}, status=500)
+
+
+__all__ = ["get_packages", "get_package_tables", "get_table_rows", "get_pool_stats"]
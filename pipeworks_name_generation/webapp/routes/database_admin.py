@@ -1,4 +1,4 @@
-"""Administrative database routes (backup/export/import)."""
+"""Administrative database routes (backup/export/import/stats recompute)."""
 
 from __future__ import annotations
 
@@ -39,6 +39,21 @@ def _coerce_bool(value: Any, *, field: str) -> bool:
     raise DatabaseAdminError(f"{field} must be a boolean.")
 
 
+def _coerce_optional_package_id(value: Any) -> int | None:
+    """Convert an optional payload package id into a positive integer."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise DatabaseAdminError("package_id must be an integer.")
+    try:
+        package_id = int(value)
+    except (TypeError, ValueError) as exc:
+        raise DatabaseAdminError("package_id must be an integer.") from exc
+    if package_id < 1:
+        raise DatabaseAdminError("package_id must be >= 1.")
+    return package_id
+
+
 def _coerce_path(value: Any, *, field: str, required: bool) -> Path | None:
     """Normalize a file path input."""
     raw = str(value).strip() if value is not None else ""
@@ -127,6 +142,7 @@ def post_database_import(
     handler: _DatabaseAdminHandler,
     *,
     restore_database: Callable[..., Any],
+    on_restore_success: Callable[[], None] | None = None,
 ) -> None:
     """Restore the SQLite database from a file path."""
     try:
@@ -149,6 +165,9 @@ def post_database_import(
         handler._send_json({"error": f"Import failed: {exc}"}, status=500)
         return
 
+    if on_restore_success is not None:
+        on_restore_success()
+
     handler._send_json(
         {
             "message": "Import completed.",
@@ -162,8 +181,54 @@ def post_database_import(
     )
 
 
+def post_database_recompute_stats(
+    handler: _DatabaseAdminHandler,
+    *,
+    connect_database: Callable[..., Any],
+    initialize_schema: Callable[..., None],
+    recompute_package_stats: Callable[..., dict[str, int]],
+    on_recompute_success: Callable[[], None] | None = None,
+) -> None:
+    """Rebuild materialized selection statistics for one or all packages."""
+    try:
+        payload = handler._read_json_body()
+        package_id = _coerce_optional_package_id(payload.get("package_id"))
+    except (DatabaseAdminError, ValueError) as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+
+    try:
+        with connect_database(handler.db_path) as conn:
+            initialize_schema(conn)
+            if package_id is not None:
+                exists = conn.execute(
+                    "SELECT 1 FROM imported_packages WHERE id = ? AND id NOT IN "
+                    "(SELECT package_id FROM pending_imports)",
+                    (package_id,),
+                ).fetchone()
+                if exists is None:
+                    handler._send_json({"error": f"Package not found: {package_id}"}, status=404)
+                    return
+            totals = recompute_package_stats(conn, package_id=package_id)
+    except Exception as exc:  # pragma: no cover - defensive error response
+        handler._send_json({"error": f"Stats recompute failed: {exc}"}, status=500)
+        return
+
+    if on_recompute_success is not None:
+        on_recompute_success()
+
+    handler._send_json(
+        {
+            "message": "Selection statistics recomputed.",
+            "package_id": package_id,
+            **totals,
+        }
+    )
+
+
 __all__ = [
     "post_database_backup",
     "post_database_export",
     "post_database_import",
+    "post_database_recompute_stats",
 ]
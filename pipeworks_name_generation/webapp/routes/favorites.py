@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
 from pathlib import Path
-from typing import Any, Callable, Iterable, Protocol
+from typing import Any, Callable, Iterable, Iterator, Mapping, Protocol
+
+from pipeworks_name_generation.webapp.constants import FAVORITES_EXPORT_FORMATS
+
+_NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+_NDJSON_LINES_PER_CHUNK = 500
 
 
 class _FavoritesHandler(Protocol):
@@ -18,6 +24,14 @@ class _FavoritesHandler(Protocol):
 
     def _ensure_favorites_schema(self, conn: Any) -> None: ...
 
+    def _send_stream(
+        self,
+        chunks: Iterable[bytes],
+        status: int = 200,
+        content_type: str = "application/octet-stream",
+        headers: Mapping[str, str] | None = None,
+    ) -> None: ...
+
 
 class _OptionalIntParser(Protocol):
     """Callable signature for optional int parsing."""
@@ -134,6 +148,48 @@ def _coerce_entry(
     }
 
 
+def _resolve_file_format(raw_format: Any, path: Path) -> str:
+    """Return ``json`` or ``ndjson`` from an explicit format or the file suffix."""
+    if raw_format is None or raw_format == "":
+        return "ndjson" if path.suffix.lower() in _NDJSON_SUFFIXES else "json"
+    value = str(raw_format).strip().lower()
+    if value not in FAVORITES_EXPORT_FORMATS:
+        raise FavoritesError("format must be 'json' or 'ndjson'.")
+    return value
+
+
+def _encode_ndjson(entries: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    """Encode favorites as NDJSON, grouping lines into moderately sized chunks."""
+    lines: list[str] = []
+    for entry in entries:
+        lines.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+        if len(lines) >= _NDJSON_LINES_PER_CHUNK:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _read_ndjson_entries(import_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield coerced favorites from an NDJSON file, one line at a time."""
+    with open(import_path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise FavoritesError(f"Invalid JSON on line {line_number}: {exc}") from exc
+            if not isinstance(entry, dict):
+                raise FavoritesError(f"Line {line_number} must be a JSON object.")
+            yield _coerce_entry(
+                entry,
+                default_tags=_parse_tags(entry.get("tags")),
+                default_note=entry.get("note_md"),
+                default_gender=_coerce_gender(entry.get("gender")),
+            )
+
+
 def get_favorites(
     handler: _FavoritesHandler,
     query: dict[str, list[str]],
@@ -312,12 +368,40 @@ def post_favorites_delete(
 
 def get_favorites_export(
     handler: _FavoritesHandler,
+    query: dict[str, list[str]] | None = None,
     *,
     connect_database: Callable[[Path], Any],
     initialize_schema: Callable[[Any], None],
     export_favorites: Callable[[Any], dict[str, Any]],
+    iter_favorites: Callable[[Any], Iterable[dict[str, Any]]] | None = None,
 ) -> None:
-    """Return JSON export payload for favorites."""
+    """Return favorites as one JSON payload, or stream them with ``format=ndjson``.
+
+    The NDJSON stream holds its database connection until the last line is
+    written and never materializes the library.
+    """
+    raw_format = ((query or {}).get("format") or [""])[0].strip().lower()
+    if raw_format and raw_format not in FAVORITES_EXPORT_FORMATS:
+        handler._send_json({"error": "format must be 'json' or 'ndjson'."}, status=400)
+        return
+
+    if raw_format == "ndjson" and iter_favorites is not None:
+        stack = contextlib.ExitStack()
+        try:
+            conn = stack.enter_context(connect_database(handler.favorites_db_path))
+            initialize_schema(conn)
+        except Exception as exc:  # pragma: no cover - defensive error response
+            stack.close()
+            handler._send_json({"error": f"Failed to export favorites: {exc}"}, status=500)
+            return
+
+        def _chunks() -> Iterator[bytes]:
+            with stack:
+                yield from _encode_ndjson(iter_favorites(conn))
+
+        handler._send_stream(_chunks(), content_type="application/x-ndjson")
+        return
+
     try:
         with connect_database(handler.favorites_db_path) as conn:
             initialize_schema(conn)
@@ -335,8 +419,13 @@ def post_favorites_export(
     connect_database: Callable[[Path], Any],
     initialize_schema: Callable[[Any], None],
     export_favorites: Callable[[Any], dict[str, Any]],
+    iter_favorites: Callable[[Any], Iterable[dict[str, Any]]] | None = None,
 ) -> None:
-    """Write favorites export payload to a JSON file."""
+    """Write favorites export payload to a JSON or NDJSON file.
+
+    ``format`` defaults to ``ndjson`` for ``.ndjson``/``.jsonl`` paths; NDJSON
+    files are written incrementally from :func:`iter_favorites`.
+    """
     try:
         payload = handler._read_json_body()
         output_path_raw = str(payload.get("output_path", "")).strip()
@@ -344,13 +433,21 @@ def post_favorites_export(
             raise FavoritesError("output_path is required.")
 
         output_path = Path(output_path_raw).expanduser()
+        file_format = _resolve_file_format(payload.get("format"), output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with connect_database(handler.favorites_db_path) as conn:
             initialize_schema(conn)
-            export_payload = export_favorites(conn)
-
-        output_path.write_text(json.dumps(export_payload, indent=2), encoding="utf-8")
+            if file_format == "ndjson" and iter_favorites is not None:
+                with open(output_path, "wb") as handle:
+                    for chunk in _encode_ndjson(iter_favorites(conn)):
+                        handle.write(chunk)
+            elif file_format == "ndjson":
+                entries = export_favorites(conn)["favorites"]
+                output_path.write_bytes(b"".join(_encode_ndjson(entries)))
+            else:
+                export_payload = export_favorites(conn)
+                output_path.write_text(json.dumps(export_payload, indent=2), encoding="utf-8")
     except FavoritesError as exc:
         handler._send_json({"error": str(exc)}, status=400)
         return
@@ -358,7 +455,7 @@ def post_favorites_export(
         handler._send_json({"error": f"Failed to export favorites: {exc}"}, status=500)
         return
 
-    handler._send_json({"path": str(output_path)})
+    handler._send_json({"path": str(output_path), "format": file_format})
 
 
 def post_favorites_import(
@@ -367,8 +464,14 @@ def post_favorites_import(
     connect_database: Callable[[Path], Any],
     initialize_schema: Callable[[Any], None],
     insert_favorites: Callable[[Any, list[dict[str, Any]]], list[dict[str, Any]]],
+    insert_favorites_bulk: Callable[[Any, Iterable[dict[str, Any]]], int] | None = None,
 ) -> None:
-    """Import favorites from a JSON file path."""
+    """Import favorites from a JSON or NDJSON file path.
+
+    ``format`` defaults to ``ndjson`` for ``.ndjson``/``.jsonl`` paths. NDJSON
+    files are read line by line; with ``insert_favorites_bulk`` every format
+    is inserted in batches within a single transaction.
+    """
     try:
         payload = handler._read_json_body()
         import_path_raw = str(payload.get("import_path", "")).strip()
@@ -378,28 +481,38 @@ def post_favorites_import(
         import_path = Path(import_path_raw).expanduser()
         if not import_path.exists():
             raise FavoritesError("Import file not found.")
-
-        data = json.loads(import_path.read_text(encoding="utf-8"))
-        if not isinstance(data, dict):
-            raise FavoritesError("Import payload must be a JSON object.")
-
-        raw_entries = data.get("favorites")
-        if not isinstance(raw_entries, list) or not raw_entries:
-            raise FavoritesError("Import file contains no favorites.")
-
-        entries = [
-            _coerce_entry(
-                entry,
-                default_tags=_parse_tags(entry.get("tags")),
-                default_note=entry.get("note_md"),
-                default_gender=_coerce_gender(entry.get("gender")),
+        file_format = _resolve_file_format(payload.get("format"), import_path)
+
+        entries: Iterable[dict[str, Any]]
+        if file_format == "ndjson":
+            entries = _read_ndjson_entries(import_path)
+        else:
+            data = json.loads(import_path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                raise FavoritesError("Import payload must be a JSON object.")
+
+            raw_entries = data.get("favorites")
+            if not isinstance(raw_entries, list) or not raw_entries:
+                raise FavoritesError("Import file contains no favorites.")
+
+            entries = (
+                _coerce_entry(
+                    entry,
+                    default_tags=_parse_tags(entry.get("tags")),
+                    default_note=entry.get("note_md"),
+                    default_gender=_coerce_gender(entry.get("gender")),
+                )
+                for entry in raw_entries
             )
-            for entry in raw_entries
-        ]
 
         with connect_database(handler.favorites_db_path) as conn:
             initialize_schema(conn)
-            inserted = insert_favorites(conn, entries)
+            if insert_favorites_bulk is not None:
+                count = insert_favorites_bulk(conn, entries)
+            else:
+                count = len(insert_favorites(conn, list(entries)))
+        if not count:
+            raise FavoritesError("Import file contains no favorites.")
     except FavoritesError as exc:
         handler._send_json({"error": str(exc)}, status=400)
         return
@@ -410,7 +523,7 @@ def post_favorites_import(
         handler._send_json({"error": f"Failed to import favorites: {exc}"}, status=500)
         return
 
-    handler._send_json({"count": len(inserted)})
+    handler._send_json({"count": count})
 
 
 __all__ = [
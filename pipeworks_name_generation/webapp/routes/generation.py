@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
-from typing import Any, Callable, Protocol, Sequence
+from typing import Any, Callable, Iterable, Iterator, Protocol, Sequence
 
 
 class _GenerationHandler(Protocol):
@@ -15,6 +16,13 @@ class _GenerationHandler(Protocol):
 
     def _send_json(self, payload: dict[str, Any], status: int = 200) -> None: ...
 
+    def _send_stream(
+        self,
+        chunks: Iterable[bytes],
+        status: int = 200,
+        content_type: str = "application/octet-stream",
+    ) -> None: ...
+
 
 def get_package_options(
     handler: _GenerationHandler,
@@ -87,9 +95,14 @@ def get_selection_stats(
     parse_required_int: Callable[..., int],
     connect_database: Callable[..., Any],
     initialize_schema: Callable[..., None],
-    get_generation_selection_stats: Callable[..., dict[str, int]],
+    get_generation_selection_stats: Callable[..., dict[str, Any]],
+    parse_optional_int: Callable[..., int] | None = None,
 ) -> None:
-    """Return max item and max unique counts for one selection scope."""
+    """Return max item and max unique counts for one selection scope.
+
+    ``include_histogram=1`` adds the value-length histogram when the adapter
+    provides ``parse_optional_int``.
+    """
     try:
         package_id = parse_required_int(query, "package_id", minimum=1)
         class_values = query.get("class_key", [])
@@ -101,6 +114,12 @@ def get_selection_stats(
         syllable_key = syllable_values[0].strip() if syllable_values else ""
         if not syllable_key:
             raise ValueError("Missing required query parameter: syllable_key")
+
+        include_histogram = False
+        if parse_optional_int is not None:
+            include_histogram = bool(
+                parse_optional_int(query, "include_histogram", default=0, minimum=0, maximum=1)
+            )
     except ValueError as exc:
         handler._send_json({"error": str(exc)}, status=400)
         return
@@ -108,12 +127,11 @@ def get_selection_stats(
     try:
         with connect_database(handler.db_path) as conn:
             initialize_schema(conn)
-            stats = get_generation_selection_stats(
-                conn,
-                class_key=class_key,
-                package_id=package_id,
-                syllable_key=syllable_key,
-            )
+            scope = {"class_key": class_key, "package_id": package_id, "syllable_key": syllable_key}
+            if include_histogram:
+                stats = get_generation_selection_stats(conn, **scope, include_histogram=True)
+            else:
+                stats = get_generation_selection_stats(conn, **scope)
         handler._send_json(
             {
                 "class_key": class_key,
@@ -136,16 +154,23 @@ def post_generate(
     *,
     coerce_generation_count: Callable[[Any], int],
     coerce_optional_seed: Callable[[Any], int | None],
-    coerce_bool: Callable[[Any], bool],
+    coerce_bool: Callable[..., bool],
     coerce_output_format: Callable[[Any], str],
     coerce_render_style: Callable[[Any], str],
     connect_database: Callable[..., Any],
     initialize_schema: Callable[..., None],
-    collect_generation_source_values: Callable[..., list[str]],
+    collect_generation_source_values: Callable[..., Any],
     sample_generation_values: Callable[..., list[str]],
     render_values: Callable[[Sequence[str], str], list[str]],
+    iter_generation_values: Callable[..., Iterable[list[str]]] | None = None,
 ) -> None:
-    """Generate names from SQLite tables for one selected class scope."""
+    """Generate names from SQLite tables for one selected class scope.
+
+    ``output_format="ndjson"`` (and ``output_format="txt"`` with ``stream``
+    enabled) streams names in chunks instead of building one JSON document.
+    Validation and candidate lookup still happen before any bytes are sent,
+    so errors surface as normal JSON error responses.
+    """
     try:
         payload = handler._read_json_body()
     except ValueError as exc:
@@ -180,22 +205,47 @@ def post_generate(
         unique_only = coerce_bool(payload.get("unique_only", False))
         output_format = coerce_output_format(payload.get("output_format", "json"))
         render_style = coerce_render_style(payload.get("render_style"))
+        stream = output_format == "ndjson"
+        if "stream" in payload:
+            stream = coerce_bool(payload.get("stream"), field="stream") or stream
+        if stream and output_format == "json":
+            raise ValueError("Field 'stream' requires output_format 'txt' or 'ndjson'.")
 
+        scope = {"class_key": class_key, "package_id": package_id, "syllable_key": syllable_key}
+        # Candidate sources may read rows lazily, so sampling happens while
+        # the connection is leased.
         with connect_database(handler.db_path) as conn:
             initialize_schema(conn)
-            source_values = collect_generation_source_values(
-                conn,
-                class_key=class_key,
-                package_id=package_id,
-                syllable_key=syllable_key,
-            )
-        names = sample_generation_values(
-            source_values,
-            count=generation_count,
-            seed=seed,
-            unique_only=unique_only,
-        )
-        rendered_names = render_values(names, render_style)
+            source_values = collect_generation_source_values(conn, **scope)
+            if not stream:
+                names = sample_generation_values(
+                    source_values,
+                    count=generation_count,
+                    seed=seed,
+                    unique_only=unique_only,
+                )
+            elif iter_generation_values is None:
+                chunks: Iterable[list[str]] = [
+                    sample_generation_values(
+                        source_values,
+                        count=generation_count,
+                        seed=seed,
+                        unique_only=unique_only,
+                    )
+                ]
+            else:
+                chunks = _iter_leased_generation_values(
+                    handler,
+                    scope,
+                    connect_database=connect_database,
+                    collect_generation_source_values=collect_generation_source_values,
+                    iter_generation_values=iter_generation_values,
+                    count=generation_count,
+                    seed=seed,
+                    unique_only=unique_only,
+                )
+        if not stream:
+            rendered_names = render_values(names, render_style)
     except ValueError as exc:
         handler._send_json({"error": str(exc)}, status=400)
         return
@@ -203,6 +253,21 @@ def post_generate(
         handler._send_json({"error": f"Generation failed: {exc}"}, status=500)
         return
 
+    if stream:
+        content_type = (
+            "application/x-ndjson" if output_format == "ndjson" else "text/plain; charset=utf-8"
+        )
+        handler._send_stream(
+            _encode_stream_chunks(
+                chunks,
+                output_format=output_format,
+                render_style=render_style,
+                render_values=render_values,
+            ),
+            content_type=content_type,
+        )
+        return
+
     response: dict[str, Any] = {
         "message": f"Generated {len(names)} name(s) from imported package data.",
         "source": "sqlite",
@@ -224,9 +289,183 @@ def post_generate(
     handler._send_json(response)
 
 
+def _iter_leased_generation_values(
+    handler: _GenerationHandler,
+    scope: dict[str, Any],
+    *,
+    connect_database: Callable[..., Any],
+    collect_generation_source_values: Callable[..., Any],
+    iter_generation_values: Callable[..., Iterable[list[str]]],
+    count: int,
+    seed: int | None,
+    unique_only: bool,
+) -> Iterator[list[str]]:
+    """Yield sampled chunks while holding a connection for the whole stream.
+
+    Streaming outlives the request's validation block, so the candidate
+    source is resolved again under a lease of its own (cached pools make this
+    a cache hit).
+    """
+    with connect_database(handler.db_path) as conn:
+        source_values = collect_generation_source_values(conn, **scope)
+        yield from iter_generation_values(
+            source_values, count=count, seed=seed, unique_only=unique_only
+        )
+
+
+def post_generate_batch(
+    handler: _GenerationHandler,
+    *,
+    parse_generation_batch_request: Callable[[dict[str, Any]], Any],
+    connect_database: Callable[..., Any],
+    initialize_schema: Callable[..., None],
+    collect_generation_source_values: Callable[..., Any],
+    sample_generation_batch: Callable[..., list[list[str]]],
+    render_values: Callable[[Sequence[str], str], list[str]],
+    render_batch_template: Callable[..., Iterable[str]],
+    stream_chunk_rows: int = 1000,
+) -> None:
+    """Generate index-aligned names for several scopes in one request.
+
+    All scopes share one database connection, and scopes that repeat the same
+    class/package/syllable selection share one candidate pool.
+    """
+    try:
+        payload = handler._read_json_body()
+        batch = parse_generation_batch_request(payload)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+
+    try:
+        pools: dict[Any, Any] = {}
+        by_selection: dict[tuple[str, int, str], Any] = {}
+        with connect_database(handler.db_path) as conn:
+            initialize_schema(conn)
+            for scope in batch.scopes:
+                selection = (scope.class_key, scope.package_id, scope.syllable_key)
+                if selection not in by_selection:
+                    try:
+                        by_selection[selection] = collect_generation_source_values(
+                            conn,
+                            class_key=scope.class_key,
+                            package_id=scope.package_id,
+                            syllable_key=scope.syllable_key,
+                        )
+                    except ValueError as exc:
+                        raise ValueError(f"Scope '{scope.key}': {exc}") from exc
+                pools[scope] = by_selection[selection]
+            raw_columns = sample_generation_batch(batch, pools)
+        columns = [render_values(column, batch.render_style) for column in raw_columns]
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Batch generation failed: {exc}"}, status=500)
+        return
+
+    keys = [scope.key for scope in batch.scopes]
+    results = (
+        list(render_batch_template(batch.template, keys, columns))
+        if batch.template is not None
+        else None
+    )
+
+    if batch.output_format == "ndjson":
+        handler._send_stream(
+            _encode_batch_rows(keys, columns, results, chunk_rows=stream_chunk_rows),
+            content_type="application/x-ndjson",
+        )
+        return
+
+    scope_payloads: list[dict[str, Any]] = []
+    for scope, names, raw_names in zip(batch.scopes, columns, raw_columns):
+        entry: dict[str, Any] = {
+            "key": scope.key,
+            "class_key": scope.class_key,
+            "package_id": scope.package_id,
+            "syllable_key": scope.syllable_key,
+            "unique_only": scope.unique_only,
+            "names": names,
+        }
+        if batch.render_style != "raw":
+            entry["raw_names"] = raw_names
+        if scope.seed is not None:
+            entry["seed"] = scope.seed
+        scope_payloads.append(entry)
+
+    response: dict[str, Any] = {
+        "message": (
+            f"Generated {batch.generation_count} row(s) across "
+            f"{len(batch.scopes)} scope(s) from imported package data."
+        ),
+        "source": "sqlite",
+        "generation_count": batch.generation_count,
+        "render_style": batch.render_style,
+        "output_format": batch.output_format,
+        "scopes": scope_payloads,
+    }
+    if batch.seed is not None:
+        response["seed"] = batch.seed
+    if results is not None:
+        response["template"] = batch.template
+        response["results"] = results
+    handler._send_json(response)
+
+
+def _encode_batch_rows(
+    keys: Sequence[str],
+    columns: Sequence[Sequence[str]],
+    results: Sequence[str] | None,
+    *,
+    chunk_rows: int,
+) -> Iterator[bytes]:
+    """Encode aligned batch rows as NDJSON ``{"names": {...}, "result"?}`` lines."""
+    total = len(columns[0]) if columns else 0
+    for start in range(0, total, chunk_rows):
+        lines = []
+        for index in range(start, min(start + chunk_rows, total)):
+            names = {key: column[index] for key, column in zip(keys, columns)}
+            row: dict[str, Any] = {"names": names}
+            if results is not None:
+                row["result"] = results[index]
+            lines.append(json.dumps(row))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _encode_stream_chunks(
+    chunks: Iterable[list[str]],
+    *,
+    output_format: str,
+    render_style: str,
+    render_values: Callable[[Sequence[str], str], list[str]],
+) -> Iterator[bytes]:
+    """Render and encode sampled name chunks for a streamed response.
+
+    ``ndjson`` emits one ``{"name": ...}`` object per line (plus ``raw_name``
+    for non-raw render styles). ``txt`` emits newline-terminated names.
+    """
+    for raw_chunk in chunks:
+        if not raw_chunk:
+            continue
+        rendered = render_values(raw_chunk, render_style)
+        if output_format == "ndjson":
+            if render_style == "raw":
+                lines = [json.dumps({"name": name}) for name in rendered]
+            else:
+                lines = [
+                    json.dumps({"name": name, "raw_name": raw})
+                    for name, raw in zip(rendered, raw_chunk)
+                ]
+        else:
+            lines = rendered
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
 __all__ = [
     "get_package_options",
     "get_package_syllables",
     "get_selection_stats",
     "post_generate",
+    "post_generate_batch",
 ]
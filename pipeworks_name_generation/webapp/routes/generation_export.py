@@ -0,0 +1,164 @@
+"""Route handlers for background generation export jobs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Protocol
+
+_DOWNLOAD_READ_SIZE = 64 * 1024
+
+
+class _GenerationExportHandler(Protocol):
+    """Structural protocol for export job endpoint handler behavior."""
+
+    db_path: Path
+
+    def _read_json_body(self) -> dict[str, Any]: ...
+
+    def _send_json(self, payload: dict[str, Any], status: int = 200) -> None: ...
+
+    def _send_stream(
+        self,
+        chunks: Iterable[bytes],
+        status: int = 200,
+        content_type: str = "application/octet-stream",
+        headers: Mapping[str, str] | None = None,
+    ) -> None: ...
+
+
+def _query_job_id(query: dict[str, list[str]]) -> str:
+    values = query.get("job_id", [])
+    job_id = values[0].strip() if values else ""
+    if not job_id:
+        raise ValueError("Missing required query parameter: job_id")
+    return job_id
+
+
+def _iter_file(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        while chunk := handle.read(_DOWNLOAD_READ_SIZE):
+            yield chunk
+
+
+def post_generate_export(
+    handler: _GenerationExportHandler,
+    *,
+    parse_export_job_request: Callable[[dict[str, Any]], Any],
+    connect_database: Callable[..., Any],
+    initialize_schema: Callable[..., None],
+    get_export_job_manager: Callable[[], Any],
+) -> None:
+    """Start a background export job and return its initial status (202)."""
+    try:
+        payload = handler._read_json_body()
+        spec = parse_export_job_request(payload)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+
+    try:
+        with connect_database(handler.db_path) as conn:
+            initialize_schema(conn)
+        job = get_export_job_manager().submit(spec)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to start export job: {exc}"}, status=500)
+        return
+    handler._send_json({"job": job}, status=202)
+
+
+def get_generate_export_status(
+    handler: _GenerationExportHandler,
+    query: dict[str, list[str]],
+    *,
+    get_export_job_manager: Callable[[], Any],
+) -> None:
+    """Return progress for one export job."""
+    try:
+        job_id = _query_job_id(query)
+        job = get_export_job_manager().get(job_id)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to read export job: {exc}"}, status=500)
+        return
+    if job is None:
+        handler._send_json({"error": f"Export job not found: {job_id}"}, status=404)
+        return
+    handler._send_json({"job": job})
+
+
+def get_generate_export_download(
+    handler: _GenerationExportHandler,
+    query: dict[str, list[str]],
+    *,
+    get_export_job_manager: Callable[[], Any],
+    content_types: Mapping[str, str],
+) -> None:
+    """Stream the output file of a completed export job."""
+    try:
+        job_id = _query_job_id(query)
+        download = get_export_job_manager().download_path(job_id)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+    except LookupError as exc:
+        handler._send_json({"error": str(exc)}, status=404)
+        return
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to read export job: {exc}"}, status=500)
+        return
+    if download is None:
+        handler._send_json({"error": f"Export job {job_id} is not completed."}, status=409)
+        return
+
+    path, output_format = download
+    if not path.is_file():
+        handler._send_json({"error": f"Export file is missing: {path.name}"}, status=404)
+        return
+    handler._send_stream(
+        _iter_file(path),
+        content_type=content_types.get(output_format, "application/octet-stream"),
+        headers={"Content-Disposition": f'attachment; filename="{path.name}"'},
+    )
+
+
+def post_generate_export_resume(
+    handler: _GenerationExportHandler,
+    *,
+    get_export_job_manager: Callable[[], Any],
+) -> None:
+    """Resume a failed or interrupted export job from its last completed chunk."""
+    try:
+        payload = handler._read_json_body()
+        job_id = str(payload.get("job_id", "")).strip()
+        if not job_id:
+            raise ValueError("Field 'job_id' is required.")
+        job = get_export_job_manager().resume(job_id)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+    except LookupError as exc:
+        handler._send_json({"error": str(exc)}, status=404)
+        return
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to resume export job: {exc}"}, status=500)
+        return
+    if job is None:
+        handler._send_json(
+            {"error": f"Export job {job_id} is not failed or interrupted; nothing to resume."},
+            status=409,
+        )
+        return
+    handler._send_json({"job": job}, status=202)
+
+
+__all__ = [
+    "post_generate_export",
+    "get_generate_export_status",
+    "get_generate_export_download",
+    "post_generate_export_resume",
+]
@@ -56,4 +56,90 @@ def post_import(
         handler._send_json({"error": f"Import failed: {exc}"}, status=500)
 
 
-__all__ = ["post_import"]
+def _query_job_id(query: dict[str, list[str]]) -> str:
+    values = query.get("job_id", [])
+    job_id = values[0].strip() if values else ""
+    if not job_id:
+        raise ValueError("Missing required query parameter: job_id")
+    return job_id
+
+
+def post_import_start(
+    handler: _ImportHandler,
+    *,
+    parse_import_job_request: Callable[[dict[str, Any]], Any],
+    connect_database: Callable[..., Any],
+    initialize_schema: Callable[..., None],
+    get_import_job_manager: Callable[[], Any],
+) -> None:
+    """Queue a background import job and return its initial status (202)."""
+    try:
+        payload = handler._read_json_body()
+        spec = parse_import_job_request(payload)
+    except (FileNotFoundError, ValueError) as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+
+    try:
+        with connect_database(handler.db_path) as conn:
+            initialize_schema(conn)
+        job = get_import_job_manager().submit(spec)
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to start import job: {exc}"}, status=500)
+        return
+    handler._send_json({"job": job}, status=202)
+
+
+def get_import_status(
+    handler: _ImportHandler,
+    query: dict[str, list[str]],
+    *,
+    get_import_job_manager: Callable[[], Any],
+) -> None:
+    """Return progress (and the summary once completed) for one import job."""
+    try:
+        job_id = _query_job_id(query)
+        job = get_import_job_manager().get(job_id)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to read import job: {exc}"}, status=500)
+        return
+    if job is None:
+        handler._send_json({"error": f"Import job not found: {job_id}"}, status=404)
+        return
+    handler._send_json({"job": job})
+
+
+def post_import_cancel(
+    handler: _ImportHandler,
+    *,
+    get_import_job_manager: Callable[[], Any],
+) -> None:
+    """Request cancellation of a queued or running import job."""
+    try:
+        payload = handler._read_json_body()
+        job_id = str(payload.get("job_id", "")).strip()
+        if not job_id:
+            raise ValueError("Field 'job_id' is required.")
+        job = get_import_job_manager().cancel(job_id)
+    except ValueError as exc:
+        handler._send_json({"error": str(exc)}, status=400)
+        return
+    except LookupError as exc:
+        handler._send_json({"error": str(exc)}, status=404)
+        return
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to cancel import job: {exc}"}, status=500)
+        return
+    if job is None:
+        handler._send_json(
+            {"error": f"Import job {job_id} has already finished; nothing to cancel."},
+            status=409,
+        )
+        return
+    handler._send_json({"job": job}, status=202)
+
+
+__all__ = ["post_import", "post_import_start", "get_import_status", "post_import_cancel"]
@@ -0,0 +1,42 @@
+"""Metrics route handlers."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Protocol
+
+
+class _MetricsHandler(Protocol):
+    """Structural protocol for metrics endpoint handler behavior."""
+
+    def _send_text(
+        self, content: str, status: int = 200, content_type: str = "text/plain"
+    ) -> None: ...
+
+    def _send_json(self, payload: dict[str, Any], status: int = 200) -> None: ...
+
+
+def get_metrics(
+    handler: _MetricsHandler,
+    *,
+    render_metrics: Callable[[], str | None],
+    content_type: str,
+) -> None:
+    """Return collected metrics in the Prometheus text format.
+
+    ``render_metrics`` returns ``None`` while metrics collection is disabled,
+    which is reported as ``404`` so scrapers notice the misconfiguration.
+    """
+    try:
+        body = render_metrics()
+    except Exception as exc:  # nosec B110 - converted into controlled API response
+        handler._send_json({"error": f"Failed to render metrics: {exc}"}, status=500)
+        return
+    if body is None:
+        handler._send_json(
+            {"error": "Metrics are disabled. Start the server with --metrics."}, status=404
+        )
+        return
+    handler._send_text(body, content_type=content_type)
+
+
+__all__ = ["get_metrics"]
@@ -4,17 +4,15 @@ from __future__ import annotations
 
 from typing import Any, Protocol
 
+from pipeworks_name_generation.webapp.http.caching import PreparedBody
+
 
 class _StaticHandler(Protocol):
     """Structural protocol for static route handler capabilities."""
 
-    def _send_text(
-        self, content: str, status: int = 200, content_type: str = "text/plain"
-    ) -> None: ...
-
-    def _send_bytes(
+    def _send_prepared(
         self,
-        payload: bytes,
+        body: PreparedBody,
         status: int = 200,
         content_type: str = "application/octet-stream",
     ) -> None: ...
@@ -26,19 +24,19 @@ class _StaticHandler(Protocol):
     def end_headers(self) -> None: ...
 
 
-def get_root(handler: _StaticHandler, html_template: str) -> None:
+def get_root(handler: _StaticHandler, body: PreparedBody) -> None:
     """Serve the single-page web UI shell."""
-    handler._send_text(html_template, content_type="text/html")
+    handler._send_prepared(body, content_type="text/html")
 
 
-def get_text_asset(handler: _StaticHandler, *, content: str, content_type: str) -> None:
+def get_text_asset(handler: _StaticHandler, *, body: PreparedBody, content_type: str) -> None:
     """Serve one UTF-8 static text asset (for example CSS/JS)."""
-    handler._send_text(content, content_type=content_type)
+    handler._send_prepared(body, content_type=content_type)
 
 
-def get_binary_asset(handler: _StaticHandler, *, payload: bytes, content_type: str) -> None:
+def get_binary_asset(handler: _StaticHandler, *, body: PreparedBody, content_type: str) -> None:
     """Serve one binary static asset (for example WOFF2 fonts)."""
-    handler._send_bytes(payload, content_type=content_type)
+    handler._send_prepared(body, content_type=content_type)
 
 
 def get_health(handler: _StaticHandler) -> None:
@@ -6,12 +6,23 @@ These helpers isolate bind-port resolution and HTTP server lifecycle behavior so
 
 from __future__ import annotations
 
+import json
+import os
 import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Any, Callable, TypeVar, cast
 
-from pipeworks_name_generation.webapp.config import ServerSettings
+from pipeworks_name_generation.webapp.async_server import AsyncHTTPServer
+from pipeworks_name_generation.webapp.config import RUNTIME_ASYNCIO, ServerSettings
+from pipeworks_name_generation.webapp.prefork import PreforkSupervisor
+from pipeworks_name_generation.webapp.route_registry import (
+    INLINE_GET_ROUTE_PREFIXES,
+    INLINE_GET_ROUTES,
+)
 
 HandlerT = TypeVar("HandlerT", bound=BaseHTTPRequestHandler)
 
@@ -112,6 +123,145 @@ def create_bound_handler_class(
     return bound_handler
 
 
+class BoundedThreadingHTTPServer(HTTPServer):
+    """``HTTPServer`` that dispatches requests to a fixed-size worker pool.
+
+    Accepted connections are handed to a ``ThreadPoolExecutor`` with
+    ``max_workers`` threads. At most ``max_workers + queue_depth`` connections
+    may be in flight (running or waiting for a worker); further connections
+    are answered immediately with ``503 Service Unavailable`` so slow imports,
+    backups, or large generations cannot starve cheap routes such as
+    ``/api/health`` indefinitely.
+
+    ``server_close`` stops accepting connections and waits for in-flight
+    requests to finish before returning.
+
+    Args:
+        server_address: ``(host, port)`` bind address.
+        handler_class: Request handler class.
+        max_workers: Number of worker threads.
+        queue_depth: Accepted connections allowed to wait for a free worker.
+        bind_and_activate: Forwarded to ``HTTPServer``.
+    """
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        *,
+        max_workers: int,
+        queue_depth: int = 0,
+        bind_and_activate: bool = True,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if queue_depth < 0:
+            raise ValueError("queue_depth must be >= 0")
+        super().__init__(server_address, handler_class, bind_and_activate=bind_and_activate)
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.rejected_requests = 0
+        self._slots = threading.BoundedSemaphore(max_workers + queue_depth)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pipeworks-http",
+        )
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Queue one accepted connection or reject it when capacity is exhausted."""
+        if not self._slots.acquire(blocking=False):
+            self._reject_overloaded(request)
+            return
+        try:
+            self._executor.submit(self._process_request_worker, request, client_address)
+        except RuntimeError:
+            # Executor already shut down: the server is closing.
+            self._slots.release()
+            self._reject_overloaded(request)
+
+    def _process_request_worker(self, request: Any, client_address: Any) -> None:
+        """Run one request on a worker thread and release its capacity slot."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # nosec B110 - mirrors socketserver error reporting
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def _reject_overloaded(self, request: Any) -> None:
+        """Write a minimal 503 JSON response directly and close the connection."""
+        self.rejected_requests += 1
+        body = json.dumps({"error": "Server is busy; retry shortly."}).encode("utf-8")
+        head = (
+            "HTTP/1.1 503 Service Unavailable\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Retry-After: 1\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("ascii")
+        try:
+            # This runs on the accept thread, so nothing here may block. Drain
+            # only request bytes that already arrived (closing with unread data
+            # resets the connection before the client reads the 503), then send
+            # the short response into the empty socket buffer.
+            request.setblocking(False)
+            try:
+                while request.recv(65536):
+                    pass
+            except OSError:
+                pass
+            request.send(head + body)
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        """Stop accepting connections, then drain in-flight requests."""
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+def async_worker_count(settings: ServerSettings) -> int:
+    """Return the asyncio runtime executor size (``worker_threads`` or a CPU-based default)."""
+    if settings.worker_threads > 0:
+        return settings.worker_threads
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def build_http_server_factory(
+    settings: ServerSettings,
+    *,
+    default_cls: Callable[[tuple[str, int], type[BaseHTTPRequestHandler]], Any] = HTTPServer,
+) -> Callable[[tuple[str, int], type[BaseHTTPRequestHandler]], Any]:
+    """Return the server constructor matching the configured concurrency mode.
+
+    ``runtime = "asyncio"`` selects :class:`AsyncHTTPServer` with
+    ``worker_threads`` executor threads (the ``ThreadPoolExecutor`` default
+    size when ``0``). Otherwise ``worker_threads <= 0`` keeps the
+    single-threaded ``default_cls`` and positive values select
+    :class:`BoundedThreadingHTTPServer`.
+    """
+    if settings.runtime == RUNTIME_ASYNCIO:
+        return partial(
+            AsyncHTTPServer,
+            max_workers=async_worker_count(settings),
+            queue_depth=settings.request_queue_depth,
+            keepalive_timeout=settings.keepalive_timeout,
+            max_body_bytes=settings.max_request_body_bytes,
+            inline_paths=INLINE_GET_ROUTES,
+            inline_prefixes=INLINE_GET_ROUTE_PREFIXES,
+        )
+    if settings.worker_threads <= 0:
+        return default_cls
+    return partial(
+        BoundedThreadingHTTPServer,
+        max_workers=settings.worker_threads,
+        queue_depth=settings.request_queue_depth,
+    )
+
+
 def start_http_server(
     settings: ServerSettings,
     *,
@@ -144,13 +294,22 @@ def run_server(
     *,
     start_server: Callable[[ServerSettings], tuple[Any, int]],
     printer: Callable[[str], None] = print,
+    worker_cleanup: Callable[[], None] | None = None,
+    supervisor_cls: Callable[..., Any] = PreforkSupervisor,
 ) -> int:
     """Run the server until interrupted.
 
+    ``settings.workers > 1`` serves from that many forked worker processes
+    under :class:`~pipeworks_name_generation.webapp.prefork.PreforkSupervisor`.
+    ``start_server`` still runs once, in this process, so storage setup and
+    the socket bind happen before any worker exists.
+
     Args:
         settings: Effective runtime settings from config and CLI overrides.
         start_server: Factory that returns ``(server, port)``.
         printer: Output callable used for startup/shutdown messages.
+        worker_cleanup: Hook each forked worker runs before exiting.
+        supervisor_cls: Supervisor constructor used when ``workers > 1``.
 
     Returns:
         Process-style exit code (``0`` on normal shutdown).
@@ -173,8 +332,34 @@ def run_server(
                 "DB backup path: (auto) timestamped copy next to DB " f"({settings.db_path.parent})"
             )
 
+        if settings.runtime == RUNTIME_ASYNCIO:
+            printer(
+                f"Runtime: asyncio ({async_worker_count(settings)} executor threads, "
+                f"queue depth {settings.request_queue_depth}, "
+                f"keep-alive {settings.keepalive_timeout:g}s)"
+            )
+        elif settings.worker_threads > 0:
+            printer(
+                f"Worker threads: {settings.worker_threads} "
+                f"(queue depth {settings.request_queue_depth})"
+            )
+        else:
+            printer("Worker threads: (single-threaded)")
+        if settings.workers > 1:
+            printer(f"Worker processes: {settings.workers} (supervisor pid {os.getpid()})")
+        if settings.metrics:
+            printer(f"Metrics: http://{settings.host}:{port}/api/metrics")
+
     try:
-        server.serve_forever()
+        if settings.workers > 1:
+            supervisor_cls(
+                server,
+                workers=settings.workers,
+                worker_cleanup=worker_cleanup,
+                printer=printer,
+            ).run()
+        else:
+            server.serve_forever()
     except KeyboardInterrupt:
         if settings.verbose:
             printer("\\nStopping server...")
@@ -189,6 +374,9 @@ __all__ = [
     "find_available_port",
     "resolve_server_port",
     "create_bound_handler_class",
+    "BoundedThreadingHTTPServer",
+    "async_worker_count",
+    "build_http_server_factory",
     "start_http_server",
     "run_server",
 ]
@@ -16,16 +16,24 @@ from typing import Sequence
 from pipeworks_name_generation.webapp import cli as webapp_cli
 from pipeworks_name_generation.webapp import runtime as webapp_runtime
 from pipeworks_name_generation.webapp.config import ServerSettings
+from pipeworks_name_generation.webapp.db import (
+    close_connection_pools as _close_connection_pools,
+)
 from pipeworks_name_generation.webapp.db import (
     connect_database as _connect_database,
 )
 from pipeworks_name_generation.webapp.db import (
     initialize_schema as _initialize_schema,
 )
+from pipeworks_name_generation.webapp.export_jobs import close_export_job_managers
 from pipeworks_name_generation.webapp.favorites import (
     initialize_favorites_schema as _initialize_favorites_schema,
 )
+from pipeworks_name_generation.webapp.frontend import preload_static_assets
 from pipeworks_name_generation.webapp.handler import WebAppHandler
+from pipeworks_name_generation.webapp.http import DEFAULT_CACHE_CONTROL
+from pipeworks_name_generation.webapp.import_jobs import close_import_job_managers
+from pipeworks_name_generation.webapp.metrics import disable_metrics, enable_metrics
 from pipeworks_name_generation.webapp.route_registry import select_route_maps
 
 
@@ -74,13 +82,22 @@ def create_handler_class(
     serve_ui: bool,
     db_export_path: Path | None = None,
     db_backup_path: Path | None = None,
+    connection_pool: bool = False,
+    storage_layout: str = "table",
+    generation_export_dir: Path | None = None,
+    compression: bool = True,
+    cache_control: dict[str, str] | None = None,
 ) -> type[WebAppHandler]:
     """Create handler class bound to runtime verbosity and DB path.
 
     The runtime bootstrap initializes schema before creating the handler class,
     so ``schema_ready`` is set to ``True`` to skip per-request schema checks on
     the hot path. Route maps are selected based on ``serve_ui`` so API-only
-    deployments skip UI/static endpoints entirely.
+    deployments skip UI/static endpoints entirely. ``connection_pool`` makes
+    routes lease persistent pooled SQLite connections. ``storage_layout``
+    selects how imports store txt rows. ``generation_export_dir`` is where
+    export jobs write their files. ``compression`` and ``cache_control`` set
+    gzip negotiation and per-route-family ``Cache-Control`` headers.
     """
     get_routes, post_routes = select_route_maps(serve_ui)
     favorites_key = str(favorites_db_path.expanduser().resolve())
@@ -97,6 +114,11 @@ def create_handler_class(
             "favorites_schema_initialized_paths": {favorites_key},
             "db_export_path": db_export_path,
             "db_backup_path": db_backup_path,
+            "connection_pool_enabled": connection_pool,
+            "storage_layout": storage_layout,
+            "generation_export_dir": generation_export_dir,
+            "compression_enabled": compression,
+            "cache_control": dict(DEFAULT_CACHE_CONTROL, **(cache_control or {})),
         },
     )
 
@@ -114,10 +136,21 @@ def _initialize_favorites_storage(favorites_db_path: Path) -> None:
 
 
 def start_http_server(settings: ServerSettings) -> tuple[HTTPServer, int]:
-    """Create a configured ``HTTPServer`` instance."""
+    """Create a configured ``HTTPServer`` instance.
+
+    ``settings.worker_threads > 0`` selects the bounded worker-pool server;
+    otherwise requests are served on the single accept thread. With
+    ``settings.metrics`` the process-wide metrics registry is enabled before
+    any SQLite connection is opened, so every connection is timed.
+    """
+    if settings.metrics:
+        enable_metrics()
 
     def handler_factory(verbose: bool, db_path: Path) -> type[WebAppHandler]:
         """Bind handler class with the selected UI/API routing mode."""
+        if settings.serve_ui:
+            # Read and gzip every static asset once, before the first request.
+            preload_static_assets()
         return create_handler_class(
             verbose,
             db_path,
@@ -125,6 +158,11 @@ def start_http_server(settings: ServerSettings) -> tuple[HTTPServer, int]:
             serve_ui=settings.serve_ui,
             db_export_path=settings.db_export_path,
             db_backup_path=settings.db_backup_path,
+            connection_pool=settings.connection_pool,
+            storage_layout=settings.storage_layout,
+            generation_export_dir=settings.generation_export_dir,
+            compression=settings.compression,
+            cache_control=settings.cache_control,
         )
 
     def initialize_storage(_db_path: Path) -> None:
@@ -137,24 +175,40 @@ def start_http_server(settings: ServerSettings) -> tuple[HTTPServer, int]:
         resolve_port=resolve_server_port,
         create_handler=handler_factory,
         initialize_storage=initialize_storage,
-        http_server_cls=HTTPServer,
+        http_server_cls=webapp_runtime.build_http_server_factory(settings, default_cls=HTTPServer),
     )
 
 
+def _close_process_resources() -> None:
+    """Stop background jobs and release per-process SQLite and metrics state."""
+    close_export_job_managers()
+    close_import_job_managers()
+    _close_connection_pools()
+    disable_metrics()
+
+
 def run_server(settings: ServerSettings) -> int:
     """Run the server until interrupted.
 
+    With ``settings.workers > 1`` each forked worker releases its own
+    resources on exit; the supervisor process releases what it holds after
+    the last worker stops.
+
     Args:
         settings: Effective runtime settings from config and CLI overrides.
 
     Returns:
         Process-style exit code (``0`` on normal shutdown).
     """
-    return webapp_runtime.run_server(
-        settings,
-        start_server=start_http_server,
-        printer=print,
-    )
+    try:
+        return webapp_runtime.run_server(
+            settings,
+            start_server=start_http_server,
+            printer=print,
+            worker_cleanup=_close_process_resources,
+        )
+    finally:
+        _close_process_resources()
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
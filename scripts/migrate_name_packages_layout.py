@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Migrate a name_packages SQLite database to the consolidated value layout.
+
+Legacy imports store each ``*.txt`` file in its own physical table. This script
+copies those rows into the shared ``package_values`` table, one package table
+per transaction, so it can run while the webapp is serving requests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Create the CLI parser for storage-layout migration."""
+    parser = argparse.ArgumentParser(
+        description="Move imported package rows into the consolidated package_values table."
+    )
+    parser.add_argument(
+        "--db",
+        required=True,
+        help="Database path used by the webapp.",
+    )
+    parser.add_argument(
+        "--package-id",
+        type=int,
+        default=None,
+        help="Only migrate tables belonging to this imported package id.",
+    )
+    parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help="Drop legacy per-txt tables after their rows are copied.",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print the final summary.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI entrypoint for migrating the storage layout."""
+    # Allow running the script from a repo checkout without installing the package.
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+    from pipeworks_name_generation.webapp.db import connect_database, initialize_schema
+    from pipeworks_name_generation.webapp.db.migration import migrate_to_values_layout
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.db).expanduser()
+    if not db_path.exists():
+        parser.error(f"Database does not exist: {db_path}")
+
+    def report(table: dict[str, object]) -> None:
+        if not args.quiet:
+            print(f"  migrated {table['table_name']} ({table['rows']} rows)")
+
+    conn = connect_database(db_path)
+    try:
+        initialize_schema(conn)
+        result = migrate_to_values_layout(
+            conn,
+            package_id=args.package_id,
+            drop_legacy_tables=bool(args.drop_legacy),
+            on_table_migrated=report,
+        )
+    finally:
+        conn.close()
+
+    print("Migration completed.")
+    print(f"  Tables migrated: {result.migrated_tables}")
+    print(f"  Rows copied: {result.migrated_rows}")
+    print(f"  Legacy tables dropped: {result.dropped_tables}")
+    if result.skipped_tables:
+        print(f"  Skipped (legacy table missing): {result.skipped_tables}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Tests for name_atlas module."""
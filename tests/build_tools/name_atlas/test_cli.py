@@ -0,0 +1,51 @@
+"""Tests for name atlas CLI."""
+
+from pathlib import Path
+
+from build_tools.name_atlas.cli import main, parse_arguments
+from pipeworks_name_generation import NameGenerator
+from pipeworks_name_generation.atlas import NameAtlas
+
+
+def test_parse_arguments_defaults(tmp_path: Path) -> None:
+    """Defaults should target the built-in pattern and Mersenne RNG."""
+    args = parse_arguments(["--output", str(tmp_path / "a.atlas"), "--count", "10"])
+
+    assert args.pattern == "simple"
+    assert args.rng_mode == "mersenne"
+    assert args.start_seed == 0
+    assert args.verify_seeds == 10000
+
+
+def test_main_builds_and_verifies_atlas(tmp_path: Path, capsys) -> None:
+    """The CLI should write a readable atlas and report verification."""
+    output = tmp_path / "names.atlas"
+    exit_code = main(
+        [
+            "--output",
+            str(output),
+            "--count",
+            "300",
+            "--start-seed",
+            "1000",
+            "--rng-mode",
+            "counter",
+            "--verify-seeds",
+            "0",
+        ]
+    )
+
+    assert exit_code == 0
+    assert "Verified 300 seeds" in capsys.readouterr().out
+    with NameAtlas(output) as atlas:
+        assert atlas.name_for(1299) == NameGenerator("simple", rng_mode="counter").generate(
+            seed=1299
+        )
+
+
+def test_main_rejects_unknown_pattern(tmp_path: Path, capsys) -> None:
+    """Invalid patterns should fail with a readable error."""
+    exit_code = main(["--output", str(tmp_path / "a.atlas"), "--count", "5", "--pattern", "nope"])
+
+    assert exit_code == 1
+    assert "Unknown pattern" in capsys.readouterr().err
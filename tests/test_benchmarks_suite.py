@@ -0,0 +1,74 @@
+"""Tests for the offline benchmark suite and its regression comparison."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_reports
+from benchmarks.suite import RESULTS_SCHEMA_VERSION, build_scenarios, run_suite
+
+
+def _report(**results: dict) -> dict:
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "results": [{"name": name, **values} for name, values in results.items()],
+    }
+
+
+def test_build_scenarios_covers_modes_and_sizes() -> None:
+    """The full suite should cover both RNG modes, batch strategies, and sizes."""
+    names = {scenario.name for scenario in build_scenarios()}
+    assert {"generate/mersenne", "generate/counter"} <= names
+    assert "generate_batch/seeded/unique=False/10000" in names
+    assert "generate_batch/permutation/unique=True/10000" in names
+    assert "render_names/title/10000" in names
+    assert "generate_batch/seeded/unique=True/10000" not in {
+        scenario.name for scenario in build_scenarios(quick=True)
+    }
+
+
+def test_run_suite_emits_json_report() -> None:
+    """Reports should be JSON-serializable with throughput, latency, and memory."""
+    report = run_suite(quick=True, only="generate/", min_time=0.0)
+    assert json.loads(json.dumps(report))["schema_version"] == RESULTS_SCHEMA_VERSION
+    assert [result["name"] for result in report["results"]] == [
+        "generate/mersenne",
+        "generate/counter",
+    ]
+    for result in report["results"]:
+        assert result["names_per_sec"] > 0
+        assert result["latency_ns"]["p50"] <= result["latency_ns"]["p99"]
+        assert result["peak_bytes"] >= 0
+
+
+def test_compare_reports_flags_only_regressions_beyond_threshold() -> None:
+    """Slower throughput or higher memory beyond the threshold is a regression."""
+    baseline = _report(
+        a={"names_per_sec": 1000, "latency_ns": {"p50": 100, "p99": 200}, "peak_bytes": 1000},
+        gone={"names_per_sec": 1},
+    )
+    current = _report(
+        a={"names_per_sec": 800, "latency_ns": {"p50": 105, "p99": 150}, "peak_bytes": 1500},
+        new={"names_per_sec": 1},
+    )
+    comparison = compare_reports(baseline, current, threshold=0.1, memory_threshold=0.6)
+    assert [(entry.metric, round(entry.change, 2)) for entry in comparison["regressions"]] == [
+        ("names_per_sec", 0.2)
+    ]
+    assert comparison["missing"] == ["gone"]
+    assert comparison["added"] == ["new"]
+
+
+def test_compare_cli_exit_status(tmp_path: Path) -> None:
+    """``compare`` exits 1 on regression, 0 otherwise, and 2 for bad reports."""
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_report(a={"names_per_sec": 100})), encoding="utf-8")
+    current.write_text(json.dumps(_report(a={"names_per_sec": 50})), encoding="utf-8")
+
+    assert main(["compare", str(baseline), str(current)]) == 1
+    assert main(["compare", str(baseline), str(baseline)]) == 0
+    current.write_text("{}", encoding="utf-8")
+    assert main(["compare", str(baseline), str(current)]) == 2
@@ -90,3 +90,76 @@ class TestBatchGeneration:
         batch2 = gen.generate_batch(count=5, base_seed=42)
 
         assert batch1 == batch2, "Same base_seed should produce same batch"
+
+
+class TestCounterRngMode:
+    """Tests for the stateless counter RNG fast path."""
+
+    def test_counter_mode_matches_contract_v1(self):
+        """Pinned outputs guard the versioned counter determinism contract."""
+        gen = NameGenerator(pattern="simple", rng_mode="counter")
+
+        assert [gen.generate(seed=seed) for seed in range(4)] == [
+            "Ellazar",
+            "Dinzardor",
+            "Dingrimwyn",
+            "Borgrim",
+        ]
+        assert gen.generate(seed=-1) == "Gorraan"
+        assert gen.generate(seed=7, syllables=4) == "Kagorgrimmir"
+
+    def test_counter_mode_never_repeats_syllables(self):
+        """Counter mode should sample syllables without replacement."""
+        gen = NameGenerator(pattern="simple", rng_mode="counter")
+        name = gen.generate(seed=3, syllables=len(gen._syllables))
+
+        assert len(name) == len("".join(gen._syllables))
+
+    def test_counter_mode_batch_is_deterministic_and_unique(self):
+        """Batch generation should work unchanged on top of counter mode."""
+        gen = NameGenerator(pattern="simple", rng_mode="counter")
+        names = gen.generate_batch(count=20, base_seed=500)
+
+        assert names == gen.generate_batch(count=20, base_seed=500)
+        assert len(set(names)) == 20
+
+    def test_unknown_rng_mode_rejected(self):
+        """Generator should reject unsupported RNG modes."""
+        with pytest.raises(ValueError, match="Unknown rng_mode"):
+            NameGenerator(pattern="simple", rng_mode="philox")
+
+
+class TestPermutationBatch:
+    """Tests for collision-free permutation batch generation."""
+
+    def test_unique_capacity_counts_syllable_sequences(self):
+        """Capacity should equal ordered 2- and 3-syllable picks."""
+        gen = NameGenerator(pattern="simple")
+
+        assert gen.unique_capacity() == 30 * 29 + 30 * 29 * 28
+        assert gen.unique_capacity(syllables=2) == 30 * 29
+
+    def test_permutation_batch_fills_capacity_without_repeats(self):
+        """The permutation strategy should reach full capacity, all distinct."""
+        gen = NameGenerator(pattern="simple")
+        capacity = gen.unique_capacity(syllables=2)
+        names = gen.generate_batch(count=capacity, base_seed=9, strategy="permutation", syllables=2)
+
+        assert len(set(names)) == capacity
+        with pytest.raises(ValueError, match="capacity"):
+            gen.generate_batch(count=capacity + 1, base_seed=9, strategy="permutation", syllables=2)
+
+    def test_permutation_batch_is_deterministic_per_seed(self):
+        """Same base_seed gives the same batch; prefixes are stable."""
+        gen = NameGenerator(pattern="simple")
+        batch = gen.generate_batch(count=50, base_seed=42, strategy="permutation")
+
+        assert batch == gen.generate_batch(count=50, base_seed=42, strategy="permutation")
+        assert batch[:10] == gen.generate_batch(count=10, base_seed=42, strategy="permutation")
+        assert batch != gen.generate_batch(count=50, base_seed=43, strategy="permutation")
+
+    def test_unknown_strategy_rejected(self):
+        """generate_batch should reject unsupported strategies."""
+        gen = NameGenerator(pattern="simple")
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            gen.generate_batch(count=1, base_seed=1, strategy="random")
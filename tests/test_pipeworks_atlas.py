@@ -0,0 +1,57 @@
+"""Tests for memory-mapped name atlas files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pipeworks_name_generation import NameGenerator
+from pipeworks_name_generation.atlas import AtlasError, NameAtlas, write_atlas
+
+
+@pytest.mark.parametrize("rng_mode", ["mersenne", "counter"])
+def test_atlas_round_trips_generator_output(tmp_path: Path, rng_mode: str) -> None:
+    """Every seed in the atlas should resolve to ``generate(seed)``."""
+    gen = NameGenerator(pattern="simple", rng_mode=rng_mode)
+    path = tmp_path / "names.atlas"
+    summary = write_atlas(path, gen, start_seed=-50, count=5000)
+
+    assert summary["file_size"] == path.stat().st_size
+    with NameAtlas(path) as atlas:
+        assert len(atlas) == 5000
+        assert atlas.start_seed == -50
+        assert atlas.metadata["rng_mode"] == rng_mode
+        assert atlas.name_for(-50) == gen.generate(seed=-50)
+        view = atlas.raw_name_for(4949)
+        assert bytes(view).decode("utf-8") == gen.generate(seed=4949)
+        view.release()
+        assert 4949 in atlas and 4950 not in atlas
+        with pytest.raises(KeyError):
+            atlas.name_for(4950)
+        atlas.verify_against(gen)
+
+
+def test_atlas_detects_corruption_and_foreign_generators(tmp_path: Path) -> None:
+    """Checksum and fingerprint checks should reject bad files and mismatches."""
+    gen = NameGenerator(pattern="simple", rng_mode="counter")
+    path = tmp_path / "names.atlas"
+    write_atlas(path, gen, start_seed=0, count=100, syllables=2)
+
+    with NameAtlas(path) as atlas:
+        assert atlas.name_for(7) == gen.generate(seed=7, syllables=2)
+        with pytest.raises(AtlasError, match="different generator"):
+            atlas.verify_against(NameGenerator(pattern="simple"))
+
+    raw = bytearray(path.read_bytes())
+    raw[-1] ^= 0x01
+    path.write_bytes(bytes(raw))
+    with pytest.raises(AtlasError, match="checksum"):
+        NameAtlas(path)
+    with NameAtlas(path, verify_checksum=False) as atlas:
+        with pytest.raises(AtlasError, match="seed 99"):
+            atlas.verify_against(gen, seeds=[99])
+
+    path.write_bytes(b"NOTATLAS" + bytes(raw[8:]))
+    with pytest.raises(AtlasError, match="not a name atlas"):
+        NameAtlas(path)
@@ -0,0 +1,125 @@
+"""Tests for pattern set loading and weighted syllable sampling."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pipeworks_name_generation import NameGenerator
+from pipeworks_name_generation.patterns import (
+    AliasSampler,
+    build_pattern_set,
+    clear_pattern_set_cache,
+    load_pattern_set,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_pattern_set_cache()
+    yield
+    clear_pattern_set_cache()
+
+
+def _write_annotated_json(path: Path) -> Path:
+    records = [
+        {"syllable": "kran", "frequency": 7, "features": {}},
+        {"syllable": "el", "frequency": 3, "features": {}},
+        {"syllable": "dor", "frequency": 1, "features": {}},
+        {"syllable": "vi", "frequency": 5, "features": {}},
+    ]
+    path.write_text(json.dumps(records), encoding="utf-8")
+    return path
+
+
+def test_alias_sampler_tables_reproduce_weights() -> None:
+    """Each index's total alias-table mass should equal its normalized weight."""
+    weights = [7, 3, 1, 5, 0]
+    sampler = AliasSampler(weights)
+    size = len(weights)
+    mass = [probability / size for probability in sampler.probability]
+    for column in range(size):
+        mass[sampler.alias[column]] += (1.0 - sampler.probability[column]) / size
+
+    assert mass == pytest.approx([weight / sum(weights) for weight in weights])
+    with pytest.raises(ValueError):
+        AliasSampler([0, 0])
+
+
+def test_load_pattern_set_reads_pipeline_outputs(tmp_path: Path) -> None:
+    """Annotated JSON, corpus.db, and package zips should load to sorted tables."""
+    annotated = load_pattern_set(_write_annotated_json(tmp_path / "syllables_annotated.json"))
+    assert annotated.syllables == ("dor", "el", "kran", "vi")
+    assert list(annotated.frequencies) == [1, 3, 7, 5]
+    assert annotated.weighted
+
+    db_path = tmp_path / "corpus.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE syllables (syllable TEXT PRIMARY KEY, frequency INTEGER)")
+    conn.executemany("INSERT INTO syllables VALUES (?, ?)", [("ta", 2), ("mo", 9)])
+    conn.commit()
+    conn.close()
+    corpus = load_pattern_set(db_path, weighted=False)
+    assert corpus.syllables == ("mo", "ta")
+    assert not corpus.weighted
+
+    zip_path = tmp_path / "package.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("selections/first.txt", "alfa\n\nbeta\nalfa\n")
+        archive.writestr("selections/first.json", "{}")
+    package = load_pattern_set(zip_path)
+    assert package.syllables == ("alfa", "beta")
+    assert list(package.frequencies) == [2, 1]
+    assert package.syllable_range == (1, 1)
+
+    csv_path = tmp_path / "syllables.csv"
+    csv_path.write_text("ka,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Unsupported pattern source"):
+        load_pattern_set(csv_path)
+
+
+def test_load_pattern_set_caches_until_file_changes(tmp_path: Path) -> None:
+    """Repeated loads should share one pattern set until the file changes."""
+    path = _write_annotated_json(tmp_path / "syllables_annotated.json")
+    first = load_pattern_set(path)
+    assert load_pattern_set(path) is first
+    assert NameGenerator(path)._sampler is first.sampler
+
+    path.write_text(json.dumps([{"syllable": "zu", "frequency": 1}]), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_pattern_set(path).syllables == ("zu",)
+
+
+@pytest.mark.parametrize("rng_mode", ["mersenne", "counter"])
+def test_generator_uses_weighted_pattern_set(tmp_path: Path, rng_mode: str) -> None:
+    """Pattern-backed generators should be deterministic and use only loaded syllables."""
+    path = _write_annotated_json(tmp_path / "syllables_annotated.json")
+    gen = NameGenerator(str(path), rng_mode=rng_mode)
+
+    names = [gen.generate(seed=seed) for seed in range(200)]
+    assert names == [gen.generate(seed=seed) for seed in range(200)]
+    for name in names:
+        remainder = name.lower()
+        while remainder:
+            prefix = next(s for s in ("kran", "el", "dor", "vi") if remainder.startswith(s))
+            remainder = remainder[len(prefix) :]
+    assert gen.pattern == "syllables_annotated.json"
+    assert len(gen.generate_batch(count=20, base_seed=1, strategy="permutation")) == 20
+
+
+def test_generator_draws_whole_values_from_package_zip(tmp_path: Path) -> None:
+    """Package values are whole names, so generators default to one unit."""
+    zip_path = tmp_path / "package.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("first.txt", "alfa\nbeta\ngamma\n")
+    gen = NameGenerator(build_pattern_set("pkg", [("alfa", 1)], syllable_range=(1, 1)))
+    assert gen.generate(seed=3) == "Alfa"
+
+    names = {NameGenerator(zip_path).generate(seed=seed) for seed in range(50)}
+    assert names == {"Alfa", "Beta", "Gamma"}
@@ -6,15 +6,19 @@ remain stable across refactors.
 
 from __future__ import annotations
 
+import contextlib
 import io
 import json
+import sqlite3
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from pipeworks_name_generation.renderer import render_names
 from pipeworks_name_generation.webapp import endpoint_adapters as endpoint_adapters_module
 from pipeworks_name_generation.webapp.generation import (
     _coerce_render_style,
+    _iter_generation_values,
+    _sample_generation_values,
     get_cached_generation_package_options,
 )
 from pipeworks_name_generation.webapp.handler import WebAppHandler
@@ -48,6 +52,7 @@ class _HandlerHarness:
         self._ensure_schema = WebAppHandler._ensure_schema.__get__(self, WebAppHandler)
         self._send_text = WebAppHandler._send_text.__get__(self, WebAppHandler)
         self._send_json = WebAppHandler._send_json.__get__(self, WebAppHandler)
+        self._send_stream = WebAppHandler._send_stream.__get__(self, WebAppHandler)
         self._read_json_body = WebAppHandler._read_json_body.__get__(self, WebAppHandler)
 
     def send_response(self, status: int) -> None:
@@ -266,6 +271,62 @@ def test_generate_contract_txt_format(tmp_path: Path) -> None:
     assert "text" in payload
 
 
+def test_generate_samples_while_a_connection_is_leased(tmp_path: Path) -> None:
+    """Buffered and streamed generation must sample inside a connection lease."""
+    db_path = _build_sample_db(tmp_path)
+    open_leases: list[sqlite3.Connection] = []
+
+    @contextlib.contextmanager
+    def closing_connect(path: Path) -> Iterator[sqlite3.Connection]:
+        conn = endpoint_adapters_module._connect_database(path)
+        open_leases.append(conn)
+        try:
+            with conn:
+                yield conn
+        finally:
+            open_leases.remove(conn)
+            conn.close()
+
+    def sample_values(values: Any, **kwargs: Any) -> list[str]:
+        assert open_leases, "sampled after the connection was released"
+        return _sample_generation_values(values, **kwargs)
+
+    def iter_values(values: Any, **kwargs: Any) -> Iterator[list[str]]:
+        for chunk in _iter_generation_values(values, **kwargs):
+            assert open_leases, "streamed after the connection was released"
+            yield chunk
+
+    for output_format in ("json", "ndjson"):
+        handler = _HandlerHarness(
+            path="/api/generate",
+            db_path=db_path,
+            body={
+                "class_key": "first_name",
+                "package_id": 1,
+                "syllable_key": "2syl",
+                "generation_count": 3,
+                "seed": 7,
+                "output_format": output_format,
+            },
+        )
+        generation_routes.post_generate(
+            handler,
+            coerce_generation_count=endpoint_adapters_module._coerce_generation_count,
+            coerce_optional_seed=endpoint_adapters_module._coerce_optional_seed,
+            coerce_bool=endpoint_adapters_module._coerce_bool,
+            coerce_output_format=endpoint_adapters_module._coerce_output_format,
+            coerce_render_style=_coerce_render_style,
+            connect_database=closing_connect,
+            initialize_schema=handler._ensure_schema,
+            collect_generation_source_values=endpoint_adapters_module._collect_generation_source_values,
+            sample_generation_values=sample_values,
+            render_values=render_names,
+            iter_generation_values=iter_values,
+        )
+        assert handler.response_status == 200
+        assert open_leases == []
+
+
 def test_database_packages_contract(tmp_path: Path) -> None:
     """Database packages endpoint should return list of packages."""
     db_path = _build_sample_db(tmp_path)
@@ -0,0 +1,257 @@
+"""Tests for the asyncio webapp runtime."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from pipeworks_name_generation.webapp.async_server import AsyncHTTPServer
+from pipeworks_name_generation.webapp.config import ServerSettings, load_server_settings
+from pipeworks_name_generation.webapp.db import close_connection_pools
+from pipeworks_name_generation.webapp.runtime import build_http_server_factory
+from pipeworks_name_generation.webapp.server import start_http_server
+
+
+def _serve(server: Any) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture()
+def webapp_server(tmp_path: Path) -> Iterator[tuple[AsyncHTTPServer, int]]:
+    settings = ServerSettings(
+        db_path=tmp_path / "packages.sqlite3",
+        favorites_db_path=tmp_path / "favorites.sqlite3",
+        verbose=False,
+        runtime="asyncio",
+        worker_threads=2,
+    )
+    server, port = start_http_server(settings)
+    assert isinstance(server, AsyncHTTPServer)
+    thread = _serve(server)
+    try:
+        yield server, port
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+        close_connection_pools()
+
+
+def test_async_runtime_serves_webapp_routes_with_keep_alive(
+    webapp_server: tuple[AsyncHTTPServer, int],
+) -> None:
+    """Several requests should share one connection and reuse the webapp routes."""
+    _server, port = webapp_server
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request("GET", "/api/health")
+        health = conn.getresponse()
+        assert health.status == 200
+        assert json.loads(health.read()) == {"ok": True}
+        first_socket = conn.sock
+
+        conn.request("GET", "/static/app.css", headers={"Accept-Encoding": "gzip"})
+        css = conn.getresponse()
+        css.read()
+        assert css.status == 200
+        assert css.getheader("Content-Encoding") == "gzip"
+
+        conn.request("GET", "/api/generation/package-options")
+        options = conn.getresponse()
+        assert options.status == 200
+        assert "name_classes" in json.loads(options.read())
+
+        body = json.dumps({"class_key": "first_name"})
+        conn.request(
+            "POST", "/api/generate", body=body, headers={"Content-Type": "application/json"}
+        )
+        invalid = conn.getresponse()
+        assert invalid.status == 400
+        assert "error" in json.loads(invalid.read())
+        assert conn.sock is first_socket
+    finally:
+        conn.close()
+
+
+def test_async_runtime_holds_idle_connections_without_threads(
+    webapp_server: tuple[AsyncHTTPServer, int],
+) -> None:
+    """Idle keep-alive clients are coroutines, not threads, and do not block requests."""
+    server, port = webapp_server
+    threads_before = threading.active_count()
+    idle = [socket.create_connection(("127.0.0.1", port), timeout=5) for _ in range(100)]
+    try:
+        deadline = time.monotonic() + 5
+        while server.open_connections < 100 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.open_connections >= 100
+        assert threading.active_count() <= threads_before + 2
+
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/api/health")
+        assert conn.getresponse().status == 200
+        conn.close()
+    finally:
+        for sock in idle:
+            sock.close()
+
+
+def test_async_runtime_rejects_malformed_requests(
+    webapp_server: tuple[AsyncHTTPServer, int],
+) -> None:
+    """Bad request lines, chunked uploads, and oversized bodies are answered and closed."""
+    server, port = webapp_server
+    too_large = server.max_body_bytes + 1
+    for raw, status in (
+        (b"NONSENSE\r\n\r\n", b"400"),
+        (b"POST /api/generate HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n", b"501"),
+        (b"GET / HTTP/2.0\r\n\r\n", b"505"),
+        (f"POST /api/generate HTTP/1.1\r\nContent-Length: {too_large}\r\n\r\n".encode(), b"413"),
+    ):
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(raw)
+            response = b""
+            while chunk := sock.recv(65536):
+                response += chunk
+        assert response.split(b" ", 2)[1] == status
+
+
+def test_async_runtime_rejects_other_methods_on_inline_routes(
+    webapp_server: tuple[AsyncHTTPServer, int],
+) -> None:
+    """Inline routes are GET-only; other methods get 405 instead of running inline."""
+    _server, port = webapp_server
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("POST", "/api/health", body=b"{}")
+    response = conn.getresponse()
+    assert response.status == 405
+    assert response.getheader("Allow") == "GET"
+    assert "not allowed" in json.loads(response.read())["error"]
+    conn.close()
+
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", "/api/health")
+    assert conn.getresponse().status == 200
+    conn.close()
+
+
+class _BlockingHandler(BaseHTTPRequestHandler):
+    """Handler that holds its executor thread until the test releases it."""
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/slow":
+            self.started.set()
+            self.release.wait(timeout=5)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence request logs during tests."""
+
+
+def test_async_server_rejects_when_executor_is_full() -> None:
+    """Saturated executors answer 503 while inline routes keep working."""
+    _BlockingHandler.started.clear()
+    _BlockingHandler.release.clear()
+    server = AsyncHTTPServer(
+        ("127.0.0.1", 0),
+        _BlockingHandler,
+        max_workers=1,
+        queue_depth=0,
+        inline_paths={"/inline"},
+    )
+    port = server.server_address[1]
+    thread = _serve(server)
+    results: dict[str, Any] = {}
+
+    def slow_request() -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/slow")
+        response = conn.getresponse()
+        results["slow"] = (response.status, response.read())
+        conn.close()
+
+    slow_thread = threading.Thread(target=slow_request)
+    slow_thread.start()
+    try:
+        assert _BlockingHandler.started.wait(timeout=5)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/busy")
+        busy = conn.getresponse()
+        assert busy.status == 503
+        assert busy.getheader("Retry-After") == "1"
+        conn.close()
+        assert server.rejected_requests == 1
+
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/inline")
+        assert conn.getresponse().read() == b"ok"
+        conn.close()
+    finally:
+        _BlockingHandler.release.set()
+        slow_thread.join(timeout=5)
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert results["slow"] == (200, b"ok")
+
+
+def test_async_server_times_out_slow_request_bodies() -> None:
+    """A body that stops arriving is answered with 408 after the keep-alive timeout."""
+    server = AsyncHTTPServer(
+        ("127.0.0.1", 0), _BlockingHandler, max_workers=1, keepalive_timeout=0.2
+    )
+    port = server.server_address[1]
+    thread = _serve(server)
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"POST /slow HTTP/1.1\r\nContent-Length: 10\r\n\r\nabc")
+            response = b""
+            while chunk := sock.recv(65536):
+                response += chunk
+        assert response.split(b" ", 2)[1] == b"408"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+def test_runtime_setting_selects_async_server(tmp_path: Path) -> None:
+    """``runtime = asyncio`` in the INI selects the asyncio server factory."""
+    ini_path = tmp_path / "server.ini"
+    ini_path.write_text(
+        "[server]\nruntime = asyncio\nkeepalive_timeout = 2.5\nmax_request_body_bytes = 4096\n",
+        encoding="utf-8",
+    )
+    settings = load_server_settings(ini_path)
+    assert settings.runtime == "asyncio"
+    assert settings.keepalive_timeout == 2.5
+    assert settings.max_request_body_bytes == 4096
+
+    server = build_http_server_factory(settings)(("127.0.0.1", 0), _BlockingHandler)
+    try:
+        assert isinstance(server, AsyncHTTPServer)
+        assert server.keepalive_timeout == 2.5
+        assert server.max_body_bytes == 4096
+    finally:
+        server.server_close()
+
+    ini_path.write_text("[server]\nruntime = gevent\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid runtime"):
+        load_server_settings(ini_path)
@@ -6,6 +6,7 @@ from pathlib import Path
 
 import pytest
 
+from pipeworks_name_generation.webapp.cli import build_settings_from_args, parse_arguments
 from pipeworks_name_generation.webapp.config import (
     DEFAULT_DB_PATH,
     DEFAULT_FAVORITES_DB_PATH,
@@ -183,3 +184,100 @@ def test_apply_runtime_overrides_keeps_defaults_when_none() -> None:
     )
 
     assert updated == base
+
+
+def test_load_server_settings_reads_worker_pool_values(tmp_path: Path) -> None:
+    """Worker pool settings should parse from INI and reject negative values."""
+    ini_path = tmp_path / "server.ini"
+    ini_path.write_text(
+        "[server]\nworker_threads = 4\nrequest_queue_depth = 2\n",
+        encoding="utf-8",
+    )
+    settings = load_server_settings(ini_path)
+    assert settings.worker_threads == 4
+    assert settings.request_queue_depth == 2
+
+    ini_path.write_text("[server]\nworker_threads = -1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="worker_threads"):
+        load_server_settings(ini_path)
+
+    ini_path.write_text("[server]\nrequest_queue_depth = many\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="request_queue_depth"):
+        load_server_settings(ini_path)
+
+
+def test_workers_setting_parses_from_ini_and_cli(tmp_path: Path) -> None:
+    """Server process count should parse from INI/CLI and reject values below one."""
+    ini_path = tmp_path / "server.ini"
+    ini_path.write_text("[server]\nworkers = 4\n", encoding="utf-8")
+    settings = load_server_settings(ini_path)
+    assert settings.workers == 4
+    assert ServerSettings().workers == 1
+
+    args = parse_arguments(["--config", str(ini_path), "--workers", "2"])
+    assert build_settings_from_args(args).workers == 2
+
+    ini_path.write_text("[server]\nworkers = 0\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="workers"):
+        load_server_settings(ini_path)
+    with pytest.raises(ValueError, match="workers"):
+        apply_runtime_overrides(
+            ServerSettings(),
+            host=None,
+            port=None,
+            db_path=None,
+            favorites_db_path=None,
+            db_export_path=None,
+            db_backup_path=None,
+            verbose=None,
+            serve_ui=None,
+            workers=0,
+        )
+
+
+def test_storage_layout_setting_is_validated(tmp_path: Path) -> None:
+    """Storage layout should parse from INI/overrides and reject unknown names."""
+    ini_path = tmp_path / "server.ini"
+    ini_path.write_text("[server]\nstorage_layout = Values\n", encoding="utf-8")
+    assert load_server_settings(ini_path).storage_layout == "values"
+
+    ini_path.write_text("[server]\nstorage_layout = sharded\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="storage_layout"):
+        load_server_settings(ini_path)
+
+    with pytest.raises(ValueError, match="storage_layout"):
+        apply_runtime_overrides(
+            ServerSettings(),
+            host=None,
+            port=None,
+            db_path=None,
+            favorites_db_path=None,
+            db_export_path=None,
+            db_backup_path=None,
+            verbose=None,
+            serve_ui=None,
+            storage_layout="sharded",
+        )
+
+
+def test_generation_export_dir_setting_and_override(tmp_path: Path) -> None:
+    """Export job directory should load from INI and accept a CLI override."""
+    ini_path = tmp_path / "server.ini"
+    ini_path.write_text("[server]\ngeneration_export_dir = /tmp/name-exports\n", encoding="utf-8")
+    loaded = load_server_settings(ini_path)
+    assert loaded.generation_export_dir == Path("/tmp/name-exports")
+
+    overridden = apply_runtime_overrides(
+        loaded,
+        host=None,
+        port=None,
+        db_path=None,
+        favorites_db_path=None,
+        db_export_path=None,
+        db_backup_path=None,
+        verbose=None,
+        serve_ui=None,
+        generation_export_dir=tmp_path / "exports",
+    )
+    assert overridden.generation_export_dir == tmp_path / "exports"
+    assert ServerSettings().generation_export_dir is None
@@ -2,10 +2,27 @@
 
 from __future__ import annotations
 
+import json
 import sqlite3
+import threading
+import zipfile
 from pathlib import Path
+from typing import Any, cast
 
-from pipeworks_name_generation.webapp.db import connect_database, initialize_schema
+import pytest
+
+from pipeworks_name_generation.webapp.db import (
+    ConnectionPool,
+    close_connection_pools,
+    connect_database,
+    get_connection_pool,
+    get_connection_pool_stats,
+    import_package_pair,
+    initialize_schema,
+    iter_txt_rows,
+    reset_connection_pools,
+)
+from pipeworks_name_generation.webapp.db import importer as importer_module
 
 
 def test_connect_database_creates_parent_and_applies_pragmas(tmp_path: Path) -> None:
@@ -46,3 +63,371 @@ def test_initialize_schema_creates_expected_indexes(tmp_path: Path) -> None:
     assert "idx_package_tables_package_id" in indexes
     assert "idx_package_tables_package_id_source_txt" in indexes
     assert "idx_imported_packages_imported_at" in indexes
+    assert "idx_package_tables_scope" in indexes
+
+
+def test_initialize_schema_backfills_scope_keys_for_legacy_rows(tmp_path: Path) -> None:
+    """Pre-existing package_tables rows should gain persisted scope keys."""
+    db_path = tmp_path / "legacy.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            CREATE TABLE imported_packages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                package_name TEXT NOT NULL,
+                imported_at TEXT NOT NULL,
+                metadata_json_path TEXT NOT NULL,
+                package_zip_path TEXT NOT NULL,
+                UNIQUE(metadata_json_path, package_zip_path)
+            );
+            CREATE TABLE package_tables (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                package_id INTEGER NOT NULL,
+                source_txt_name TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                UNIQUE(package_id, source_txt_name)
+            );
+            INSERT INTO imported_packages VALUES (1, 'Legacy', 'now', '/m.json', '/p.zip');
+            INSERT INTO package_tables (package_id, source_txt_name, table_name, row_count)
+            VALUES
+                (1, 'nltk_first_name_3syl.txt', 't1', 0),
+                (1, 'readme.txt', 't2', 0);
+            """)
+
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+        rows = conn.execute(
+            "SELECT source_txt_name, class_key, syllable_key FROM package_tables ORDER BY id"
+        ).fetchall()
+        plan = " ".join(
+            str(row[3])
+            for row in conn.execute(
+                """
+                EXPLAIN QUERY PLAN
+                SELECT id FROM package_tables
+                WHERE package_id = ? AND class_key = ? AND syllable_key = ?
+                """,
+                (1, "first_name", "3syl"),
+            )
+        )
+
+    assert [tuple(row) for row in rows] == [
+        ("nltk_first_name_3syl.txt", "first_name", "3syl"),
+        ("readme.txt", "", ""),
+    ]
+    assert "idx_package_tables_scope" in plan
+
+
+def test_initialize_schema_backfills_text_table_line_indexes(tmp_path: Path) -> None:
+    """Legacy physical txt tables should gain the keyset pagination index."""
+    db_path = tmp_path / "legacy_index.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+        conn.execute("CREATE TABLE legacy_rows (id INTEGER PRIMARY KEY, line_number, value)")
+        conn.execute("INSERT INTO imported_packages VALUES (1, 'p', 'now', 'm', 'z')")
+        conn.executemany(
+            """
+            INSERT INTO package_tables (package_id, source_txt_name, table_name, row_count)
+            VALUES (1, ?, ?, 0)
+            """,
+            [("a.txt", "legacy_rows"), ("b.txt", "dropped_rows")],
+        )
+        conn.commit()
+
+        initialize_schema(conn)
+        indexes = {
+            str(row[0])
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+    assert "legacy_rows_line_idx" in indexes
+    assert "dropped_rows_line_idx" not in indexes
+
+
+def test_connection_pool_reuses_read_only_thread_connections(tmp_path: Path) -> None:
+    """Pool readers should be per-thread, read-only, and see committed writes."""
+    db_path = tmp_path / "pool.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+
+    pool = ConnectionPool(db_path)
+    with pool.read() as first:
+        assert first.row_factory is sqlite3.Row
+        with pytest.raises(sqlite3.OperationalError):
+            first.execute("INSERT INTO imported_packages VALUES (1, 'p', 'now', 'm', 'z')")
+    with pool.read() as second:
+        assert second is first
+
+    with pool.write() as writer:
+        writer.execute("INSERT INTO imported_packages VALUES (1, 'p', 'now', 'm', 'z')")
+    with pool.read() as reader:
+        assert reader.execute("SELECT COUNT(*) FROM imported_packages").fetchone()[0] == 1
+
+    other_thread: list[sqlite3.Connection] = []
+
+    def lease_in_thread() -> None:
+        with pool.read() as conn:
+            other_thread.append(conn)
+
+    worker = threading.Thread(target=lease_in_thread)
+    worker.start()
+    worker.join()
+    assert other_thread[0] is not first
+
+    stats = pool.stats()
+    assert stats.reader_connections == 2
+    assert stats.reader_leases == 4
+    assert stats.writer_leases == 1
+    assert stats.writer_open is True
+    assert stats.active_leases == 0
+
+    pool.close()
+    with pool.read() as reopened:
+        assert reopened is not first
+    pool.close()
+
+
+def test_connection_pool_writer_rolls_back_on_error(tmp_path: Path) -> None:
+    """Writer leases should roll back failed blocks and release the writer lock."""
+    db_path = tmp_path / "pool.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+
+    pool = get_connection_pool(db_path)
+    try:
+        with pytest.raises(RuntimeError):
+            with pool.write() as writer:
+                writer.execute("INSERT INTO imported_packages VALUES (1, 'p', 'now', 'm', 'z')")
+                raise RuntimeError("boom")
+        with pool.write() as writer:
+            count = writer.execute("SELECT COUNT(*) FROM imported_packages").fetchone()[0]
+        assert count == 0
+        assert get_connection_pool(db_path) is pool
+        assert [entry["writer_leases"] for entry in get_connection_pool_stats()] == [2]
+    finally:
+        close_connection_pools()
+    assert get_connection_pool_stats() == []
+
+
+def test_connection_pool_reset_leaves_other_threads_readers_open(tmp_path: Path) -> None:
+    """A reset must not close readers in use; each thread replaces its own."""
+    db_path = tmp_path / "pool.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+
+    pool = get_connection_pool(db_path)
+    leased = threading.Event()
+    resume = threading.Event()
+    results: dict[str, object] = {}
+
+    def long_read() -> None:
+        with pool.read() as conn:
+            leased.set()
+            assert resume.wait(timeout=5)
+            results["count"] = conn.execute("SELECT COUNT(*) FROM imported_packages").fetchone()[0]
+        with pool.read() as fresh:
+            results["replaced"] = fresh is not conn
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        results["stale_closed"] = True
+
+    worker = threading.Thread(target=long_read)
+    try:
+        with pool.read() as outer:
+            worker.start()
+            assert leased.wait(timeout=5)
+            reset_connection_pools(db_path)
+            resume.set()
+            worker.join(timeout=5)
+            # Nested leases keep the connection the outer lease is using.
+            with pool.read() as nested:
+                assert nested is outer
+            assert outer.execute("SELECT 1").fetchone()[0] == 1
+        with pool.read() as after:
+            assert after is not outer
+        assert pool.stats().reader_connections == 2
+    finally:
+        close_connection_pools()
+
+    assert results == {"count": 0, "replaced": True, "stale_closed": True}
+
+
+def test_connection_pool_retries_read_only_readers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """One failed ``mode=ro`` open should not disable read-only readers for good."""
+    db_path = tmp_path / "pool.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+
+    real_connect = sqlite3.connect
+    failures = iter([True])
+
+    def flaky_connect(*args: Any, **kwargs: Any) -> sqlite3.Connection:
+        if kwargs.get("uri") and next(failures, False):
+            raise sqlite3.OperationalError("unable to open database file")
+        return cast(sqlite3.Connection, real_connect(*args, **kwargs))
+
+    monkeypatch.setattr(sqlite3, "connect", flaky_connect)
+    pool = ConnectionPool(db_path)
+    try:
+        with pool.read():
+            pass
+        assert pool.stats().read_only is False
+
+        pool.reset()
+        with pool.read() as reader:
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("INSERT INTO imported_packages VALUES (1, 'p', 'now', 'm', 'z')")
+        assert pool.stats().read_only is True
+    finally:
+        pool.close()
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 7, 64 * 1024])
+def test_iter_txt_rows_streams_like_splitlines(tmp_path: Path, block_size: int) -> None:
+    """Streaming reads should number lines exactly like ``str.splitlines``."""
+    content = "alpha\r\nbeta\r\rgamma\u2028  \nd\u00e9lta\n\n  eps  \rzeta"
+    archive_path = tmp_path / "rows.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("rows.txt", content.encode("utf-8"))
+
+    expected = [
+        (number, line.strip())
+        for number, line in enumerate(content.splitlines(), start=1)
+        if line.strip()
+    ]
+    with zipfile.ZipFile(archive_path, "r") as archive:
+        assert list(iter_txt_rows(archive, "rows.txt", block_size=block_size)) == expected
+
+
+def _write_values_package(tmp_path: Path, rows: int) -> tuple[Path, Path]:
+    metadata_path = tmp_path / "meta.json"
+    zip_path = tmp_path / "pkg.zip"
+    metadata_path.write_text(json.dumps({"common_name": "Bulk"}), encoding="utf-8")
+    values = "\n".join(f"name{index % 7}" for index in range(rows))
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("selections/nltk_first_name_2syl.txt", values)
+        archive.writestr("selections/nltk_last_name_2syl.txt", "name1\nother\n")
+    return metadata_path, zip_path
+
+
+def test_import_streams_chunks_keeping_shared_indexes(tmp_path: Path) -> None:
+    """Chunked ``values`` imports should never rebuild shared indexes and keep stats exact."""
+    metadata_path, zip_path = _write_values_package(tmp_path, rows=25)
+    statements: list[str] = []
+
+    with connect_database(tmp_path / "bulk.sqlite3") as conn:
+        initialize_schema(conn)
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        conn.set_trace_callback(lambda sql: statements.append(" ".join(sql.split())))
+        result = import_package_pair(
+            conn,
+            metadata_path=metadata_path,
+            zip_path=zip_path,
+            storage_layout="values",
+            chunk_rows=4,
+        )
+        conn.set_trace_callback(None)
+
+        assert not [sql for sql in statements if sql.startswith(("DROP INDEX", "CREATE INDEX"))]
+
+        assert [table["row_count"] for table in result["tables"]] == [25, 2]
+        assert conn.execute("SELECT COUNT(*) FROM package_values").fetchone()[0] == 27
+        assert [
+            int(row[0]) for row in conn.execute("SELECT row_count FROM package_tables ORDER BY id")
+        ] == [25, 2]
+        indexes = {
+            str(row[0])
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+                ("package_values",),
+            )
+        }
+        assert {"idx_package_values_table_line", "idx_package_values_table_value"} <= indexes
+        assert [
+            tuple(row)
+            for row in conn.execute(
+                "SELECT row_count, distinct_count FROM package_table_stats "
+                "ORDER BY package_table_id"
+            )
+        ] == [(25, 7), (2, 2)]
+        assert (
+            conn.execute(
+                "SELECT distinct_count FROM generation_scope_stats WHERE class_key = 'last_name'"
+            ).fetchone()[0]
+            == 2
+        )
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == cache_size
+
+
+def test_table_layout_import_indexes_after_inserting_rows(tmp_path: Path) -> None:
+    """Physical txt tables should get their line index once their rows are in."""
+    metadata_path, zip_path = _write_values_package(tmp_path, rows=9)
+    statements: list[str] = []
+
+    with connect_database(tmp_path / "table.sqlite3") as conn:
+        initialize_schema(conn)
+        conn.set_trace_callback(lambda sql: statements.append(" ".join(sql.split())))
+        result = import_package_pair(
+            conn,
+            metadata_path=metadata_path,
+            zip_path=zip_path,
+            storage_layout="table",
+            chunk_rows=4,
+        )
+        conn.set_trace_callback(None)
+
+        for table in result["tables"]:
+            table_name = table["table_name"]
+            inserts = [
+                position
+                for position, sql in enumerate(statements)
+                if sql.startswith(f'INSERT INTO "{table_name}"')
+            ]
+            index_builds = [
+                position
+                for position, sql in enumerate(statements)
+                if sql.startswith(f'CREATE INDEX IF NOT EXISTS "{table_name}_line_idx"')
+            ]
+            assert inserts and len(index_builds) == 1
+            assert index_builds[0] > max(inserts)
+        indexes = {
+            str(row[0])
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert {f"{table['table_name']}_line_idx" for table in result["tables"]} <= indexes
+
+
+def test_import_rollback_keeps_shared_indexes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A failed streaming import should roll back its rows and leave indexes intact."""
+    metadata_path, zip_path = _write_values_package(tmp_path, rows=10)
+    inserted_chunks = 0
+    original_insert = importer_module.insert_package_values
+
+    def failing_insert(*args: object, **kwargs: object) -> None:
+        nonlocal inserted_chunks
+        inserted_chunks += 1
+        if inserted_chunks == 2:
+            raise RuntimeError("disk full")
+        original_insert(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(importer_module, "insert_package_values", failing_insert)
+    with connect_database(tmp_path / "rollback.sqlite3") as conn:
+        initialize_schema(conn)
+        with pytest.raises(RuntimeError, match="disk full"):
+            import_package_pair(
+                conn,
+                metadata_path=metadata_path,
+                zip_path=zip_path,
+                storage_layout="values",
+                chunk_rows=3,
+            )
+        assert conn.execute("SELECT COUNT(*) FROM package_values").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM imported_packages").fetchone()[0] == 0
+        index_count = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+            ("package_values",),
+        ).fetchone()[0]
+        assert index_count == 2
@@ -12,6 +12,7 @@ from pipeworks_name_generation.webapp.db import (
     backup_database,
     connect_database,
     export_database,
+    get_database_change_stamp,
     initialize_schema,
     restore_database,
 )
@@ -131,6 +132,26 @@ def test_restore_database_overwrites_and_creates_backup(tmp_path: Path) -> None:
     assert packages[0]["package_name"] == "Imported Package"
 
 
+def test_restore_database_advances_change_stamp(tmp_path: Path) -> None:
+    """A restored file must never reuse the change stamp of the DB it replaced."""
+    dest_db = tmp_path / "dest.sqlite3"
+    import_db = tmp_path / "import.sqlite3"
+    _seed_database(dest_db, "Original Package")
+    _seed_database(import_db, "Imported Package")
+    with connect_database(dest_db) as conn:
+        replaced_stamp = get_database_change_stamp(conn)
+    with connect_database(import_db) as conn:
+        assert get_database_change_stamp(conn) == replaced_stamp
+
+    restore_database(dest_db, import_path=import_db, overwrite=True, create_backup=False)
+
+    with connect_database(dest_db) as conn:
+        restored_stamp = get_database_change_stamp(conn)
+    assert replaced_stamp is not None
+    assert restored_stamp is not None
+    assert restored_stamp > replaced_stamp
+
+
 def test_restore_database_rejects_same_path(tmp_path: Path) -> None:
     """Restore should reject using the destination path as the import path."""
     db_path = tmp_path / "db.sqlite3"
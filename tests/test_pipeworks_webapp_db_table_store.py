@@ -3,15 +3,24 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any, Callable
 
 import pytest
 
 from pipeworks_name_generation.webapp.db import (
     connect_database,
     create_text_table,
+    decode_row_cursor,
+    encode_row_cursor,
+    fetch_package_values,
+    fetch_package_values_after,
     fetch_text_rows,
+    fetch_text_rows_after,
+    initialize_schema,
+    insert_package_values,
     insert_text_rows,
     quote_identifier,
+    read_package_values,
 )
 
 
@@ -58,3 +67,89 @@ def test_insert_text_rows_noop(tmp_path: Path) -> None:
 
         rows = fetch_text_rows(conn, "empty_table", offset=0, limit=10)
         assert rows == []
+
+
+def test_package_values_insert_fetch_and_grouped_read(tmp_path: Path) -> None:
+    """Consolidated rows should page and group in line_number order."""
+    db_path = tmp_path / "values.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+        conn.execute(
+            "INSERT INTO imported_packages VALUES (1, 'pkg', 'now', 'meta.json', 'pkg.zip')"
+        )
+        for table_id in (1, 2):
+            conn.execute(
+                """
+                INSERT INTO package_tables (id, package_id, source_txt_name, table_name, row_count)
+                VALUES (?, 1, ?, ?, 2)
+                """,
+                (table_id, f"source_{table_id}.txt", f"logical_{table_id}"),
+            )
+        insert_package_values(conn, 1, [(3, "gamma"), (1, "alpha")])
+        insert_package_values(conn, 2, [(1, "delta"), (2, "alpha")])
+        conn.commit()
+
+        assert fetch_package_values(conn, 1, offset=0, limit=1) == [
+            {"line_number": 1, "value": "alpha"}
+        ]
+        assert fetch_package_values(conn, 1, offset=1, limit=5) == [
+            {"line_number": 3, "value": "gamma"}
+        ]
+        assert read_package_values(conn, [2, 1, 99]) == {
+            2: ["delta", "alpha"],
+            1: ["alpha", "gamma"],
+            99: [],
+        }
+        assert read_package_values(conn, []) == {}
+
+
+def test_row_cursor_round_trip_and_validation() -> None:
+    """Row cursors should round-trip and reject malformed input."""
+    cursor = encode_row_cursor(12, 345)
+    assert "=" not in cursor
+    assert decode_row_cursor(cursor) == (12, 345)
+    for bad in ("", "!!", encode_row_cursor(1, 2)[:-1] + "*", "YWJj"):
+        with pytest.raises(ValueError, match="Invalid row cursor"):
+            decode_row_cursor(bad)
+
+
+def test_keyset_pages_follow_line_order(tmp_path: Path) -> None:
+    """Keyset pages should cover every row once in (line_number, id) order."""
+    with connect_database(tmp_path / "keyset.sqlite3") as conn:
+        initialize_schema(conn)
+        create_text_table(conn, "keyset_table")
+        insert_text_rows(conn, "keyset_table", [(3, "c"), (1, "a"), (1, "a2"), (2, "b")])
+        conn.execute(
+            "INSERT INTO imported_packages VALUES (1, 'pkg', 'now', 'meta.json', 'pkg.zip')"
+        )
+        conn.execute("""
+            INSERT INTO package_tables (id, package_id, source_txt_name, table_name, row_count)
+            VALUES (1, 1, 'source.txt', 'logical', 4)
+            """)
+        insert_package_values(conn, 1, [(3, "c"), (1, "a"), (1, "a2"), (2, "b")])
+        conn.commit()
+
+        plan = " ".join(
+            str(row[3])
+            for row in conn.execute(
+                'EXPLAIN QUERY PLAN SELECT id FROM "keyset_table" '
+                "WHERE (line_number, id) > (1, 1) ORDER BY line_number, id LIMIT 2"
+            )
+        )
+        assert "keyset_table_line_idx" in plan
+
+        pages: list[tuple[Callable[..., Any], str | int]] = [
+            (fetch_text_rows_after, "keyset_table"),
+            (fetch_package_values_after, 1),
+        ]
+        for fetch_page, source in pages:
+            values: list[str] = []
+            after = None
+            while True:
+                rows, next_cursor = fetch_page(conn, source, after=after, limit=3)
+                values.extend(row["value"] for row in rows)
+                if next_cursor is None:
+                    break
+                after = decode_row_cursor(next_cursor)
+            assert values == ["a", "a2", "b", "c"]
+            assert fetch_page(conn, source, after=None, limit=4)[1] is None
@@ -0,0 +1,167 @@
+"""Tests for background generation export jobs."""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import zipfile
+from pathlib import Path
+from typing import Sequence
+
+import pytest
+
+from pipeworks_name_generation.renderer import render_names
+from pipeworks_name_generation.webapp.db import (
+    connect_database,
+    import_package_pair,
+    initialize_schema,
+)
+from pipeworks_name_generation.webapp.export_jobs import (
+    ExportJobManager,
+    _parse_export_job_request,
+)
+from pipeworks_name_generation.webapp.generation import clear_generation_candidate_cache
+
+
+def _import_package(tmp_path: Path, db_path: Path) -> int:
+    metadata_path = tmp_path / "export_metadata.json"
+    zip_path = tmp_path / "export.zip"
+    metadata_path.write_text('{"common_name": "Export"}', encoding="utf-8")
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("nltk_first_name_2syl.txt", "\n".join(f"name{i}" for i in range(40)))
+    conn = connect_database(db_path)
+    try:
+        initialize_schema(conn)
+        result = import_package_pair(conn, metadata_path=metadata_path, zip_path=zip_path)
+    finally:
+        conn.close()
+    return int(result["package_id"])
+
+
+def test_parse_export_job_request_fills_seed_and_validates() -> None:
+    """Seedless requests get a recorded seed; bad fields raise ``ValueError``."""
+    base = {"class_key": "first_name", "package_id": 1, "syllable_key": "2syl"}
+    spec = _parse_export_job_request({**base, "generation_count": 10})
+    assert isinstance(spec.seed, int)
+    assert spec.output_format == "txt"
+
+    with pytest.raises(ValueError, match="generation_count"):
+        _parse_export_job_request({**base, "generation_count": 0})
+    with pytest.raises(ValueError, match="chunk_size"):
+        _parse_export_job_request({**base, "generation_count": 5, "chunk_size": 0})
+
+
+@pytest.mark.parametrize(
+    ("output_format", "unique_only"),
+    [("txt", False), ("csv", False), ("ndjson", True)],
+)
+def test_export_job_resumes_to_identical_output(
+    tmp_path: Path, output_format: str, unique_only: bool
+) -> None:
+    """A job that fails mid-run should resume to the uninterrupted output."""
+    db_path = tmp_path / "export.sqlite3"
+    clear_generation_candidate_cache()
+    package_id = _import_package(tmp_path, db_path)
+    spec = _parse_export_job_request(
+        {
+            "class_key": "first_name",
+            "package_id": package_id,
+            "syllable_key": "2syl",
+            "generation_count": 35,
+            "seed": 99,
+            "unique_only": unique_only,
+            "render_style": "upper",
+            "output_format": output_format,
+            "chunk_size": 8,
+        }
+    )
+
+    reference = ExportJobManager(tmp_path / "reference", db_path=db_path)
+    expected_job = reference.submit(spec)
+    reference.wait(expected_job["job_id"], timeout=10)
+    expected = Path(expected_job["output_path"]).read_bytes()
+
+    calls = {"count": 0}
+
+    def flaky_render(names: Sequence[str], style: str) -> list[str]:
+        calls["count"] += 1
+        if calls["count"] == 3:
+            raise RuntimeError("disk full")
+        return render_names(names, style)
+
+    export_dir = tmp_path / "exports"
+    failing = ExportJobManager(export_dir, db_path=db_path, render_values=flaky_render)
+    job_id = failing.submit(spec)["job_id"]
+    failing.wait(job_id, timeout=10)
+    failed = failing.get(job_id)
+    assert failed is not None
+    assert failed["status"] == "failed"
+    assert failed["chunks_completed"] == 2
+    assert failed["error"] == "disk full"
+
+    # A fresh manager (as after a restart) reloads the manifest and resumes.
+    restarted = ExportJobManager(export_dir, db_path=db_path)
+    assert restarted.resume(job_id) is not None
+    restarted.wait(job_id, timeout=10)
+    finished = restarted.get(job_id)
+    assert finished is not None
+    assert finished["status"] == "completed"
+    assert finished["names_written"] == 35
+    assert Path(finished["output_path"]).read_bytes() == expected
+    assert restarted.resume(job_id) is None
+
+    manifest = json.loads((export_dir / f"{job_id}.json").read_text(encoding="utf-8"))
+    assert manifest["bytes_written"] == len(expected)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="job locks use flock")
+def test_export_job_owned_by_another_manager_is_not_interrupted(tmp_path: Path) -> None:
+    """Another worker reports a live job as running and refuses to resume it."""
+    db_path = tmp_path / "export.sqlite3"
+    clear_generation_candidate_cache()
+    package_id = _import_package(tmp_path, db_path)
+    spec = _parse_export_job_request(
+        {
+            "class_key": "first_name",
+            "package_id": package_id,
+            "syllable_key": "2syl",
+            "generation_count": 20,
+            "seed": 7,
+            "chunk_size": 5,
+        }
+    )
+    rendering = threading.Event()
+    release = threading.Event()
+
+    def blocking_render(names: Sequence[str], style: str) -> list[str]:
+        rendering.set()
+        release.wait(timeout=5)
+        return render_names(names, style)
+
+    export_dir = tmp_path / "exports"
+    owner = ExportJobManager(export_dir, db_path=db_path, render_values=blocking_render)
+    job_id = owner.submit(spec)["job_id"]
+    assert rendering.wait(timeout=5)
+
+    # A second manager on the same directory stands in for another worker.
+    other = ExportJobManager(export_dir, db_path=db_path)
+    running = other.get(job_id)
+    assert running is not None
+    assert running["status"] == "running"
+    assert other.resume(job_id) is None
+
+    release.set()
+    owner.wait(job_id, timeout=10)
+    finished = other.get(job_id)
+    assert finished is not None
+    assert finished["status"] == "completed"
+    assert finished["names_written"] == 20
+
+    # Once no process holds the lock, a job left "running" was interrupted.
+    manifest_path = export_dir / f"{job_id}.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest_path.write_text(json.dumps({**manifest, "status": "running"}), encoding="utf-8")
+    stale = other.get(job_id)
+    assert stale is not None
+    assert stale["status"] == "interrupted"
@@ -5,7 +5,9 @@ from __future__ import annotations
 import json
 import sqlite3
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+import pytest
 
 from pipeworks_name_generation.webapp import endpoint_adapters as endpoint_adapters_module
 from pipeworks_name_generation.webapp.db import connect_database
@@ -13,10 +15,13 @@ from pipeworks_name_generation.webapp.favorites import (
     delete_favorite,
     export_favorites,
     insert_favorites,
+    insert_favorites_bulk,
+    iter_favorites,
     list_favorites,
     list_tags,
     update_favorite,
 )
+from pipeworks_name_generation.webapp.favorites import repositories as repositories_module
 from pipeworks_name_generation.webapp.favorites.schema import initialize_favorites_schema
 from pipeworks_name_generation.webapp.http import _parse_optional_int
 from pipeworks_name_generation.webapp.routes import favorites as favorites_routes
@@ -30,11 +35,24 @@ class _FavoritesHandlerStub:
         self._body = body or {}
         self.payload: dict[str, Any] | None = None
         self.status: int | None = None
+        self.stream_body: bytes | None = None
+        self.content_type: str | None = None
 
     def _send_json(self, payload: dict[str, Any], status: int = 200) -> None:
         self.payload = payload
         self.status = status
 
+    def _send_stream(
+        self,
+        chunks: Iterable[bytes],
+        status: int = 200,
+        content_type: str = "application/octet-stream",
+        headers: Any = None,
+    ) -> None:
+        self.stream_body = b"".join(chunks)
+        self.status = status
+        self.content_type = content_type
+
     def _read_json_body(self) -> dict[str, Any]:
         return self._body
 
@@ -571,6 +589,209 @@ def test_update_favorite_missing_returns_none(tmp_path: Path) -> None:
         assert result is None
 
 
+def test_favorites_fts_prefix_search_ranking_and_sync(tmp_path: Path) -> None:
+    """Name/note search should use prefix FTS, rank matches, and follow edits."""
+    db_path = tmp_path / "favorites.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_favorites_schema(conn)
+        inserted = insert_favorites(
+            conn,
+            [
+                {**_sample_entry("Bryn"), "tags": ["b", "a"]},
+                {**_sample_entry("Bryndle"), "note_md": "a distant cousin from the hills"},
+                {**_sample_entry("Corin"), "note_md": "river **folk**"},
+            ]
+            + [_sample_entry(f"Filler{index}") for index in range(5)],
+        )
+
+        searched, total = list_favorites(conn, limit=10, offset=0, name_query="bry")
+        assert total == 2
+        # Same created_at, so recency alone would list the newer "Bryndle" first.
+        assert [entry["name"] for entry in searched] == ["Bryn", "Bryndle"]
+        assert searched[0]["tags"] == ["b", "a"]
+
+        notes, _ = list_favorites(conn, limit=10, offset=0, name_query="FOLK riv")
+        assert [entry["name"] for entry in notes] == ["Corin"]
+
+        page, total = list_favorites(conn, limit=3, offset=3)
+        assert total == 8 and len(page) == 3
+        past_end, total = list_favorites(conn, limit=3, offset=30, name_query="filler")
+        assert past_end == [] and total == 5
+
+        corin_id = inserted[2]["id"]
+        update_favorite(conn, favorite_id=corin_id, note_md="mountain", gender=None, tags=[])
+        assert list_favorites(conn, limit=10, offset=0, name_query="river")[1] == 0
+        assert list_favorites(conn, limit=10, offset=0, name_query="mount")[1] == 1
+        delete_favorite(conn, corin_id)
+        assert list_favorites(conn, limit=10, offset=0, name_query="mount")[1] == 0
+
+        punctuation_only, total = list_favorites(conn, limit=10, offset=0, name_query="'")
+        assert punctuation_only == [] and total == 0
+
+
+def test_favorites_fts_index_is_built_for_existing_rows(tmp_path: Path) -> None:
+    """Databases created before the FTS index should be searchable after upgrade."""
+    db_path = tmp_path / "favorites.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_favorites_schema(conn)
+        insert_favorites(conn, [_sample_entry("Alma")])
+        conn.executescript("""
+            DROP TRIGGER favorites_fts_insert;
+            DROP TRIGGER favorites_fts_delete;
+            DROP TRIGGER favorites_fts_update;
+            DROP TABLE favorites_fts;
+            """)
+        insert_favorites(conn, [_sample_entry("Almeric")])
+
+        initialize_favorites_schema(conn)
+        searched, total = list_favorites(conn, limit=10, offset=0, name_query="alm")
+    assert total == 2
+    assert {entry["name"] for entry in searched} == {"Alma", "Almeric"}
+
+
+def test_favorites_fts_index_is_repaired_when_incomplete(tmp_path: Path) -> None:
+    """An FTS index that lost documents should be rebuilt on the next start."""
+    db_path = tmp_path / "favorites.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_favorites_schema(conn)
+        insert_favorites(conn, [_sample_entry("Alma"), _sample_entry("Almeric")])
+        # Triggers in place but documents missing, as after an interrupted setup.
+        conn.execute("INSERT INTO favorites_fts(favorites_fts) VALUES ('delete-all')")
+        conn.commit()
+
+        initialize_favorites_schema(conn)
+        assert not conn.in_transaction
+        searched, total = list_favorites(conn, limit=10, offset=0, name_query="alm")
+    assert total == 2
+    assert {entry["name"] for entry in searched} == {"Alma", "Almeric"}
+
+
+def test_list_favorites_loads_tags_in_bounded_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tag lookups should split favorite ids into bounded ``IN`` lists."""
+    monkeypatch.setattr(repositories_module, "_SQL_VARIABLE_BATCH", 2)
+    db_path = tmp_path / "favorites.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_favorites_schema(conn)
+        created = insert_favorites(
+            conn,
+            [{**_sample_entry(f"Name{index}"), "tags": [f"t{index}"]} for index in range(5)],
+        )
+        assert [entry["id"] for entry in created] == [1, 2, 3, 4, 5]
+        listed, total = list_favorites(conn, limit=10, offset=0)
+    assert total == 5
+    assert {entry["name"]: entry["tags"] for entry in listed} == {
+        f"Name{index}": [f"t{index}"] for index in range(5)
+    }
+
+
+def test_insert_favorites_bulk_batches_and_rolls_back(tmp_path: Path) -> None:
+    """Bulk inserts should batch tag links and roll back the whole stream on error."""
+    db_path = tmp_path / "favorites.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_favorites_schema(conn)
+        insert_favorites(conn, [_sample_entry("Existing")])
+        conn.execute("DELETE FROM favorites")
+        conn.commit()
+
+        entries = (
+            {**_sample_entry(f"Name{index}"), "tags": ["Shared", f"t{index % 3}", "shared"]}
+            for index in range(7)
+        )
+        assert insert_favorites_bulk(conn, entries, batch_size=3) == 7
+
+        exported = list(iter_favorites(conn, batch_size=2))
+        assert [entry["name"] for entry in exported] == [f"Name{index}" for index in range(7)]
+        # AUTOINCREMENT never reuses the deleted id.
+        assert exported[0]["id"] == 2
+        assert exported[4]["tags"] == ["Shared", "t1"]
+        assert set(list_tags(conn)) == {"Shared", "t0", "t1", "t2"}
+
+        def _bad_stream() -> Iterable[dict[str, Any]]:
+            yield from (_sample_entry(f"Later{index}") for index in range(4))
+            yield {**_sample_entry("x"), "name": " "}
+
+        try:
+            insert_favorites_bulk(conn, _bad_stream(), batch_size=2)
+        except ValueError as exc:
+            assert "name is required" in str(exc)
+        else:  # pragma: no cover - the stream above must fail
+            raise AssertionError("expected ValueError")
+        assert conn.execute("SELECT COUNT(*) FROM favorites").fetchone()[0] == 7
+        assert list_favorites(conn, limit=5, offset=0, name_query="later")[1] == 0
+
+
+def test_favorites_ndjson_export_and_import_routes(tmp_path: Path) -> None:
+    """NDJSON export should stream one favorite per line and re-import in bulk."""
+    db_path = tmp_path / "favorites.sqlite3"
+    with connect_database(db_path) as conn:
+        initialize_favorites_schema(conn)
+        insert_favorites(
+            conn, [{**_sample_entry(f"Name{index}"), "tags": ["a"]} for index in range(3)]
+        )
+
+    stream_handler = _FavoritesHandlerStub(db_path)
+    favorites_routes.get_favorites_export(
+        stream_handler,
+        {"format": ["ndjson"]},
+        connect_database=connect_database,
+        initialize_schema=initialize_favorites_schema,
+        export_favorites=export_favorites,
+        iter_favorites=iter_favorites,
+    )
+    assert stream_handler.content_type == "application/x-ndjson"
+    lines = (stream_handler.stream_body or b"").decode("utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["Name0", "Name1", "Name2"]
+
+    bad_format = _FavoritesHandlerStub(db_path)
+    favorites_routes.get_favorites_export(
+        bad_format,
+        {"format": ["xml"]},
+        connect_database=connect_database,
+        initialize_schema=initialize_favorites_schema,
+        export_favorites=export_favorites,
+    )
+    assert bad_format.status == 400
+
+    export_path = tmp_path / "out" / "favorites.ndjson"
+    write_handler = _FavoritesHandlerStub(db_path, body={"output_path": str(export_path)})
+    favorites_routes.post_favorites_export(
+        write_handler,
+        connect_database=connect_database,
+        initialize_schema=initialize_favorites_schema,
+        export_favorites=export_favorites,
+        iter_favorites=iter_favorites,
+    )
+    assert write_handler.payload == {"path": str(export_path), "format": "ndjson"}
+    assert export_path.read_bytes() == stream_handler.stream_body
+
+    import_handler = _FavoritesHandlerStub(db_path, body={"import_path": str(export_path)})
+    favorites_routes.post_favorites_import(
+        import_handler,
+        connect_database=connect_database,
+        initialize_schema=initialize_favorites_schema,
+        insert_favorites=insert_favorites,
+        insert_favorites_bulk=insert_favorites_bulk,
+    )
+    assert import_handler.payload == {"count": 3}
+
+    broken = tmp_path / "broken.jsonl"
+    broken.write_text(lines[0] + "\n\n{oops\n", encoding="utf-8")
+    broken_handler = _FavoritesHandlerStub(db_path, body={"import_path": str(broken)})
+    favorites_routes.post_favorites_import(
+        broken_handler,
+        connect_database=connect_database,
+        initialize_schema=initialize_favorites_schema,
+        insert_favorites=insert_favorites,
+        insert_favorites_bulk=insert_favorites_bulk,
+    )
+    assert broken_handler.status == 400
+    assert "line 3" in (broken_handler.payload or {})["error"]
+    with connect_database(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM favorites").fetchone()[0] == 6
+
+
 def test_endpoint_adapters_favorites_round_trip(tmp_path: Path) -> None:
     """Endpoint adapters should delegate favorites requests."""
     db_path = tmp_path / "favorites.sqlite3"
@@ -6,7 +6,9 @@ import pytest
 
 from pipeworks_name_generation.webapp.frontend.assets import (
     get_index_html,
+    get_static_asset_cache_stats,
     get_static_text_asset,
+    prepare_asset,
 )
 
 
@@ -30,3 +32,17 @@ def test_static_assets_load_known_files_and_reject_unknown() -> None:
 
     with pytest.raises(FileNotFoundError):
         get_static_text_asset("missing.css")
+
+
+def test_prepared_asset_cache_tracks_bytes() -> None:
+    """Prepared asset stats should report real sizes for identity and gzip bodies."""
+    content, content_type = get_static_text_asset("app.css")
+    prepared = prepare_asset(content, content_type)
+    before = get_static_asset_cache_stats()
+    assert prepare_asset(content, content_type) is prepared
+
+    stats = get_static_asset_cache_stats()
+    assert stats.hits == before.hits + 1
+    assert stats.total_bytes >= len(prepared.identity) + len(prepared.gzipped or b"")
+    assert 0 < stats.total_bytes <= stats.max_bytes
+    assert stats.evictions == 0
@@ -1,16 +1,47 @@
-"""Unit tests for generation package option caching."""
+"""Unit tests for generation package option and candidate pool caching."""
 
 from __future__ import annotations
 
+import dataclasses
+import zipfile
 from pathlib import Path
+from typing import TypedDict
 
-from pipeworks_name_generation.webapp.db import connect_database, initialize_schema
+import pytest
+
+from pipeworks_name_generation.webapp import generation as generation_module
+from pipeworks_name_generation.webapp.cache import ByteBoundedLRUCache, ChangeStampedCache
+from pipeworks_name_generation.webapp.db import (
+    bump_database_change_stamp,
+    connect_database,
+    get_database_change_stamp,
+    import_package_pair,
+    initialize_schema,
+)
 from pipeworks_name_generation.webapp.generation import (
+    GenerationCandidatePool,
+    IndexedCandidateSource,
+    _collect_generation_source_values,
+    _iter_generation_values,
+    _sample_generation_values,
+    clear_generation_candidate_cache,
     clear_generation_package_options_cache,
+    get_cached_generation_candidate_pool,
     get_cached_generation_package_options,
+    get_generation_candidate_cache_stats,
+    get_generation_candidate_source,
+    invalidate_generation_caches,
 )
 
 
+class _GenerationScope(TypedDict):
+    """Keyword arguments selecting one generation scope."""
+
+    class_key: str
+    package_id: int
+    syllable_key: str
+
+
 def _insert_package_with_table(
     conn,
     *,
@@ -47,10 +78,11 @@ def _insert_package_with_table(
     return package_id
 
 
-def test_generation_package_options_cache_invalidation(tmp_path: Path) -> None:
-    """Cache should hold until explicit invalidation per db path."""
+def test_generation_package_options_cache_follows_change_stamp(tmp_path: Path) -> None:
+    """Cache should refresh when any connection writes package metadata."""
     db_path = tmp_path / "cache.sqlite3"
-    with connect_database(db_path) as conn:
+    clear_generation_package_options_cache()
+    with connect_database(db_path) as conn, connect_database(db_path) as other_conn:
         initialize_schema(conn)
         _insert_package_with_table(
             conn,
@@ -64,9 +96,12 @@ def test_generation_package_options_cache_invalidation(tmp_path: Path) -> None:
 
         first_payload = get_cached_generation_package_options(conn, db_path=db_path)
         first_total = sum(len(entry["packages"]) for entry in first_payload)
+        assert get_cached_generation_package_options(conn, db_path=db_path) is first_payload
 
+        # A second connection stands in for another server process or importer.
+        stamp = get_database_change_stamp(conn)
         _insert_package_with_table(
-            conn,
+            other_conn,
             name="Package B",
             metadata_path="b.json",
             zip_path="b.zip",
@@ -74,14 +109,289 @@ def test_generation_package_options_cache_invalidation(tmp_path: Path) -> None:
             table_name="pkg_b",
             row_count=2,
         )
+        new_stamp = get_database_change_stamp(conn)
+        assert stamp is not None and new_stamp is not None
+        assert new_stamp > stamp
 
-        cached_payload = get_cached_generation_package_options(conn, db_path=db_path)
-        cached_total = sum(len(entry["packages"]) for entry in cached_payload)
-        assert cached_total == first_total
-
-        clear_generation_package_options_cache(db_path)
         refreshed_payload = get_cached_generation_package_options(conn, db_path=db_path)
         refreshed_total = sum(len(entry["packages"]) for entry in refreshed_payload)
         assert refreshed_total == first_total + 1
 
+        clear_generation_package_options_cache(db_path)
+        assert get_cached_generation_package_options(conn, db_path=db_path) == refreshed_payload
+
         clear_generation_package_options_cache()
+
+
+def _insert_text_values(conn, table_name: str, values: list[str]) -> None:
+    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+    conn.execute(
+        f"CREATE TABLE {table_name} ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, line_number INTEGER NOT NULL, value TEXT NOT NULL)"
+    )
+    conn.executemany(
+        f"INSERT INTO {table_name} (line_number, value) VALUES (?, ?)",
+        list(enumerate(values, start=1)),
+    )
+    conn.commit()
+
+
+def test_candidate_pool_cache_hits_and_invalidation(tmp_path: Path) -> None:
+    """Candidate pools should be reused until the DB's caches are invalidated."""
+    db_path = tmp_path / "pool.sqlite3"
+    clear_generation_candidate_cache()
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+        package_id = _insert_package_with_table(
+            conn,
+            name="Pool Package",
+            metadata_path="p.json",
+            zip_path="p.zip",
+            source_txt="nltk_first_name_2syl.txt",
+            table_name="pool_t1",
+            row_count=3,
+        )
+        _insert_text_values(conn, "pool_t1", ["alfa", "beta", "alfa"])
+
+        before = get_generation_candidate_cache_stats()
+        scope: _GenerationScope = {
+            "class_key": "first_name",
+            "package_id": package_id,
+            "syllable_key": "2syl",
+        }
+        first = get_cached_generation_candidate_pool(conn, db_path=db_path, **scope)
+        second = get_cached_generation_candidate_pool(conn, db_path=db_path, **scope)
+        after = get_generation_candidate_cache_stats()
+
+        assert first is second
+        assert first.values == ("alfa", "beta", "alfa")
+        assert first.unique_values == ("alfa", "beta")
+        assert after.misses == before.misses + 1
+        assert after.hits == before.hits + 1
+
+        # Raw value writes bypass the tracked metadata tables.
+        _insert_text_values(conn, "pool_t1", ["gamma"])
+        assert get_cached_generation_candidate_pool(conn, db_path=db_path, **scope) is first
+
+        invalidate_generation_caches(db_path)
+        refreshed = get_cached_generation_candidate_pool(conn, db_path=db_path, **scope)
+        assert refreshed.values == ("gamma",)
+
+        _insert_text_values(conn, "pool_t1", ["delta"])
+        bump_database_change_stamp(conn)
+        conn.commit()
+        assert get_cached_generation_candidate_pool(conn, db_path=db_path, **scope).values == (
+            "delta",
+        )
+
+    clear_generation_candidate_cache()
+
+
+def test_candidate_pool_sampling_matches_plain_values() -> None:
+    """Sampling from a prepared pool should match sampling the raw value list."""
+    values = ["alfa", "beta", "beta", "gamma", "delta", "alfa"]
+    pool = GenerationCandidatePool.from_values(values)
+
+    for unique_only in (False, True):
+        for count in (1, 3, 10):
+            assert _sample_generation_values(
+                pool, count=count, seed=11, unique_only=unique_only
+            ) == _sample_generation_values(values, count=count, seed=11, unique_only=unique_only)
+
+
+def test_byte_bounded_lru_cache_evicts_by_size_and_count() -> None:
+    """LRU cache should honor both entry and byte limits."""
+    cache: ByteBoundedLRUCache[str, str] = ByteBoundedLRUCache(max_entries=3, max_bytes=100)
+    cache.put("a", "A", nbytes=40)
+    cache.put("b", "B", nbytes=40)
+    assert cache.get("a") == "A"
+
+    # Inserting "c" exceeds max_bytes, so least-recently-used "b" is dropped.
+    cache.put("c", "C", nbytes=40)
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+    assert cache.put("huge", "H", nbytes=101) is False
+    assert cache.get("huge") is None
+
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.total_bytes == 80
+    assert stats.evictions == 1
+    assert stats.hits == 3
+    assert stats.misses == 2
+
+    assert cache.invalidate(lambda key: key == "a") == 1
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.stats().total_bytes == 0
+
+
+def test_change_stamped_cache_drops_entries_when_stamp_moves() -> None:
+    """Stamped entries should be served only under the stamp they were built for."""
+    cache: ChangeStampedCache[str, str] = ChangeStampedCache(max_entries=4, max_bytes=100)
+    assert cache.put("db1", "a", "A1", stamp=1, nbytes=10) is True
+    cache.put("db2", "a", "B1", stamp=7, nbytes=10)
+    assert cache.get("db1", "a", stamp=1) == "A1"
+
+    # A newer stamp empties db1 only; a result computed under the old stamp
+    # afterwards is rejected instead of replacing fresher data.
+    assert cache.get("db1", "a", stamp=2) is None
+    assert cache.put("db1", "a", "stale", stamp=1, nbytes=10) is False
+    assert cache.get("db2", "a", stamp=7) == "B1"
+    assert cache.put("db1", "a", "A2", stamp=2, nbytes=10) is True
+    assert cache.get("db1", "a", stamp=2) == "A2"
+
+    assert cache.invalidate("db1") == 1
+    assert len(cache) == 1
+    assert cache.invalidate() == 1
+    assert cache.stats().entries == 0
+
+
+def _import_large_package(tmp_path: Path, conn, *, storage_layout: str) -> int:
+    metadata_path = tmp_path / "large_metadata.json"
+    zip_path = tmp_path / "large.zip"
+    metadata_path.write_text('{"common_name": "Large"}', encoding="utf-8")
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr(
+            "nltk_first_name_2syl.txt", "\n".join(f"name{i % 250}" for i in range(300))
+        )
+        archive.writestr(
+            "nltk_first_name_2syl_extra.txt", "\n".join(f"extra{i}" for i in range(200))
+        )
+    result = import_package_pair(
+        conn, metadata_path=metadata_path, zip_path=zip_path, storage_layout=storage_layout
+    )
+    return int(result["package_id"])
+
+
+@pytest.mark.parametrize("storage_layout", ["table", "values"])
+def test_indexed_candidate_source_matches_in_memory_sampling(
+    tmp_path: Path, storage_layout: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Indexed sampling should reproduce in-memory draws without loading the pool."""
+    db_path = tmp_path / "indexed.sqlite3"
+    clear_generation_candidate_cache()
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+        package_id = _import_large_package(tmp_path, conn, storage_layout=storage_layout)
+        scope: _GenerationScope = {
+            "class_key": "first_name",
+            "package_id": package_id,
+            "syllable_key": "2syl",
+        }
+
+        source = get_generation_candidate_source(conn, db_path=db_path, min_indexed_rows=1, **scope)
+        assert isinstance(source, IndexedCandidateSource)
+        assert len(source) == 500
+
+        values = _collect_generation_source_values(conn, **scope)
+        for seed in (1, 2, 99):
+            expected = _sample_generation_values(values, count=40, seed=seed, unique_only=False)
+            assert (
+                _sample_generation_values(source, count=40, seed=seed, unique_only=False)
+                == expected
+            )
+            chunks = list(
+                _iter_generation_values(
+                    source, count=40, seed=seed, unique_only=False, chunk_size=7
+                )
+            )
+            assert [name for chunk in chunks for name in chunk] == expected
+        assert get_generation_candidate_cache_stats().entries == 0
+
+        # 100 of 450 distinct values is too large a share for rejection
+        # sampling, so this unique draw shuffles the deduplicated pool exactly
+        # as in-memory sampling would.
+        unique = _sample_generation_values(source, count=100, seed=5, unique_only=True)
+        assert unique == _sample_generation_values(values, count=100, seed=5, unique_only=True)
+        assert len(set(unique)) == 100
+        assert get_generation_candidate_cache_stats().entries == 1
+
+        clear_generation_candidate_cache()
+        small = get_generation_candidate_source(conn, db_path=db_path, **scope)
+        assert isinstance(small, GenerationCandidatePool)
+
+        # A cached pool answers without listing the matching tables again.
+        def fail_listing(*_args: object, **_kwargs: object) -> None:
+            raise AssertionError("matching tables listed despite a cached pool")
+
+        monkeypatch.setattr(generation_module, "_list_generation_matching_tables", fail_listing)
+        cached = get_generation_candidate_source(conn, db_path=db_path, min_indexed_rows=1, **scope)
+        assert cached is small
+    clear_generation_candidate_cache()
+
+
+def test_indexed_unique_draw_does_not_load_pool(tmp_path: Path) -> None:
+    """Small unique draws from a large scope should use row lookups only."""
+    db_path = tmp_path / "unique.sqlite3"
+    metadata_path = tmp_path / "unique_metadata.json"
+    zip_path = tmp_path / "unique.zip"
+    metadata_path.write_text('{"common_name": "Unique"}', encoding="utf-8")
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr(
+            "nltk_first_name_2syl.txt", "\n".join(f"name{i % 60000}" for i in range(120000))
+        )
+    clear_generation_candidate_cache()
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+        result = import_package_pair(
+            conn, metadata_path=metadata_path, zip_path=zip_path, storage_layout="values"
+        )
+        scope: _GenerationScope = {
+            "class_key": "first_name",
+            "package_id": int(result["package_id"]),
+            "syllable_key": "2syl",
+        }
+        source = get_generation_candidate_source(conn, db_path=db_path, **scope)
+        assert isinstance(source, IndexedCandidateSource)
+        assert source.distinct_count == 60000
+
+        def fail_load_pool() -> GenerationCandidatePool:
+            raise AssertionError("unique draw loaded the candidate pool")
+
+        source = dataclasses.replace(source, load_pool=fail_load_pool)
+        unique = _sample_generation_values(source, count=25, seed=11, unique_only=True)
+        assert len(set(unique)) == 25
+
+        values = _collect_generation_source_values(conn, **scope)
+        assert unique == _sample_generation_values(values, count=25, seed=11, unique_only=True)
+        assert get_generation_candidate_cache_stats().entries == 0
+    clear_generation_candidate_cache()
+
+
+def test_indexed_candidate_source_skips_blank_rows(tmp_path: Path) -> None:
+    """Indexed draws should drop blank values like the in-memory loader does."""
+    db_path = tmp_path / "blank.sqlite3"
+    clear_generation_candidate_cache()
+    with connect_database(db_path) as conn:
+        initialize_schema(conn)
+        package_id = _insert_package_with_table(
+            conn,
+            name="Blank Package",
+            metadata_path="b.json",
+            zip_path="b.zip",
+            source_txt="nltk_first_name_2syl.txt",
+            table_name="blank_t1",
+            row_count=4,
+        )
+        _insert_text_values(conn, "blank_t1", ["alfa", " ", "beta", ""])
+        scope: _GenerationScope = {
+            "class_key": "first_name",
+            "package_id": package_id,
+            "syllable_key": "2syl",
+        }
+
+        source = get_generation_candidate_source(conn, db_path=db_path, min_indexed_rows=1, **scope)
+        assert isinstance(source, IndexedCandidateSource)
+        assert source.fetch([3, 0, 1, 2]) == ["alfa", "beta"]
+        names = _sample_generation_values(source, count=50, seed=3, unique_only=False)
+        assert len(names) == 50
+        assert set(names) == {"alfa", "beta"}
+
+        _insert_text_values(conn, "blank_t1", ["", " ", "\t", ""])
+        blank = get_generation_candidate_source(conn, db_path=db_path, min_indexed_rows=1, **scope)
+        with pytest.raises(ValueError, match="No candidate values"):
+            _sample_generation_values(blank, count=5, seed=3, unique_only=False)
+    clear_generation_candidate_cache()
@@ -0,0 +1,152 @@
+"""Unit tests for HTTP compression, ETag, and cache-header helpers."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pipeworks_name_generation.webapp.config import load_server_settings
+from pipeworks_name_generation.webapp.frontend import get_static_text_asset, prepare_asset
+from pipeworks_name_generation.webapp.http import send_chunked, send_json, send_prepared
+from pipeworks_name_generation.webapp.http.caching import (
+    accepts_gzip,
+    cache_control_for,
+    etag_matches,
+    prepare_body,
+)
+
+
+class _Handler:
+    """Minimal ``BaseHTTPRequestHandler`` stand-in capturing the response."""
+
+    def __init__(self, path: str, *, command: str = "GET", **headers: str) -> None:
+        self.path = path
+        self.command = command
+        self.request_version = "HTTP/1.0"
+        self.headers = {name.replace("_", "-"): value for name, value in headers.items()}
+        self.wfile = io.BytesIO()
+        self.status = 0
+        self.response_headers: dict[str, str] = {}
+
+    def send_response(self, status: int) -> None:
+        self.status = status
+
+    def send_header(self, name: str, value: str) -> None:
+        self.response_headers[name] = value
+
+    def end_headers(self) -> None:
+        pass
+
+
+def test_accepts_gzip_honours_quality_values() -> None:
+    """gzip is accepted explicitly or via ``*`` unless its quality is zero."""
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip("gzip;q=0, *")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+
+def test_etag_matching_and_route_families() -> None:
+    """If-None-Match lists and weak validators match; families pick policies."""
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"a"', '"b"')
+    assert cache_control_for("/static/fonts/x.woff2") == "public, max-age=86400"
+    assert cache_control_for("/api/help?x=1", {"api": "no-store"}) == "no-store"
+
+
+def test_send_prepared_negotiates_gzip_and_returns_304() -> None:
+    """Static assets are sent gzip-encoded and revalidate to an empty 304."""
+    content, content_type = get_static_text_asset("app.js")
+    body = prepare_asset(content, content_type)
+    assert prepare_asset(content, content_type) is body
+    assert body.gzipped is not None
+
+    first = _Handler("/static/app.js", Accept_Encoding="gzip")
+    send_prepared(first, body, content_type=content_type)
+    assert first.status == 200
+    assert first.response_headers["Content-Encoding"] == "gzip"
+    assert first.response_headers["Vary"] == "Accept-Encoding"
+    assert first.response_headers["Cache-Control"] == "no-cache"
+    assert gzip.decompress(first.wfile.getvalue()).decode("utf-8") == content
+
+    etag = first.response_headers["ETag"]
+    assert etag != body.etag
+    revalidate = _Handler("/static/app.js", Accept_Encoding="gzip", If_None_Match=etag)
+    send_prepared(revalidate, body, content_type=content_type)
+    assert revalidate.status == 304
+    assert revalidate.wfile.getvalue() == b""
+
+    # The identity representation has its own validator.
+    identity = _Handler("/static/app.js", If_None_Match=etag)
+    send_prepared(identity, body, content_type=content_type)
+    assert identity.status == 200
+    assert identity.wfile.getvalue().decode("utf-8") == content
+
+
+def test_send_prepared_if_modified_since() -> None:
+    """Without If-None-Match, Last-Modified validation yields a 304."""
+    body = prepare_body(b"x" * 10, "font/woff2", last_modified=1_700_000_000)
+    assert body.last_modified is not None
+    handler = _Handler("/static/fonts/a.woff2", If_Modified_Since=body.last_modified)
+    send_prepared(handler, body, content_type="font/woff2")
+    assert handler.status == 304
+
+
+def test_json_responses_compress_and_validate() -> None:
+    """Large JSON is gzip-encoded; GET responses carry ETags, POST ones do not."""
+    payload: dict[str, Any] = {"names": [f"name-{index}" for index in range(500)]}
+
+    post = _Handler("/api/generate", command="POST", Accept_Encoding="gzip")
+    send_json(post, payload)
+    assert post.response_headers["Content-Encoding"] == "gzip"
+    assert "ETag" not in post.response_headers
+    assert json.loads(gzip.decompress(post.wfile.getvalue())) == payload
+
+    get = _Handler("/api/favorites", Accept_Encoding="gzip")
+    send_json(get, payload)
+    etag = get.response_headers["ETag"]
+    repeat = _Handler("/api/favorites", Accept_Encoding="gzip", If_None_Match=etag)
+    send_json(repeat, payload)
+    assert repeat.status == 304
+
+    small = _Handler("/api/health", command="POST", Accept_Encoding="gzip")
+    send_json(small, {"ok": True})
+    assert "Content-Encoding" not in small.response_headers
+
+    disabled = _Handler("/api/generate", command="POST", Accept_Encoding="gzip")
+    disabled.compression_enabled = False  # type: ignore[attr-defined]
+    send_json(disabled, payload)
+    assert "Content-Encoding" not in disabled.response_headers
+
+
+def test_send_chunked_streams_gzip() -> None:
+    """Compressible streams are gzip-encoded incrementally."""
+    handler = _Handler("/api/generate", command="POST", Accept_Encoding="gzip")
+    chunks = [f'{{"name": "n{index}"}}\n'.encode("utf-8") for index in range(100)]
+    send_chunked(handler, iter(chunks), content_type="application/x-ndjson")
+    assert handler.response_headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(handler.wfile.getvalue()) == b"".join(chunks)
+
+
+def test_cache_section_configures_route_families(tmp_path: Path) -> None:
+    """The ``[cache]`` INI section overrides defaults and rejects unknown families."""
+    ini_path = tmp_path / "server.ini"
+    ini_path.write_text(
+        "[server]\ncompression = false\n[cache]\nstatic = public, max-age=60\n",
+        encoding="utf-8",
+    )
+    settings = load_server_settings(ini_path)
+    assert settings.compression is False
+    assert settings.cache_control["static"] == "public, max-age=60"
+    assert settings.cache_control["api"] == "no-cache"
+
+    ini_path.write_text("[cache]\nimages = no-store\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Unknown cache route family"):
+        load_server_settings(ini_path)
@@ -0,0 +1,374 @@
+"""Tests for background package import jobs."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pipeworks_name_generation.webapp import endpoint_adapters
+from pipeworks_name_generation.webapp.db import (
+    ImportProgress,
+    connect_database,
+    import_package_pair,
+    initialize_schema,
+    list_packages,
+)
+from pipeworks_name_generation.webapp.import_jobs import (
+    ImportJobManager,
+    _parse_import_job_request,
+    close_import_job_managers,
+)
+from tests.test_pipeworks_webapp_server import _HandlerHarness
+
+
+def _write_package(tmp_path: Path, *, entries: int = 3) -> tuple[Path, Path]:
+    metadata_path = tmp_path / "jobs_metadata.json"
+    zip_path = tmp_path / "jobs.zip"
+    metadata_path.write_text('{"common_name": "Jobs"}', encoding="utf-8")
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for index in range(entries):
+            archive.writestr(
+                f"nltk_first_name_{index + 1}syl.txt",
+                "\n".join(f"name{index}_{row}" for row in range(20)),
+            )
+    return metadata_path, zip_path
+
+
+def _initialized_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "jobs.sqlite3"
+    conn = connect_database(db_path)
+    try:
+        initialize_schema(conn)
+    finally:
+        conn.close()
+    return db_path
+
+
+def _package_count(db_path: Path) -> int:
+    conn = connect_database(db_path)
+    try:
+        return len(list_packages(conn))
+    finally:
+        conn.close()
+
+
+def test_import_package_pair_reports_progress(tmp_path: Path) -> None:
+    """The importer reports one snapshot up front and one per entry."""
+    metadata_path, zip_path = _write_package(tmp_path)
+    snapshots: list[ImportProgress] = []
+    conn = connect_database(_initialized_db(tmp_path))
+    try:
+        import_package_pair(
+            conn, metadata_path=metadata_path, zip_path=zip_path, on_progress=snapshots.append
+        )
+    finally:
+        conn.close()
+
+    assert [snapshot.entries_processed for snapshot in snapshots] == [0, 1, 2, 3]
+    final = snapshots[-1]
+    assert final.entries_total == 3
+    assert final.rows_inserted == 60
+    assert final.bytes_read == final.bytes_total > 0
+
+
+def test_import_job_completes_and_invalidates(tmp_path: Path) -> None:
+    """A job reports progress, stores the summary, and runs ``on_success``."""
+    metadata_path, zip_path = _write_package(tmp_path)
+    db_path = _initialized_db(tmp_path)
+    invalidated: list[bool] = []
+    manager = ImportJobManager(db_path, on_success=lambda: invalidated.append(True))
+    spec = _parse_import_job_request(
+        {"metadata_json_path": str(metadata_path), "package_zip_path": str(zip_path)},
+        storage_layout="values",
+    )
+    job = manager.submit(spec)
+    manager.wait(job["job_id"], timeout=10)
+
+    status = manager.get(job["job_id"])
+    assert status is not None
+    assert status["status"] == "completed"
+    assert status["entries_processed"] == status["entries_total"] == 3
+    assert status["rows_inserted"] == 60
+    assert status["progress"] == 1.0
+    assert status["result"]["package_name"] == "Jobs"
+    assert invalidated == [True]
+    assert manager.cancel(job["job_id"]) is None
+
+    duplicate = manager.submit(spec)
+    manager.wait(duplicate["job_id"], timeout=10)
+    failed = manager.get(duplicate["job_id"])
+    assert failed is not None
+    assert failed["status"] == "failed"
+    assert "already been imported" in failed["error"]
+
+
+def test_import_job_cancellation_rolls_back(tmp_path: Path) -> None:
+    """Cancelling mid-import leaves no package behind."""
+    metadata_path, zip_path = _write_package(tmp_path, entries=4)
+    db_path = _initialized_db(tmp_path)
+    reached_entry = threading.Event()
+    resume = threading.Event()
+
+    def slow_import(conn: Any, **kwargs: Any) -> dict[str, Any]:
+        report = kwargs.pop("on_progress")
+
+        def on_progress(progress: ImportProgress) -> None:
+            report(progress)
+            if progress.entries_processed == 1:
+                reached_entry.set()
+                resume.wait(timeout=5)
+
+        return import_package_pair(conn, on_progress=on_progress, **kwargs)
+
+    manager = ImportJobManager(db_path, import_pair=slow_import)
+    spec = _parse_import_job_request(
+        {"metadata_json_path": str(metadata_path), "package_zip_path": str(zip_path)},
+        storage_layout="table",
+    )
+    job = manager.submit(spec)
+    assert reached_entry.wait(timeout=5)
+    running = manager.get(job["job_id"])
+    assert running is not None
+    assert running["status"] == "running"
+    assert running["entries_processed"] == 1
+    # Chunks are committed, so another writer gets the lock without waiting,
+    # while the partial package stays out of listings.
+    probe = connect_database(db_path)
+    try:
+        probe.execute("PRAGMA busy_timeout = 0")
+        probe.execute("BEGIN IMMEDIATE")
+        probe.rollback()
+        assert list_packages(probe) == []
+        assert probe.execute("SELECT COUNT(*) FROM imported_packages").fetchone()[0] == 1
+    finally:
+        probe.close()
+
+    cancelled = manager.cancel(job["job_id"])
+    assert cancelled is not None and cancelled["cancel_requested"] is True
+    resume.set()
+    manager.wait(job["job_id"], timeout=10)
+
+    final = manager.get(job["job_id"])
+    assert final is not None
+    assert final["status"] == "cancelled"
+    assert _package_count(db_path) == 0
+    conn = connect_database(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM imported_packages").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM package_tables").fetchone()[0] == 0
+        leftovers = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name LIKE 'pkg_%'"
+        ).fetchone()[0]
+        assert leftovers == 0
+    finally:
+        conn.close()
+    with pytest.raises(LookupError):
+        manager.cancel("0" * 32)
+
+
+def test_chunked_import_discards_stale_partial_packages(tmp_path: Path) -> None:
+    """A partial package left by a dead process is removed by the next chunked import."""
+    metadata_path, zip_path = _write_package(tmp_path)
+    db_path = _initialized_db(tmp_path)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    conn = connect_database(db_path)
+    try:
+        cursor = conn.execute(
+            """
+            INSERT INTO imported_packages (
+                package_name, imported_at, metadata_json_path, package_zip_path
+            ) VALUES ('Jobs', 'then', ?, ?)
+            """,
+            (str(metadata_path), str(zip_path)),
+        )
+        conn.execute(
+            "INSERT INTO pending_imports (package_id, import_pid) VALUES (?, ?)",
+            (cursor.lastrowid, dead.pid),
+        )
+        conn.commit()
+        assert list_packages(conn) == []
+
+        result = import_package_pair(
+            conn, metadata_path=metadata_path, zip_path=zip_path, commit_chunks=True, chunk_rows=7
+        )
+        packages = list_packages(conn)
+        assert [package["id"] for package in packages] == [result["package_id"]]
+        assert conn.execute("SELECT COUNT(*) FROM imported_packages").fetchone()[0] == 1
+        assert sum(table["row_count"] for table in result["tables"]) == 60
+    finally:
+        conn.close()
+
+
+def test_import_job_state_is_shared_across_managers(tmp_path: Path) -> None:
+    """Another worker reports and cancels a job through the job table."""
+    metadata_path, zip_path = _write_package(tmp_path, entries=4)
+    db_path = _initialized_db(tmp_path)
+    reached_entry = threading.Event()
+    resume = threading.Event()
+
+    def slow_import(conn: Any, **kwargs: Any) -> dict[str, Any]:
+        report = kwargs.pop("on_progress")
+
+        def on_progress(progress: ImportProgress) -> None:
+            report(progress)
+            if progress.entries_processed == 1:
+                reached_entry.set()
+                resume.wait(timeout=5)
+
+        return import_package_pair(conn, on_progress=on_progress, **kwargs)
+
+    owner = ImportJobManager(db_path, import_pair=slow_import, cancel_poll_interval=0)
+    spec = _parse_import_job_request(
+        {"metadata_json_path": str(metadata_path), "package_zip_path": str(zip_path)},
+        storage_layout="values",
+    )
+    job_id = owner.submit(spec)["job_id"]
+    assert reached_entry.wait(timeout=5)
+
+    # A second manager on the same database stands in for another worker.
+    other = ImportJobManager(db_path)
+    running = other.get(job_id)
+    assert running is not None
+    assert running["status"] == "running"
+    assert running["entries_processed"] == 1
+    cancelled = other.cancel(job_id)
+    assert cancelled is not None and cancelled["cancel_requested"] is True
+    resume.set()
+    owner.wait(job_id, timeout=10)
+
+    final = other.get(job_id)
+    assert final is not None
+    assert final["status"] == "cancelled"
+    assert other.cancel(job_id) is None
+    assert _package_count(db_path) == 0
+    with pytest.raises(LookupError):
+        other.cancel("0" * 32)
+
+
+def test_import_job_with_exited_owner_reports_failed(tmp_path: Path) -> None:
+    """A job row left active by a process that exited is reported as failed."""
+    db_path = _initialized_db(tmp_path)
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    job_id = "f" * 32
+    conn = connect_database(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO import_jobs (job_id, owner_pid, status, payload, updated_at)
+            VALUES (?, ?, 'running', ?, 'then')
+            """,
+            (job_id, dead.pid, json.dumps({"job_id": job_id, "cancel_requested": False})),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    manager = ImportJobManager(db_path)
+    status = manager.get(job_id)
+    assert status is not None
+    assert status["status"] == "failed"
+    assert "exited" in status["error"]
+    assert manager.cancel(job_id) is None
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="needs /proc start times")
+def test_import_job_with_reused_owner_pid_reports_failed(tmp_path: Path) -> None:
+    """A live pid with a different start time is not the process that owned the job."""
+    db_path = _initialized_db(tmp_path)
+    job_id = "e" * 32
+    conn = connect_database(db_path)
+    try:
+        conn.execute(
+            """
+            INSERT INTO import_jobs (job_id, owner_pid, owner_started, status, payload, updated_at)
+            VALUES (?, ?, '0', 'running', ?, 'then')
+            """,
+            (job_id, os.getpid(), json.dumps({"job_id": job_id, "cancel_requested": False})),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    status = ImportJobManager(db_path).get(job_id)
+    assert status is not None
+    assert status["status"] == "failed"
+
+
+def test_import_job_reuses_one_state_connection(tmp_path: Path) -> None:
+    """Progress writes and cancel polls share the job thread's connection."""
+    metadata_path, zip_path = _write_package(tmp_path, entries=4)
+    db_path = _initialized_db(tmp_path)
+    opened: list[str] = []
+
+    def counting_connect(path: Path) -> Any:
+        opened.append(threading.current_thread().name)
+        return connect_database(path)
+
+    manager = ImportJobManager(db_path, open_connection=counting_connect, cancel_poll_interval=0)
+    spec = _parse_import_job_request(
+        {"metadata_json_path": str(metadata_path), "package_zip_path": str(zip_path)},
+        storage_layout="values",
+    )
+    job_id = manager.submit(spec)["job_id"]
+    manager.wait(job_id, timeout=10)
+
+    status = manager.get(job_id)
+    assert status is not None and status["status"] == "completed"
+    # One connection for the submit write, then one state and one import
+    # connection on the job thread, however many progress updates and polls.
+    job_thread = f"package-import-{job_id[:8]}"
+    assert opened.count(job_thread) == 2
+    assert len(opened) == 3
+
+
+def test_import_job_routes(tmp_path: Path) -> None:
+    """Start/status/cancel routes validate input and expose job state."""
+    metadata_path, zip_path = _write_package(tmp_path)
+    db_path = tmp_path / "routes.sqlite3"
+    try:
+        missing = _HandlerHarness(
+            path="/api/import/start",
+            db_path=db_path,
+            body={"metadata_json_path": str(metadata_path), "package_zip_path": "nope.zip"},
+        )
+        missing.do_POST()
+        assert missing.response_status == 400
+        assert "does not exist" in missing.json_body()["error"]
+
+        start = _HandlerHarness(
+            path="/api/import/start",
+            db_path=db_path,
+            body={"metadata_json_path": str(metadata_path), "package_zip_path": str(zip_path)},
+        )
+        start.do_POST()
+        assert start.response_status == 202
+        job_id = start.json_body()["job"]["job_id"]
+        endpoint_adapters._import_job_manager(start)().wait(job_id, timeout=10)
+
+        status = _HandlerHarness(path=f"/api/import/status?job_id={job_id}", db_path=db_path)
+        status.do_GET()
+        assert status.response_status == 200
+        assert status.json_body()["job"]["status"] == "completed"
+
+        unknown = _HandlerHarness(path="/api/import/status?job_id=abc", db_path=db_path)
+        unknown.do_GET()
+        assert unknown.response_status == 404
+
+        finished = _HandlerHarness(
+            path="/api/import/cancel", db_path=db_path, body={"job_id": job_id}
+        )
+        finished.do_POST()
+        assert finished.response_status == 409
+    finally:
+        close_import_job_managers()
+    assert _package_count(db_path) == 1
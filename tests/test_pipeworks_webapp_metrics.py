@@ -0,0 +1,199 @@
+"""Tests for the opt-in webapp metrics layer."""
+
+from __future__ import annotations
+
+import http.client
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from pipeworks_name_generation.webapp.cli import build_settings_from_args, parse_arguments
+from pipeworks_name_generation.webapp.config import ServerSettings
+from pipeworks_name_generation.webapp.db import close_connection_pools, connect_database
+from pipeworks_name_generation.webapp.metrics import (
+    FONT_ROUTE,
+    UNMATCHED_ROUTE,
+    MetricsRegistry,
+    TimedConnection,
+    disable_metrics,
+    enable_metrics,
+    get_metrics_registry,
+    route_label,
+)
+from pipeworks_name_generation.webapp.server import start_http_server
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> Iterator[None]:
+    disable_metrics()
+    yield
+    disable_metrics()
+
+
+# Every series starts with the rendering process's ``worker_pid`` label.
+_PID = f'worker_pid="{os.getpid()}",'
+
+
+def _sample(text: str, prefix: str) -> float:
+    """Return the value of the first exposition line starting with ``prefix``."""
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"No sample starting with {prefix!r}")
+
+
+def test_registry_renders_histograms_and_counters() -> None:
+    """Requests land in cumulative buckets; labels are escaped."""
+    registry = MetricsRegistry()
+    registry.observe_request("/api/health", "GET", 200, 0.003, 120)
+    registry.observe_request("/api/health", "GET", 200, 0.2, 5000)
+    registry.observe_request('/a"b', "POST", 404, 0.0001, 10)
+    registry.observe_query("SELECT", 0.0002)
+    registry.observe_query("INSERT", 0.5, failed=True)
+
+    text = registry.render_prometheus()
+    assert "# TYPE pipeworks_http_request_duration_seconds histogram" in text
+    requests = (
+        f'pipeworks_http_requests_total{{{_PID}route="/api/health",method="GET",status="200"}}'
+    )
+    assert _sample(text, requests) == 2
+    health = (
+        f'pipeworks_http_request_duration_seconds_bucket{{{_PID}route="/api/health",method="GET",'
+    )
+    assert _sample(text, health + 'le="0.005"}') == 1
+    assert _sample(text, health + 'le="0.25"}') == 2
+    assert _sample(text, health + 'le="+Inf"}') == 2
+    assert 'route="/a\\"b"' in text
+    assert _sample(text, f'pipeworks_db_query_duration_seconds_count{{{_PID}verb="SELECT"}}') == 1
+    assert _sample(text, f'pipeworks_db_query_errors_total{{{_PID}verb="INSERT"}}') == 1
+    assert _sample(text, f"pipeworks_uptime_seconds{{{_PID.rstrip(',')}}}") >= 0
+
+
+def test_route_label_bounds_cardinality() -> None:
+    """Unknown paths collapse into fixed labels."""
+    routes = {"/api/health": "get_health"}
+    assert route_label("/api/health", routes) == "/api/health"
+    assert route_label("/static/fonts/a.woff2", routes) == FONT_ROUTE
+    assert route_label("/api/nope/123", routes) == UNMATCHED_ROUTE
+
+
+def test_connections_are_timed_only_while_enabled(tmp_path: Path) -> None:
+    """Connections opened while enabled record statements by verb."""
+    plain = connect_database(tmp_path / "plain.sqlite3")
+    assert type(plain) is sqlite3.Connection
+    plain.close()
+
+    registry = enable_metrics()
+    conn = connect_database(tmp_path / "timed.sqlite3")
+    try:
+        assert isinstance(conn, TimedConnection)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+        assert conn.cursor().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("SELECT * FROM missing")
+    finally:
+        conn.close()
+
+    text = registry.render_prometheus()
+    assert _sample(text, f'pipeworks_db_query_duration_seconds_count{{{_PID}verb="PRAGMA"}}') == 4
+    assert _sample(text, f'pipeworks_db_query_duration_seconds_count{{{_PID}verb="INSERT"}}') == 1
+    assert _sample(text, f'pipeworks_db_query_duration_seconds_count{{{_PID}verb="SELECT"}}') == 2
+    assert _sample(text, f'pipeworks_db_query_errors_total{{{_PID}verb="SELECT"}}') == 1
+
+
+@pytest.fixture()
+def metrics_server(tmp_path: Path) -> Iterator[int]:
+    settings = ServerSettings(
+        db_path=tmp_path / "packages.sqlite3",
+        favorites_db_path=tmp_path / "favorites.sqlite3",
+        verbose=False,
+        metrics=True,
+    )
+    server, port = start_http_server(settings)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield port
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+        close_connection_pools()
+
+
+def _get(port: int, path: str) -> tuple[int, Any, bytes]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response, response.read()
+    finally:
+        conn.close()
+
+
+def test_metrics_endpoint_reports_routes_queries_and_caches(metrics_server: int) -> None:
+    """A running server exposes per-route, SQLite, cache, and pool metrics."""
+    port = metrics_server
+    assert get_metrics_registry() is not None
+    assert _get(port, "/api/health")[0] == 200
+    assert _get(port, "/api/generation/package-options")[0] == 200
+    assert _get(port, "/api/missing")[0] == 404
+
+    status, response, body = _get(port, "/api/metrics")
+    assert status == 200
+    assert response.getheader("Content-Type").startswith("text/plain; version=0.0.4")
+    text = body.decode("utf-8")
+    requests = (
+        f'pipeworks_http_requests_total{{{_PID}route="/api/health",method="GET",status="200"}}'
+    )
+    assert _sample(text, requests) == 1
+    assert (
+        _sample(
+            text,
+            f'pipeworks_http_requests_total{{{_PID}route="{UNMATCHED_ROUTE}",'
+            'method="GET",status="404"}',
+        )
+        == 1
+    )
+    sizes = f'pipeworks_http_response_size_bytes_sum{{{_PID}route="/api/health",method="GET"}}'
+    assert _sample(text, sizes) > 0
+    assert _sample(text, f'pipeworks_db_query_duration_seconds_count{{{_PID}verb="SELECT"}}') >= 1
+    assert f'pipeworks_cache_hit_ratio{{{_PID}cache="generation_candidates"}}' in text
+    assert f'pipeworks_cache_hits_total{{{_PID}cache="static_assets"}}' in text
+    assert f"pipeworks_db_pool_reader_leases_total{{{_PID}db=" in text
+
+
+def test_metrics_endpoint_is_404_when_disabled(tmp_path: Path) -> None:
+    """Without ``--metrics`` the route answers with a JSON error."""
+    settings = ServerSettings(
+        db_path=tmp_path / "packages.sqlite3",
+        favorites_db_path=tmp_path / "favorites.sqlite3",
+        verbose=False,
+    )
+    server, port = start_http_server(settings)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, _response, body = _get(port, "/api/metrics")
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+        close_connection_pools()
+    assert status == 404
+    assert b"Metrics are disabled" in body
+    assert get_metrics_registry() is None
+
+
+def test_metrics_flag_enables_setting(tmp_path: Path) -> None:
+    """``--metrics`` overrides the INI default."""
+    config = tmp_path / "server.ini"
+    config.write_text("[server]\nmetrics = false\n", encoding="utf-8")
+    assert build_settings_from_args(parse_arguments(["--config", str(config)])).metrics is False
+    args = parse_arguments(["--config", str(config), "--metrics"])
+    assert build_settings_from_args(args).metrics is True
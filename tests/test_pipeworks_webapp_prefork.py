@@ -0,0 +1,240 @@
+"""Tests for the pre-fork multi-process server mode."""
+
+from __future__ import annotations
+
+import http.client
+import os
+import signal
+import socket
+import subprocess  # nosec B404 - tests launch the server module with fixed arguments
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+import pipeworks_name_generation
+from pipeworks_name_generation.webapp.config import ServerSettings
+from pipeworks_name_generation.webapp.prefork import PreforkSupervisor
+from pipeworks_name_generation.webapp.runtime import run_server
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="worker discovery reads /proc"
+)
+
+_SUPERVISOR_SCRIPT = """
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from pipeworks_name_generation.webapp.prefork import PreforkSupervisor
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = str(os.getpid()).encode("ascii")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+server = HTTPServer(("127.0.0.1", 0), Handler)
+print(server.server_address[1], flush=True)
+supervisor = PreforkSupervisor(
+    server,
+    workers=2,
+    min_uptime=0.0,
+    worker_cleanup=lambda: print("cleanup", os.getpid(), flush=True),
+)
+code = supervisor.run()
+server.server_close()
+print("supervisor exited", flush=True)
+sys.exit(code)
+"""
+
+
+def _subprocess_env() -> dict[str, str]:
+    """Environment that imports this checkout even when it is not installed."""
+    package_root = str(Path(pipeworks_name_generation.__file__).resolve().parents[1])
+    existing = os.environ.get("PYTHONPATH")
+    python_path = package_root if not existing else os.pathsep.join([package_root, existing])
+    return {**os.environ, "PYTHONPATH": python_path}
+
+
+def _child_pids(parent_pid: int) -> set[int]:
+    children: set[int] = set()
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text(encoding="utf-8")
+        except OSError:
+            continue
+        # The command name is parenthesized and may contain spaces.
+        fields = stat.rsplit(")", 1)[1].split()
+        if int(fields[1]) == parent_pid and fields[0] != "Z":
+            children.add(int(entry.name))
+    return children
+
+
+def _wait_for(predicate: Callable[[], Any], *, timeout: float = 10.0) -> Any:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.05)
+    raise AssertionError("condition not met before timeout")
+
+
+def _get(port: int, path: str) -> tuple[int, bytes]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def test_supervisor_restarts_crashed_workers_and_stops_gracefully(tmp_path: Path) -> None:
+    """Workers share the socket, crashed ones are replaced, SIGTERM drains all."""
+    script = tmp_path / "supervise.py"
+    script.write_text(_SUPERVISOR_SCRIPT, encoding="utf-8")
+    proc = subprocess.Popen(  # nosec B603
+        [sys.executable, str(script)], stdout=subprocess.PIPE, text=True, env=_subprocess_env()
+    )
+    try:
+        assert proc.stdout is not None
+        port = int(proc.stdout.readline())
+        workers = _wait_for(lambda: len(_child_pids(proc.pid)) == 2 and _child_pids(proc.pid))
+
+        status, body = _get(port, "/")
+        assert status == 200
+        assert int(body) in workers
+
+        victim = next(iter(workers))
+        os.kill(victim, signal.SIGKILL)
+        replaced = _wait_for(
+            lambda: (pids := _child_pids(proc.pid)) and len(pids) == 2 and victim not in pids
+        )
+        assert replaced
+        assert int(_get(port, "/")[1]) != victim
+
+        proc.send_signal(signal.SIGTERM)
+        output, _ = proc.communicate(timeout=15)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    assert proc.returncode == 0
+    assert f"Worker {victim} exited with status -9; restarting." in output
+    assert output.count("cleanup") == 2
+    assert output.rstrip().endswith("supervisor exited")
+
+
+def test_webapp_workers_mode_serves_and_shuts_down(tmp_path: Path) -> None:
+    """``--workers`` should initialize storage once and serve from forked workers."""
+    db_path = tmp_path / "packages.sqlite3"
+    config = tmp_path / "server.ini"
+    config.write_text(
+        "[server]\n"
+        f"db_path = {db_path}\n"
+        f"favorites_db_path = {tmp_path / 'favorites.sqlite3'}\n"
+        "worker_threads = 2\n",
+        encoding="utf-8",
+    )
+    port = _free_port()
+    proc = subprocess.Popen(  # nosec B603
+        [
+            sys.executable,
+            "-m",
+            "pipeworks_name_generation.webapp.server",
+            "--config",
+            str(config),
+            "--port",
+            str(port),
+            "--workers",
+            "3",
+            "--api-only",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+        env=_subprocess_env(),
+    )
+    try:
+        _wait_for(lambda: len(_child_pids(proc.pid)) == 3)
+        assert db_path.exists()
+        for _ in range(6):
+            status, body = _get(port, "/api/health")
+            assert status == 200
+            assert b"ok" in body
+
+        # Ctrl-C reaches the supervisor; it forwards SIGTERM to the workers.
+        proc.send_signal(signal.SIGINT)
+        output, _ = proc.communicate(timeout=15)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    assert proc.returncode == 0
+    assert f"Worker processes: 3 (supervisor pid {proc.pid})" in output
+
+
+def test_run_server_uses_supervisor_for_multiple_workers() -> None:
+    """``workers > 1`` should hand the bound server to the supervisor."""
+    calls: dict[str, Any] = {}
+
+    class _Server:
+        closed = False
+
+        def serve_forever(self) -> None:
+            raise AssertionError("the supervisor serves, not the parent")
+
+        def server_close(self) -> None:
+            self.closed = True
+
+    class _Supervisor:
+        def __init__(self, server: Any, **kwargs: Any) -> None:
+            calls["server"] = server
+            calls.update(kwargs)
+
+        def run(self) -> int:
+            calls["ran"] = True
+            return 0
+
+    def cleanup() -> None:
+        pass
+
+    server = _Server()
+    result = run_server(
+        ServerSettings(verbose=False, workers=4),
+        start_server=lambda _settings: (server, 8125),
+        worker_cleanup=cleanup,
+        supervisor_cls=_Supervisor,
+    )
+
+    assert result == 0
+    assert calls["server"] is server
+    assert calls["workers"] == 4
+    assert calls["worker_cleanup"] is cleanup
+    assert calls["ran"] is True
+    assert server.closed is True
+
+
+def test_prefork_supervisor_rejects_invalid_worker_count() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        PreforkSupervisor(object(), workers=0)
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
-from http.server import BaseHTTPRequestHandler
+import http.client
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Any, cast
 
+import pytest
+
 from pipeworks_name_generation.webapp.config import ServerSettings
 from pipeworks_name_generation.webapp.runtime import (
+    BoundedThreadingHTTPServer,
+    build_http_server_factory,
     create_bound_handler_class,
     run_server,
     start_http_server,
@@ -121,3 +128,118 @@ def test_run_server_prints_api_label_when_ui_disabled() -> None:
     assert result == 0
     assert runtime.closed is True
     assert any("Serving Pipeworks Name Generator API" in line for line in messages)
+
+
+class _BlockingHandler(BaseHTTPRequestHandler):
+    """Handler that holds its worker until the test releases it."""
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.started.set()
+        self.release.wait(timeout=5)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence request logs during tests."""
+
+
+def test_build_http_server_factory_selects_concurrency_mode() -> None:
+    """Zero workers should keep the default class; positive counts use the pool."""
+    assert build_http_server_factory(ServerSettings(), default_cls=HTTPServer) is HTTPServer
+    factory = build_http_server_factory(
+        ServerSettings(worker_threads=3, request_queue_depth=5), default_cls=HTTPServer
+    )
+    server = factory(("127.0.0.1", 0), _BaseHandler)
+    try:
+        assert isinstance(server, BoundedThreadingHTTPServer)
+        assert server.max_workers == 3
+        assert server.queue_depth == 5
+    finally:
+        server.server_close()
+
+
+def test_bounded_server_rejects_when_full_and_drains_on_close() -> None:
+    """Saturated pools should answer 503 and finish in-flight work on close."""
+    _BlockingHandler.started.clear()
+    _BlockingHandler.release.clear()
+    server = BoundedThreadingHTTPServer(
+        ("127.0.0.1", 0), _BlockingHandler, max_workers=1, queue_depth=0
+    )
+    port = server.server_address[1]
+    serve_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    serve_thread.start()
+
+    results: dict[str, Any] = {}
+
+    def slow_request() -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/slow")
+        response = conn.getresponse()
+        results["slow"] = (response.status, response.read())
+        conn.close()
+
+    slow_thread = threading.Thread(target=slow_request)
+    slow_thread.start()
+    try:
+        assert _BlockingHandler.started.wait(timeout=5)
+
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/busy")
+        busy = conn.getresponse()
+        assert busy.status == 503
+        assert busy.getheader("Retry-After") == "1"
+        assert "busy" in json.loads(busy.read())["error"]
+        conn.close()
+        assert server.rejected_requests == 1
+    finally:
+        _BlockingHandler.release.set()
+        server.shutdown()
+        server.server_close()
+        slow_thread.join(timeout=5)
+        serve_thread.join(timeout=5)
+
+    assert results["slow"] == (200, b"ok")
+
+
+def test_bounded_server_rejects_without_blocking_the_accept_thread(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Overload rejection must not wait for request bytes that have not arrived."""
+
+    class _Request:
+        def __init__(self) -> None:
+            self.calls: list[str] = []
+            self.sent = b""
+
+        def setblocking(self, flag: bool) -> None:
+            self.calls.append(f"setblocking({flag})")
+
+        def recv(self, _size: int) -> bytes:
+            self.calls.append("recv")
+            raise BlockingIOError
+
+        def send(self, data: bytes) -> int:
+            self.sent += data
+            return len(data)
+
+    server = BoundedThreadingHTTPServer(
+        ("127.0.0.1", 0), _BlockingHandler, max_workers=1, bind_and_activate=False
+    )
+    closed: list[Any] = []
+    monkeypatch.setattr(server, "shutdown_request", closed.append)
+    request = _Request()
+    try:
+        server._reject_overloaded(request)
+    finally:
+        server.server_close()
+
+    assert request.calls == ["setblocking(False)", "recv"]
+    assert request.sent.startswith(b"HTTP/1.1 503 Service Unavailable\r\n")
+    assert closed == [request]
+    assert server.rejected_requests == 1
@@ -20,6 +20,10 @@ from pipeworks_name_generation.webapp.config import ServerSettings
 from pipeworks_name_generation.webapp.db import (
     connect_database as _connect_database,
 )
+from pipeworks_name_generation.webapp.db import (
+    fetch_package_table_rows,
+    migrate_to_values_layout,
+)
 from pipeworks_name_generation.webapp.db import (
     fetch_text_rows as _fetch_text_rows,
 )
@@ -53,6 +57,7 @@ from pipeworks_name_generation.webapp.db import (
 from pipeworks_name_generation.webapp.db import (
     slugify_identifier as _slugify_identifier,
 )
+from pipeworks_name_generation.webapp.db.pool import close_connection_pools
 from pipeworks_name_generation.webapp.generation import (
     _coerce_bool,
     _coerce_generation_count,
@@ -62,6 +67,7 @@ from pipeworks_name_generation.webapp.generation import (
     _collect_generation_source_values,
     _extract_syllable_option_from_source_txt_name,
     _get_generation_selection_stats,
+    _iter_generation_values,
     _list_generation_package_options,
     _list_generation_syllable_options,
     _map_source_txt_name_to_generation_class,
@@ -72,6 +78,7 @@ from pipeworks_name_generation.webapp.http import (
     _coerce_int,
     _parse_optional_int,
     _parse_required_int,
+    send_chunked,
 )
 from pipeworks_name_generation.webapp.routes import help as help_routes
 from pipeworks_name_generation.webapp.server import (
@@ -121,6 +128,9 @@ class _HandlerHarness:
     favorites_schema_initialized_paths: set[str] = set()
     get_routes: dict[str, str] = route_registry_module.GET_ROUTE_METHODS
     post_routes: dict[str, str] = route_registry_module.POST_ROUTE_METHODS
+    request_version: str = "HTTP/1.1"
+    close_connection: bool = False
+    connection_pool_enabled: bool = False
 
     def __init__(
         self,
@@ -153,10 +163,14 @@ class _HandlerHarness:
         )
         self._send_text = WebAppHandler._send_text.__get__(self, WebAppHandler)
         self._send_bytes = WebAppHandler._send_bytes.__get__(self, WebAppHandler)
+        self._send_prepared = WebAppHandler._send_prepared.__get__(self, WebAppHandler)
         self._send_json = WebAppHandler._send_json.__get__(self, WebAppHandler)
+        self._send_stream = WebAppHandler._send_stream.__get__(self, WebAppHandler)
         self._read_json_body = WebAppHandler._read_json_body.__get__(self, WebAppHandler)
         self.do_GET = WebAppHandler.do_GET.__get__(self, WebAppHandler)
         self.do_POST = WebAppHandler.do_POST.__get__(self, WebAppHandler)
+        self._dispatch_get = WebAppHandler._dispatch_get.__get__(self, WebAppHandler)
+        self._dispatch_post = WebAppHandler._dispatch_post.__get__(self, WebAppHandler)
 
     def send_response(self, status: int) -> None:
         """Store HTTP status code sent by handler logic."""
@@ -238,6 +252,133 @@ def test_import_package_pair_rejects_duplicate_pair(tmp_path: Path) -> None:
             _import_package_pair(conn, metadata_path=metadata_path, zip_path=zip_path)
 
 
+def test_values_storage_layout_matches_legacy_reads_and_migration(tmp_path: Path) -> None:
+    """Consolidated rows should serve the same data as per-txt tables."""
+    metadata_path, zip_path = _build_sample_package_pair(tmp_path)
+
+    def snapshot(conn: sqlite3.Connection, package_id: int) -> dict[str, Any]:
+        tables = _list_package_tables(conn, package_id)
+        return {
+            "values": _collect_generation_source_values(
+                conn, package_id=package_id, class_key="first_name", syllable_key="2syl"
+            ),
+            "stats": _get_generation_selection_stats(
+                conn, package_id=package_id, class_key="first_name", syllable_key="2syl"
+            ),
+            "rows": [fetch_package_table_rows(conn, table, offset=0, limit=20) for table in tables],
+        }
+
+    legacy_conn = _connect_database(tmp_path / "legacy.sqlite3")
+    values_conn = _connect_database(tmp_path / "values.sqlite3")
+    try:
+        for conn, layout in ((legacy_conn, "table"), (values_conn, "values")):
+            _initialize_schema(conn)
+            result = _import_package_pair(
+                conn, metadata_path=metadata_path, zip_path=zip_path, storage_layout=layout
+            )
+            assert {table["storage_layout"] for table in result["tables"]} == {layout}
+
+        package_id = 1
+        expected = snapshot(legacy_conn, package_id)
+        assert expected["values"] == ["alfa", "beta", "gamma"]
+        assert snapshot(values_conn, package_id) == expected
+        physical = {
+            str(row[0])
+            for row in values_conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'pkg_%'"
+            )
+        }
+        assert physical == set()
+
+        migrated = migrate_to_values_layout(legacy_conn, drop_legacy_tables=True)
+        assert migrated.migrated_tables == 2
+        assert migrated.migrated_rows == 5
+        assert migrated.dropped_tables == 2
+        assert snapshot(legacy_conn, package_id) == expected
+        assert migrate_to_values_layout(legacy_conn).migrated_tables == 0
+
+        with pytest.raises(ValueError, match="storage layout"):
+            _import_package_pair(
+                values_conn, metadata_path=metadata_path, zip_path=zip_path, storage_layout="x"
+            )
+    finally:
+        legacy_conn.close()
+        values_conn.close()
+
+
+def test_selection_stats_are_materialized_at_import_and_recomputable(tmp_path: Path) -> None:
+    """Imports should persist scope stats that match live scans and can be rebuilt."""
+    metadata_path, zip_path = _build_sample_package_pair(tmp_path)
+    db_path = tmp_path / "stats.sqlite3"
+
+    with _connect_database(db_path) as conn:
+        _initialize_schema(conn)
+        _import_package_pair(conn, metadata_path=metadata_path, zip_path=zip_path)
+        stored = conn.execute(
+            "SELECT class_key, syllable_key, row_count, distinct_count, length_histogram "
+            "FROM generation_scope_stats ORDER BY class_key"
+        ).fetchall()
+        assert [tuple(row) for row in stored] == [
+            ("first_name", "2syl", 3, 3, '{"4": 2, "5": 1}'),
+            ("last_name", "2syl", 2, 2, '{"5": 2}'),
+        ]
+        assert conn.execute("SELECT COUNT(*) FROM package_table_stats").fetchone()[0] == 2
+
+        materialized = _get_generation_selection_stats(
+            conn, package_id=1, class_key="first_name", syllable_key="2syl", include_histogram=True
+        )
+        assert materialized == {
+            "max_items": 3,
+            "max_unique_combinations": 3,
+            "length_histogram": {"4": 2, "5": 1},
+        }
+        assert _get_generation_selection_stats(
+            conn, package_id=1, class_key="first_name", syllable_key="3syl"
+        ) == {"max_items": 0, "max_unique_combinations": 0}
+
+        # Packages without stored stats fall back to scanning the value tables.
+        conn.execute("DELETE FROM package_table_stats")
+        conn.execute("DELETE FROM generation_scope_stats")
+        conn.commit()
+        rescanned = _get_generation_selection_stats(
+            conn, package_id=1, class_key="first_name", syllable_key="2syl", include_histogram=True
+        )
+        assert rescanned == materialized
+
+    recompute = _HandlerHarness(
+        path="/api/database/recompute-stats", db_path=db_path, body={"package_id": 1}
+    )
+    recompute.do_POST()
+    assert recompute.response_status == 200
+    assert recompute.json_body()["packages"] == 1
+    assert recompute.json_body()["scopes"] == 2
+
+    missing = _HandlerHarness(
+        path="/api/database/recompute-stats", db_path=db_path, body={"package_id": 99}
+    )
+    missing.do_POST()
+    assert missing.response_status == 404
+
+    invalid = _HandlerHarness(
+        path="/api/database/recompute-stats", db_path=db_path, body={"package_id": "x"}
+    )
+    invalid.do_POST()
+    assert invalid.response_status == 400
+
+    stats_route = _HandlerHarness(
+        path=(
+            "/api/generation/selection-stats?package_id=1&class_key=first_name"
+            "&syllable_key=2syl&include_histogram=1"
+        ),
+        db_path=db_path,
+    )
+    stats_route.do_GET()
+    assert stats_route.response_status == 200
+    assert stats_route.json_body()["length_histogram"] == {"4": 2, "5": 1}
+    with _connect_database(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM generation_scope_stats").fetchone()[0] == 2
+
+
 def test_import_package_pair_rejects_invalid_files_included_type(tmp_path: Path) -> None:
     """Metadata ``files_included`` must be list when provided."""
     db_path = tmp_path / "webapp.sqlite3"
@@ -345,6 +486,42 @@ def test_api_endpoints_import_and_browse_rows(tmp_path: Path) -> None:
     assert "table_id" in missing_payload["error"]
 
 
+def test_table_rows_keyset_pagination_route(tmp_path: Path) -> None:
+    """``after`` cursors should page through rows and reject malformed cursors."""
+    metadata_path, zip_path = _build_sample_package_pair(tmp_path)
+    db_path = tmp_path / "keyset.sqlite3"
+    with _connect_database(db_path) as conn:
+        _initialize_schema(conn)
+        _import_package_pair(conn, metadata_path=metadata_path, zip_path=zip_path)
+
+    offset_route = _HandlerHarness(
+        path="/api/database/table-rows?table_id=1&offset=0&limit=20", db_path=db_path
+    )
+    offset_route.do_GET()
+    expected_rows = offset_route.json_body()["rows"]
+
+    collected: list[dict[str, Any]] = []
+    path = "/api/database/table-rows?table_id=1&limit=2"
+    while True:
+        page = _HandlerHarness(path=path, db_path=db_path)
+        page.do_GET()
+        payload = page.json_body()
+        assert page.response_status == 200
+        assert "offset" not in payload
+        collected.extend(payload["rows"])
+        if payload["next_cursor"] is None:
+            break
+        path = f"/api/database/table-rows?table_id=1&after={payload['next_cursor']}&limit=2"
+    assert collected == expected_rows
+
+    bad_cursor = _HandlerHarness(
+        path="/api/database/table-rows?table_id=1&after=%21%21", db_path=db_path
+    )
+    bad_cursor.do_GET()
+    assert bad_cursor.response_status == 400
+    assert "Invalid row cursor" in bad_cursor.json_body()["error"]
+
+
 def test_create_handler_class_binds_runtime_values(tmp_path: Path) -> None:
     """Bound handler class should reflect runtime ``verbose`` and ``db_path``."""
     db_path = tmp_path / "bound.sqlite3"
@@ -905,6 +1082,230 @@ def test_generate_route_applies_render_style(tmp_path: Path) -> None:
     assert payload["text"] == "\n".join(payload["names"])
 
 
+def test_routes_use_connection_pool_when_enabled(tmp_path: Path) -> None:
+    """Pooled handlers should serve import/generate and report pool metrics."""
+    db_path = tmp_path / "db.sqlite3"
+    metadata_path, zip_path = _build_sample_package_pair(tmp_path)
+    with _connect_database(db_path) as conn:
+        _initialize_schema(conn)
+
+    try:
+        importer = _HandlerHarness(
+            path="/api/import",
+            db_path=db_path,
+            body={
+                "metadata_json_path": str(metadata_path),
+                "package_zip_path": str(zip_path),
+            },
+        )
+        importer.connection_pool_enabled = True
+        importer.do_POST()
+        assert importer.response_status == 200
+        package_id = int(importer.json_body()["package_id"])
+
+        gen = _HandlerHarness(
+            path="/api/generate",
+            db_path=db_path,
+            body={
+                "class_key": "first_name",
+                "package_id": package_id,
+                "syllable_key": "2syl",
+                "generation_count": 3,
+                "seed": 1,
+            },
+        )
+        gen.connection_pool_enabled = True
+        gen.do_POST()
+        assert gen.response_status == 200
+        assert len(gen.json_body()["names"]) == 3
+
+        stats = _HandlerHarness(path="/api/database/pool-stats", db_path=db_path)
+        stats.connection_pool_enabled = True
+        stats.do_GET()
+        payload = stats.json_body()
+        assert payload["enabled"] is True
+        (pool_stats,) = payload["pools"]
+        assert pool_stats["writer_leases"] == 1
+        assert pool_stats["reader_leases"] >= 1
+        assert pool_stats["active_leases"] == 0
+    finally:
+        close_connection_pools()
+
+
+def _decode_chunked_body(raw: bytes) -> bytes:
+    """Decode an HTTP/1.1 chunked response body captured by the harness."""
+    body = b""
+    while True:
+        size_line, raw = raw.split(b"\r\n", 1)
+        size = int(size_line, 16)
+        if size == 0:
+            assert raw == b"\r\n"
+            return body
+        body += raw[:size]
+        assert raw[size : size + 2] == b"\r\n"
+        raw = raw[size + 2 :]
+
+
+def test_generate_route_streams_ndjson_and_txt(tmp_path: Path) -> None:
+    """Streamed output should match the buffered JSON response for one seed."""
+    db_path = tmp_path / "db.sqlite3"
+    metadata_path, zip_path = _build_sample_package_pair(tmp_path)
+
+    importer = _HandlerHarness(
+        path="/api/import",
+        db_path=db_path,
+        body={
+            "metadata_json_path": str(metadata_path),
+            "package_zip_path": str(zip_path),
+        },
+    )
+    importer.do_POST()
+    package_id = int(importer.json_body()["package_id"])
+    scope = {
+        "class_key": "first_name",
+        "package_id": package_id,
+        "syllable_key": "2syl",
+        "generation_count": 2500,
+        "seed": 11,
+        "render_style": "upper",
+    }
+
+    buffered = _HandlerHarness(path="/api/generate", db_path=db_path, body=scope)
+    buffered.do_POST()
+    expected = buffered.json_body()
+
+    ndjson = _HandlerHarness(
+        path="/api/generate", db_path=db_path, body={**scope, "output_format": "ndjson"}
+    )
+    ndjson.do_POST()
+    assert ndjson.response_status == 200
+    assert ndjson.response_headers["Content-Type"] == "application/x-ndjson"
+    assert ndjson.response_headers["Transfer-Encoding"] == "chunked"
+    lines = _decode_chunked_body(ndjson.wfile.getvalue()).decode("utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["name"] for record in records] == expected["names"]
+    assert [record["raw_name"] for record in records] == expected["raw_names"]
+
+    txt = _HandlerHarness(
+        path="/api/generate",
+        db_path=db_path,
+        body={**scope, "output_format": "txt", "stream": True},
+    )
+    txt.do_POST()
+    assert txt.response_status == 200
+    assert txt.response_headers["Content-Type"].startswith("text/plain")
+    text = _decode_chunked_body(txt.wfile.getvalue()).decode("utf-8")
+    assert text.splitlines() == expected["names"]
+
+    invalid = _HandlerHarness(path="/api/generate", db_path=db_path, body={**scope, "stream": True})
+    invalid.do_POST()
+    assert invalid.response_status == 400
+    assert "stream" in invalid.json_body()["error"]
+
+
+def test_generate_batch_route_returns_aligned_deterministic_rows(tmp_path: Path) -> None:
+    """Batch generation should align scopes per row and repeat for one seed."""
+    db_path = tmp_path / "db.sqlite3"
+    metadata_path, zip_path = _build_sample_package_pair(tmp_path)
+    importer = _HandlerHarness(
+        path="/api/import",
+        db_path=db_path,
+        body={
+            "metadata_json_path": str(metadata_path),
+            "package_zip_path": str(zip_path),
+        },
+    )
+    importer.do_POST()
+    package_id = int(importer.json_body()["package_id"])
+    body = {
+        "template": "{first_name} {last_name}",
+        "package_id": package_id,
+        "syllable_key": "2syl",
+        "generation_count": 50,
+        "seed": 7,
+        "render_style": "title",
+    }
+
+    first = _HandlerHarness(path="/api/generate/batch", db_path=db_path, body=body)
+    first.do_POST()
+    assert first.response_status == 200
+    payload = first.json_body()
+    second = _HandlerHarness(path="/api/generate/batch", db_path=db_path, body=body)
+    second.do_POST()
+    assert second.json_body() == payload
+
+    first_names, last_names = (scope["names"] for scope in payload["scopes"])
+    assert [scope["key"] for scope in payload["scopes"]] == ["first_name", "last_name"]
+    assert len(first_names) == len(last_names) == len(payload["results"]) == 50
+    assert payload["results"] == [f"{a} {b}" for a, b in zip(first_names, last_names)]
+    assert set(first_names) <= {"Alfa", "Beta", "Gamma"}
+    assert set(last_names) <= {"Thorn", "Briar"}
+
+    ndjson = _HandlerHarness(
+        path="/api/generate/batch",
+        db_path=db_path,
+        body={**body, "output_format": "ndjson"},
+    )
+    ndjson.do_POST()
+    lines = _decode_chunked_body(ndjson.wfile.getvalue()).decode("utf-8").splitlines()
+    assert [json.loads(line)["result"] for line in lines] == payload["results"]
+
+    explicit = _HandlerHarness(
+        path="/api/generate/batch",
+        db_path=db_path,
+        body={
+            "scopes": [
+                {"key": "given", "class_key": "first_name", "unique_only": True},
+                {"key": "family", "class_key": "last_name"},
+            ],
+            "package_id": package_id,
+            "syllable_key": "2syl",
+            "generation_count": 3,
+        },
+    )
+    explicit.do_POST()
+    assert explicit.response_status == 200
+    assert sorted(explicit.json_body()["scopes"][0]["names"]) == ["alfa", "beta", "gamma"]
+
+    for invalid_body, message in (
+        ({**body, "template": "{first_name} {epithet}"}, "Unsupported generation class_key"),
+        (
+            {**body, "scopes": [{"class_key": "first_name"}], "template": "{first_name} {x}"},
+            "unknown scope key",
+        ),
+        ({**body, "template": "{first_name!r}"}, "placeholders"),
+        ({**body, "unique_only": True}, "aligned"),
+        ({**body, "package_id": 999}, "Scope 'first_name'"),
+    ):
+        invalid = _HandlerHarness(path="/api/generate/batch", db_path=db_path, body=invalid_body)
+        invalid.do_POST()
+        assert invalid.response_status == 400
+        assert message in invalid.json_body()["error"]
+
+
+def test_send_chunked_falls_back_to_raw_body_for_http_10() -> None:
+    """HTTP/1.0 clients should receive unframed bytes and a closed connection."""
+    harness = _HandlerHarness(path="/api/generate", db_path=Path("unused.sqlite3"))
+    harness.request_version = "HTTP/1.0"
+    send_chunked(harness, [b"a\n", b"", b"b\n"], content_type="text/plain")
+    assert harness.wfile.getvalue() == b"a\nb\n"
+    assert "Transfer-Encoding" not in harness.response_headers
+    assert harness.response_headers["Connection"] == "close"
+    assert harness.close_connection is True
+
+
+def test_iter_generation_values_matches_buffered_sampling() -> None:
+    """Chunked sampling should reproduce the buffered sampler exactly."""
+    values = ["a", "b", "c", "a", "d"]
+    for unique_only in (False, True):
+        chunks = list(
+            _iter_generation_values(values, count=7, seed=5, unique_only=unique_only, chunk_size=3)
+        )
+        assert all(len(chunk) <= 3 for chunk in chunks)
+        flat = [name for chunk in chunks for name in chunk]
+        assert flat == _sample_generation_values(values, count=7, seed=5, unique_only=unique_only)
+
+
 def test_handle_import_validation_and_exception_paths(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -1079,7 +1480,7 @@ def test_import_package_pair_other_error_paths(
         def fail_rows(*args: Any, **kwargs: Any) -> Any:
             raise RuntimeError("read fail")
 
-        monkeypatch.setattr(importer_module, "read_txt_rows", fail_rows)
+        monkeypatch.setattr(importer_module, "iter_txt_rows", fail_rows)
         with pytest.raises(RuntimeError, match="read fail"):
             _import_package_pair(conn, metadata_path=metadata_path, zip_path=zip_path)
 
@@ -1647,3 +2048,81 @@ def test_argument_parsing_and_main(
     monkeypatch.setattr(server_module, "parse_arguments", boom_parse)
     assert main([]) == 1
     assert "Error: parse failed" in capsys.readouterr().out
+
+
+def test_generate_export_routes_write_and_download_file(tmp_path: Path) -> None:
+    """Export jobs should write the same names as ``/api/generate`` for one seed."""
+    db_path = tmp_path / "db.sqlite3"
+    metadata_path, zip_path = _build_sample_package_pair(tmp_path)
+    importer = _HandlerHarness(
+        path="/api/import",
+        db_path=db_path,
+        body={
+            "metadata_json_path": str(metadata_path),
+            "package_zip_path": str(zip_path),
+        },
+    )
+    importer.do_POST()
+    package_id = int(importer.json_body()["package_id"])
+    scope = {
+        "class_key": "first_name",
+        "package_id": package_id,
+        "syllable_key": "2syl",
+        "generation_count": 250,
+        "seed": 5,
+        "render_style": "title",
+    }
+
+    started = _HandlerHarness(
+        path="/api/generate/export",
+        db_path=db_path,
+        body={**scope, "output_format": "txt", "chunk_size": 40},
+    )
+    started.do_POST()
+    assert started.response_status == 202
+    job_id = started.json_body()["job"]["job_id"]
+    export_manager = endpoint_adapters_module.get_export_job_manager(
+        tmp_path / "exports", db_path=db_path
+    )
+    export_manager.wait(job_id, timeout=10)
+
+    status = _HandlerHarness(path=f"/api/generate/export/status?job_id={job_id}", db_path=db_path)
+    status.do_GET()
+    job = status.json_body()["job"]
+    assert job["status"] == "completed"
+    assert job["names_written"] == 250
+    assert job["chunks_completed"] == 7
+    assert job["progress"] == 1.0
+
+    download = _HandlerHarness(
+        path=f"/api/generate/export/download?job_id={job_id}", db_path=db_path
+    )
+    download.do_GET()
+    assert download.response_status == 200
+    assert download.response_headers["Content-Disposition"].endswith(f'{job_id}.txt"')
+    text = _decode_chunked_body(download.wfile.getvalue()).decode("utf-8")
+
+    generated = _HandlerHarness(path="/api/generate", db_path=db_path, body=scope)
+    generated.do_POST()
+    assert text.splitlines() == generated.json_body()["names"]
+
+    resume = _HandlerHarness(
+        path="/api/generate/export/resume", db_path=db_path, body={"job_id": job_id}
+    )
+    resume.do_POST()
+    assert resume.response_status == 409
+
+    missing = _HandlerHarness(
+        path="/api/generate/export/status?job_id=" + "0" * 32, db_path=db_path
+    )
+    missing.do_GET()
+    assert missing.response_status == 404
+
+    invalid = _HandlerHarness(
+        path="/api/generate/export",
+        db_path=db_path,
+        body={**scope, "output_format": "xlsx"},
+    )
+    invalid.do_POST()
+    assert invalid.response_status == 400
+    assert "output_format" in invalid.json_body()["error"]